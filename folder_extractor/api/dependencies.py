@@ -2,7 +2,7 @@
 Dependency injection functions for FastAPI endpoints.
 
 This module provides reusable dependencies for accessing core components
-like ZoneManager, Settings, SmartSorter, and KnowledgeGraph.
+like ZoneManager, Settings, SmartSorter, KnowledgeGraph and JobManager.
 Uses FastAPI's Depends() mechanism for automatic injection.
 """
 
@@ -16,6 +16,7 @@ from folder_extractor.config.settings import Settings
 from folder_extractor.core.zone_manager import ZoneManager
 
 if TYPE_CHECKING:
+    from folder_extractor.api.jobs import JobManager
     from folder_extractor.core.memory.graph import KnowledgeGraph
     from folder_extractor.core.smart_sorter import SmartSorter
 
@@ -153,3 +154,31 @@ def get_knowledge_graph_from_app_state(request: Request) -> KnowledgeGraph:
         )
 
     return request.app.state.knowledge_graph
+
+
+def get_job_manager_from_app_state(request: Request) -> JobManager:
+    """
+    Get JobManager from FastAPI app state.
+
+    The JobManager is initialized during app startup (lifespan) and
+    stored in app.state. This dependency retrieves it for endpoint use.
+
+    Args:
+        request: FastAPI request object containing app reference.
+
+    Returns:
+        The initialized JobManager instance.
+
+    Raises:
+        HTTPException: 503 if JobManager is not available.
+    """
+    if (
+        not hasattr(request.app.state, "job_manager")
+        or request.app.state.job_manager is None
+    ):
+        raise HTTPException(
+            status_code=503,
+            detail="Auftragsverwaltung nicht verfügbar",
+        )
+
+    return request.app.state.job_manager
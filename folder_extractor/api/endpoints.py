@@ -2,11 +2,18 @@
 REST API endpoints for file processing and zone management.
 
 This module defines the core REST endpoints for the Folder Extractor API:
-- POST /process: Process a single file (background task)
+- POST /process: Queue a single file for processing
+- POST /process/batch: Queue many files or a directory as one task
+- GET /tasks/{task_id}: Status and result of a processing task
+- GET /tasks/{task_id}/stream: Stream the progress of a task as NDJSON
+- DELETE /tasks/{task_id}: Cancel a queued processing task
 - GET /zones: List all dropzones
 - POST /zones: Create a new dropzone
 - DELETE /zones/{zone_id}: Delete a dropzone
 - PUT /zones/{zone_id}: Update a dropzone
+- GET /search: Search documents in the local index (optional AI fallback)
+- GET /query: Answer a question from the knowledge graph, page by page
+- GET /query/stream: Stream all answers to a question as NDJSON
 
 All endpoints use dependency injection for testability and are
 registered under the /api/v1 prefix.
@@ -14,16 +21,17 @@ registered under the /api/v1 prefix.
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import threading
-import uuid
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
     HTTPException,
     Query,
@@ -31,13 +39,23 @@ from fastapi import (
     Response,
 )
 from fastapi import Path as PathParam
+from fastapi.responses import StreamingResponse
 from watchdog.observers import Observer
 
-from folder_extractor.api.dependencies import get_zone_manager
+from folder_extractor.api.dependencies import (
+    get_job_manager_from_app_state,
+    get_knowledge_graph_from_app_state,
+    get_zone_manager,
+)
+from folder_extractor.api.jobs import Job, JobManager, JobQueueFullError
 from folder_extractor.api.models import (
+    BatchProcessRequest,
     ProcessRequest,
     ProcessResponse,
+    QueryPageResponse,
+    SearchResponse,
     SingleWatcherStatus,
+    TaskStatusResponse,
     WatcherListResponse,
     WatcherStartRequest,
     WatcherStopRequest,
@@ -50,11 +68,31 @@ from folder_extractor.api.websocket import (
     ConnectionManager,
     WebSocketProgressBroadcaster,
 )
+from folder_extractor.config.constants import (
+    API_JOB_RETRY_AFTER,
+    API_JOB_STREAM_INTERVAL,
+    QUERY_MAX_PAGE_SIZE,
+    QUERY_PAGE_SIZE,
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_MAX_LIMIT,
+    WATCH_AI_CONCURRENCY,
+    WATCH_PROCESSING_WORKERS,
+)
+from folder_extractor.core.archives import SecurityError
 from folder_extractor.core.extractor import (
     EnhancedExtractionOrchestrator,
     EnhancedFileExtractor,
+    MoveCallback,
 )
+from folder_extractor.core.memory.graph import (
+    InvalidCursorError,
+    KnowledgeGraph,
+    KnowledgeGraphError,
+)
+from folder_extractor.core.memory.maintenance import GraphMaintenance
 from folder_extractor.core.monitor import StabilityMonitor
+from folder_extractor.core.pipeline import WatchPipeline
+from folder_extractor.core.preclassifier import PreClassifier
 from folder_extractor.core.state_manager import StateManager
 from folder_extractor.core.watch import FolderEventHandler, SmartFolderEventHandler
 from folder_extractor.core.zone_manager import ZoneManager, ZoneManagerError
@@ -77,6 +115,28 @@ active_watchers: dict[str, dict[str, Any]] = {}
 watchers_lock = threading.Lock()
 
 
+def watcher_queue_depths() -> Dict[str, float]:
+    """Return the files waiting in the pipeline of each active watcher.
+
+    Collector of the watcher_queue_depth gauge of GET /metrics; watchers
+    that process files inline are left out.
+
+    Returns:
+        Queue depth per zone ID.
+    """
+    with watchers_lock:
+        handlers = {
+            zone_id: data.get("handler") for zone_id, data in active_watchers.items()
+        }
+    depths: Dict[str, float] = {}
+    for zone_id, handler in handlers.items():
+        if isinstance(getattr(handler, "pipeline", None), WatchPipeline):
+            stats = handler.get_pipeline_stats()
+            if stats is not None:
+                depths[zone_id] = stats["queue_depth"]
+    return depths
+
+
 def _parse_iso_timestamp(timestamp_str: Optional[str]) -> Optional[datetime]:
     """Parse ISO 8601 timestamp string to datetime object.
 
@@ -94,28 +154,130 @@ def _parse_iso_timestamp(timestamp_str: Optional[str]) -> Optional[datetime]:
         return None
 
 
+def _move_callback(app: Any) -> Optional[MoveCallback]:
+    """Return the callback reporting moved files to graph maintenance.
+
+    Args:
+        app: FastAPI application giving access to the app state.
+
+    Returns:
+        GraphMaintenance.record_moves, or None without maintenance.
+    """
+    maintenance = getattr(app.state, "graph_maintenance", None)
+    if isinstance(maintenance, GraphMaintenance):
+        return maintenance.record_moves
+    return None
+
+
 # =============================================================================
 # File Processing Endpoints
 # =============================================================================
 
 
+def process_batch(
+    app: Any,
+    filepaths: List[Path],
+    destination: Path,
+    options: Dict[str, Any],
+    directory: Optional[Path] = None,
+    progress_callback: Optional[Callable[..., None]] = None,
+) -> Dict[str, Any]:
+    """Process queued files of one destination (runner of the JobManager).
+
+    Clones the app settings once per batch, applies the options of the
+    batch and moves all files with a single extract_files() call, so the
+    destination scan, hash index and unique names are shared by the batch.
+
+    Args:
+        app: FastAPI application giving access to settings and graph
+            maintenance.
+        filepaths: Files to process.
+        destination: Target directory.
+        options: Setting overrides (sort_by_type, deduplicate, global_dedup).
+        directory: Directory whose files are discovered and processed in
+            addition to filepaths.
+        progress_callback: Receives (current, total, filename, error).
+
+    Returns:
+        Result of EnhancedExtractionOrchestrator.process_files() with
+        "files_found", the number of files of the batch.
+    """
+    from folder_extractor.config.settings import Settings
+
+    # Clone app settings to avoid mutating global state
+    batch_settings = Settings()
+    batch_settings.from_dict(app.state.settings.to_dict())
+    for key, value in options.items():
+        batch_settings.set(key, value)
+
+    state_manager = StateManager()
+    extractor = EnhancedFileExtractor(
+        settings=batch_settings,
+        state_manager=state_manager,
+        move_callback=_move_callback(app),
+    )
+    orchestrator = EnhancedExtractionOrchestrator(
+        extractor, state_manager=state_manager
+    )
+
+    files = list(filepaths)
+    if directory is not None:
+        try:
+            extractor.validate_security(directory)
+            files.extend(Path(f) for f in extractor.discover_files(directory))
+        except SecurityError as e:
+            return {"status": "security_error", "message": str(e), "error": True}
+        if not files:
+            return {
+                "status": "success",
+                "files_found": 0,
+                "moved": 0,
+                "duplicates": 0,
+                "errors": 0,
+                "missing": [],
+            }
+
+    result = orchestrator.process_files(files, destination, progress_callback)
+    result["files_found"] = len(files)
+    return result
+
+
+def _task_response(job: Job) -> TaskStatusResponse:
+    """Convert a job to its API representation."""
+    return TaskStatusResponse(
+        task_id=job.task_id,
+        status=job.status,
+        filepath=str(job.filepath) if job.filepath is not None else None,
+        file_count=len(job.filepaths),
+        directory=str(job.directory) if job.directory is not None else None,
+        destination=str(job.destination),
+        progress=job.progress,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result=job.result,
+        error=job.error,
+    )
+
+
 @router.post("/process", response_model=ProcessResponse, tags=["Processing"])
 async def process_file(
     request: ProcessRequest,
     http_request: Request,
-    background_tasks: BackgroundTasks,
+    job_manager: JobManager = Depends(get_job_manager_from_app_state),
 ) -> ProcessResponse:
     """
-    Process a single file in the background.
+    Queue a single file for processing.
 
-    Takes a file path and starts processing with the EnhancedExtractionOrchestrator.
-    Processing runs asynchronously in the background, so the response is
-    returned immediately.
+    The file is processed by the worker pool of the JobManager; files
+    queued for the same destination with the same options are processed
+    together. The response is returned immediately; the outcome is
+    available via GET /tasks/{task_id}.
 
     Args:
         request: ProcessRequest with filepath and optional settings.
         http_request: FastAPI request for accessing app state.
-        background_tasks: FastAPI BackgroundTasks for async processing.
+        job_manager: JobManager from app state (injected).
 
     Returns:
         ProcessResponse with task ID and initial status.
@@ -123,6 +285,8 @@ async def process_file(
     Raises:
         HTTPException 404: File not found.
         HTTPException 422: Invalid request data.
+        HTTPException 429: Job queue is full (retry after Retry-After seconds).
+        HTTPException 503: Settings or JobManager not available.
 
     Example Request:
         POST /api/v1/process
@@ -133,8 +297,8 @@ async def process_file(
     Example Response:
         {
             "task_id": "550e8400-e29b-41d4-a716-446655440000",
-            "status": "processing",
-            "message": "Verarbeitung gestartet für: invoice.pdf"
+            "status": "queued",
+            "message": "Verarbeitung eingeplant für: invoice.pdf"
         }
     """
     file_path = Path(request.filepath)
@@ -146,13 +310,10 @@ async def process_file(
             detail=f"Datei nicht gefunden: {request.filepath}",
         )
 
-    # Generate task ID for tracking
-    task_id = str(uuid.uuid4())
-
     # Determine destination (from request or file's directory as fallback)
     destination = Path(request.destination) if request.destination else file_path.parent
 
-    # Get Settings from app state
+    # Batches are processed with the app settings
     if (
         not hasattr(http_request.app.state, "settings")
         or http_request.app.state.settings is None
@@ -161,60 +322,244 @@ async def process_file(
             status_code=503,
             detail="Settings nicht verfügbar",
         )
-    app_settings = http_request.app.state.settings
 
-    # Clone app settings to avoid mutating global state
-    # Create a new Settings instance configured per-request
-    from folder_extractor.config.settings import Settings
-
-    request_settings = Settings()
-    request_settings.from_dict(app_settings.to_dict())
+    try:
+        job = job_manager.submit(
+            file_path,
+            destination,
+            {
+                "sort_by_type": request.sort_by_type,
+                "deduplicate": request.deduplicate,
+                "global_dedup": request.global_dedup,
+            },
+        )
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"{e}, bitte später erneut versuchen",
+            headers={"Retry-After": str(API_JOB_RETRY_AFTER)},
+        ) from e
 
-    # Apply request-specific flags from ProcessRequest payload
-    request_settings.set("sort_by_type", request.sort_by_type)
-    request_settings.set("deduplicate", request.deduplicate)
-    request_settings.set("global_dedup", request.global_dedup)
+    logger.info(f"Processing queued for: {file_path.name}, Task ID: {job.task_id}")
 
-    # Create orchestrator with dependencies from app state
-    state_manager = StateManager()
-    extractor = EnhancedFileExtractor(
-        settings=request_settings, state_manager=state_manager
-    )
-    orchestrator = EnhancedExtractionOrchestrator(
-        extractor, state_manager=state_manager
+    return ProcessResponse(
+        task_id=job.task_id,
+        status=job.status,
+        message=f"Verarbeitung eingeplant für: {file_path.name}",
     )
 
-    # Define background processing function
-    def process_in_background() -> None:
-        try:
-            result = orchestrator.process_single_file(
-                filepath=file_path,
-                destination=destination,
-                progress_callback=None,  # WebSocket integration in future phase
-            )
-            logger.info(
-                f"File processed: {file_path.name}, "
-                f"Status: {result.get('status', 'unknown')}, "
-                f"Task ID: {task_id}"
-            )
-        except Exception as e:
-            logger.error(
-                f"Background processing failed for {file_path.name}: {e}",
-                exc_info=True,
-            )
 
-    # Add task to background queue
-    background_tasks.add_task(process_in_background)
+@router.post("/process/batch", response_model=ProcessResponse, tags=["Processing"])
+async def process_files_batch(
+    request: BatchProcessRequest,
+    http_request: Request,
+    job_manager: JobManager = Depends(get_job_manager_from_app_state),
+) -> ProcessResponse:
+    """
+    Queue many files, or all files of a directory, as one task.
+
+    The task runs one discovery pass (for a directory) and one
+    extract_files() call, so all files share one destination scan, hash
+    index and set of unique names. Progress is available via
+    GET /tasks/{task_id} and GET /tasks/{task_id}/stream.
+
+    Args:
+        request: BatchProcessRequest with filepaths or directory.
+        http_request: FastAPI request for accessing app state.
+        job_manager: JobManager from app state (injected).
+
+    Returns:
+        ProcessResponse with task ID and initial status.
+
+    Raises:
+        HTTPException 400: Neither or both of filepaths and directory given,
+            or filepaths without destination.
+        HTTPException 404: Directory not found.
+        HTTPException 422: Invalid request data.
+        HTTPException 429: Job queue is full (retry after Retry-After seconds).
+        HTTPException 503: Settings or JobManager not available.
+
+    Example Request:
+        POST /api/v1/process/batch
+        {
+            "directory": "/Users/user/Downloads",
+            "destination": "/Users/user/Dokumente",
+            "deduplicate": true
+        }
 
-    logger.info(f"Processing started for: {file_path.name}, Task ID: {task_id}")
+    Example Response:
+        {
+            "task_id": "550e8400-e29b-41d4-a716-446655440000",
+            "status": "queued",
+            "message": "Verarbeitung eingeplant für: Downloads"
+        }
+    """
+    if (request.filepaths is None) == (request.directory is None):
+        raise HTTPException(
+            status_code=400,
+            detail="Entweder filepaths oder directory angeben",
+        )
+
+    directory = Path(request.directory) if request.directory else None
+    if directory is not None and not directory.is_dir():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Ordner nicht gefunden: {request.directory}",
+        )
+    if request.destination:
+        destination = Path(request.destination)
+    elif directory is not None:
+        destination = directory
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Zielordner fehlt (destination)",
+        )
+
+    # Batches are processed with the app settings
+    if (
+        not hasattr(http_request.app.state, "settings")
+        or http_request.app.state.settings is None
+    ):
+        raise HTTPException(
+            status_code=503,
+            detail="Settings nicht verfügbar",
+        )
+
+    try:
+        job = job_manager.submit_bulk(
+            destination,
+            {
+                "sort_by_type": request.sort_by_type,
+                "deduplicate": request.deduplicate,
+                "global_dedup": request.global_dedup,
+            },
+            filepaths=[Path(f) for f in request.filepaths or []],
+            directory=directory,
+        )
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"{e}, bitte später erneut versuchen",
+            headers={"Retry-After": str(API_JOB_RETRY_AFTER)},
+        ) from e
+
+    label = directory.name if directory is not None else f"{len(job.filepaths)} Dateien"
+    logger.info(f"Bulk processing queued for: {label}, Task ID: {job.task_id}")
 
     return ProcessResponse(
-        task_id=task_id,
-        status="processing",
-        message=f"Verarbeitung gestartet für: {file_path.name}",
+        task_id=job.task_id,
+        status=job.status,
+        message=f"Verarbeitung eingeplant für: {label}",
     )
 
 
+@router.get("/tasks/{task_id}", response_model=TaskStatusResponse, tags=["Processing"])
+async def get_task(
+    task_id: str = PathParam(..., description="Task ID from POST /process"),
+    job_manager: JobManager = Depends(get_job_manager_from_app_state),
+) -> TaskStatusResponse:
+    """
+    Return the status and result of a processing task.
+
+    Finished tasks are remembered for the last API_JOB_HISTORY_SIZE tasks.
+
+    Args:
+        task_id: Task ID returned by POST /process.
+        job_manager: JobManager from app state (injected).
+
+    Returns:
+        TaskStatusResponse with status, timestamps, result or error.
+
+    Raises:
+        HTTPException 404: Unknown or forgotten task.
+    """
+    job = job_manager.get(task_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Auftrag nicht gefunden: {task_id}",
+        )
+    return _task_response(job)
+
+
+@router.get("/tasks/{task_id}/stream", tags=["Processing"])
+async def stream_task(
+    task_id: str = PathParam(..., description="Task ID from POST /process"),
+    job_manager: JobManager = Depends(get_job_manager_from_app_state),
+) -> StreamingResponse:
+    """
+    Stream the status and progress of a task as newline-delimited JSON.
+
+    A line is written whenever the status or progress changes; the stream
+    ends with the finished task. Every line is a TaskStatusResponse.
+
+    Raises:
+        HTTPException 404: Unknown or forgotten task.
+
+    Example Response (application/x-ndjson):
+        {"task_id": "...", "status": "processing", "progress": {"current": 1, ...}}
+        {"task_id": "...", "status": "completed", "result": {"moved": 2, ...}}
+    """
+    job = job_manager.get(task_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Auftrag nicht gefunden: {task_id}",
+        )
+
+    async def generate() -> AsyncIterator[str]:
+        current: Optional[Job] = job
+        last: Optional[tuple] = None
+        while current is not None:
+            state = (current.status, tuple(current.progress.items()))
+            if state != last:
+                last = state
+                yield _ndjson_line(_task_response(current).model_dump(mode="json"))
+            if current.status not in ("queued", "processing"):
+                return
+            await asyncio.sleep(API_JOB_STREAM_INTERVAL)
+            current = job_manager.get(task_id)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.delete(
+    "/tasks/{task_id}", response_model=TaskStatusResponse, tags=["Processing"]
+)
+async def cancel_task(
+    task_id: str = PathParam(..., description="Task ID from POST /process"),
+    job_manager: JobManager = Depends(get_job_manager_from_app_state),
+) -> TaskStatusResponse:
+    """
+    Cancel a queued processing task.
+
+    Args:
+        task_id: Task ID returned by POST /process.
+        job_manager: JobManager from app state (injected).
+
+    Returns:
+        TaskStatusResponse with status "cancelled".
+
+    Raises:
+        HTTPException 404: Unknown or forgotten task.
+        HTTPException 409: Task is already processing or finished.
+    """
+    job = job_manager.cancel(task_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Auftrag nicht gefunden: {task_id}",
+        )
+    if job.status != "cancelled":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Auftrag kann nicht mehr abgebrochen werden ({job.status})",
+        )
+    logger.info(f"Processing cancelled, Task ID: {task_id}")
+    return _task_response(job)
+
+
 # =============================================================================
 # Zone Management Endpoints
 # =============================================================================
@@ -583,8 +928,9 @@ async def start_watcher(
         # Create components for watching
         state_manager = StateManager()
         monitor = StabilityMonitor(state_manager)
+        move_callback = _move_callback(http_request.app)
         extractor = EnhancedFileExtractor(
-            settings=settings, state_manager=state_manager
+            settings=settings, state_manager=state_manager, move_callback=move_callback
         )
         orchestrator = EnhancedExtractionOrchestrator(
             extractor, state_manager=state_manager
@@ -601,11 +947,24 @@ async def start_watcher(
         websocket_callback = None
 
         if connection_manager is not None:
-            broadcaster = WebSocketProgressBroadcaster(connection_manager)
+            # Collapse the zone's events into snapshots if the server runs
+            # an aggregator; a restarted watcher starts counting from zero
+            aggregator = getattr(http_request.app.state, "progress_aggregator", None)
+            if aggregator is not None:
+                aggregator.reset(zone_id)
+            broadcaster = WebSocketProgressBroadcaster(
+                connection_manager,
+                bridge=getattr(http_request.app.state, "ws_bridge", None),
+                aggregator=aggregator,
+                zone_id=zone_id,
+            )
             progress_callback = broadcaster.get_progress_callback()
             event_callback = broadcaster.get_event_callback()
             logger.info(f"WebSocket broadcasting enabled for zone {zone_id}")
 
+        # Processing workers of the watch pipeline
+        workers = settings.get("watch_workers", WATCH_PROCESSING_WORKERS)
+
         # Determine which handler to use based on auto_sort setting
         use_smart_handler = zone.get("auto_sort", False)
         smart_sorter = getattr(http_request.app.state, "smart_sorter", None)
@@ -626,6 +985,11 @@ async def start_watcher(
                 progress_callback=progress_callback,
                 on_event_callback=event_callback,
                 websocket_callback=websocket_callback,
+                workers=workers,
+                ai_concurrency=settings.get(
+                    "watch_ai_concurrency", WATCH_AI_CONCURRENCY
+                ),
+                move_callback=move_callback,
             )
         else:
             # Use standard FolderEventHandler
@@ -647,6 +1011,7 @@ async def start_watcher(
                 progress_callback=progress_callback,
                 on_event_callback=event_callback,
                 websocket_callback=websocket_callback,
+                workers=workers,
             )
 
         # Create and configure observer with zone's recursive setting
@@ -741,6 +1106,11 @@ async def stop_watcher(
         observer.stop()
         observer.join(timeout=5.0)
 
+        # Stop pipeline workers of the handler
+        handler = watcher_data.get("handler")
+        if isinstance(getattr(handler, "pipeline", None), WatchPipeline):
+            handler.stop()
+
     except Exception as e:
         logger.error(f"Error stopping watcher for zone {zone_id}: {e}")
         raise HTTPException(
@@ -817,6 +1187,18 @@ async def get_watcher_status(
                 if stats:
                     files_processed = stats.files_processed
 
+            # Queue metrics of the watch pipeline (None when processing inline)
+            pipeline_stats = None
+            handler = watcher_data.get("handler")
+            if isinstance(getattr(handler, "pipeline", None), WatchPipeline):
+                pipeline_stats = handler.get_pipeline_stats()
+
+            # Hit statistics of the local pre-classifier (smart handler only)
+            preclassifier_stats = None
+            sorter = getattr(handler, "smart_sorter", None)
+            if isinstance(getattr(sorter, "preclassifier", None), PreClassifier):
+                preclassifier_stats = handler.get_preclassifier_stats()
+
             watchers_list.append(
                 SingleWatcherStatus(
                     zone_id=watcher_zone_id,
@@ -824,6 +1206,9 @@ async def get_watcher_status(
                     status="running",
                     started_at=watcher_data["started_at"],
                     files_processed=files_processed,
+                    queue_depth=(pipeline_stats or {}).get("queue_depth", 0),
+                    pipeline=pipeline_stats,
+                    preclassifier=preclassifier_stats,
                 )
             )
 
@@ -835,3 +1220,217 @@ async def get_watcher_status(
         active_watchers=watchers_list,
         total_count=len(watchers_list),
     )
+
+
+# =============================================================================
+# Search Endpoints
+# =============================================================================
+
+
+@router.get("/search", response_model=SearchResponse, tags=["Search"])
+async def search_documents(
+    q: str = Query(..., min_length=1, max_length=500, description="Search query"),
+    limit: int = Query(
+        default=SEARCH_DEFAULT_LIMIT,
+        ge=1,
+        le=SEARCH_MAX_LIMIT,
+        description="Maximum number of results",
+    ),
+    ai_fallback: bool = Query(
+        default=False,
+        description="Ask the AI if the local index finds nothing",
+    ),
+    knowledge_graph: KnowledgeGraph = Depends(get_knowledge_graph_from_app_state),
+) -> SearchResponse:
+    """
+    Search documents in the local full-text index.
+
+    The index covers filename, summary, category, sender, year and entity
+    names and answers in milliseconds without network access. With
+    ai_fallback=true, a search without results is translated by the AI
+    into a knowledge graph query.
+
+    Returns:
+        SearchResponse with matching paths and where they came from.
+
+    Raises:
+        HTTPException 400: Empty query.
+        HTTPException 502: AI fallback failed.
+        HTTPException 503: Knowledge graph not available.
+
+    Example Request:
+        GET /api/v1/search?q=Telekom%202024
+
+    Example Response:
+        {
+            "query": "Telekom 2024",
+            "results": ["/Users/user/Dokumente/Finanzen/Telekom/2024/rechnung.pdf"],
+            "total": 1,
+            "source": "index",
+            "took_ms": 1.8
+        }
+    """
+    started = time.perf_counter()
+    try:
+        results = knowledge_graph.search_documents(q, limit)
+    except KnowledgeGraphError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    source = "index"
+    if not results and ai_fallback:
+        try:
+            results = (await knowledge_graph.query_documents(q))[:limit]
+        except KnowledgeGraphError as e:
+            raise HTTPException(
+                status_code=502, detail=f"KI-Suche fehlgeschlagen: {e}"
+            ) from e
+        source = "ai"
+
+    return SearchResponse(
+        query=q,
+        results=results,
+        total=len(results),
+        source=source,
+        took_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
+
+
+# =============================================================================
+# Query Endpoints
+# =============================================================================
+
+
+@router.get("/query", response_model=QueryPageResponse, tags=["Query"])
+async def query_documents_page(
+    q: str = Query(
+        ..., min_length=1, max_length=500, description="Natural language question"
+    ),
+    page_size: int = Query(
+        default=QUERY_PAGE_SIZE,
+        ge=1,
+        le=QUERY_MAX_PAGE_SIZE,
+        description="Maximum number of results per page",
+    ),
+    cursor: Optional[str] = Query(
+        default=None, description="next_cursor of the previous page"
+    ),
+    knowledge_graph: KnowledgeGraph = Depends(get_knowledge_graph_from_app_state),
+) -> QueryPageResponse:
+    """
+    Answer a question from the knowledge graph, one page at a time.
+
+    Results are distinct and sorted by path. Repeat the request with the
+    same question and the returned next_cursor until it is null.
+
+    Returns:
+        QueryPageResponse with the paths of this page.
+
+    Raises:
+        HTTPException 400: Empty question or invalid cursor.
+        HTTPException 502: Translation or query failed.
+        HTTPException 503: Knowledge graph not available.
+
+    Example Request:
+        GET /api/v1/query?q=Rechnungen%20von%20Telekom&page_size=2
+
+    Example Response:
+        {
+            "query": "Rechnungen von Telekom",
+            "results": ["/docs/telekom_01.pdf", "/docs/telekom_02.pdf"],
+            "count": 2,
+            "next_cursor": "eyJxIjoiYjQ1..."
+        }
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Frage darf nicht leer sein")
+    try:
+        page = await knowledge_graph.query_documents_page(q, page_size, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except KnowledgeGraphError as e:
+        raise HTTPException(
+            status_code=502, detail=f"Abfrage fehlgeschlagen: {e}"
+        ) from e
+
+    return QueryPageResponse(
+        query=q,
+        results=page.paths,
+        count=len(page.paths),
+        next_cursor=page.cursor,
+    )
+
+
+def _ndjson_line(data: Dict[str, Any]) -> str:
+    """Serialize one NDJSON record."""
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+@router.get("/query/stream", tags=["Query"])
+async def stream_query_documents(
+    q: str = Query(
+        ..., min_length=1, max_length=500, description="Natural language question"
+    ),
+    page_size: int = Query(
+        default=QUERY_PAGE_SIZE,
+        ge=1,
+        le=QUERY_MAX_PAGE_SIZE,
+        description="Results read from the graph per chunk",
+    ),
+    knowledge_graph: KnowledgeGraph = Depends(get_knowledge_graph_from_app_state),
+) -> StreamingResponse:
+    """
+    Stream all answers to a question as newline-delimited JSON.
+
+    Results are read page by page, so the server never holds more than one
+    page in memory. Every line is one JSON object:
+    - {"path": "..."} for each document, sorted by path
+    - {"done": true, "total": n} as the last line
+    - {"error": "..."} instead, if the query fails after streaming began
+
+    Raises:
+        HTTPException 400: Empty question.
+        HTTPException 502: Translation or first page failed.
+        HTTPException 503: Knowledge graph not available.
+
+    Example Request:
+        GET /api/v1/query/stream?q=Alle%20Dokumente%20aus%202024
+
+    Example Response (application/x-ndjson):
+        {"path": "/docs/a.pdf"}
+        {"path": "/docs/b.pdf"}
+        {"done": true, "total": 2}
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Frage darf nicht leer sein")
+
+    # Translate and read the first page before the response starts, so
+    # errors at this point still get a proper status code
+    pages = knowledge_graph.iter_documents(q, page_size)
+    try:
+        first_page: List[str] = await pages.__anext__()
+    except StopAsyncIteration:
+        first_page = []
+    except KnowledgeGraphError as e:
+        raise HTTPException(
+            status_code=502, detail=f"Abfrage fehlgeschlagen: {e}"
+        ) from e
+
+    async def generate() -> AsyncIterator[str]:
+        total = 0
+        page = first_page
+        try:
+            while page:
+                total += len(page)
+                yield "".join(_ndjson_line({"path": path}) for path in page)
+                page = await pages.__anext__()
+        except StopAsyncIteration:
+            pass
+        except KnowledgeGraphError as e:
+            logger.warning(f"Query stream aborted after {total} results: {e}")
+            yield _ndjson_line({"error": str(e)})
+            return
+        finally:
+            await pages.aclose()
+        yield _ndjson_line({"done": True, "total": total})
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
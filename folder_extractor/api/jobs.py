@@ -0,0 +1,469 @@
+"""
+Bounded job queue and worker pool for file processing requests.
+
+POST /process hands each file to a JobManager instead of starting a
+background task per request. The manager keeps at most max_queue_size
+files queued (beyond that submit() raises JobQueueFullError and the
+endpoint answers 429), processes them on a fixed number of worker threads
+and remembers recent jobs for GET /tasks/{task_id}.
+
+Queued files with the same destination and options are coalesced: a worker
+takes up to batch_size of them and processes them with one call of the
+batch function, i.e. one extract_files() call with one destination scan
+and one hash index instead of one per file.
+
+Bulk jobs (POST /process/batch) cover many files, or a directory that the
+worker discovers, in a single task. They are never coalesced and report
+their progress while running.
+
+Usage:
+    jobs = JobManager(run_batch)  # See BatchRunner
+    job = jobs.submit(Path("a.pdf"), Path("/Ziel"), {"deduplicate": True})
+    bulk = jobs.submit_bulk(Path("/Ziel"), directory=Path("/Eingang"))
+    jobs.get(job.task_id).status  # queued, processing, completed, ...
+    jobs.cancel(job.task_id)  # Only while queued
+    jobs.close()
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import threading
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from folder_extractor.config.constants import (
+    API_JOB_BATCH_SIZE,
+    API_JOB_HISTORY_SIZE,
+    API_JOB_QUEUE_SIZE,
+    API_JOB_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Processes files of one destination: runner(filepaths, destination, options,
+# directory=None, progress_callback=None) -> result of
+# EnhancedExtractionOrchestrator.process_files(). Files discovered in
+# directory are processed in addition to filepaths.
+BatchRunner = Callable[..., Dict[str, Any]]
+
+# Jobs with the same key are processed together
+_GroupKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue has no room for another file."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class Job:
+    """State of one queued file or bulk task.
+
+    Attributes:
+        task_id: Unique identifier returned to the client.
+        destination: Target directory.
+        filepath: File to process (None for bulk jobs).
+        filepaths: Files of a bulk job.
+        directory: Directory whose files a bulk job discovers and processes.
+        options: Settings applied to the batch (e.g. "deduplicate").
+        status: queued, processing, completed, failed or cancelled.
+        progress: "current" and "total" files and the latest "filename" of
+            the running batch.
+        created_at: When the job was submitted.
+        started_at: When its batch started.
+        finished_at: When it completed, failed or was cancelled.
+        result: Outcome of a completed job. For a file: "new_path" (None if
+            the file was skipped or a duplicate) and "batch" counts; for a
+            bulk job: the counts and the "missing" files.
+        error: Reason a job failed.
+    """
+
+    task_id: str
+    destination: Path
+    filepath: Optional[Path] = None
+    filepaths: List[Path] = field(default_factory=list)
+    directory: Optional[Path] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+    status: str = "queued"
+    progress: Dict[str, Any] = field(
+        default_factory=lambda: {"current": 0, "total": 0, "filename": ""}
+    )
+    created_at: datetime = field(default_factory=_now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def _group_key(job: Job) -> _GroupKey:
+    """Return the key of the jobs a job may be batched with."""
+    if job.filepath is None:
+        return (job.task_id, ())  # Bulk jobs run alone
+    return (str(job.destination), tuple(sorted(job.options.items())))
+
+
+def _copy(job: Job) -> Job:
+    """Return a copy of a job that later updates do not change."""
+    return dataclasses.replace(job, progress=dict(job.progress))
+
+
+class JobManager:
+    """
+    Queue processing jobs and run them on a fixed pool of worker threads.
+
+    Groups of jobs (same destination and options) are served round-robin,
+    so a large burst for one destination does not starve the others. Only
+    one batch per destination runs at a time: concurrent extractions into
+    the same folder would race on unique names and the hash index.
+
+    Thread-safe: all methods may be called from any thread.
+
+    Attributes:
+        workers: Number of worker threads.
+        max_queue_size: Jobs queued before submit() raises.
+        batch_size: Maximum number of jobs per batch call.
+    """
+
+    def __init__(
+        self,
+        runner: BatchRunner,
+        workers: int = API_JOB_WORKERS,
+        max_queue_size: int = API_JOB_QUEUE_SIZE,
+        batch_size: int = API_JOB_BATCH_SIZE,
+        history_size: int = API_JOB_HISTORY_SIZE,
+    ) -> None:
+        """
+        Initialize the manager (threads are started on first submit).
+
+        Args:
+            runner: Processes the files of one batch.
+            workers: Concurrent batch calls.
+            max_queue_size: Jobs waiting to be processed at most.
+            batch_size: Jobs of one group processed in one call at most.
+            history_size: Finished jobs remembered for get().
+        """
+        self.workers = max(1, workers)
+        self.max_queue_size = max(1, max_queue_size)
+        self.batch_size = max(1, batch_size)
+        self._runner = runner
+        self._history_size = max(1, history_size)
+
+        self._groups: OrderedDict[_GroupKey, Deque[Job]] = OrderedDict()
+        # Destinations a batch is currently being processed for
+        self._busy_destinations: Set[str] = set()
+        self._jobs: Dict[str, Job] = {}
+        self._finished: Deque[str] = deque()
+        self._queued = 0
+        self._processing = 0
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+        self._condition = threading.Condition()
+
+    def start(self) -> None:
+        """Start the worker threads (no-op if already running)."""
+        with self._condition:
+            if self._threads or self._closed:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work, name=f"api-job-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(
+        self,
+        filepath: Path,
+        destination: Path,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Job:
+        """
+        Queue a file for processing.
+
+        Args:
+            filepath: File to process.
+            destination: Target directory.
+            options: Settings for the file; files are only batched with
+                files that have the same destination and options.
+
+        Returns:
+            Copy of the queued job.
+
+        Raises:
+            JobQueueFullError: If max_queue_size jobs are already queued or
+                the manager was closed.
+        """
+        return self._enqueue(
+            Job(
+                task_id=str(uuid.uuid4()),
+                destination=Path(destination),
+                filepath=Path(filepath),
+                options=dict(options or {}),
+            )
+        )
+
+    def submit_bulk(
+        self,
+        destination: Path,
+        options: Optional[Dict[str, Any]] = None,
+        filepaths: Optional[List[Path]] = None,
+        directory: Optional[Path] = None,
+    ) -> Job:
+        """
+        Queue many files, or the files of a directory, as one task.
+
+        The files are processed with one batch call; a bulk job takes one
+        slot of the queue.
+
+        Args:
+            destination: Target directory.
+            options: Settings for the files.
+            filepaths: Files to process.
+            directory: Directory whose files are discovered and processed.
+
+        Returns:
+            Copy of the queued job.
+
+        Raises:
+            JobQueueFullError: If max_queue_size jobs are already queued or
+                the manager was closed.
+        """
+        return self._enqueue(
+            Job(
+                task_id=str(uuid.uuid4()),
+                destination=Path(destination),
+                filepaths=[Path(f) for f in filepaths or []],
+                directory=Path(directory) if directory is not None else None,
+                options=dict(options or {}),
+            )
+        )
+
+    def _enqueue(self, job: Job) -> Job:
+        """Add a new job to its group and wake a worker."""
+        self.start()
+        with self._condition:
+            if self._closed:
+                raise JobQueueFullError("Auftragsverwaltung wird beendet")
+            if self._queued >= self.max_queue_size:
+                raise JobQueueFullError(
+                    f"Warteschlange voll ({self.max_queue_size} Dateien)"
+                )
+            self._groups.setdefault(_group_key(job), deque()).append(job)
+            self._jobs[job.task_id] = job
+            self._queued += 1
+            self._condition.notify()
+            return _copy(job)
+
+    def get(self, task_id: str) -> Optional[Job]:
+        """Return a copy of a job, or None if it is unknown or forgotten."""
+        with self._condition:
+            job = self._jobs.get(task_id)
+            return _copy(job) if job is not None else None
+
+    def cancel(self, task_id: str) -> Optional[Job]:
+        """
+        Cancel a queued job.
+
+        Jobs that are processing or finished keep their status.
+
+        Args:
+            task_id: Job to cancel.
+
+        Returns:
+            Copy of the job afterwards (status "cancelled" on success), or
+            None if the job is unknown.
+        """
+        with self._condition:
+            job = self._jobs.get(task_id)
+            if job is None:
+                return None
+            if job.status == "queued":
+                key = _group_key(job)
+                group = self._groups.get(key)
+                if group is not None:
+                    group.remove(job)
+                    if not group:
+                        del self._groups[key]
+                self._queued -= 1
+                self._finish(job, "cancelled")
+            return _copy(job)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of queued and processing jobs."""
+        with self._condition:
+            return {
+                "queued": self._queued,
+                "processing": self._processing,
+                "workers": self.workers,
+            }
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers; jobs still queued are cancelled.
+
+        Batches being processed are finished first.
+
+        Args:
+            timeout: Maximum seconds to wait for each worker thread.
+        """
+        with self._condition:
+            self._closed = True
+            for group in self._groups.values():
+                for job in group:
+                    self._finish(job, "cancelled")
+            self._groups.clear()
+            self._queued = 0
+            self._condition.notify_all()
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join(timeout)
+
+    def _work(self) -> None:
+        """Worker loop: take a batch of one group and process it."""
+        while True:
+            with self._condition:
+                key = self._next_group()
+                while not self._closed and key is None:
+                    self._condition.wait()
+                    key = self._next_group()
+                if self._closed:
+                    return
+                batch = self._take_batch(key)
+            self._run(batch)
+
+    def _next_group(self) -> Optional[_GroupKey]:
+        """Return the oldest group whose destination is idle (lock held)."""
+        for key, group in self._groups.items():
+            if str(group[0].destination) not in self._busy_destinations:
+                return key
+        return None
+
+    def _take_batch(self, key: _GroupKey) -> List[Job]:
+        """Remove up to batch_size jobs of a group (lock held)."""
+        group = self._groups[key]
+        batch = [group.popleft() for _ in range(min(self.batch_size, len(group)))]
+        if group:
+            # Serve the other groups before the rest of this one
+            self._groups.move_to_end(key)
+        else:
+            del self._groups[key]
+        started = _now()
+        for job in batch:
+            job.status = "processing"
+            job.started_at = started
+        self._queued -= len(batch)
+        self._processing += len(batch)
+        self._busy_destinations.add(str(batch[0].destination))
+        return batch
+
+    def _release_destination(self, job: Job) -> None:
+        """Let other batches for a job's destination run (lock held)."""
+        self._busy_destinations.discard(str(job.destination))
+        self._condition.notify_all()
+
+    def _run(self, batch: List[Job]) -> None:
+        """Process a batch and record the outcome of each job."""
+        first = batch[0]
+        filepaths = [job.filepath for job in batch if job.filepath is not None]
+
+        def progress(
+            current: int, total: int, filename: str, error: Optional[str] = None
+        ) -> None:
+            with self._condition:
+                for job in batch:
+                    job.progress = {
+                        "current": current,
+                        "total": total,
+                        "filename": filename,
+                    }
+
+        try:
+            result = self._runner(
+                filepaths + first.filepaths,
+                first.destination,
+                dict(first.options),
+                directory=first.directory,
+                progress_callback=progress,
+            )
+        except Exception as e:
+            logger.error(
+                f"Processing {len(batch)} jobs failed: {e}",
+                exc_info=True,
+            )
+            result = {"status": "error", "message": f"Fehler: {e}", "error": True}
+
+        if first.filepath is None:
+            self._finish_bulk(first, result)
+            return
+
+        missing = {str(path) for path in result.get("missing") or []}
+        new_paths = {
+            str(entry["original_pfad"]): entry.get("neuer_pfad")
+            for entry in result.get("history") or []
+            if isinstance(entry, dict) and entry.get("original_pfad")
+        }
+        summary = {
+            "files": len(batch),
+            "moved": result.get("moved", 0),
+            "duplicates": result.get("duplicates", 0),
+            "errors": result.get("errors", 0),
+        }
+        with self._condition:
+            self._processing -= len(batch)
+            self._release_destination(first)
+            for job in batch:
+                path = str(job.filepath)
+                if path in missing:
+                    job.error = f"Datei existiert nicht: {path}"
+                    self._finish(job, "failed")
+                elif result.get("status") != "success":
+                    job.error = str(
+                        result.get("message", "Verarbeitung fehlgeschlagen")
+                    )
+                    self._finish(job, "failed")
+                else:
+                    job.result = {"new_path": new_paths.get(path), "batch": summary}
+                    self._finish(job, "completed")
+        logger.info(
+            f"Processed batch of {len(batch)} files for {first.destination}: "
+            f"{result.get('status', 'unknown')}"
+        )
+
+    def _finish_bulk(self, job: Job, result: Dict[str, Any]) -> None:
+        """Record the outcome of a bulk job."""
+        with self._condition:
+            self._processing -= 1
+            self._release_destination(job)
+            if result.get("status") != "success":
+                job.error = str(result.get("message", "Verarbeitung fehlgeschlagen"))
+                self._finish(job, "failed")
+            else:
+                job.result = {
+                    "files": result.get("files_found", len(job.filepaths)),
+                    "moved": result.get("moved", 0),
+                    "duplicates": result.get("duplicates", 0),
+                    "errors": result.get("errors", 0),
+                    "missing": [str(path) for path in result.get("missing") or []],
+                }
+                self._finish(job, "completed")
+        logger.info(
+            f"Processed bulk task {job.task_id} for {job.destination}: "
+            f"{result.get('status', 'unknown')}"
+        )
+
+    def _finish(self, job: Job, status: str) -> None:
+        """Set a final status and forget the oldest finished jobs (lock held)."""
+        job.status = status
+        job.finished_at = _now()
+        self._finished.append(job.task_id)
+        while len(self._finished) > self._history_size:
+            self._jobs.pop(self._finished.popleft(), None)
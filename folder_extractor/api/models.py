@@ -12,6 +12,8 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from folder_extractor.config.constants import API_JOB_MAX_BATCH_FILES
+
 # =============================================================================
 # Request Models
 # =============================================================================
@@ -39,6 +41,39 @@ class ProcessRequest(BaseModel):
     global_dedup: bool = Field(default=False, description="Global deduplication check")
 
 
+class BatchProcessRequest(BaseModel):
+    """Request model for the bulk processing endpoint.
+
+    Exactly one of filepaths and directory must be given.
+
+    Attributes:
+        filepaths: Absolute paths of the files to process.
+        directory: Directory whose files are discovered and processed.
+        destination: Target directory (optional if directory is given,
+            defaults to directory).
+        sort_by_type: Whether to sort files by type into subfolders.
+        deduplicate: Enable content-based deduplication (same name + content).
+        global_dedup: Check against entire target directory for duplicates.
+    """
+
+    filepaths: Optional[List[str]] = Field(
+        default=None,
+        min_length=1,
+        max_length=API_JOB_MAX_BATCH_FILES,
+        description="Absolute paths to files",
+    )
+    directory: Optional[str] = Field(
+        default=None, min_length=1, description="Directory to process"
+    )
+    destination: Optional[str] = Field(
+        default=None,
+        description="Target directory (defaults to directory)",
+    )
+    sort_by_type: bool = Field(default=False, description="Sort by file type")
+    deduplicate: bool = Field(default=False, description="Content-based deduplication")
+    global_dedup: bool = Field(default=False, description="Global deduplication check")
+
+
 class ZoneConfig(BaseModel):
     """Configuration for a dropzone (request model).
 
@@ -152,7 +187,8 @@ class ProcessResponse(BaseModel):
 
     Attributes:
         task_id: Unique identifier for the background task.
-        status: Current status (started, processing, completed, failed).
+        status: Current status (queued, processing, completed, failed,
+            cancelled).
         message: Human-readable status message.
     """
 
@@ -161,6 +197,47 @@ class ProcessResponse(BaseModel):
     message: str = Field(..., description="Status message")
 
 
+class TaskStatusResponse(BaseModel):
+    """Status of a processing task (GET /tasks/{task_id}).
+
+    Attributes:
+        task_id: Unique identifier of the task.
+        status: queued, processing, completed, failed or cancelled.
+        filepath: File being processed (None for bulk tasks).
+        file_count: Number of files given to a bulk task.
+        directory: Directory processed by a bulk task.
+        destination: Target directory.
+        progress: "current" and "total" files and the latest "filename".
+        created_at: When the task was queued.
+        started_at: When processing started.
+        finished_at: When the task completed, failed or was cancelled.
+        result: Outcome of a completed task ("new_path" and "batch" counts,
+            or the counts and "missing" files of a bulk task).
+        error: Reason a task failed.
+    """
+
+    task_id: str = Field(..., description="Task ID")
+    status: str = Field(..., description="Task status")
+    filepath: Optional[str] = Field(default=None, description="File path")
+    file_count: int = Field(default=0, description="Files of a bulk task")
+    directory: Optional[str] = Field(
+        default=None, description="Directory of a bulk task"
+    )
+    destination: str = Field(..., description="Target directory")
+    progress: Dict[str, Any] = Field(
+        default_factory=dict, description="Progress of the running task"
+    )
+    created_at: datetime = Field(..., description="Queued at")
+    started_at: Optional[datetime] = Field(
+        default=None, description="Processing started at"
+    )
+    finished_at: Optional[datetime] = Field(default=None, description="Finished at")
+    result: Optional[Dict[str, Any]] = Field(
+        default=None, description="Outcome of a completed task"
+    )
+    error: Optional[str] = Field(default=None, description="Error message")
+
+
 class ZoneResponse(BaseModel):
     """Response containing full zone information.
 
@@ -222,6 +299,9 @@ class SingleWatcherStatus(BaseModel):
         status: Current status ("running", "stopping").
         started_at: Timestamp when watcher was started.
         files_processed: Number of files processed since start.
+        queue_depth: Files detected but not yet being processed.
+        pipeline: Queue depths and counters of the watch pipeline.
+        preclassifier: Hit statistics of the local pre-classifier.
     """
 
     zone_id: str = Field(..., description="Zone UUID")
@@ -229,6 +309,13 @@ class SingleWatcherStatus(BaseModel):
     status: str = Field(..., description="Watcher status: running, stopping")
     started_at: datetime = Field(..., description="Start timestamp")
     files_processed: int = Field(default=0, description="Files processed count")
+    queue_depth: int = Field(default=0, description="Files waiting in the queue")
+    pipeline: Optional[Dict[str, int]] = Field(
+        default=None, description="Watch pipeline queue metrics"
+    )
+    preclassifier: Optional[Dict[str, float]] = Field(
+        default=None, description="Pre-classifier hit rate and AI calls saved"
+    )
 
 
 class WatcherStatusResponse(BaseModel):
@@ -263,6 +350,43 @@ class WatcherListResponse(BaseModel):
     total_count: int = Field(..., description="Total active watcher count")
 
 
+class SearchResponse(BaseModel):
+    """Response for document search.
+
+    Attributes:
+        query: The search query as received.
+        results: Matching document paths, best match first.
+        total: Number of results.
+        source: "index" for the local full-text index, "ai" for the
+            AI translation to a graph query.
+        took_ms: Time spent on the search in milliseconds.
+    """
+
+    query: str = Field(..., description="Search query")
+    results: List[str] = Field(..., description="Matching document paths")
+    total: int = Field(..., description="Number of results")
+    source: str = Field(..., description="Result source: index or ai")
+    took_ms: float = Field(..., description="Search duration in milliseconds")
+
+
+class QueryPageResponse(BaseModel):
+    """One page of a knowledge graph query.
+
+    Attributes:
+        query: The question as received.
+        results: Distinct document paths on this page, sorted by path.
+        count: Number of results on this page.
+        next_cursor: Token for the next page, or None on the last page.
+    """
+
+    query: str = Field(..., description="Natural language question")
+    results: List[str] = Field(..., description="Document paths on this page")
+    count: int = Field(..., description="Number of results on this page")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor of the next page (None on the last page)"
+    )
+
+
 class HealthResponse(BaseModel):
     """Response for health check endpoint.
 
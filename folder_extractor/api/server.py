@@ -11,6 +11,7 @@ Usage:
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -19,22 +20,37 @@ from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from folder_extractor.api.endpoints import process_batch, watcher_queue_depths
 from folder_extractor.api.endpoints import router as api_router
+from folder_extractor.api.jobs import JobManager
 from folder_extractor.api.models import HealthResponse
 from folder_extractor.api.websocket import (
     ConnectionManager,
+    ProgressAggregator,
+    WebSocketBridge,
     WebSocketLogHandler,
     WebSocketMessage,
 )
-from folder_extractor.config.constants import VERSION
+from folder_extractor.config.constants import (
+    QUERY_MAX_PAGE_SIZE,
+    QUERY_PAGE_SIZE,
+    VERSION,
+    WS_PROGRESS_SNAPSHOT_RATE,
+)
 from folder_extractor.core.ai_async import AIClientError, AsyncGeminiClient
+from folder_extractor.core.ai_cache import AIResultCache
 from folder_extractor.core.memory.graph import (
     KnowledgeGraph,
+    KnowledgeGraphError,
     get_knowledge_graph,
     reset_knowledge_graph,
 )
+from folder_extractor.core.memory.maintenance import GraphMaintenance
+from folder_extractor.core.memory.writer import KnowledgeGraphWriter
+from folder_extractor.core.metrics import metrics
+from folder_extractor.core.preclassifier import PreClassifier
 from folder_extractor.core.security import APIKeyError
 from folder_extractor.core.smart_sorter import SmartSorter
 
@@ -47,6 +63,8 @@ load_dotenv()
 # API Configuration
 API_HOST = os.getenv("API_HOST", "127.0.0.1")
 API_PORT = int(os.getenv("API_PORT", "23456"))
+# Record hot-path metrics for GET /metrics (off: no recording, endpoint 404)
+API_METRICS = os.getenv("API_METRICS", "true").lower() == "true"
 
 # Configure logging
 logging.basicConfig(
@@ -90,11 +108,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     app.state.connection_manager = connection_manager
     logger.info("WebSocket ConnectionManager initialized")
 
+    # Bridge for progress, events and logs from watcher and worker threads
+    ws_bridge = WebSocketBridge(connection_manager)
+    ws_bridge.start()
+    app.state.ws_bridge = ws_bridge
+
     # Initialize WebSocketLogHandler for log streaming
     ws_log_handler = WebSocketLogHandler(
         connection_manager,
         logger_prefix="folder_extractor",
         level=logging.INFO,
+        bridge=ws_bridge,
     )
     ws_log_handler.setFormatter(
         logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -128,11 +152,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     app.state.settings = api_settings
     logger.info("Settings initialized")
 
+    # Collapse watcher progress and status events into per-zone snapshots
+    progress_aggregator = ProgressAggregator(
+        connection_manager,
+        rate=api_settings.get("progress_snapshot_rate", WS_PROGRESS_SNAPSHOT_RATE),
+    )
+    progress_aggregator.start()
+    app.state.progress_aggregator = progress_aggregator
+
     # Initialize SmartSorter (depends on AI client)
     if app.state.ai_client is not None:
         try:
             sorter = SmartSorter(
-                client=app.state.ai_client, settings=app.state.settings
+                client=app.state.ai_client,
+                settings=app.state.settings,
+                cache=AIResultCache(),
+                preclassifier=(
+                    PreClassifier(settings=app.state.settings)
+                    if app.state.settings.get("preclassifier_enabled", True)
+                    else None
+                ),
+                graph_writer=KnowledgeGraphWriter(),
             )
             app.state.smart_sorter = sorter
             logger.info("SmartSorter initialized")
@@ -143,6 +183,36 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         app.state.smart_sorter = None
         logger.info("SmartSorter skipped (AI client unavailable)")
 
+    # Start knowledge graph maintenance (re-keys moved documents, sweeps
+    # stale ones); flushes the SmartSorter's queued writes before re-keying
+    sorter = app.state.smart_sorter
+    maintenance = GraphMaintenance(
+        knowledge_graph=kg,
+        graph_writer=(
+            sorter.graph_writer
+            if isinstance(getattr(sorter, "graph_writer", None), KnowledgeGraphWriter)
+            else None
+        ),
+    )
+    maintenance.start()
+    app.state.graph_maintenance = maintenance
+    logger.info("Knowledge graph maintenance started")
+
+    # Worker pool for POST /process; files of one destination are batched
+    app.state.job_manager = JobManager(functools.partial(process_batch, app))
+    logger.info("Job queue initialized")
+
+    # Latency histograms of the hot paths and watcher queue depths
+    if API_METRICS:
+        metrics.enable()
+        metrics.register_gauge(
+            "watcher_queue_depth",
+            "Files waiting in the pipeline of each active watcher.",
+            "zone",
+            watcher_queue_depths,
+        )
+        logger.info("Metrics enabled")
+
     logger.info(f"API server ready on port {API_PORT}")
 
     yield
@@ -174,6 +244,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if active_watchers:
         logger.info("All filesystem watchers stopped")
 
+    # Finish running processing jobs; queued ones are cancelled
+    job_manager = getattr(app.state, "job_manager", None)
+    if isinstance(job_manager, JobManager):
+        job_manager.close(timeout=10.0)
+    app.state.job_manager = None
+
+    # Apply file moves still queued for re-keying
+    maintenance = getattr(app.state, "graph_maintenance", None)
+    if isinstance(maintenance, GraphMaintenance):
+        maintenance.close(timeout=10.0)
+    app.state.graph_maintenance = None
+
+    # Write knowledge graph updates still queued by the SmartSorter
+    sorter = getattr(app.state, "smart_sorter", None)
+    if isinstance(getattr(sorter, "graph_writer", None), KnowledgeGraphWriter):
+        sorter.graph_writer.close(timeout=10.0)
+
     # Cleanup KnowledgeGraph - reset singleton so next startup creates fresh instance
     reset_knowledge_graph()
     app.state.knowledge_graph = None
@@ -183,6 +270,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if hasattr(app.state, "ai_client") and app.state.ai_client is not None:
         logger.info("AI client resources released")
 
+    # Send the final progress snapshots
+    progress_aggregator = getattr(app.state, "progress_aggregator", None)
+    if isinstance(progress_aggregator, ProgressAggregator):
+        await progress_aggregator.close()
+
+    # Deliver messages still waiting in the bridge
+    ws_bridge = getattr(app.state, "ws_bridge", None)
+    if isinstance(ws_bridge, WebSocketBridge):
+        await ws_bridge.close()
+
     # Cleanup WebSocket connections
     if hasattr(app.state, "connection_manager") and app.state.connection_manager:
         await app.state.connection_manager.close_all()
@@ -193,6 +290,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logging.getLogger("folder_extractor").removeHandler(app.state.ws_log_handler)
         logger.info("WebSocket log handler removed")
 
+    # Stop recording metrics
+    metrics.unregister_gauge("watcher_queue_depth")
+    metrics.disable()
+
     logger.info("Shutdown complete")
 
 
@@ -367,6 +468,28 @@ async def health_check() -> HealthResponse | JSONResponse:
     return response_data
 
 
+@app.get("/metrics", response_class=PlainTextResponse, tags=["System"])
+async def get_metrics() -> PlainTextResponse:
+    """
+    Metrics in the Prometheus text exposition format.
+
+    Exposes call counts, failures and latency histograms of file hashing,
+    file moves, file readiness checks, AI analysis, knowledge graph ingests
+    and WebSocket broadcasts, plus the queue depth of each active watcher.
+
+    Returns:
+        Plain text metrics for a Prometheus scraper.
+
+    Raises:
+        HTTPException 404: Metrics are disabled (API_METRICS=false).
+    """
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metriken deaktiviert")
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # =============================================================================
 # WebSocket Endpoint
 # =============================================================================
@@ -385,13 +508,20 @@ async def websocket_chat_endpoint(websocket: WebSocket) -> None:
     Message types (incoming):
     - chat: {"type": "chat", "data": {"message": "..."}}
     - command: {"type": "command", "data": {"action": "abort|pause|resume"}}
+    - query: {"type": "query", "data": {"query": "...", "page_size": 500}}
+    - subscribe: {"type": "subscribe", "data": {"zones": [...], "types": [...],
+      "log_level": "WARNING"}} - Only receive matching broadcasts; every
+      field is optional, an empty filter receives everything again
     - ping: {"type": "ping"} - Keepalive
 
     Message types (outgoing):
     - chat: AI responses
+    - query_results: Chunks of knowledge graph query results
     - status: Event updates (incoming, waiting, analyzing, sorted, error)
-    - progress: File processing progress
+    - progress: File processing progress; for watched zones a periodic
+      snapshot with counts by status, rate, ETA and recent files
     - log: Application logs
+    - subscribed: Confirms the filter of a subscribe message
     """
     manager: ConnectionManager = app.state.connection_manager
 
@@ -421,6 +551,14 @@ async def websocket_chat_endpoint(websocket: WebSocket) -> None:
                 action = msg_data.get("action", "")
                 await _handle_command(websocket, manager, action, msg_data)
 
+            elif msg_type == "query":
+                # Knowledge graph question - results are sent in chunks
+                await _handle_query(websocket, manager, msg_data)
+
+            elif msg_type == "subscribe":
+                # Filter broadcasts by zone, message type and log level
+                await _handle_subscribe(websocket, manager, msg_data)
+
             else:
                 # Unknown message type - log but don't crash
                 logger.warning(f"Unknown WebSocket message type: {msg_type}")
@@ -505,6 +643,112 @@ async def _handle_chat_message(
         await manager.send_personal_message(error_msg.to_dict(), websocket)
 
 
+async def _handle_query(
+    websocket: WebSocket,
+    manager: ConnectionManager,
+    data: dict[str, Any],
+) -> None:
+    """Answer a knowledge graph question in chunks.
+
+    Sends one "query_results" message per page of results and a final one
+    with "done": true and the total, so clients can render large result
+    sets progressively.
+
+    Args:
+        websocket: The client's WebSocket connection.
+        manager: ConnectionManager for sending responses.
+        data: Payload with "query" and an optional "page_size".
+    """
+    query = str(data.get("query", "")).strip()
+    try:
+        page_size = int(data.get("page_size", QUERY_PAGE_SIZE))
+    except (TypeError, ValueError):
+        page_size = QUERY_PAGE_SIZE
+    page_size = min(max(page_size, 1), QUERY_MAX_PAGE_SIZE)
+
+    knowledge_graph = getattr(app.state, "knowledge_graph", None)
+    if knowledge_graph is None:
+        error_msg = WebSocketMessage(
+            type="error",
+            data={
+                "message": "Wissensgraph nicht verfügbar.",
+                "code": "KG_UNAVAILABLE",
+            },
+        )
+        await manager.send_personal_message(error_msg.to_dict(), websocket)
+        return
+
+    total = 0
+    chunk = 0
+    try:
+        async for paths in knowledge_graph.iter_documents(query, page_size):
+            total += len(paths)
+            chunk_msg = WebSocketMessage(
+                type="query_results",
+                data={"query": query, "chunk": chunk, "results": paths, "done": False},
+            )
+            await manager.send_personal_message(chunk_msg.to_dict(), websocket)
+            chunk += 1
+    except KnowledgeGraphError as e:
+        logger.warning(f"WebSocket query failed after {total} results: {e}")
+        error_msg = WebSocketMessage(
+            type="error",
+            data={
+                "message": f"Abfrage fehlgeschlagen: {e}",
+                "code": "QUERY_ERROR",
+            },
+        )
+        await manager.send_personal_message(error_msg.to_dict(), websocket)
+        return
+
+    done_msg = WebSocketMessage(
+        type="query_results",
+        data={
+            "query": query,
+            "chunk": chunk,
+            "results": [],
+            "done": True,
+            "total": total,
+        },
+    )
+    await manager.send_personal_message(done_msg.to_dict(), websocket)
+
+
+async def _handle_subscribe(
+    websocket: WebSocket,
+    manager: ConnectionManager,
+    data: dict[str, Any],
+) -> None:
+    """Set the broadcast filter of a client.
+
+    Args:
+        websocket: The client's WebSocket connection.
+        manager: ConnectionManager holding the filter.
+        data: Optional "zones" and "types" lists and "log_level" name.
+    """
+    zones = data.get("zones")
+    types = data.get("types")
+    log_level = data.get("log_level")
+    try:
+        manager.subscribe(websocket, zones=zones, types=types, log_level=log_level)
+    except (TypeError, ValueError) as e:
+        error_msg = WebSocketMessage(
+            type="error",
+            data={
+                "message": f"Ungültiges Abonnement: {e}",
+                "code": "INVALID_SUBSCRIPTION",
+            },
+        )
+        await manager.send_personal_message(error_msg.to_dict(), websocket)
+        return
+
+    response = WebSocketMessage(
+        type="subscribed",
+        data={"zones": zones, "types": types, "log_level": log_level},
+    )
+    await manager.send_personal_message(response.to_dict(), websocket)
+
+
 async def _handle_command(
     websocket: WebSocket,
     manager: ConnectionManager,
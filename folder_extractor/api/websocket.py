@@ -1,28 +1,66 @@
 """WebSocket support for real-time communication.
 
 Provides ConnectionManager for handling multiple WebSocket connections,
-WebSocketProgressBroadcaster for adapting FolderEventHandler callbacks,
-and WebSocketLogHandler for streaming logs to connected clients.
+WebSocketBridge for handing messages from worker threads to the server's
+event loop, ProgressAggregator for collapsing per-file events into periodic
+per-zone snapshots, WebSocketProgressBroadcaster for adapting
+FolderEventHandler callbacks, and WebSocketLogHandler for streaming logs to
+connected clients.
 
 Usage:
     manager = ConnectionManager()
     await manager.connect(websocket)
-    await manager.broadcast({"type": "progress", "data": {...}})
+    await manager.broadcast({"type": "progress", "data": {...}})  # Queued
+    manager.subscribe(websocket, zones=["inbox"], log_level="WARNING")
+
+    bridge = WebSocketBridge(manager)
+    bridge.start()  # On the server's event loop
+    bridge.submit({"type": "log", "data": {...}})  # From any thread
+
+    aggregator = ProgressAggregator(manager)
+    aggregator.start()  # On the server's event loop
+    aggregator.record_event("inbox", "sorted", "a.pdf")  # From any thread
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import json
 import logging
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+from folder_extractor.config.constants import (
+    WS_BRIDGE_FRAME_RATE,
+    WS_BRIDGE_MAX_PENDING,
+    WS_COALESCED_TYPES,
+    WS_PROGRESS_RECENT_FILES,
+    WS_PROGRESS_SNAPSHOT_RATE,
+    WS_SEND_QUEUE_SIZE,
+    WS_SEND_TIMEOUT,
+    WS_SLOW_CLIENT_POLICY,
+)
+from folder_extractor.core.metrics import timed
 
 if TYPE_CHECKING:
     from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+# Close code for clients disconnected for being too slow ("Try Again Later")
+_CLOSE_TRY_AGAIN_LATER = 1013
+# Seconds close_all() waits for queued messages before closing
+_CLOSE_DRAIN_TIMEOUT = 1.0
+# Weight of the latest interval in the smoothed processing rate of a zone
+_RATE_SMOOTHING = 0.5
+# Status events of files whose processing is finished
+_FINISHED_STATUSES = frozenset({"sorted", "error"})
+
 
 # =============================================================================
 # Message Types
@@ -63,21 +101,145 @@ class WebSocketMessage:
 # =============================================================================
 
 
+def _level_number(name: Any) -> Optional[int]:
+    """Return the numeric value of a log level name, None if unknown."""
+    value = logging.getLevelName(str(name).upper())
+    return value if isinstance(value, int) else None
+
+
+def _name_set(values: Optional[Iterable[str]], what: str) -> Optional[frozenset[str]]:
+    """Validate a filter list of a subscription (None matches everything).
+
+    Raises:
+        TypeError: If values is not a list of strings.
+    """
+    if values is None:
+        return None
+    if isinstance(values, str) or not all(isinstance(v, str) for v in values):
+        raise TypeError(f"{what} must be a list of strings")
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class _Subscription:
+    """Broadcast filter of one connection.
+
+    Attributes:
+        zones: Zone IDs to receive; messages without a zone always pass.
+        types: Message types to receive.
+        log_level: Minimum level of log messages.
+    """
+
+    zones: Optional[frozenset[str]] = None
+    types: Optional[frozenset[str]] = None
+    log_level: int = logging.NOTSET
+
+    def accepts(self, msg_type: Any, zone: Optional[str], level: Optional[int]) -> bool:
+        """Whether a broadcast message passes the filter."""
+        if self.types is not None and msg_type not in self.types:
+            return False
+        if self.zones is not None and zone is not None and zone not in self.zones:
+            return False
+        return level is None or level >= self.log_level
+
+
+@dataclass
+class _Client:
+    """Outbound state of one connection.
+
+    Attributes:
+        websocket: The connection.
+        queue: Serialized messages waiting to be sent, as [key, text] entries.
+            key is set for coalesced message types.
+        coalesced: Queued entries of coalesced message types by key.
+        ready: Set while the queue has messages.
+        idle: Set while nothing is queued or being sent.
+        send_lock: Serializes the writer task and personal messages.
+        writer: Task sending the queue.
+        dropped: Messages discarded because the queue was full.
+        subscription: Filter for broadcasts (None receives everything).
+    """
+
+    websocket: WebSocket
+    queue: deque[list[Any]] = field(default_factory=deque)
+    coalesced: dict[Any, list[Any]] = field(default_factory=dict)
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    idle: asyncio.Event = field(default_factory=asyncio.Event)
+    send_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    writer: Optional[asyncio.Task[None]] = None
+    dropped: int = 0
+    subscription: Optional[_Subscription] = None
+
+    def pop(self) -> str:
+        """Remove and return the oldest queued message."""
+        key, text = self.queue.popleft()
+        if key is not None:
+            del self.coalesced[key]
+        return text
+
+
+def _serialize(message: dict[str, Any]) -> str:
+    """Serialize a message the way WebSocket.send_json() does."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
 class ConnectionManager:
     """Manage active WebSocket connections.
 
     Handles connection lifecycle (connect, disconnect, close_all) and
     message distribution (send_personal_message, broadcast).
 
+    Every connection has its own bounded send queue and writer task, so
+    broadcast() returns immediately and a slow client delays nobody else.
+    A broadcast message is serialized once and the text shared by all
+    queues. For coalesced types (progress) a client only keeps the latest
+    message; when a queue is full, slow_client_policy decides whether the
+    oldest message is dropped or the client disconnected. A client whose
+    send takes longer than send_timeout is disconnected. Clients may
+    subscribe() to a subset of zones, message types and log levels; other
+    broadcasts are not queued for them at all.
+
     Thread-safe through asyncio.Lock for concurrent access protection.
+    Methods must be called on the server's event loop.
 
     Attributes:
         active_connections: List of currently connected WebSockets.
+        queue_size: Messages queued per client.
+        send_timeout: Seconds one send may take.
+        slow_client_policy: "drop_oldest" or "disconnect".
     """
 
-    def __init__(self) -> None:
-        """Initialize connection manager with empty connection list."""
+    def __init__(
+        self,
+        queue_size: int = WS_SEND_QUEUE_SIZE,
+        send_timeout: float = WS_SEND_TIMEOUT,
+        slow_client_policy: str = WS_SLOW_CLIENT_POLICY,
+        coalesced_types: Optional[list[str]] = None,
+    ) -> None:
+        """Initialize connection manager with empty connection list.
+
+        Args:
+            queue_size: Messages queued per client before the policy applies.
+            send_timeout: Seconds one send may take before the client is
+                disconnected.
+            slow_client_policy: "drop_oldest" discards the oldest queued
+                message of a full queue, "disconnect" closes the connection.
+            coalesced_types: Message types of which only the latest is kept
+                (default: WS_COALESCED_TYPES).
+
+        Raises:
+            ValueError: If slow_client_policy is unknown.
+        """
+        if slow_client_policy not in ("drop_oldest", "disconnect"):
+            raise ValueError(f"Unknown slow client policy: {slow_client_policy}")
+        self.queue_size = max(1, queue_size)
+        self.send_timeout = send_timeout
+        self.slow_client_policy = slow_client_policy
+        self._coalesced_types = frozenset(
+            WS_COALESCED_TYPES if coalesced_types is None else coalesced_types
+        )
         self._connections: list[WebSocket] = []
+        self._clients: dict[WebSocket, _Client] = {}
         self._lock = asyncio.Lock()
 
     @property
@@ -105,8 +267,12 @@ class ConnectionManager:
             websocket: FastAPI WebSocket instance to connect.
         """
         await websocket.accept()
+        client = _Client(websocket)
+        client.idle.set()
+        client.writer = asyncio.ensure_future(self._write(client))
         async with self._lock:
             self._connections.append(websocket)
+            self._clients[websocket] = client
         logger.info(f"WebSocket connected. Total connections: {self.connection_count}")
 
     async def disconnect(self, websocket: WebSocket) -> None:
@@ -114,69 +280,609 @@ class ConnectionManager:
 
         Safe to call even if the WebSocket was never connected.
         Uses async lock for thread safety (consistent with connect).
+        Messages still queued for the client are discarded.
 
         Args:
             websocket: WebSocket instance to remove.
         """
         async with self._lock:
+            client = self._clients.pop(websocket, None)
             try:
                 self._connections.remove(websocket)
                 count = self.connection_count
                 logger.info(f"WebSocket disconnected. Remaining: {count}")
             except ValueError:
                 pass  # WebSocket was not in the list
+        if client is not None:
+            self._stop_writer(client)
+
+    def subscribe(
+        self,
+        websocket: WebSocket,
+        zones: Optional[Iterable[str]] = None,
+        types: Optional[Iterable[str]] = None,
+        log_level: Optional[str] = None,
+    ) -> None:
+        """Limit the broadcasts a client receives.
+
+        Replaces the client's previous filter; without any argument the
+        client receives every broadcast again. Personal messages (chat
+        replies, query results) are never filtered.
+
+        Args:
+            websocket: The client's connection.
+            zones: Zone IDs whose messages are received. Messages that
+                belong to no zone (e.g. logs) are always received.
+            types: Message types received (e.g. ["progress", "log"]).
+            log_level: Minimum level of log messages (e.g. "WARNING").
+
+        Raises:
+            TypeError: If zones or types is not a list of strings.
+            ValueError: If log_level is not a known level name.
+        """
+        level = logging.NOTSET
+        if log_level is not None:
+            number = _level_number(log_level)
+            if number is None:
+                raise ValueError(f"Unknown log level: {log_level}")
+            level = number
+        subscription = _Subscription(
+            zones=_name_set(zones, "zones"),
+            types=_name_set(types, "types"),
+            log_level=level,
+        )
+        client = self._clients.get(websocket)
+        if client is None:
+            return
+        client.subscription = None if subscription == _Subscription() else subscription
 
     async def send_personal_message(
         self, message: dict[str, Any], websocket: WebSocket
     ) -> None:
         """Send a message to a specific WebSocket client.
 
+        Waits until the message is sent; never interleaves with a broadcast
+        being sent to the same client.
+
         Args:
             message: Dictionary to send as JSON.
             websocket: Target WebSocket connection.
         """
-        await websocket.send_json(message)
+        client = self._clients.get(websocket)
+        if client is None:
+            await websocket.send_json(message)
+            return
+        async with client.send_lock:
+            await websocket.send_json(message)
 
+    @timed("ws_broadcast")
     async def broadcast(self, message: dict[str, Any]) -> None:
-        """Broadcast a message to all connected clients.
+        """Queue a message for all connected clients.
 
-        Handles disconnected clients gracefully by removing them from
-        the active connections list.
+        Returns without waiting for any client. Clients whose sends fail
+        are removed from the active connections list by their writer task.
+        Clients whose subscription excludes the message are skipped.
 
         Args:
             message: Dictionary to broadcast as JSON.
         """
-        if not self._connections:
+        if not self._clients:
             return
 
-        disconnected: list[WebSocket] = []
+        text = _serialize(message)
+        msg_type = message.get("type")
+        data = message.get("data")
+        zone = data.get("zone_id") if isinstance(data, dict) else None
+        level = None
+        if msg_type == "log" and isinstance(data, dict):
+            level = _level_number(data.get("level"))
+        key = (msg_type, zone) if msg_type in self._coalesced_types else None
+
+        overflowing: list[_Client] = []
+        for client in list(self._clients.values()):
+            subscription = client.subscription
+            if subscription is not None and not subscription.accepts(
+                msg_type, zone, level
+            ):
+                continue
+            if not self._enqueue(client, key, text):
+                overflowing.append(client)
+
+        for client in overflowing:
+            logger.warning(
+                f"WebSocket client too slow ({self.queue_size} messages queued), "
+                "disconnecting"
+            )
+            await self._close(client, _CLOSE_TRY_AGAIN_LATER)
 
-        for connection in self._connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send to WebSocket: {e}")
-                disconnected.append(connection)
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message has been sent.
 
-        # Remove failed connections
-        for ws in disconnected:
-            await self.disconnect(ws)
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if all queues are empty, False on timeout.
+        """
+        waits = [client.idle.wait() for client in self._clients.values()]
+        if not waits:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """Return queued and dropped messages summed over all clients."""
+        clients = list(self._clients.values())
+        return {
+            "connections": len(clients),
+            "queued": sum(len(client.queue) for client in clients),
+            "dropped": sum(client.dropped for client in clients),
+        }
 
     async def close_all(self) -> None:
         """Close all active WebSocket connections.
 
         Used during server shutdown to cleanly terminate all connections.
+        Queued messages get a short time to be sent first.
         """
+        await self.drain(timeout=_CLOSE_DRAIN_TIMEOUT)
         async with self._lock:
+            for client in self._clients.values():
+                self._stop_writer(client)
             for connection in self._connections:
                 try:
                     await connection.close()
                 except Exception as e:
                     logger.warning(f"Error closing WebSocket: {e}")
             self._connections.clear()
+            self._clients.clear()
 
         logger.info("All WebSocket connections closed")
 
+    def _enqueue(self, client: _Client, key: Any, text: str) -> bool:
+        """Queue a serialized message for one client.
+
+        Returns:
+            False if the queue is full and the client must be disconnected.
+        """
+        entry = client.coalesced.get(key) if key is not None else None
+        if entry is not None:
+            # Replace the queued message of this type with the newer one
+            entry[1] = text
+            return True
+        if len(client.queue) >= self.queue_size:
+            if self.slow_client_policy == "disconnect":
+                return False
+            client.pop()
+            client.dropped += 1
+        entry = [key, text]
+        client.queue.append(entry)
+        if key is not None:
+            client.coalesced[key] = entry
+        client.idle.clear()
+        client.ready.set()
+        return True
+
+    async def _write(self, client: _Client) -> None:
+        """Send a client's queued messages until it disconnects."""
+        websocket = client.websocket
+        try:
+            while True:
+                if not client.queue:
+                    client.ready.clear()
+                    client.idle.set()
+                    await client.ready.wait()
+                    continue
+                text = client.pop()
+                async with client.send_lock:
+                    await asyncio.wait_for(
+                        websocket.send_text(text), timeout=self.send_timeout
+                    )
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"WebSocket send took longer than {self.send_timeout}s, "
+                "disconnecting slow client"
+            )
+            await self._close(client, _CLOSE_TRY_AGAIN_LATER)
+        except Exception as e:
+            logger.warning(f"Failed to send to WebSocket: {e}")
+            await self.disconnect(websocket)
+        finally:
+            client.idle.set()
+
+    async def _close(self, client: _Client, code: int) -> None:
+        """Disconnect a client and close its connection."""
+        await self.disconnect(client.websocket)
+        with contextlib.suppress(Exception):
+            await client.websocket.close(code=code)
+
+    @staticmethod
+    def _stop_writer(client: _Client) -> None:
+        """Cancel a client's writer task unless it is the caller."""
+        client.queue.clear()
+        client.coalesced.clear()
+        writer = client.writer
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+        client.idle.set()
+
+
+# =============================================================================
+# Bridge from Worker Threads to the Event Loop
+# =============================================================================
+
+
+class WebSocketBridge:
+    """Hand messages from worker threads to the server's event loop.
+
+    Watcher threads, extraction workers and logging call submit(), which
+    only appends to a buffer. The first message of a frame schedules one
+    flush on the captured loop via call_soon_threadsafe(); the flush runs
+    a frame later (1/frame_rate seconds) and broadcasts everything buffered
+    meanwhile. A high message rate therefore costs at most frame_rate
+    wake-ups of the loop per second and never blocks the calling thread.
+
+    Attributes:
+        manager: ConnectionManager the messages are broadcast with.
+        interval: Seconds between the first message of a frame and its flush.
+        dropped: Messages discarded because the buffer was full.
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        frame_rate: float = WS_BRIDGE_FRAME_RATE,
+        max_pending: int = WS_BRIDGE_MAX_PENDING,
+    ) -> None:
+        """Initialize the bridge; messages are accepted after start().
+
+        Args:
+            manager: ConnectionManager for broadcasting.
+            frame_rate: Flushes per second at most.
+            max_pending: Messages buffered between flushes; beyond that the
+                oldest are dropped.
+        """
+        self.manager = manager
+        self.interval = 1.0 / frame_rate if frame_rate > 0 else 0.0
+        self.dropped = 0
+        self._pending: deque[dict[str, Any]] = deque(maxlen=max(1, max_pending))
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scheduled = False
+        self._closed = False
+        self._sends: set[asyncio.Future[None]] = set()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Capture the event loop messages are delivered on.
+
+        Args:
+            loop: Server event loop (default: the running loop, so call this
+                from the server's startup code).
+        """
+        self._loop = loop or asyncio.get_running_loop()
+
+    @property
+    def running(self) -> bool:
+        """Whether submitted messages are delivered."""
+        return self._loop is not None and not self._closed
+
+    def submit(self, message: dict[str, Any]) -> bool:
+        """Queue a message for broadcasting. Safe to call from any thread.
+
+        Args:
+            message: Dictionary to broadcast as JSON.
+
+        Returns:
+            False if the bridge is not running and the message was dropped.
+        """
+        with self._lock:
+            loop = self._loop
+            if loop is None or self._closed:
+                return False
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append(message)
+            if self._scheduled:
+                return True
+            self._scheduled = True
+        try:
+            loop.call_soon_threadsafe(self._schedule_flush)
+        except RuntimeError:
+            # The loop was closed; nothing will deliver the message
+            with self._lock:
+                self._scheduled = False
+            return False
+        return True
+
+    async def close(self) -> None:
+        """Broadcast buffered messages and stop accepting new ones."""
+        with self._lock:
+            self._closed = True
+            batch = list(self._pending)
+            self._pending.clear()
+        if batch:
+            await self._broadcast(batch)
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
+
+    def _schedule_flush(self) -> None:
+        """Flush one frame from now (runs on the event loop)."""
+        asyncio.get_running_loop().call_later(self.interval, self._flush)
+
+    def _flush(self) -> None:
+        """Broadcast all buffered messages (runs on the event loop)."""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+        if not batch:
+            return
+        send = asyncio.ensure_future(self._broadcast(batch))
+        self._sends.add(send)
+        send.add_done_callback(self._sends.discard)
+
+    async def _broadcast(self, batch: list[dict[str, Any]]) -> None:
+        """Broadcast a batch in order."""
+        for message in batch:
+            try:
+                await self.manager.broadcast(message)
+            except Exception as e:
+                logger.warning(f"WebSocket broadcast failed: {e}")
+
+
+def _deliver(
+    manager: ConnectionManager,
+    bridge: Optional[WebSocketBridge],
+    message: dict[str, Any],
+) -> None:
+    """Broadcast a message from synchronous code.
+
+    Uses the bridge if there is one. Without a bridge, only code running on
+    an event loop can deliver; elsewhere the message is dropped, as there is
+    no loop that owns the connections.
+    """
+    if bridge is not None:
+        bridge.submit(message)
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    loop.create_task(manager.broadcast(message))
+
+
+# =============================================================================
+# Progress Aggregation (periodic per-zone snapshots)
+# =============================================================================
+
+
+@dataclass
+class _ZoneProgress:
+    """Progress of one zone since the last reset.
+
+    Attributes:
+        counts: Status events by status.
+        recent: Names of recently finished files, newest last.
+        filename: Name or message of the latest progress update.
+        error: Error of the latest progress update or error event.
+        updated: Monotonic time of the previous snapshot (or of creation).
+        finished: Finished files at the previous snapshot.
+        rate: Smoothed finished files per second.
+        changed: Whether anything happened since the previous snapshot.
+    """
+
+    recent: deque[str]
+    updated: float
+    counts: dict[str, int] = field(default_factory=dict)
+    filename: str = ""
+    error: Optional[str] = None
+    finished: int = 0
+    rate: float = 0.0
+    changed: bool = True
+
+
+class ProgressAggregator:
+    """Collapse per-file progress and status events into zone snapshots.
+
+    A watcher sorting thousands of files per second reports several events
+    per file. Broadcasting each of them would flood every dashboard, so the
+    broadcaster's callbacks only update counters here (under a lock, from
+    any thread). On the server's event loop, a task broadcasts one
+    "progress" message per changed zone at most rate times per second.
+    Besides the fields of a single progress update (current, total,
+    filename, error), a snapshot has counts by status, the processing rate
+    in files per second, the estimated seconds until the zone is idle and
+    the names of recently finished files.
+
+    Attributes:
+        manager: ConnectionManager the snapshots are broadcast with.
+        interval: Seconds between snapshots.
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        rate: float = WS_PROGRESS_SNAPSHOT_RATE,
+        recent_files: int = WS_PROGRESS_RECENT_FILES,
+    ) -> None:
+        """Initialize the aggregator; snapshots are broadcast after start().
+
+        Args:
+            manager: ConnectionManager for broadcasting.
+            rate: Snapshots per zone and second at most.
+            recent_files: Names of finished files listed in a snapshot.
+
+        Raises:
+            ValueError: If rate is not positive.
+        """
+        if rate <= 0:
+            raise ValueError(f"Snapshot rate must be positive: {rate}")
+        self.manager = manager
+        self.interval = 1.0 / rate
+        self._recent_files = max(0, recent_files)
+        self._zones: dict[Optional[str], _ZoneProgress] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start broadcasting snapshots.
+
+        Args:
+            loop: Server event loop (default: the running loop, so call this
+                from the server's startup code).
+        """
+        if self._task is None and not self._closed:
+            loop = loop or asyncio.get_running_loop()
+            self._task = loop.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the periodic task and broadcast the final snapshots."""
+        self._closed = True
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self.flush()
+
+    def record_progress(
+        self,
+        zone_id: Optional[str],
+        current: int,
+        total: int,
+        filename: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record a progress update. Safe to call from any thread.
+
+        Args:
+            zone_id: Zone the update belongs to.
+            current: Current progress count (of the file or batch).
+            total: Total items of the file or batch.
+            filename: Name of the file or progress message.
+            error: Optional error message.
+        """
+        with self._lock:
+            zone = self._zone(zone_id)
+            zone.filename = filename
+            zone.error = error
+            zone.changed = True
+
+    def record_event(
+        self,
+        zone_id: Optional[str],
+        status: str,
+        filename: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record a status event. Safe to call from any thread.
+
+        Args:
+            zone_id: Zone the event belongs to.
+            status: Event status (incoming, waiting, analyzing, sorted, error).
+            filename: Name of the file.
+            error: Optional error message.
+        """
+        with self._lock:
+            zone = self._zone(zone_id)
+            zone.counts[status] = zone.counts.get(status, 0) + 1
+            if status in _FINISHED_STATUSES:
+                zone.recent.append(filename)
+            if error is not None:
+                zone.error = error
+            zone.changed = True
+
+    def reset(self, zone_id: Optional[str]) -> None:
+        """Forget the progress of a zone (e.g. when its watcher restarts)."""
+        with self._lock:
+            self._zones.pop(zone_id, None)
+
+    def snapshots(self, now: Optional[float] = None) -> list[dict[str, Any]]:
+        """Build snapshot messages of the zones changed since the last call.
+
+        Args:
+            now: Monotonic time of the snapshot (default: now).
+
+        Returns:
+            One "progress" message per changed zone.
+        """
+        now = time.monotonic() if now is None else now
+        messages: list[dict[str, Any]] = []
+        with self._lock:
+            for zone_id, zone in self._zones.items():
+                if not zone.changed:
+                    continue
+                zone.changed = False
+                messages.append(self._snapshot(zone_id, zone, now))
+        return messages
+
+    async def flush(self) -> None:
+        """Broadcast the snapshots of all changed zones now."""
+        for message in self.snapshots():
+            try:
+                await self.manager.broadcast(message)
+            except Exception as e:
+                logger.warning(f"WebSocket broadcast failed: {e}")
+
+    def _zone(self, zone_id: Optional[str]) -> _ZoneProgress:
+        """Return the progress of a zone, creating it (lock held)."""
+        zone = self._zones.get(zone_id)
+        if zone is None:
+            zone = _ZoneProgress(
+                recent=deque(maxlen=self._recent_files), updated=time.monotonic()
+            )
+            self._zones[zone_id] = zone
+        return zone
+
+    def _snapshot(
+        self, zone_id: Optional[str], zone: _ZoneProgress, now: float
+    ) -> dict[str, Any]:
+        """Build the snapshot message of a zone and advance its rate (lock held)."""
+        finished = sum(zone.counts.get(status, 0) for status in _FINISHED_STATUSES)
+        total = max(zone.counts.get("incoming", 0), finished)
+        elapsed = now - zone.updated
+        if elapsed > 0:
+            current_rate = (finished - zone.finished) / elapsed
+            zone.rate = (
+                _RATE_SMOOTHING * current_rate + (1 - _RATE_SMOOTHING) * zone.rate
+            )
+        zone.updated = now
+        zone.finished = finished
+
+        pending = total - finished
+        if pending == 0:
+            eta: Optional[float] = 0.0
+        elif zone.rate > 0:
+            eta = round(pending / zone.rate, 1)
+        else:
+            eta = None
+        return WebSocketMessage(
+            type="progress",
+            data={
+                "zone_id": zone_id,
+                "current": finished,
+                "total": total,
+                "filename": zone.filename,
+                "error": zone.error,
+                "counts": dict(zone.counts),
+                "rate": round(zone.rate, 2),
+                "eta": eta,
+                "recent": list(zone.recent),
+            },
+        ).to_dict()
+
+    async def _run(self) -> None:
+        """Broadcast snapshots every interval until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
 
 # =============================================================================
 # Progress Broadcaster (Adapter for FolderEventHandler callbacks)
@@ -188,24 +894,74 @@ class WebSocketProgressBroadcaster:
 
     Converts progress and event callbacks from the file processing system
     into structured WebSocket messages and broadcasts them to all connected
-    clients.
+    clients. With an aggregator, the callbacks are only recorded and
+    clients receive the zone's periodic snapshots instead.
 
     Provides both async methods (on_progress, on_event) and synchronous
     wrappers (get_progress_callback, get_event_callback) for integration
-    with synchronous code.
+    with synchronous code. The synchronous wrappers may be called from
+    watcher threads; they hand messages to the bridge.
 
     Attributes:
         manager: ConnectionManager for broadcasting messages.
+        bridge: Bridge to the server's event loop used by the wrappers.
+        aggregator: Collects the callbacks into per-zone snapshots.
+        zone_id: Zone the callbacks belong to, included in every message.
     """
 
-    def __init__(self, manager: ConnectionManager) -> None:
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        bridge: Optional[WebSocketBridge] = None,
+        aggregator: Optional[ProgressAggregator] = None,
+        zone_id: Optional[str] = None,
+    ) -> None:
         """Initialize broadcaster with connection manager.
 
         Args:
             manager: ConnectionManager instance for broadcasting.
+            bridge: Bridge to the server's event loop. Without it, the
+                synchronous wrappers only deliver when called on a running
+                event loop.
+            aggregator: Collapses progress and status events into snapshots.
+                Without it, every callback is broadcast.
+            zone_id: Zone of the watcher the callbacks come from.
         """
         self.manager = manager
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.bridge = bridge
+        self.aggregator = aggregator
+        self.zone_id = zone_id
+
+    def _message(self, msg_type: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Build a message, tagged with the zone if there is one."""
+        if self.zone_id is not None:
+            data["zone_id"] = self.zone_id
+        return WebSocketMessage(type=msg_type, data=data).to_dict()
+
+    def _progress(
+        self, current: int, total: int, filename: str, error: Optional[str]
+    ) -> Optional[dict[str, Any]]:
+        """Record a progress update or return it as a message to broadcast."""
+        if self.aggregator is not None:
+            self.aggregator.record_progress(
+                self.zone_id, current, total, filename, error
+            )
+            return None
+        return self._message(
+            "progress",
+            {"current": current, "total": total, "filename": filename, "error": error},
+        )
+
+    def _event(
+        self, status: str, filename: str, error: Optional[str]
+    ) -> Optional[dict[str, Any]]:
+        """Record a status event or return it as a message to broadcast."""
+        if self.aggregator is not None:
+            self.aggregator.record_event(self.zone_id, status, filename, error)
+            return None
+        return self._message(
+            "status", {"status": status, "filename": filename, "error": error}
+        )
 
     async def on_progress(
         self,
@@ -222,16 +978,9 @@ class WebSocketProgressBroadcaster:
             filename: Name of file being processed.
             error: Optional error message.
         """
-        message = WebSocketMessage(
-            type="progress",
-            data={
-                "current": current,
-                "total": total,
-                "filename": filename,
-                "error": error,
-            },
-        )
-        await self.manager.broadcast(message.to_dict())
+        message = self._progress(current, total, filename, error)
+        if message is not None:
+            await self.manager.broadcast(message)
 
     async def on_event(
         self,
@@ -246,15 +995,9 @@ class WebSocketProgressBroadcaster:
             filename: Name of file being processed.
             error: Optional error message.
         """
-        message = WebSocketMessage(
-            type="status",
-            data={
-                "status": status,
-                "filename": filename,
-                "error": error,
-            },
-        )
-        await self.manager.broadcast(message.to_dict())
+        message = self._event(status, filename, error)
+        if message is not None:
+            await self.manager.broadcast(message)
 
     def get_progress_callback(
         self,
@@ -262,7 +1005,8 @@ class WebSocketProgressBroadcaster:
         """Get synchronous callback wrapper for progress updates.
 
         The returned callback can be passed to FolderEventHandler as
-        progress_callback. It schedules async broadcasting on the event loop.
+        progress_callback. It returns immediately; the message is broadcast
+        on the server's event loop.
 
         Returns:
             Synchronous callback function with signature:
@@ -272,19 +1016,9 @@ class WebSocketProgressBroadcaster:
         def sync_progress(
             current: int, total: int, filename: str, error: Optional[str] = None
         ) -> None:
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(
-                        self.on_progress(current, total, filename, error)
-                    )
-                else:
-                    loop.run_until_complete(
-                        self.on_progress(current, total, filename, error)
-                    )
-            except RuntimeError:
-                # No event loop available, create a new one
-                asyncio.run(self.on_progress(current, total, filename, error))
+            message = self._progress(current, total, filename, error)
+            if message is not None:
+                _deliver(self.manager, self.bridge, message)
 
         return sync_progress
 
@@ -294,7 +1028,8 @@ class WebSocketProgressBroadcaster:
         """Get synchronous callback wrapper for event updates.
 
         The returned callback can be passed to FolderEventHandler as
-        on_event_callback. It schedules async broadcasting on the event loop.
+        on_event_callback. It returns immediately; the message is broadcast
+        on the server's event loop.
 
         Returns:
             Synchronous callback function with signature:
@@ -302,15 +1037,9 @@ class WebSocketProgressBroadcaster:
         """
 
         def sync_event(status: str, filename: str, error: Optional[str] = None) -> None:
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(self.on_event(status, filename, error))
-                else:
-                    loop.run_until_complete(self.on_event(status, filename, error))
-            except RuntimeError:
-                # No event loop available, create a new one
-                asyncio.run(self.on_event(status, filename, error))
+            message = self._event(status, filename, error)
+            if message is not None:
+                _deliver(self.manager, self.bridge, message)
 
         return sync_event
 
@@ -326,11 +1055,13 @@ class WebSocketLogHandler(logging.Handler):
     Converts Python logging records into WebSocket messages and broadcasts
     them to all connected clients. Can filter by logger name prefix.
 
-    Integrates with Python's logging system as a standard Handler.
+    Integrates with Python's logging system as a standard Handler. Records
+    logged on worker threads are handed to the bridge.
 
     Attributes:
         manager: ConnectionManager for broadcasting messages.
         logger_prefix: Optional prefix to filter logger names.
+        bridge: Bridge to the server's event loop.
     """
 
     def __init__(
@@ -338,6 +1069,7 @@ class WebSocketLogHandler(logging.Handler):
         manager: ConnectionManager,
         logger_prefix: Optional[str] = None,
         level: int = logging.DEBUG,
+        bridge: Optional[WebSocketBridge] = None,
     ) -> None:
         """Initialize log handler.
 
@@ -345,10 +1077,13 @@ class WebSocketLogHandler(logging.Handler):
             manager: ConnectionManager for broadcasting.
             logger_prefix: Only emit logs from loggers starting with this prefix.
             level: Minimum log level to emit.
+            bridge: Bridge to the server's event loop. Without it, only
+                records logged on a running event loop are delivered.
         """
         super().__init__(level=level)
         self.manager = manager
         self.logger_prefix = logger_prefix
+        self.bridge = bridge
 
     def filter(self, record: logging.LogRecord) -> bool:
         """Filter log records by logger name prefix.
@@ -383,17 +1118,7 @@ class WebSocketLogHandler(logging.Handler):
                 },
             )
 
-            # Schedule broadcast asynchronously
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(self.manager.broadcast(message.to_dict()))
-                else:
-                    # Fallback for sync context
-                    loop.run_until_complete(self.manager.broadcast(message.to_dict()))
-            except RuntimeError:
-                # No event loop, try creating one
-                asyncio.run(self.manager.broadcast(message.to_dict()))
+            _deliver(self.manager, self.bridge, message.to_dict())
 
         except Exception:
             # Never let logging errors propagate
@@ -6,6 +6,8 @@ and progress tracking capabilities.
 """
 
 import asyncio
+import mimetypes
+import shutil
 import sys
 import time
 from pathlib import Path
@@ -15,19 +17,37 @@ from watchdog.observers import Observer
 
 from folder_extractor.cli.interface import create_console_interface
 from folder_extractor.cli.parser import create_parser
-from folder_extractor.config.constants import MESSAGES
+from folder_extractor.config.constants import (
+    KNOWLEDGE_GRAPH_DB_NAME,
+    MESSAGES,
+    WATCH_AI_CONCURRENCY,
+    WATCH_PROCESSING_WORKERS,
+)
 from folder_extractor.config.settings import Settings, configure_from_args
 from folder_extractor.core.ai_async import AsyncGeminiClient
+from folder_extractor.core.ai_cache import AIResultCache
 from folder_extractor.core.extractor import (
     EnhancedExtractionOrchestrator,
     EnhancedFileExtractor,
 )
+from folder_extractor.core.file_operations import (
+    FileOperations,
+    get_config_directory,
+)
 from folder_extractor.core.memory.graph import KnowledgeGraph
+from folder_extractor.core.memory.maintenance import GraphMaintenance
+from folder_extractor.core.memory.writer import KnowledgeGraphWriter
 from folder_extractor.core.monitor import StabilityMonitor
+from folder_extractor.core.preclassifier import PreClassifier
 from folder_extractor.core.smart_sorter import SmartSorter
 from folder_extractor.core.state_manager import StateManager
-from folder_extractor.core.watch import FolderEventHandler, SmartFolderEventHandler
+from folder_extractor.core.watch import (
+    FolderEventHandler,
+    SmartFolderEventHandler,
+    build_target_path,
+)
 from folder_extractor.core.zone_manager import ZoneManager
+from folder_extractor.utils.path_validators import is_safe_path
 
 
 class EnhancedFolderExtractorCLI:
@@ -73,6 +93,8 @@ class EnhancedFolderExtractorCLI:
                 return self._execute_undo(current_dir)
             elif getattr(parsed_args, "ask", None):
                 return self._execute_query(parsed_args.ask)
+            elif getattr(parsed_args, "smart_sort", False) is True:
+                return self._execute_smart_sort(current_dir)
             elif getattr(parsed_args, "watch", False):
                 return self._execute_watch(current_dir)
             else:
@@ -96,9 +118,13 @@ class EnhancedFolderExtractorCLI:
             Exit code
         """
         path = Path(path)
+        # Keep the knowledge graph in step with moved files
+        maintenance = self._create_graph_maintenance()
         # Create extractor and orchestrator
         extractor = EnhancedFileExtractor(
-            settings=self.settings, state_manager=self.state_manager
+            settings=self.settings,
+            state_manager=self.state_manager,
+            move_callback=maintenance.record_moves if maintenance else None,
         )
         orchestrator = EnhancedExtractionOrchestrator(extractor, self.state_manager)
 
@@ -162,6 +188,10 @@ class EnhancedFolderExtractorCLI:
             )
             return 1
 
+        finally:
+            if maintenance is not None:
+                maintenance.close()
+
     def _execute_undo(self, path: Path) -> int:
         """Execute undo operation.
 
@@ -172,9 +202,13 @@ class EnhancedFolderExtractorCLI:
             Exit code
         """
         path = Path(path)
+        # Keep the knowledge graph in step with restored files
+        maintenance = self._create_graph_maintenance()
         # Create extractor and orchestrator
         extractor = EnhancedFileExtractor(
-            settings=self.settings, state_manager=self.state_manager
+            settings=self.settings,
+            state_manager=self.state_manager,
+            move_callback=maintenance.record_moves if maintenance else None,
         )
         orchestrator = EnhancedExtractionOrchestrator(extractor, self.state_manager)
 
@@ -184,7 +218,11 @@ class EnhancedFolderExtractorCLI:
         )
 
         # Execute undo
-        result = orchestrator.execute_undo(path)
+        try:
+            result = orchestrator.execute_undo(path)
+        finally:
+            if maintenance is not None:
+                maintenance.close()
 
         # Show result
         self.interface.show_message(
@@ -253,8 +291,10 @@ class EnhancedFolderExtractorCLI:
             orchestrator,
             monitor,
             self.state_manager,
-            progress_callback,
+            base_path=path,
+            progress_callback=progress_callback,
             on_event_callback=event_callback,
+            workers=self.settings.get("watch_workers", WATCH_PROCESSING_WORKERS),
         )
 
         # Create and configure observer
@@ -278,6 +318,7 @@ class EnhancedFolderExtractorCLI:
             # Clean shutdown
             observer.stop()
             observer.join()
+            handler.stop()
             self.interface.show_watch_stopped()
 
         return 0
@@ -326,7 +367,17 @@ class EnhancedFolderExtractorCLI:
 
         # Create AI client and SmartSorter with configured settings
         ai_client = AsyncGeminiClient()
-        smart_sorter = SmartSorter(client=ai_client, settings=self.settings)
+        graph_writer = KnowledgeGraphWriter()
+        smart_sorter = SmartSorter(
+            client=ai_client,
+            settings=self.settings,
+            cache=AIResultCache(),
+            preclassifier=self._create_preclassifier(),
+            graph_writer=graph_writer,
+        )
+        # Re-key documents of sorted files and sweep stale ones while watching
+        maintenance = GraphMaintenance(graph_writer=graph_writer)
+        maintenance.start()
 
         # Create stability monitor
         monitor = StabilityMonitor(self.state_manager)
@@ -352,6 +403,11 @@ class EnhancedFolderExtractorCLI:
             exclude_subfolders=profile["exclude_subfolders"],
             recursive=profile["recursive"],
             on_event_callback=event_callback,
+            workers=self.settings.get("watch_workers", WATCH_PROCESSING_WORKERS),
+            ai_concurrency=self.settings.get(
+                "watch_ai_concurrency", WATCH_AI_CONCURRENCY
+            ),
+            move_callback=maintenance.record_moves,
         )
 
         # Create and configure observer
@@ -375,15 +431,161 @@ class EnhancedFolderExtractorCLI:
             # Clean shutdown
             observer.stop()
             observer.join()
+            handler.stop()
+            # Apply moves and write knowledge graph updates still queued
+            maintenance.close()
+            graph_writer.close()
             self.interface.show_watch_stopped()
             # Reset custom_categories after watch mode completes
             self.settings.set("custom_categories", [])
 
         return 0
 
+    def _execute_smart_sort(self, path: Path) -> int:
+        """Categorize the files in a folder once with AI and sort them.
+
+        Analyzes all (non-hidden) files directly inside ``path`` with the
+        SmartSorter and moves them into ``{category}/{sender}/{year}``
+        below ``path``. With ``--batch`` several small files share one
+        AI request.
+
+        Args:
+            path: Folder whose files should be sorted
+
+        Returns:
+            Exit code (0 for success, non-zero for error)
+        """
+        path = Path(path)
+        if not is_safe_path(path):
+            self.interface.show_message(
+                MESSAGES["SECURITY_ERROR"].format(path=path), message_type="error"
+            )
+            return 1
+
+        include_hidden = self.settings.get("include_hidden", False)
+        files = sorted(
+            entry
+            for entry in path.iterdir()
+            if entry.is_file() and (include_hidden or not entry.name.startswith("."))
+        )
+        if not files:
+            self.interface.show_message(
+                MESSAGES["SMART_SORT_NO_FILES"], message_type="warning"
+            )
+            return 0
+
+        batch_size = self.settings.get("ai_batch_size", 1)
+        self.interface.show_message(
+            MESSAGES["SMART_SORT_ANALYZING"].format(count=len(files), batch=batch_size),
+            message_type="info",
+        )
+
+        items = [
+            (f, mimetypes.guess_type(str(f))[0] or "application/octet-stream")
+            for f in files
+        ]
+        graph_writer = KnowledgeGraphWriter()
+        smart_sorter = SmartSorter(
+            client=AsyncGeminiClient(),
+            settings=self.settings,
+            cache=AIResultCache(),
+            preclassifier=self._create_preclassifier(),
+            graph_writer=graph_writer,
+        )
+        try:
+            results = asyncio.run(
+                smart_sorter.process_files(items, batch_size=batch_size)
+            )
+        finally:
+            graph_writer.close()
+
+        file_ops = FileOperations()
+        dry_run = self.settings.get("dry_run", False)
+        prefix = MESSAGES["DRY_RUN_PREFIX"] if dry_run else ""
+        sorted_count = 0
+        errors = 0
+        moved = []
+        for filepath, result in zip(files, results):
+            if isinstance(result, Exception):
+                errors += 1
+                self.interface.show_message(
+                    MESSAGES["SMART_SORT_ERROR"].format(
+                        file=filepath.name, error=result
+                    ),
+                    message_type="error",
+                )
+                continue
+            try:
+                target_dir = build_target_path(result, filepath, path)
+                if not is_safe_path(target_dir):
+                    raise ValueError(f"Unsicherer Zielpfad: {target_dir}")
+                if not dry_run:
+                    target_dir.mkdir(parents=True, exist_ok=True)
+                    unique_name = file_ops.generate_unique_name(
+                        target_dir, filepath.name
+                    )
+                    shutil.move(str(filepath), str(target_dir / unique_name))
+                    moved.append((filepath, target_dir / unique_name))
+            except Exception as e:
+                errors += 1
+                self.interface.show_message(
+                    MESSAGES["SMART_SORT_ERROR"].format(file=filepath.name, error=e),
+                    message_type="error",
+                )
+                continue
+            sorted_count += 1
+            self.interface.show_message(
+                prefix
+                + MESSAGES["SMART_SORT_MOVED"].format(
+                    file=filepath.name, target=target_dir.relative_to(path)
+                ),
+                message_type="success",
+            )
+
+        self.interface.show_message(
+            MESSAGES["SMART_SORT_SUMMARY"].format(sorted=sorted_count, errors=errors),
+            message_type="info",
+        )
+        if moved:
+            # The analyses were stored under the paths before sorting
+            maintenance = GraphMaintenance()
+            maintenance.record_moves(moved)
+            maintenance.close()
+        if isinstance(smart_sorter.preclassifier, PreClassifier):
+            stats = smart_sorter.preclassifier.stats()
+            if stats["hits"]:
+                self.interface.show_message(
+                    MESSAGES["SMART_SORT_PRECLASSIFIED"].format(
+                        hits=stats["hits"],
+                        checked=stats["checked"],
+                        rate=stats["hit_rate"],
+                    ),
+                    message_type="info",
+                )
+        return 0 if errors == 0 else 1
+
+    def _create_graph_maintenance(self) -> Optional[GraphMaintenance]:
+        """Create graph maintenance for moves, if a knowledge graph exists.
+
+        Plain extraction and undo never analyze files, so they must not
+        create a knowledge graph just to record moves.
+        """
+        if not (get_config_directory() / KNOWLEDGE_GRAPH_DB_NAME).exists():
+            return None
+        return GraphMaintenance()
+
+    def _create_preclassifier(self) -> Optional[PreClassifier]:
+        """Create the local pre-classifier unless disabled in the settings."""
+        if not self.settings.get("preclassifier_enabled", True):
+            return None
+        return PreClassifier(settings=self.settings)
+
     def _execute_query(self, query_text: str) -> int:
         """Execute knowledge graph query operation.
 
+        Searches the local full-text index first. Only if it finds nothing
+        is the question translated by the AI (unless --offline is given).
+
         Args:
             query_text: Natural language query string
 
@@ -400,8 +602,16 @@ class EnhancedFolderExtractorCLI:
             # Initialize knowledge graph
             kg = KnowledgeGraph()
 
-            # Execute query (async call via asyncio.run)
-            results = asyncio.run(kg.query_documents(query_text))
+            # Local full-text index first: instant and offline
+            results = kg.search_documents(query_text)
+            if not isinstance(results, list) or not results:
+                results = []
+                if self.settings.get("ask_ai_fallback", True):
+                    self.interface.show_message(
+                        MESSAGES["QUERY_AI_FALLBACK"], message_type="info"
+                    )
+                    # Execute query (async call via asyncio.run)
+                    results = asyncio.run(kg.query_documents(query_text))
 
             # Display results
             if not results:
@@ -8,7 +8,12 @@ import argparse
 import sys
 from typing import List, Optional
 
-from folder_extractor.config.constants import AUTHOR, HELP_TEXT, VERSION
+from folder_extractor.config.constants import (
+    AI_BATCH_SIZE,
+    AUTHOR,
+    HELP_TEXT,
+    VERSION,
+)
 from folder_extractor.utils.parsers import parse_depth
 
 
@@ -110,7 +115,17 @@ class ArgumentParser:
         parser.add_argument(
             "--extract-archives",
             action="store_true",
-            help="Archive (ZIP, TAR, GZ) entpacken und Inhalt extrahieren",
+            help="Archive (ZIP, TAR, GZ, ZST, 7Z, RAR) entpacken und Inhalt "
+            "extrahieren",
+        )
+
+        parser.add_argument(
+            "--archive-depth",
+            type=int,
+            default=None,
+            metavar="TIEFE",
+            help="Maximale Verschachtelungstiefe für Archive in Archiven "
+            "(0 = innere Archive nicht entpacken)",
         )
 
         parser.add_argument(
@@ -125,6 +140,22 @@ class ArgumentParser:
             help="Ordner überwachen und neue Dateien automatisch verarbeiten",
         )
 
+        parser.add_argument(
+            "--watch-workers",
+            type=int,
+            default=None,
+            metavar="ANZAHL",
+            help="Anzahl paralleler Verarbeitungs-Worker im Watch-Modus",
+        )
+
+        parser.add_argument(
+            "--ai-concurrency",
+            type=int,
+            default=None,
+            metavar="ANZAHL",
+            help="Anzahl gleichzeitiger KI-Analysen im Smart-Watch-Modus",
+        )
+
         parser.add_argument(
             "--ask",
             type=str,
@@ -132,6 +163,29 @@ class ArgumentParser:
             help="Natürlichsprachige Abfrage des Knowledge Graphs",
         )
 
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Nur im lokalen Suchindex suchen, ohne KI (nur mit --ask)",
+        )
+
+        parser.add_argument(
+            "--smart-sort",
+            action="store_true",
+            help="Dateien im aktuellen Ordner einmalig per KI sortieren",
+        )
+
+        parser.add_argument(
+            "--batch",
+            type=int,
+            nargs="?",
+            const=AI_BATCH_SIZE,
+            default=None,
+            metavar="ANZAHL",
+            help="Mehrere kleine Dateien pro KI-Anfrage analysieren "
+            "(nur mit --smart-sort)",
+        )
+
         return parser
 
     def parse_args(self, args: Optional[List[str]] = None) -> argparse.Namespace:
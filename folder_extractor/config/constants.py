@@ -198,6 +198,12 @@ ARCHIVE_EXTENSIONS = {
     ".tar.bz2",
     ".xz",
     ".tar.xz",
+    ".txz",
+    ".tbz2",
+    ".tar.zst",
+    ".tzst",
+    ".7z",
+    ".rar",
 }
 
 
@@ -280,6 +286,15 @@ Zusammenfassung:
     "QUERY_RESULTS_HEADER": "\n📚 Gefundene Dokumente ({count}):",
     "QUERY_RESULT_ITEM": "  • {path}",
     "QUERY_ERROR": "✗ Fehler bei der Abfrage: {error}",
+    "QUERY_AI_FALLBACK": "Nicht im lokalen Index gefunden, frage die KI...",
+    # Smart Sort (one-off AI categorization) messages
+    "SMART_SORT_NO_FILES": "Keine Dateien zum Sortieren gefunden.",
+    "SMART_SORT_ANALYZING": "🤖 Analysiere {count} Dateien (Batchgröße {batch})...",
+    "SMART_SORT_MOVED": "✓ {file} → {target}",
+    "SMART_SORT_ERROR": "✗ Fehler bei {file}: {error}",
+    "SMART_SORT_SUMMARY": "\n✓ {sorted} Dateien sortiert, ✗ {errors} Fehler",
+    "SMART_SORT_PRECLASSIFIED": "⚡ {hits} von {checked} Dateien ohne KI sortiert "
+    "({rate:.0%})",
     # Smart Watch Mode messages
     "SMART_WATCH_BANNER": "🧠 Smart Watch aktiv",
     "SMART_WATCH_PATH": "📂 Pfad: {path}",
@@ -312,13 +327,24 @@ Optionen:
     --global-dedup          Globale Deduplizierung über gesamten Zielordner
                             ⚠ WARNUNG: Kann bei großen Ordnern langsam sein!
     --domain DOMAINS        Nur Weblinks von bestimmten Domains (z.B. youtube.com)
-    --extract-archives      Archive (ZIP, TAR, GZ) entpacken und Inhalt extrahieren
+    --extract-archives      Archive (ZIP, TAR, GZ, ZST, 7Z, RAR) entpacken und
+                            Inhalt extrahieren
+    --archive-depth TIEFE   Verschachtelungstiefe für Archive in Archiven
+                            (0 = innere Archive nicht entpacken, Standard: 5)
     --delete-archives       Original-Archive nach erfolgreichem Entpacken löschen
                             (nur wirksam mit --extract-archives)
     --watch                 Ordner überwachen und neue Dateien automatisch verarbeiten
                             (Ctrl+C zum Beenden)
+    --watch-workers ANZAHL  Parallele Verarbeitungs-Worker im Watch-Modus
+                            (Standard: 2)
+    --ai-concurrency ANZAHL Gleichzeitige KI-Analysen im Smart-Watch-Modus
+                            (Standard: 4)
     --ask FRAGE             Natürlichsprachige Abfrage des Knowledge Graphs
                             (z.B. "Welche Versicherungsdokumente habe ich?")
+    --smart-sort            Dateien im aktuellen Ordner per KI einmalig nach
+                            Kategorie/Absender/Jahr sortieren
+    --batch [ANZAHL]        Mit --smart-sort: mehrere kleine Dateien pro
+                            KI-Anfrage analysieren (Standard: 10)
 
 Beispiele:
     # Alle Dateien aus Unterordnern extrahieren
@@ -359,6 +385,9 @@ Beispiele:
     folder-extractor --ask "Welche Versicherungsdokumente habe ich?"
     folder-extractor --ask "Zeig mir Rechnungen von Apple"
 
+    # Bestehenden Ordner einmalig per KI sortieren (20 Dateien pro Anfrage)
+    folder-extractor --smart-sort --batch 20
+
 Sicherheit:
     Das Tool funktioniert nur in den Ordnern Desktop, Downloads und Documents.
     
@@ -393,6 +422,12 @@ PREPROCESSOR_MAX_FILE_SIZE_MB = 20  # Gemini API limit
 PREPROCESSOR_MAX_IMAGE_DIMENSION = 2048  # Max image edge length
 PREPROCESSOR_JPG_QUALITY = 85  # JPG compression quality
 PREPROCESSOR_MAX_PDF_PAGES = 5  # Max PDF pages to extract
+PREPROCESSOR_WORKERS = 2  # Processes optimizing files (0 = threads only)
+PREPROCESSOR_CACHE_DIR_NAME = "preprocessed"  # Optimized files, in config root
+PREPROCESSOR_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Oldest outputs evicted beyond
+PREPROCESSOR_TEXT_FIRST = True  # Send text of digital PDFs instead of the file
+PREPROCESSOR_TEXT_MAX_BYTES = 8 * 1024  # Extracted text sent per document
+PREPROCESSOR_TEXT_MIN_CHARS = 200  # Less text means a scan, which is uploaded
 # Exotic image formats to convert to JPG
 PREPROCESSOR_EXOTIC_IMAGE_FORMATS = {".tiff", ".tif", ".bmp", ".webp"}
 
@@ -407,3 +442,276 @@ DEFAULT_CATEGORIES = [
     "Arbeit",
     "Reisen",
 ]
+
+# Archive Extraction Limits (shared by an archive and all archives nested in it)
+ARCHIVE_MAX_NESTING_DEPTH = 5  # Levels of inner archives to expand
+ARCHIVE_MAX_TOTAL_SIZE = 10 * 1024 * 1024 * 1024  # 10 GiB extracted bytes
+ARCHIVE_MAX_ENTRIES = 100_000  # Extracted entries (files and directories)
+
+# File Stability Monitoring (watch mode)
+# Seconds a file's size must stay unchanged (and, with inotify, unwritten)
+# before it counts as ready without a close or rename event
+MONITOR_STABILITY_WINDOW = 1.0
+MONITOR_EVENT_POLL_INTERVAL = 0.05  # Initial re-check interval with inotify events
+MONITOR_POLL_INTERVAL = 0.25  # Initial re-check interval when polling only
+MONITOR_MAX_POLL_INTERVAL = 1.0  # Upper bound after backoff for changing files
+
+# Watch Pipeline (event intake -> stability stage -> processing stage)
+WATCH_STABILITY_WORKERS = 16  # Concurrent stability waits (cheap with inotify)
+WATCH_PROCESSING_WORKERS = 2  # Concurrent processing of ready files
+WATCH_MAX_QUEUE_SIZE = 10_000  # Capacity of each pipeline stage queue
+WATCH_COALESCE_WINDOW = 0.5  # Seconds without events before a path is queued
+WATCH_AI_CONCURRENCY = 4  # Concurrent AI analyses per smart watcher
+
+# AI Request Scheduling (overridable via environment variables of the same name)
+AI_REQUESTS_PER_MINUTE = 60  # Generation requests per minute (quota of the API key)
+AI_TOKENS_PER_MINUTE = 1_000_000  # Input + output tokens per minute
+AI_MAX_CONCURRENT_UPLOADS = 4  # Files uploaded to the AI service at the same time
+AI_BURST_SECONDS = 10.0  # Bucket capacity in seconds of quota (limits bursts)
+AI_FILE_TOKEN_ESTIMATE = 1_500  # Assumed tokens per analyzed file (+ prompt)
+AI_RESPONSE_TOKEN_ESTIMATE = 500  # Assumed tokens per generated answer
+AI_RATE_LIMIT_COOLDOWN = 1.0  # Pause after a 429, doubled per consecutive 429
+AI_RATE_LIMIT_MAX_COOLDOWN = 30.0  # Upper bound for the pause after 429s
+AI_MIN_RATE_FACTOR = 0.1  # Lowest fraction of the quota used after 429s
+AI_RATE_RECOVERY_STEP = 0.05  # Fraction of quota regained per successful request
+
+# AI Result Cache (content hash + prompt/model fingerprint -> analysis result)
+AI_CACHE_FILE_NAME = "ai_cache.db"  # Stored in the config root directory
+AI_CACHE_TTL = 180 * 24 * 60 * 60  # Seconds until a cached result expires
+AI_CACHE_MAX_ENTRIES = 100_000  # Least recently used results are evicted beyond
+
+# AI Batch Analysis (several small documents per request)
+AI_BATCH_SIZE = 10  # Maximum documents per batch request
+AI_BATCH_MAX_FILE_SIZE = 2 * 1024 * 1024  # Larger files are analyzed alone
+AI_BATCH_CONCURRENCY = 4  # Batch requests in flight during bulk sorting
+
+# AI Upload Reuse (Gemini keeps uploaded files for 48 hours)
+AI_UPLOAD_TTL = 46 * 60 * 60  # Seconds an upload handle is reused
+AI_UPLOAD_CACHE_MAX_ENTRIES = 1000  # Least recently used handles are dropped beyond
+
+# Local Pre-Classification (sort obvious files without an AI request)
+PRECLASSIFIER_MIN_CONFIDENCE = 0.9  # Results below are sent to the AI instead
+PRECLASSIFIER_MIN_SENDER_DOCUMENTS = 3  # Documents before a sender rule is learned
+PRECLASSIFIER_MIN_SENDER_SHARE = 0.9  # Share of a sender's documents in one category
+PRECLASSIFIER_SENDER_REFRESH = 600  # Seconds between reloads of learned senders
+# Rules are tried in order; each matches by "extensions", "patterns" (filename
+# globs, case-insensitive), "file_types" (groups of FILE_TYPE_FOLDERS) or
+# "metadata" (text in EXIF/XMP of images or the document info of PDFs)
+PRECLASSIFIER_RULES = [
+    {
+        "name": "installer",
+        "extensions": [
+            ".dmg",
+            ".pkg",
+            ".exe",
+            ".msi",
+            ".deb",
+            ".rpm",
+            ".appimage",
+            ".apk",
+            ".iso",
+        ],
+        "category": "Technik",
+        "confidence": 0.95,
+    },
+    {
+        "name": "screenshot",
+        "patterns": [
+            "Screenshot*",
+            "Screen Shot*",
+            "Bildschirmfoto*",
+            "Simulator Screenshot*",
+        ],
+        "metadata": ["Screenshot"],
+        "category": "Privat",
+        "confidence": 0.9,
+    },
+    {
+        "name": "archive",
+        "file_types": ["ZIP", "RAR", "7ZIP", "TAR", "GZ", "BZ2", "XZ"],
+        "category": "Technik",
+        "confidence": 0.9,
+    },
+    {
+        "name": "media",
+        "file_types": ["VIDEO", "AUDIO"],
+        "category": "Privat",
+        "confidence": 0.9,
+    },
+    {
+        "name": "code",
+        "file_types": [
+            "PYTHON",
+            "JAVASCRIPT",
+            "TYPESCRIPT",
+            "JAVA",
+            "CPP",
+            "C",
+            "CSHARP",
+            "PHP",
+            "RUBY",
+            "GO",
+            "RUST",
+            "SWIFT",
+            "KOTLIN",
+            "HTML",
+            "CSS",
+            "SCSS",
+            "SASS",
+            "LESS",
+            "JSON",
+            "XML",
+            "YAML",
+            "TOML",
+            "INI",
+            "CONFIG",
+            "SQL",
+            "DATABASE",
+            "SQLITE",
+            "FONT",
+        ],
+        "category": "Technik",
+        "confidence": 0.9,
+    },
+]
+
+# Knowledge Graph Database (directory in the config directory)
+KNOWLEDGE_GRAPH_DB_NAME = "knowledge_graph.db"
+
+# Knowledge Graph Write-Behind (graph writes batched off the analysis path)
+KG_WRITE_BATCH_SIZE = 50  # Documents per transaction
+KG_WRITE_FLUSH_INTERVAL = 2.0  # Seconds a document waits at most before writing
+KG_WRITE_MAX_PENDING = 1000  # Queued documents before submit() waits for a flush
+
+# Knowledge Graph Connection Pool (concurrent readers next to one writer)
+KG_READ_CONNECTIONS = 4  # Read connections shared by threads and async tasks
+
+# Knowledge Graph Maintenance (re-keying moved documents, removing stale ones)
+KG_MAINTENANCE_INTERVAL = 600.0  # Seconds between background sweeps
+KG_MAINTENANCE_TIME_BUDGET = 2.0  # Seconds a sweep may run before it pauses
+KG_MAINTENANCE_BATCH_SIZE = 500  # Documents checked per step of a sweep
+KG_MAINTENANCE_MAX_MOVES = 10000  # Unmatched moves kept for re-keying by hash
+KG_MAINTENANCE_MOVE_TTL = 3600.0  # Seconds an unmatched move is kept
+
+# Knowledge Graph Queries (natural language → Cypher without repeated AI calls)
+QUERY_CACHE_FILE_NAME = "query_cache.db"  # Stored next to the graph database
+QUERY_CACHE_MAX_ENTRIES = 1000  # Least recently used translations are evicted beyond
+# Words a query may contain besides entity, category and year and still be
+# answered by a local template; any other word is left to the AI
+QUERY_TEMPLATE_FILLER_WORDS = [
+    # German
+    "zeig",
+    "zeige",
+    "mir",
+    "gib",
+    "finde",
+    "suche",
+    "liste",
+    "welche",
+    "habe",
+    "ich",
+    "alle",
+    "meine",
+    "bitte",
+    "der",
+    "die",
+    "das",
+    "den",
+    "dem",
+    "des",
+    "von",
+    "vom",
+    "aus",
+    "im",
+    "in",
+    "zu",
+    "zum",
+    "zur",
+    "mit",
+    "über",
+    "jahr",
+    "kategorie",
+    "dokument",
+    "dokumente",
+    "datei",
+    "dateien",
+    "unterlagen",
+    # English
+    "show",
+    "me",
+    "find",
+    "list",
+    "which",
+    "do",
+    "i",
+    "have",
+    "all",
+    "my",
+    "the",
+    "from",
+    "of",
+    "by",
+    "with",
+    "about",
+    "year",
+    "category",
+    "document",
+    "documents",
+    "file",
+    "files",
+]
+
+# Local Document Search (SQLite FTS5 index kept next to the knowledge graph)
+SEARCH_INDEX_FILE_NAME = "search_index.db"  # Stored next to the graph database
+SEARCH_DEFAULT_LIMIT = 50  # Results returned by a search
+SEARCH_MAX_LIMIT = 500  # Upper bound for the limit requested via the API
+
+# Paged Query Results (cursor pagination and NDJSON streaming)
+QUERY_PAGE_SIZE = 500  # Document paths per page or stream chunk
+QUERY_MAX_PAGE_SIZE = 5000  # Upper bound for the page size requested via the API
+
+# WebSocket Broadcast (per-client send queues, so slow clients never block others)
+WS_SEND_QUEUE_SIZE = 256  # Messages queued per client before the policy applies
+WS_SEND_TIMEOUT = 10.0  # Seconds one send may take before the client is dropped
+# What happens when a client's queue is full: "drop_oldest" discards the oldest
+# queued message, "disconnect" closes the connection
+WS_SLOW_CLIENT_POLICY = "drop_oldest"
+# Message types of which a client only needs the latest; a newer message
+# replaces the queued one instead of adding to the backlog
+WS_COALESCED_TYPES = ["progress"]
+
+# WebSocket Bridge (progress, events and logs from worker threads to the server loop)
+WS_BRIDGE_FRAME_RATE = 20  # Batches handed to the event loop per second at most
+WS_BRIDGE_MAX_PENDING = 10000  # Messages waiting for the next batch; oldest dropped
+
+# Progress Snapshots (watcher progress and status events collapsed per zone)
+WS_PROGRESS_SNAPSHOT_RATE = 4.0  # Snapshots broadcast per zone and second at most
+WS_PROGRESS_RECENT_FILES = 10  # Names of recently finished files in a snapshot
+
+# API Processing Jobs (bounded queue and worker pool behind POST /process)
+API_JOB_WORKERS = 2  # Worker threads processing queued files
+API_JOB_QUEUE_SIZE = 1000  # Queued files before POST /process answers 429
+API_JOB_BATCH_SIZE = 100  # Queued files of one destination processed in one call
+API_JOB_HISTORY_SIZE = 1000  # Finished jobs kept for GET /tasks/{task_id}
+API_JOB_RETRY_AFTER = 1  # Seconds a client is asked to wait after a 429
+API_JOB_MAX_BATCH_FILES = 10000  # Paths accepted by one POST /process/batch
+API_JOB_STREAM_INTERVAL = 0.5  # Seconds between checks of a streamed task
+
+# Metrics (in-process registry rendered by GET /metrics)
+# Upper bounds of the latency histogram buckets in seconds
+METRICS_LATENCY_BUCKETS = [
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+]
@@ -11,6 +11,16 @@ import json
 from pathlib import Path
 from typing import Any, Optional
 
+from folder_extractor.config.constants import (
+    ARCHIVE_MAX_ENTRIES,
+    ARCHIVE_MAX_NESTING_DEPTH,
+    ARCHIVE_MAX_TOTAL_SIZE,
+    PRECLASSIFIER_MIN_CONFIDENCE,
+    WATCH_AI_CONCURRENCY,
+    WATCH_PROCESSING_WORKERS,
+    WS_PROGRESS_SNAPSHOT_RATE,
+)
+
 
 class Settings:
     """Runtime settings manager."""
@@ -32,6 +42,11 @@ class Settings:
             # Archive settings
             "extract_archives": False,
             "delete_archives": False,
+            "archive_nesting_depth": ARCHIVE_MAX_NESTING_DEPTH,
+            "archive_max_total_size": ARCHIVE_MAX_TOTAL_SIZE,
+            "archive_max_entries": ARCHIVE_MAX_ENTRIES,
+            "watch_workers": WATCH_PROCESSING_WORKERS,
+            "watch_ai_concurrency": WATCH_AI_CONCURRENCY,
             # Filtering
             "file_type_filter": None,
             "domain_filter": None,
@@ -39,6 +54,8 @@ class Settings:
             "batch_size": 100,
             "show_progress": True,
             "progress_update_interval": 0.1,
+            # Progress snapshots per zone and second sent to WebSocket clients
+            "progress_snapshot_rate": WS_PROGRESS_SNAPSHOT_RATE,
             # Safety
             "confirm_operations": True,
             "safe_mode": True,
@@ -48,6 +65,13 @@ class Settings:
             "color_output": True,
             # Smart Sorting
             "custom_categories": [],
+            "ai_batch_size": 1,  # Files per AI request (1 = no batching)
+            # Local pre-classification before AI requests
+            "preclassifier_enabled": True,
+            "preclassifier_rules": [],  # Custom rules, tried before the defaults
+            "preclassifier_min_confidence": PRECLASSIFIER_MIN_CONFIDENCE,
+            # --ask: translate questions the search index cannot answer by AI
+            "ask_ai_fallback": True,
             # Watch mode
             "watch_mode": False,
         }
@@ -123,6 +147,10 @@ class Settings:
     def delete_archives(self) -> bool:
         return self._settings["delete_archives"]
 
+    @property
+    def archive_nesting_depth(self) -> int:
+        return self._settings["archive_nesting_depth"]
+
     @property
     def custom_categories(self) -> list:
         return self._settings["custom_categories"]
@@ -167,6 +195,26 @@ def configure_from_args(settings: Settings, args) -> None:
     # delete_archives only makes sense with extract_archives enabled
     settings.set("delete_archives", delete_archives and extract_archives)
 
+    archive_depth = getattr(args, "archive_depth", None)
+    if isinstance(archive_depth, int):
+        settings.set("archive_nesting_depth", archive_depth)
+
+    watch_workers = getattr(args, "watch_workers", None)
+    if isinstance(watch_workers, int):
+        settings.set("watch_workers", max(1, watch_workers))
+
+    ai_concurrency = getattr(args, "ai_concurrency", None)
+    if isinstance(ai_concurrency, int):
+        settings.set("watch_ai_concurrency", max(1, ai_concurrency))
+
+    # Smart sort batching (--batch without --smart-sort has no effect)
+    batch = getattr(args, "batch", None)
+    if isinstance(batch, int):
+        settings.set("ai_batch_size", max(1, batch))
+
+    # Knowledge graph queries (--offline only uses the local search index)
+    settings.set("ask_ai_fallback", getattr(args, "offline", False) is not True)
+
     # Watch mode
     settings.set("watch_mode", getattr(args, "watch", False))
 
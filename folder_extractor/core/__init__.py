@@ -3,10 +3,16 @@ Core business logic for Folder Extractor.
 """
 
 from .archives import (
+    CompressedFileHandler,
     IArchiveHandler,
+    RarHandler,
+    SevenZipHandler,
     TarHandler,
     ZipHandler,
+    ZstdTarHandler,
+    detect_archive_format,
     get_archive_handler,
+    register_archive_handler,
 )
 from .security import (
     APIKeyError,
@@ -26,6 +32,11 @@ try:
         ai_retry,
         create_ai_retry_decorator,
     )
+    from .ai_scheduler import (
+        PRIORITY_BULK,
+        PRIORITY_INTERACTIVE,
+        AIRequestScheduler,
+    )
 except ImportError:
     # google-generativeai not installed (e.g., Python 3.8)
     # AI features will not be available
@@ -10,7 +10,10 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Optional
 
@@ -21,7 +24,23 @@ from google.api_core.exceptions import (
     ServiceUnavailable,
 )
 
+from folder_extractor.config.constants import (
+    AI_FILE_TOKEN_ESTIMATE,
+    AI_RESPONSE_TOKEN_ESTIMATE,
+    AI_UPLOAD_CACHE_MAX_ENTRIES,
+    AI_UPLOAD_TTL,
+    PREPROCESSOR_CACHE_DIR_NAME,
+)
+from folder_extractor.core.ai_prompts import format_extracted_text, get_batch_prompt
 from folder_extractor.core.ai_resilience import ai_retry
+from folder_extractor.core.ai_scheduler import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    AIRequestScheduler,
+    estimate_tokens,
+)
+from folder_extractor.core.file_operations import FileOperations, get_config_dir
+from folder_extractor.core.metrics import timed
 from folder_extractor.core.preprocessor import FilePreprocessor, PreprocessorError
 from folder_extractor.core.security import load_google_api_key
 
@@ -48,6 +67,7 @@ class IAIClient(ABC):
         filepath: Path,
         mime_type: str,
         prompt: str,
+        content_hash: Optional[str] = None,
     ) -> dict[str, Any]:
         """
         Analyze a file using AI model.
@@ -56,6 +76,8 @@ class IAIClient(ABC):
             filepath: Path to the file to analyze
             mime_type: MIME type of the file (e.g., "image/jpeg")
             prompt: Analysis prompt for the AI model
+            content_hash: Content hash of the file if the caller already
+                calculated it (saves hashing the file again)
 
         Returns:
             Dictionary containing the analysis results (parsed JSON)
@@ -84,13 +106,98 @@ class IAIClient(ABC):
         """
         pass
 
+    async def analyze_files(
+        self,
+        files: list[tuple[Path, str]],
+        prompt: str,
+        hashes: Optional[list[Optional[str]]] = None,
+    ) -> list[Optional[dict[str, Any]]]:
+        """
+        Analyze several files, ideally in a single AI request.
+
+        The default implementation analyzes the files one after another;
+        clients that can pack several files into one request override it.
+
+        Args:
+            files: List of (filepath, mime_type) tuples
+            prompt: Analysis prompt for a single document
+            hashes: Content hashes of ``files`` if already calculated (same
+                order; None entries are calculated by the client if needed)
+
+        Returns:
+            One result per file, in the order of ``files``. An entry is None
+            if the model returned no result for that file; callers should
+            analyze it individually.
+
+        Raises:
+            AIClientError: If the analysis fails after all retries
+        """
+        if hashes is None:
+            hashes = [None] * len(files)
+        return [
+            await self.analyze_file(filepath, mime_type, prompt, content_hash)
+            for (filepath, mime_type), content_hash in zip(files, hashes)
+        ]
+
+
+class _UploadCache:
+    """Handles of uploaded files, keyed by content hash and MIME type.
+
+    Gemini keeps uploaded files for 48 hours, so a handle can be reused by
+    retries and by byte-identical copies instead of uploading again.
+    """
+
+    def __init__(
+        self,
+        ttl: float = AI_UPLOAD_TTL,
+        max_entries: int = AI_UPLOAD_CACHE_MAX_ENTRIES,
+    ):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> Any:
+        """Return the handle for ``key``, or None if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            handle, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return handle
+
+    def put(self, key: tuple[str, str], handle: Any) -> None:
+        """Remember an uploaded file handle."""
+        with self._lock:
+            self._entries[key] = (handle, time.monotonic() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, handles: list[Any]) -> None:
+        """Forget the given handles, e.g. after the server rejected them."""
+        with self._lock:
+            for key in [k for k, (h, _) in self._entries.items() if h in handles]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
 
 class AsyncGeminiClient(IAIClient):
     """
     Async client for Google Gemini API.
 
     Supports: gemini-3-flash-preview model with JSON response format
-    Features: Automatic retry on rate limits and server errors
+    Features: Automatic retry on rate limits and server errors, requests
+    paced by an AIRequestScheduler (file analyses in the bulk lane, text
+    generation in the interactive lane), uploads reused across retries and
+    for identical content, digital PDFs sent as extracted text
     """
 
     DEFAULT_MODEL: str = "gemini-3-flash-preview"
@@ -99,6 +206,7 @@ class AsyncGeminiClient(IAIClient):
         self,
         api_key: Optional[str] = None,
         model_name: str = DEFAULT_MODEL,
+        scheduler: Optional[AIRequestScheduler] = None,
     ):
         """
         Initialize Gemini client.
@@ -106,6 +214,8 @@ class AsyncGeminiClient(IAIClient):
         Args:
             api_key: Google API key (loads from env if not provided)
             model_name: Gemini model to use (default: gemini-1.5-flash)
+            scheduler: Request scheduler enforcing the API quota (default:
+                a scheduler configured from the environment)
 
         Raises:
             APIKeyError: If API key cannot be loaded
@@ -116,28 +226,39 @@ class AsyncGeminiClient(IAIClient):
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model_name)
         self.model_name = model_name
-        self.preprocessor = FilePreprocessor()
-
-    @ai_retry
+        self.preprocessor = FilePreprocessor(
+            cache_dir=get_config_dir() / PREPROCESSOR_CACHE_DIR_NAME
+        )
+        self.scheduler = scheduler or AIRequestScheduler.from_env()
+        self._uploads = _UploadCache()
+        self._file_ops = FileOperations()
+
+    @timed("ai_analyze_file")
     async def analyze_file(
         self,
         filepath: Path,
         mime_type: str,
         prompt: str,
+        content_hash: Optional[str] = None,
     ) -> dict[str, Any]:
         """
         Analyze file using Gemini model with automatic retry.
 
-        Uploads file, sends prompt, and returns JSON response.
-        Automatically retries on rate limits (429) and server errors (5xx).
-        Files are automatically preprocessed before upload if they exceed
-        size limits or use exotic formats.
+        Uploads file, sends prompt, and returns JSON response. Digital PDFs
+        are not uploaded; their extracted text is sent with the filename
+        instead (see FilePreprocessor.extract_text_async()). Upload and
+        generation are retried separately on rate limits (429)
+        and server errors (5xx), so a failed generation never uploads the
+        file again. Files are automatically preprocessed before upload if
+        they exceed size limits or use exotic formats.
 
         Args:
             filepath: Path to the file to analyze. Files > 20MB are
                 automatically optimized before upload.
             mime_type: MIME type of the file
             prompt: Analysis prompt
+            content_hash: Content hash of the file if already calculated
+                (calculated here otherwise, for the upload cache)
 
         Returns:
             Parsed JSON response as dictionary
@@ -151,7 +272,9 @@ class AsyncGeminiClient(IAIClient):
             - Images > 20MB are resized to max 2048px and converted to JPG
             - PDFs > 20MB have only first 5 pages extracted
             - Exotic formats (TIFF, BMP, WebP) are converted to JPG
-            - Temporary files are automatically cleaned up after analysis
+            - Temporary files are kept until the last attempt, then removed
+            Upload handles are cached by content hash for AI_UPLOAD_TTL, so
+            identical files are not uploaded twice.
         """
         # Validate filepath
         if not filepath.exists():
@@ -160,34 +283,17 @@ class AsyncGeminiClient(IAIClient):
         if not filepath.is_file():
             raise AIClientError(f"Path is not a file: {filepath}")
 
-        # Preprocess file (may create optimized temporary copy)
-        try:
-            optimized_path, needs_cleanup = self.preprocessor.prepare_file(filepath)
-            logger.info(
-                f"File preprocessed: {filepath.name} -> {optimized_path.name} "
-                f"(cleanup={needs_cleanup})"
-            )
-        except PreprocessorError as e:
-            raise AIClientError(f"File preprocessing failed: {e}") from e
-
+        prepared: list[tuple[Path, bool]] = []
+        uploaded_files: list[Any] = []
         try:
-            logger.debug(f"Uploading file: {optimized_path}")
-
-            # Upload file in thread pool (blocking operation)
-            # Use run_in_executor for Python 3.8 compatibility (to_thread requires 3.9+)
-            loop = asyncio.get_running_loop()
-            uploaded_file = await loop.run_in_executor(
-                None,  # Use default executor
-                lambda: genai.upload_file(
-                    path=str(optimized_path), mime_type=mime_type
-                ),
+            content, content_tokens = await self._document_content(
+                filepath, mime_type, prepared, uploaded_files, content_hash
             )
 
-            # Generate content with JSON response format
-            response = await self.model.generate_content_async(
-                [uploaded_file, prompt],
-                generation_config={"response_mime_type": "application/json"},
+            estimated_tokens = (
+                estimate_tokens(prompt) + content_tokens + AI_RESPONSE_TOKEN_ESTIMATE
             )
+            response = await self._generate([content, prompt], estimated_tokens)
 
             # Parse JSON response
             try:
@@ -201,18 +307,18 @@ class AsyncGeminiClient(IAIClient):
                 ) from e
 
         except (ResourceExhausted, InternalServerError, ServiceUnavailable):
-            # Re-raise retriable exceptions for @ai_retry decorator to handle
+            # Retries are exhausted; propagate the original error
             raise
         except AIClientError:
             # Re-raise our own errors (not retriable)
             raise
         except Exception as e:
-            # Wrap only non-retriable, unexpected errors
+            # The server may have rejected a reused handle; upload again next time
+            self._uploads.discard(uploaded_files)
             raise AIClientError(f"AI analysis failed: {e}") from e
         finally:
-            # Always cleanup temporary files
-            if needs_cleanup:
-                self._cleanup_temp_file(optimized_path)
+            # Temporary files are no longer needed after the last attempt
+            self._cleanup_prepared(prepared)
 
     @ai_retry
     async def generate_response(
@@ -247,14 +353,17 @@ class AsyncGeminiClient(IAIClient):
         try:
             logger.debug(f"Generating response for prompt: {prompt[:100]}...")
 
-            # Configure generation for JSON or text response
-            if json_response:
-                response = await self.model.generate_content_async(
-                    prompt,
-                    generation_config={"response_mime_type": "application/json"},
-                )
-            else:
-                response = await self.model.generate_content_async(prompt)
+            estimated_tokens = estimate_tokens(prompt) + AI_RESPONSE_TOKEN_ESTIMATE
+            async with self.scheduler.request(PRIORITY_INTERACTIVE, estimated_tokens):
+                # Configure generation for JSON or text response
+                if json_response:
+                    response = await self.model.generate_content_async(
+                        prompt,
+                        generation_config={"response_mime_type": "application/json"},
+                    )
+                else:
+                    response = await self.model.generate_content_async(prompt)
+            self._record_response(response, estimated_tokens)
 
             if not response.text:
                 raise AIClientError("Model returned empty response")
@@ -274,7 +383,11 @@ class AsyncGeminiClient(IAIClient):
             logger.info("Text response generated successfully")
             return response.text
 
-        except (ResourceExhausted, InternalServerError, ServiceUnavailable):
+        except ResourceExhausted:
+            # Slow down all requests, then let @ai_retry retry this one
+            self.scheduler.record_rate_limited()
+            raise
+        except (InternalServerError, ServiceUnavailable):
             # Re-raise retriable exceptions for @ai_retry decorator to handle
             raise
         except AIClientError:
@@ -284,6 +397,278 @@ class AsyncGeminiClient(IAIClient):
             # Wrap only non-retriable, unexpected errors
             raise AIClientError(f"Text generation failed: {e}") from e
 
+    @timed("ai_analyze_files")
+    async def analyze_files(
+        self,
+        files: list[tuple[Path, str]],
+        prompt: str,
+        hashes: Optional[list[Optional[str]]] = None,
+    ) -> list[Optional[dict[str, Any]]]:
+        """
+        Analyze several files with a single Gemini request.
+
+        All files are uploaded (digital PDFs are included as extracted text
+        instead), then sent in one request together with a
+        batch prompt that asks for a JSON array keyed by file index. This
+        saves the per-request overhead for small documents such as receipts
+        and photos. Upload and generation are retried separately on rate
+        limits (429) and server errors (5xx).
+
+        Args:
+            files: List of (filepath, mime_type) tuples
+            prompt: Analysis prompt for a single document (extended with
+                batch instructions by get_batch_prompt())
+            hashes: Content hashes of ``files`` if already calculated (same
+                order; missing hashes are calculated for the upload cache)
+
+        Returns:
+            One result per file, in the order of ``files``. An entry is None
+            if the response contained no valid result for that file.
+
+        Raises:
+            AIClientError: If a file doesn't exist, preprocessing fails or
+                the response is not a JSON array
+        """
+        if not files:
+            return []
+        for filepath, _ in files:
+            if not filepath.is_file():
+                raise AIClientError(f"File does not exist: {filepath}")
+
+        if hashes is None:
+            hashes = [None] * len(files)
+        batch_prompt = get_batch_prompt(prompt, len(files))
+        prepared: list[tuple[Path, bool]] = []
+        uploaded_files: list[Any] = []
+        try:
+            parts = await asyncio.gather(
+                *(
+                    self._document_content(
+                        filepath, mime_type, prepared, uploaded_files, content_hash
+                    )
+                    for (filepath, mime_type), content_hash in zip(files, hashes)
+                )
+            )
+            contents: list[Any] = []
+            for index, (content, _) in enumerate(parts):
+                contents.extend([f"Dokument {index}:", content])
+            contents.append(batch_prompt)
+
+            estimated_tokens = (
+                estimate_tokens(batch_prompt)
+                + sum(tokens for _, tokens in parts)
+                + len(files) * AI_RESPONSE_TOKEN_ESTIMATE
+            )
+            response = await self._generate(contents, estimated_tokens)
+
+            try:
+                items = json.loads(response.text)
+            except json.JSONDecodeError as e:
+                raise AIClientError(
+                    f"Failed to parse JSON response: {e}. "
+                    f"Response was: {response.text[:200]}..."
+                ) from e
+            if not isinstance(items, list):
+                raise AIClientError("Batch response is not a JSON array")
+
+            results: list[Optional[dict[str, Any]]] = [None] * len(files)
+            for item in items:
+                index = item.get("index") if isinstance(item, dict) else None
+                if isinstance(index, int) and 0 <= index < len(files):
+                    results[index] = {k: v for k, v in item.items() if k != "index"}
+            logger.info(
+                f"Batch analyzed: {sum(r is not None for r in results)}"
+                f"/{len(files)} files"
+            )
+            return results
+
+        except (ResourceExhausted, InternalServerError, ServiceUnavailable):
+            # Retries are exhausted; propagate the original error
+            raise
+        except AIClientError:
+            # Re-raise our own errors (not retriable)
+            raise
+        except Exception as e:
+            # The server may have rejected a reused handle; upload again next time
+            self._uploads.discard(uploaded_files)
+            raise AIClientError(f"AI batch analysis failed: {e}") from e
+        finally:
+            self._cleanup_prepared(prepared)
+
+    async def _document_content(
+        self,
+        filepath: Path,
+        mime_type: str,
+        prepared: list[tuple[Path, bool]],
+        uploaded_files: list[Any],
+        content_hash: Optional[str] = None,
+    ) -> tuple[Any, int]:
+        """Return the request part representing a document.
+
+        Digital PDFs are represented by their extracted text and filename;
+        scans, images and all other files by an upload handle, which is
+        also appended to ``uploaded_files``.
+
+        Args:
+            filepath: Original file to analyze
+            mime_type: MIME type of the file
+            prepared: Collects prepared files for cleanup (see _upload_file())
+            uploaded_files: Collects the upload handles used
+            content_hash: Content hash of the file if already calculated
+
+        Returns:
+            Tuple of (request part, estimated input tokens)
+
+        Raises:
+            AIClientError: If file preprocessing fails
+        """
+        text = await self.preprocessor.extract_text_async(filepath)
+        if isinstance(text, str):
+            logger.info(f"Sending extracted text instead of file: {filepath.name}")
+            content = format_extracted_text(filepath.name, text)
+            return content, estimate_tokens(content)
+
+        uploaded_file = await self._upload_file(
+            filepath, mime_type, prepared, content_hash
+        )
+        uploaded_files.append(uploaded_file)
+        return uploaded_file, AI_FILE_TOKEN_ESTIMATE
+
+    async def _upload_file(
+        self,
+        filepath: Path,
+        mime_type: str,
+        prepared: list[tuple[Path, bool]],
+        content_hash: Optional[str] = None,
+    ) -> Any:
+        """Return an upload handle for a file, uploading it only if needed.
+
+        A handle cached for the same content and MIME type is reused.
+        Otherwise the file is preprocessed and uploaded; the prepared file
+        is appended to ``prepared`` so the caller can clean it up after its
+        last attempt.
+
+        Args:
+            filepath: Original file to analyze
+            mime_type: MIME type of the file
+            prepared: Collects (optimized_path, needs_cleanup) tuples
+            content_hash: Content hash of the file if already calculated
+                (calculated off the event loop otherwise)
+
+        Returns:
+            Handle of the uploaded file for use in generation requests
+
+        Raises:
+            AIClientError: If file preprocessing fails
+        """
+        if content_hash is None:
+            loop = asyncio.get_running_loop()
+            try:
+                content_hash = await loop.run_in_executor(
+                    None, self._file_ops.calculate_file_hash, filepath
+                )
+            except Exception as e:
+                logger.debug(f"Could not hash {filepath.name}, upload not cached: {e}")
+        key = (content_hash, mime_type) if content_hash is not None else None
+
+        if key is not None:
+            uploaded_file = self._uploads.get(key)
+            if uploaded_file is not None:
+                logger.debug(f"Reusing uploaded file for {filepath.name}")
+                return uploaded_file
+
+        # Preprocess file off the event loop (may create optimized temporary copy)
+        try:
+            optimized_path, needs_cleanup = await self.preprocessor.prepare_file_async(
+                filepath, content_hash
+            )
+            logger.info(
+                f"File preprocessed: {filepath.name} -> {optimized_path.name} "
+                f"(cleanup={needs_cleanup})"
+            )
+        except PreprocessorError as e:
+            raise AIClientError(f"File preprocessing failed: {e}") from e
+        prepared.append((optimized_path, needs_cleanup))
+
+        uploaded_file = await self._upload(optimized_path, mime_type)
+        if key is not None:
+            self._uploads.put(key, uploaded_file)
+        return uploaded_file
+
+    @ai_retry
+    async def _generate(self, contents: list[Any], estimated_tokens: int) -> Any:
+        """Send a JSON generation request in the bulk lane.
+
+        Only this step is repeated when Gemini answers with 429 or 5xx;
+        uploaded files are reused by every attempt.
+
+        Args:
+            contents: Uploaded file handles and prompt text
+            estimated_tokens: Tokens to reserve with the scheduler
+
+        Returns:
+            Response of the Gemini model
+        """
+        try:
+            async with self.scheduler.request(PRIORITY_BULK, estimated_tokens):
+                response = await self.model.generate_content_async(
+                    contents,
+                    generation_config={"response_mime_type": "application/json"},
+                )
+        except ResourceExhausted:
+            # Slow down all requests, then let @ai_retry retry this one
+            self.scheduler.record_rate_limited()
+            raise
+        self._record_response(response, estimated_tokens)
+        return response
+
+    @ai_retry
+    async def _upload(self, path: Path, mime_type: str) -> Any:
+        """Upload a file to Gemini, limited by the scheduler's upload slots.
+
+        Retried on its own on rate limits (429) and server errors (5xx).
+
+        Args:
+            path: File to upload (already preprocessed)
+            mime_type: MIME type of the file
+
+        Returns:
+            Handle of the uploaded file for use in generation requests
+        """
+        logger.debug(f"Uploading file: {path}")
+        # Upload file in thread pool (blocking operation)
+        # Use run_in_executor for Python 3.8 compatibility (to_thread requires 3.9+)
+        loop = asyncio.get_running_loop()
+        try:
+            async with self.scheduler.upload():
+                return await loop.run_in_executor(
+                    None,  # Use default executor
+                    lambda: genai.upload_file(path=str(path), mime_type=mime_type),
+                )
+        except ResourceExhausted:
+            # Slow down all requests, then let @ai_retry retry the upload
+            self.scheduler.record_rate_limited()
+            raise
+
+    def _record_response(self, response: Any, estimated_tokens: int) -> None:
+        """Report a successful request and its real token usage to the scheduler.
+
+        Args:
+            response: Response returned by the Gemini model.
+            estimated_tokens: Tokens estimated when the request was scheduled.
+        """
+        self.scheduler.record_success()
+        usage = getattr(response, "usage_metadata", None)
+        total_tokens = getattr(usage, "total_token_count", None)
+        if isinstance(total_tokens, int) and total_tokens > 0:
+            self.scheduler.record_usage(estimated_tokens, total_tokens)
+
+    def _cleanup_prepared(self, prepared: list[tuple[Path, bool]]) -> None:
+        """Remove the temporary copies among prepared files."""
+        for optimized_path, needs_cleanup in prepared:
+            if needs_cleanup:
+                self._cleanup_temp_file(optimized_path)
+
     def _cleanup_temp_file(self, filepath: Path) -> None:
         """Clean up temporary file created by preprocessor.
 
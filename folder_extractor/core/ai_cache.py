@@ -0,0 +1,215 @@
+"""
+Persistent cache for AI analysis results.
+
+Analyzing a file costs an upload and a model request. Byte-identical copies
+and files that are dropped into a zone again produce the same result, so
+results are stored in a SQLite database under the config directory.
+
+The cache key combines the SHA-256 hash of the file content with a
+fingerprint of the analysis prompt and the model name. The prompt contains
+the category list, so changing the categories (or the model) automatically
+leads to cache misses; entries of old fingerprints are no longer read and
+age out through TTL and LRU eviction.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from folder_extractor.config.constants import (
+    AI_CACHE_FILE_NAME,
+    AI_CACHE_MAX_ENTRIES,
+    AI_CACHE_TTL,
+)
+from folder_extractor.core.file_operations import get_config_dir
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_results (
+    content_hash TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (content_hash, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS idx_ai_results_last_access
+    ON ai_results (last_access);
+"""
+
+
+def analysis_fingerprint(prompt: str, model_name: str) -> str:
+    """Hash the inputs that influence an analysis besides the file itself.
+
+    Args:
+        prompt: Analysis prompt (includes the category list).
+        model_name: Name of the AI model.
+
+    Returns:
+        Hexadecimal SHA-256 fingerprint.
+    """
+    return hashlib.sha256(f"{model_name}\0{prompt}".encode()).hexdigest()
+
+
+class AIResultCache:
+    """SQLite-backed cache of AI analysis results with TTL and LRU eviction.
+
+    The cache is fail-safe: database errors are logged and treated as cache
+    misses, so a broken cache never blocks file processing.
+
+    Attributes:
+        db_path: Location of the SQLite database.
+        ttl: Seconds until an entry expires.
+        max_entries: Maximum number of entries before LRU eviction.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl: float = AI_CACHE_TTL,
+        max_entries: int = AI_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            db_path: Database file (default: ai_cache.db in the config dir).
+            ttl: Seconds until an entry expires.
+            max_entries: Maximum number of entries before LRU eviction.
+        """
+        self.db_path = db_path or get_config_dir() / AI_CACHE_FILE_NAME
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"AI result cache disabled ({self.db_path}): {e}")
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the database could be opened."""
+        return self._conn is not None
+
+    def get(self, content_hash: str, fingerprint: str) -> Optional[dict[str, Any]]:
+        """Look up a cached result.
+
+        Args:
+            content_hash: SHA-256 hash of the file content.
+            fingerprint: Fingerprint from analysis_fingerprint().
+
+        Returns:
+            The cached result, or None on a miss or expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT result, created FROM ai_results "
+                    "WHERE content_hash = ? AND fingerprint = ?",
+                    (content_hash, fingerprint),
+                ).fetchone()
+                if row is None or now - row[1] > self.ttl:
+                    if row is not None:
+                        self._delete(content_hash, fingerprint)
+                    self._misses += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE ai_results SET last_access = ? "
+                    "WHERE content_hash = ? AND fingerprint = ?",
+                    (now, content_hash, fingerprint),
+                )
+                self._conn.commit()
+                result = json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"AI result cache lookup failed: {e}")
+                self._misses += 1
+                return None
+            self._hits += 1
+            return result
+
+    def put(self, content_hash: str, fingerprint: str, result: dict[str, Any]) -> None:
+        """Store a result and evict expired and least recently used entries.
+
+        Args:
+            content_hash: SHA-256 hash of the file content.
+            fingerprint: Fingerprint from analysis_fingerprint().
+            result: JSON-serializable analysis result.
+        """
+        now = time.time()
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ai_results "
+                    "(content_hash, fingerprint, result, created, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (content_hash, fingerprint, json.dumps(result), now, now),
+                )
+                self._conn.execute(
+                    "DELETE FROM ai_results WHERE created < ?", (now - self.ttl,)
+                )
+                self._conn.execute(
+                    "DELETE FROM ai_results WHERE rowid IN ("
+                    "SELECT rowid FROM ai_results ORDER BY last_access DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self._conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"AI result cache update failed: {e}")
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("DELETE FROM ai_results")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"AI result cache clear failed: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of entries, hits and misses."""
+        with self._lock:
+            entries = 0
+            if self._conn is not None:
+                with contextlib.suppress(sqlite3.Error):
+                    entries = self._conn.execute(
+                        "SELECT COUNT(*) FROM ai_results"
+                    ).fetchone()[0]
+            return {"entries": entries, "hits": self._hits, "misses": self._misses}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _delete(self, content_hash: str, fingerprint: str) -> None:
+        """Delete one entry (lock held)."""
+        assert self._conn is not None
+        self._conn.execute(
+            "DELETE FROM ai_results WHERE content_hash = ? AND fingerprint = ?",
+            (content_hash, fingerprint),
+        )
+        self._conn.commit()
@@ -121,3 +121,74 @@ Persönliches Foto ohne erkennbaren Absender:
 Antworte nur mit dem JSON-Objekt, ohne zusätzlichen Text."""
 
     return prompt
+
+
+def get_batch_prompt(system_prompt: str, count: int) -> str:
+    """
+    Erweitert einen Einzeldokument-Prompt für die Analyse mehrerer Dokumente.
+
+    Mehrere kleine Dokumente werden in einer einzigen Anfrage gesendet, jeweils
+    eingeleitet durch "Dokument <index>:". Die Antwort ist ein JSON-Array mit
+    einem Objekt pro Dokument, das über das Feld "index" zugeordnet wird.
+
+    Args:
+        system_prompt: Prompt für ein einzelnes Dokument (z.B. von
+            get_system_prompt()).
+        count: Anzahl der Dokumente in der Anfrage.
+
+    Returns:
+        Prompt für die Stapelanalyse.
+
+    Examples:
+        >>> prompt = get_batch_prompt(get_system_prompt(["Finanzen"]), 3)
+        >>> '"index"' in prompt
+        True
+    """
+    return f"""{system_prompt}
+
+## Stapelverarbeitung
+
+Diese Anfrage enthält {count} Dokumente. Jedes Dokument ist durch
+"Dokument <index>:" eingeleitet (index 0 bis {count - 1}).
+
+Analysiere jedes Dokument einzeln nach den obigen Regeln. Antworte
+ausschließlich mit einem JSON-Array, das für jedes Dokument genau ein Objekt
+im obigen Format enthält, ergänzt um das Feld "index" mit der Nummer des
+Dokuments:
+
+```json
+[
+  {{"index": 0, "category": "Finanzen", "sender": "Telekom Deutschland GmbH",
+   "year": "2024", "entities": []}},
+  {{"index": 1, "category": "Privat", "sender": null, "year": null,
+   "entities": []}}
+]
+```
+
+Diese Anweisung ersetzt das Antwortformat für ein einzelnes Dokument."""
+
+
+def format_extracted_text(filename: str, text: str) -> str:
+    """
+    Formatiert den lokal extrahierten Text eines Dokuments für die Analyse.
+
+    Digitale PDFs werden nicht hochgeladen, sondern als Text mit Dateiname
+    gesendet. Der Block ersetzt die hochgeladene Datei in der Anfrage.
+
+    Args:
+        filename: Name der Originaldatei (liefert oft Absender oder Datum).
+        text: Extrahierter Text der ersten Seiten (bereits gekürzt).
+
+    Returns:
+        Textblock für die Anfrage.
+
+    Examples:
+        >>> block = format_extracted_text("rechnung.pdf", "Telekom ...")
+        >>> "rechnung.pdf" in block
+        True
+    """
+    return f"""Dateiname: {filename}
+Extrahierter Text des Dokuments (erste Seiten, ggf. gekürzt):
+<<<
+{text}
+>>>"""
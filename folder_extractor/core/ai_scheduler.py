@@ -0,0 +1,285 @@
+"""
+Rate-aware scheduling of AI requests.
+
+The Gemini API enforces per-minute quotas for requests and tokens. Sending a
+large backlog as fast as possible only produces 429 responses, and every
+retry adds to the load. AIRequestScheduler sits between the callers and the
+API and paces requests before they are sent:
+
+- Token buckets for requests per minute and tokens per minute.
+- A limit for concurrently running file uploads.
+- Priority lanes: interactive requests (chat, queries) are granted before
+  queued bulk requests (file analysis).
+- Adaptation: each 429 pauses all requests and halves the used share of the
+  quota; successful requests slowly restore it.
+
+The scheduler is thread-safe and not bound to an event loop, because one AI
+client is shared by the API server loop and the smart watcher loop threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from folder_extractor.config.constants import (
+    AI_BURST_SECONDS,
+    AI_MAX_CONCURRENT_UPLOADS,
+    AI_MIN_RATE_FACTOR,
+    AI_RATE_LIMIT_COOLDOWN,
+    AI_RATE_LIMIT_MAX_COOLDOWN,
+    AI_RATE_RECOVERY_STEP,
+    AI_REQUESTS_PER_MINUTE,
+    AI_TOKENS_PER_MINUTE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes (lower value is served first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of tokens of a text (about 4 chars each)."""
+    return max(1, len(text) // 4)
+
+
+class _TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float, factor: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate * factor)
+        self._updated = now
+
+    def time_until(self, amount: float, factor: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if available now)."""
+        missing = amount - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / (self.rate * factor)
+
+
+class AIRequestScheduler:
+    """Pace AI requests to stay within the API quota.
+
+    Attributes:
+        requests_per_minute: Configured request quota.
+        tokens_per_minute: Configured token quota.
+        max_concurrent_uploads: Maximum number of concurrent file uploads.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = AI_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = AI_TOKENS_PER_MINUTE,
+        max_concurrent_uploads: int = AI_MAX_CONCURRENT_UPLOADS,
+        burst_seconds: float = AI_BURST_SECONDS,
+        poll_interval: float = 0.05,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            requests_per_minute: Requests per minute allowed by the API key.
+            tokens_per_minute: Tokens per minute allowed by the API key.
+            max_concurrent_uploads: Maximum number of concurrent file uploads.
+            burst_seconds: Bucket capacity in seconds worth of quota.
+            poll_interval: Seconds between checks while waiting for a turn.
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        if requests_per_minute <= 0 or tokens_per_minute <= 0:
+            raise ValueError("Rate limits must be positive")
+        if max_concurrent_uploads < 1:
+            raise ValueError("max_concurrent_uploads must be at least 1")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrent_uploads = max_concurrent_uploads
+        self._poll_interval = poll_interval
+        self._requests = _TokenBucket(requests_per_minute, burst_seconds)
+        self._tokens = _TokenBucket(tokens_per_minute, burst_seconds)
+        self._lock = threading.Lock()
+        self._queue: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._uploads = 0
+        self._in_flight = 0
+        self._rate_factor = 1.0
+        self._blocked_until = 0.0
+        self._consecutive_limited = 0
+        self._granted = 0
+        self._rate_limited = 0
+
+    @classmethod
+    def from_env(cls) -> AIRequestScheduler:
+        """Create a scheduler, reading quota overrides from the environment.
+
+        Recognized variables: AI_REQUESTS_PER_MINUTE, AI_TOKENS_PER_MINUTE and
+        AI_MAX_CONCURRENT_UPLOADS. Invalid values fall back to the defaults.
+        """
+
+        def read(name: str, default: float) -> float:
+            try:
+                value = float(os.environ.get(name, default))
+            except ValueError:
+                logger.warning(f"Ignoring invalid value for {name}")
+                return default
+            return value if value > 0 else default
+
+        return cls(
+            requests_per_minute=read("AI_REQUESTS_PER_MINUTE", AI_REQUESTS_PER_MINUTE),
+            tokens_per_minute=read("AI_TOKENS_PER_MINUTE", AI_TOKENS_PER_MINUTE),
+            max_concurrent_uploads=int(
+                read("AI_MAX_CONCURRENT_UPLOADS", AI_MAX_CONCURRENT_UPLOADS)
+            ),
+        )
+
+    @property
+    def rate_factor(self) -> float:
+        """Share of the configured quota currently used (reduced after 429s)."""
+        with self._lock:
+            return self._rate_factor
+
+    @asynccontextmanager
+    async def request(
+        self, priority: int = PRIORITY_BULK, tokens: int = 1
+    ) -> AsyncIterator[None]:
+        """Wait for a request slot and keep it while the block runs.
+
+        Args:
+            priority: Lane of the request (PRIORITY_INTERACTIVE or PRIORITY_BULK).
+            tokens: Estimated tokens of the request.
+        """
+        await self.acquire(priority, tokens)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    @asynccontextmanager
+    async def upload(self) -> AsyncIterator[None]:
+        """Wait until fewer than max_concurrent_uploads uploads are running."""
+        while True:
+            with self._lock:
+                if self._uploads < self.max_concurrent_uploads:
+                    self._uploads += 1
+                    break
+            await asyncio.sleep(self._poll_interval)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._uploads -= 1
+
+    async def acquire(self, priority: int = PRIORITY_BULK, tokens: int = 1) -> None:
+        """Wait until the request may be sent and consume its quota.
+
+        Requests are granted strictly by (priority, arrival order).
+
+        Args:
+            priority: Lane of the request (PRIORITY_INTERACTIVE or PRIORITY_BULK).
+            tokens: Estimated tokens of the request.
+        """
+        ticket = (priority, next(self._sequence))
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+        granted = False
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_grant(ticket, tokens)
+                if delay is None:
+                    granted = True
+                    return
+                await asyncio.sleep(min(max(delay, 0.001), 1.0))
+        finally:
+            if not granted:
+                with self._lock:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+
+    def record_success(self) -> None:
+        """Report a successful request (slowly restores the used quota share)."""
+        with self._lock:
+            self._consecutive_limited = 0
+            self._rate_factor = min(1.0, self._rate_factor + AI_RATE_RECOVERY_STEP)
+
+    def record_rate_limited(self) -> None:
+        """Report a 429 response: pause all requests and halve the rate."""
+        with self._lock:
+            self._rate_limited += 1
+            self._consecutive_limited += 1
+            self._rate_factor = max(AI_MIN_RATE_FACTOR, self._rate_factor / 2)
+            cooldown = min(
+                AI_RATE_LIMIT_MAX_COOLDOWN,
+                AI_RATE_LIMIT_COOLDOWN * 2 ** (self._consecutive_limited - 1),
+            )
+            self._blocked_until = max(self._blocked_until, time.monotonic() + cooldown)
+            # Resume one request at a time instead of with a full burst
+            self._requests.tokens = min(self._requests.tokens, 0.0)
+            factor = self._rate_factor
+        logger.warning(
+            f"AI rate limit hit, pausing {cooldown:.1f}s "
+            f"(using {factor:.0%} of the quota)"
+        )
+
+    def record_usage(self, estimated: int, actual: int) -> None:
+        """Correct the token bucket once the real token count is known.
+
+        Args:
+            estimated: Tokens consumed when the request was granted.
+            actual: Tokens reported by the API.
+        """
+        with self._lock:
+            self._tokens.tokens -= actual - min(estimated, self._tokens.capacity)
+
+    def stats(self) -> dict[str, float]:
+        """Return counters and the current state of the scheduler."""
+        with self._lock:
+            return {
+                "waiting": len(self._queue),
+                "in_flight": self._in_flight,
+                "uploads_in_flight": self._uploads,
+                "granted": self._granted,
+                "rate_limited": self._rate_limited,
+                "rate_factor": self._rate_factor,
+            }
+
+    def _try_grant(self, ticket: tuple[int, int], tokens: int) -> Optional[float]:
+        """Grant the request or return the seconds to wait (lock held)."""
+        if self._queue[0] != ticket:
+            return self._poll_interval
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        self._requests.refill(now, self._rate_factor)
+        self._tokens.refill(now, self._rate_factor)
+        # Requests larger than the bucket go through once the bucket is full
+        tokens = min(tokens, self._tokens.capacity)
+        delay = max(
+            self._requests.time_until(1, self._rate_factor),
+            self._tokens.time_until(tokens, self._rate_factor),
+        )
+        if delay > 0:
+            return delay
+        self._requests.tokens -= 1
+        self._tokens.tokens -= tokens
+        heapq.heappop(self._queue)
+        self._in_flight += 1
+        self._granted += 1
+        return None
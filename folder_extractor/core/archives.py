@@ -1,8 +1,20 @@
 """
 Archive handling module with Zip Slip protection.
 
-Provides handlers for extracting ZIP and TAR archives safely,
-with protection against path traversal attacks (Zip Slip).
+Provides handlers for extracting ZIP, TAR (plain, gzip, bzip2, xz, zstd),
+single compressed files (.gz, .bz2, .xz) and - via a locally installed
+tool - 7z and RAR archives, with protection against path traversal
+attacks (Zip Slip).
+
+Handlers are kept in a registry. The format of a file is determined by
+sniffing its magic bytes; the extension only decides whether a file is an
+archive candidate at all and serves as fallback when the content is not
+conclusive.
+
+Archives inside archives are expanded in place up to a configurable depth.
+ZIP, TAR and single compressed members are read directly from the outer
+archive's stream. Size and entry limits are enforced by an ExtractionBudget
+shared across the whole recursion (archive bomb protection).
 
 Security Features:
 - All extracted paths are validated to stay within target directory
@@ -12,15 +24,38 @@ Security Features:
 
 from __future__ import annotations
 
+import bz2
+import gzip
+import io
+import lzma
+import os
+import shutil
+import subprocess
 import sys
 import tarfile
 import zipfile
+import zlib
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import IO, Iterator, Optional
 
+from folder_extractor.config.constants import (
+    ARCHIVE_MAX_ENTRIES,
+    ARCHIVE_MAX_NESTING_DEPTH,
+    ARCHIVE_MAX_TOTAL_SIZE,
+    CACHE_SIZE,
+)
 from folder_extractor.core.file_operations import FileOperationError
 
+# zstandard is optional - .tar.zst falls back to the zstd command line tool
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on installed packages
+    zstandard = None  # type: ignore[assignment]
+
 
 class SecurityError(Exception):
     """Raised when security validation fails (e.g., Zip Slip attack detected)."""
@@ -28,24 +63,107 @@ class SecurityError(Exception):
     pass
 
 
+class ArchiveLimitError(SecurityError):
+    """Raised when an extraction exceeds its size or entry count limit."""
+
+    pass
+
+
+@dataclass
+class ExtractionBudget:
+    """
+    Limits shared by one archive and all archives nested inside it.
+
+    Every extracted entry and every written byte is charged against the same
+    budget, so an archive bomb is stopped regardless of how deeply it nests.
+
+    Attributes:
+        max_depth: Levels of inner archives to expand
+            (0 = keep inner archives as regular files)
+        max_total_size: Maximum extracted bytes (0 = unlimited)
+        max_entries: Maximum extracted entries (0 = unlimited)
+        total_size: Bytes extracted so far
+        entries: Entries extracted so far
+        depth: Nesting level currently being extracted
+    """
+
+    max_depth: int = ARCHIVE_MAX_NESTING_DEPTH
+    max_total_size: int = ARCHIVE_MAX_TOTAL_SIZE
+    max_entries: int = ARCHIVE_MAX_ENTRIES
+    total_size: int = 0
+    entries: int = 0
+    depth: int = 0
+
+    def add_entry(self) -> None:
+        """Charge one archive entry against the budget."""
+        self.entries += 1
+        if self.max_entries and self.entries > self.max_entries:
+            raise ArchiveLimitError(
+                f"Archive exceeds the limit of {self.max_entries} entries"
+            )
+
+    def add_bytes(self, count: int) -> None:
+        """Charge extracted bytes against the budget."""
+        self.total_size += count
+        if self.max_total_size and self.total_size > self.max_total_size:
+            raise ArchiveLimitError(
+                f"Archive exceeds the limit of {self.max_total_size} extracted bytes"
+            )
+
+    def can_nest(self) -> bool:
+        """Check if an inner archive at the current level may be expanded."""
+        return self.depth < self.max_depth
+
+    @contextmanager
+    def nested(self) -> Iterator[None]:
+        """Track extraction of an inner archive one level deeper."""
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+
+
 class IArchiveHandler(ABC):
     """
     Interface for archive handlers.
 
     Implementations must provide safe extraction with path traversal protection.
+
+    Attributes:
+        FORMATS: Content formats (as returned by detect_archive_format)
+            this handler can extract
     """
 
+    FORMATS: frozenset[str] = frozenset()
+
+    def is_available(self) -> bool:
+        """
+        Check if the handler can be used in the current environment.
+
+        Handlers relying on optional packages or external tools override this.
+        """
+        return True
+
     @abstractmethod
-    def extract(self, archive_path: Path, target_dir: Path) -> None:
+    def extract(
+        self,
+        archive_path: Path,
+        target_dir: Path,
+        budget: Optional[ExtractionBudget] = None,
+    ) -> None:
         """
         Extract archive contents to target directory.
 
         Args:
             archive_path: Path to the archive file
             target_dir: Directory to extract contents into
+            budget: Limits shared with the enclosing extraction
+                (optional, creates default limits if None)
 
         Raises:
             SecurityError: If path traversal attack is detected
+            ArchiveLimitError: If size or entry count limits are exceeded
             FileOperationError: If extraction fails due to I/O error
         """
         pass
@@ -106,6 +224,384 @@ def _validate_extraction_path(target_dir: Path, member_name: str) -> Path:
     return target_path
 
 
+# =============================================================================
+# Format Detection (magic bytes)
+# =============================================================================
+
+# Number of header bytes read per candidate file. Large enough to contain the
+# TAR "ustar" magic at offset 257 and, for compressed streams, enough input to
+# decompress the first TAR header block.
+_SNIFF_SIZE = 4096
+
+_TAR_BLOCK_SIZE = 512
+
+# (magic bytes, format) for formats identified at offset 0
+_MAGIC_SIGNATURES: list[tuple[bytes, str]] = [
+    (b"PK\x03\x04", "zip"),
+    (b"PK\x05\x06", "zip"),  # Empty archive
+    (b"7z\xbc\xaf\x27\x1c", "7z"),
+    (b"Rar!\x1a\x07", "rar"),
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bzip2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+]
+
+# Stream formats that wrap a TAR archive when the content is a tarball
+_COMPRESSED_TAR_FORMATS = {
+    "gzip": "tar",
+    "bzip2": "tar",
+    "xz": "tar",
+    "zstd": "tar.zst",
+}
+
+# Name suffixes that mark a compressed stream as a tarball when the header
+# alone is not conclusive (e.g. bzip2 only emits data after a full block)
+_TAR_NAME_SUFFIXES = (
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tbz",
+    ".tar.xz",
+    ".txz",
+    ".tar.zst",
+    ".tzst",
+)
+
+
+def _is_tar_block(block: bytes) -> bool:
+    """Check if a block starts with a POSIX/GNU TAR header."""
+    return block[257:262] == b"ustar"
+
+
+def _decompress_head(stream_format: str, header: bytes) -> bytes:
+    """
+    Decompress as much of a compressed stream header as possible.
+
+    Returns an empty result when the head cannot be decoded from the
+    available bytes (the caller then falls back to the file name).
+    """
+    try:
+        if stream_format == "gzip":
+            return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(
+                header, _TAR_BLOCK_SIZE
+            )
+        if stream_format == "bzip2":
+            return bz2.BZ2Decompressor().decompress(header, _TAR_BLOCK_SIZE)
+        if stream_format == "xz":
+            return lzma.LZMADecompressor().decompress(header, _TAR_BLOCK_SIZE)
+        if stream_format == "zstd" and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompressobj().decompress(header)
+    except Exception:
+        # Truncated or corrupt stream (zlib.error, LZMAError, ZstdError, ...)
+        return b""
+    return b""
+
+
+def _classify_header(header: bytes, name: str) -> Optional[str]:
+    """
+    Map a file header to an archive format.
+
+    Args:
+        header: First bytes of the file
+        name: Lower-cased file name, used when the content is not conclusive
+
+    Returns:
+        Format name (e.g. "zip", "tar", "tar.zst", "gzip") or None if the
+        header does not match any known archive format
+    """
+    fmt = next(
+        (fmt for magic, fmt in _MAGIC_SIGNATURES if header.startswith(magic)),
+        None,
+    )
+    if fmt is None:
+        return "tar" if _is_tar_block(header) else None
+
+    if fmt not in _COMPRESSED_TAR_FORMATS:
+        return fmt
+
+    # Compressed stream: tarball or single compressed file?
+    head = _decompress_head(fmt, header)
+    if len(head) >= _TAR_BLOCK_SIZE:
+        return _COMPRESSED_TAR_FORMATS[fmt] if _is_tar_block(head) else fmt
+    if name.endswith(_TAR_NAME_SUFFIXES):
+        return _COMPRESSED_TAR_FORMATS[fmt]
+    return fmt
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _sniff_format(path: str, size: int, mtime_ns: int) -> Optional[str]:
+    """
+    Read the header of a file once and classify it.
+
+    Size and modification time are part of the cache key, so a file that is
+    rewritten in place is sniffed again.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_SNIFF_SIZE)
+    except OSError:
+        return None
+    return _classify_header(header, os.path.basename(path).lower())
+
+
+def detect_archive_format(file_path: Path) -> Optional[str]:
+    """
+    Detect the archive format of a file from its magic bytes.
+
+    The header of each file is read at most once per size/mtime; repeated
+    calls for the same file are served from a bounded cache.
+
+    Args:
+        file_path: Path to the file to inspect
+
+    Returns:
+        Format name ("zip", "tar", "tar.zst", "gzip", "bzip2", "xz",
+        "zstd", "7z", "rar") or None if the file does not exist, cannot be
+        read, or is not a known archive format
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return _sniff_format(str(file_path), stat.st_size, stat.st_mtime_ns)
+
+
+# =============================================================================
+# Member Extraction (nested archives)
+# =============================================================================
+
+# Chunk size for copying member data; limits are checked per chunk
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Inner archives up to this size are buffered in memory when they must be
+# re-readable: ZipFile seeks backwards (a compressed member stream can only
+# seek by decompressing again from the start), and members of non-seekable
+# streams must be kept as a file if they turn out to be corrupt.
+_NESTED_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# Name suffixes of inner archive candidates (compound suffixes first)
+_ARCHIVE_NAME_SUFFIXES = _TAR_NAME_SUFFIXES + (
+    ".tar",
+    ".zip",
+    ".gz",
+    ".bz2",
+    ".xz",
+    ".7z",
+    ".rar",
+)
+
+# Stream openers for single compressed files
+_STREAM_OPENERS = {
+    "gzip": gzip.open,
+    "bzip2": bz2.open,
+    "xz": lzma.open,
+}
+
+# Errors raised while reading a corrupted inner archive
+_CORRUPT_ARCHIVE_ERRORS = (
+    zipfile.BadZipFile,
+    tarfile.TarError,
+    EOFError,
+    lzma.LZMAError,
+    zlib.error,
+    gzip.BadGzipFile,
+)
+
+
+def _archive_stem(name: str) -> Optional[str]:
+    """Return the name without archive suffix, or None for non-archives."""
+    name_lower = name.lower()
+    for suffix in _ARCHIVE_NAME_SUFFIXES:
+        if name_lower.endswith(suffix) and len(name) > len(suffix):
+            return name[: -len(suffix)]
+    return None
+
+
+def _is_corrupt_archive_error(error: Exception) -> bool:
+    """
+    Check if an error means the inner archive is unreadable.
+
+    bz2 reports corrupt data as an OSError without errno; OSErrors from the
+    file system (disk full, permission denied, I/O errors) always carry one
+    and must reach the caller instead.
+    """
+    if isinstance(error, _CORRUPT_ARCHIVE_ERRORS):
+        return True
+    return isinstance(error, OSError) and error.errno is None
+
+
+def _is_seekable(stream: IO[bytes]) -> bool:
+    """Check if a stream supports seeking (tar stream members do not)."""
+    try:
+        return bool(stream.seekable())
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _peek_header(stream: IO[bytes]) -> bytes:
+    """Return the first bytes of a stream without consuming them."""
+    peek = getattr(stream, "peek", None)
+    if peek is None:
+        return b""
+    return peek(_SNIFF_SIZE)[:_SNIFF_SIZE]
+
+
+def _copy_to_file(
+    source: IO[bytes], target_path: Path, budget: ExtractionBudget
+) -> None:
+    """Copy a member stream to disk, charging written bytes to the budget."""
+    with open(target_path, "wb") as target:
+        while True:
+            chunk = source.read(_COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            budget.add_bytes(len(chunk))
+            target.write(chunk)
+
+
+def _extract_nested_stream(
+    source: IO[bytes],
+    target_path: Path,
+    stem: str,
+    budget: ExtractionBudget,
+    size: Optional[int],
+) -> bool:
+    """
+    Expand an inner archive directly from the outer archive's stream.
+
+    Returns:
+        True if the member was expanded, False if its format cannot be
+        read from this stream (the caller then writes it to disk)
+    """
+    archive_format = _classify_header(_peek_header(source), target_path.name.lower())
+    nested_dir = target_path.parent / stem
+
+    if archive_format == "zip":
+        if size is not None and size <= _NESTED_MEMORY_LIMIT:
+            source = io.BytesIO(source.read())
+        with zipfile.ZipFile(source) as zf:
+            _extract_zip_members(zf, nested_dir, budget)
+        return True
+
+    if archive_format == "tar":
+        with tarfile.open(fileobj=source, mode="r|*") as tf:
+            _extract_tar_members(tf, nested_dir, budget)
+        return True
+
+    if archive_format in _STREAM_OPENERS:
+        with _STREAM_OPENERS[archive_format](source, "rb") as stream:
+            budget.add_entry()
+            _extract_member(stream, stem, target_path.parent, budget)
+        return True
+
+    return False
+
+
+def _expand_archive_file(path: Path, stem: str, budget: ExtractionBudget) -> None:
+    """
+    Expand an inner archive that was written to disk, then remove it.
+
+    Used for formats that cannot be read from a stream (e.g. 7z) and for
+    inner archives of non-seekable streams. Corrupted inner archives are
+    kept as regular files; file system errors are raised.
+    """
+    handler = get_archive_handler(path)
+    if handler is None:
+        return
+    nested_dir = path.parent / stem
+    nested_dir_existed = nested_dir.exists()
+    try:
+        handler.extract(path, nested_dir, budget)
+    except FileOperationError as e:
+        cause = e.__cause__
+        if isinstance(cause, Exception) and not _is_corrupt_archive_error(cause):
+            raise
+        if not nested_dir_existed:
+            shutil.rmtree(nested_dir, ignore_errors=True)
+        return
+    path.unlink()
+
+
+def _extract_member(
+    source: IO[bytes],
+    member_name: str,
+    target_dir: Path,
+    budget: ExtractionBudget,
+    size: Optional[int] = None,
+) -> None:
+    """
+    Write one archive member below target_dir.
+
+    Members that are archives themselves are expanded into a folder named
+    after them (``docs.zip`` -> ``docs/``) while the budget allows another
+    nesting level. ZIP, TAR and single compressed members are read from the
+    outer stream without an intermediate file, unless the outer stream cannot
+    seek back (TAR stream mode): then a corrupt inner archive could not be
+    kept as a file, so it is written to disk first and expanded from there.
+
+    Args:
+        source: Readable stream with the member content
+        member_name: Path of the member inside the archive
+        target_dir: Directory to extract into
+        budget: Limits shared across the whole recursion
+        size: Uncompressed member size, if known
+    """
+    target_path = _validate_extraction_path(target_dir, member_name)
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+
+    stem = _archive_stem(target_path.name)
+    if stem is None or not budget.can_nest():
+        _copy_to_file(source, target_path, budget)
+        return
+
+    with budget.nested():
+        if not _is_seekable(source):
+            if size is None or size > _NESTED_MEMORY_LIMIT:
+                _copy_to_file(source, target_path, budget)
+                _expand_archive_file(target_path, stem, budget)
+                return
+            source = io.BytesIO(source.read())
+
+        nested_dir = target_path.parent / stem
+        nested_dir_existed = nested_dir.exists()
+        try:
+            if _extract_nested_stream(source, target_path, stem, budget, size):
+                return
+        except (*_CORRUPT_ARCHIVE_ERRORS, OSError) as e:
+            if not _is_corrupt_archive_error(e):
+                raise
+            # Not a readable archive after all: keep it as a regular file
+            if not nested_dir_existed:
+                shutil.rmtree(nested_dir, ignore_errors=True)
+            source.seek(0)
+            _copy_to_file(source, target_path, budget)
+            return
+
+        _copy_to_file(source, target_path, budget)
+        _expand_archive_file(target_path, stem, budget)
+
+
+def _extract_zip_members(
+    zf: zipfile.ZipFile, target_dir: Path, budget: ExtractionBudget
+) -> None:
+    """Extract all members of an open ZIP archive."""
+    for info in zf.infolist():
+        budget.add_entry()
+        member_name = info.filename
+
+        # Skip directory entries (they end with /)
+        if member_name.endswith("/"):
+            # Create the directory
+            dir_path = _validate_extraction_path(target_dir, member_name)
+            dir_path.mkdir(parents=True, exist_ok=True)
+            continue
+
+        with zf.open(info) as source:
+            _extract_member(source, member_name, target_dir, budget, info.file_size)
+
+
 class ZipHandler(IArchiveHandler):
     """
     Handler for ZIP archives with Zip Slip protection.
@@ -113,6 +609,7 @@ class ZipHandler(IArchiveHandler):
     Supports: .zip files (case-insensitive)
     """
 
+    FORMATS = frozenset(["zip"])
     SUPPORTED_EXTENSIONS: list[str] = [".zip"]
 
     def is_supported(self, file_path: Path) -> bool:
@@ -120,35 +617,26 @@ class ZipHandler(IArchiveHandler):
         suffix = file_path.suffix.lower()
         return suffix in self.SUPPORTED_EXTENSIONS
 
-    def extract(self, archive_path: Path, target_dir: Path) -> None:
+    def extract(
+        self,
+        archive_path: Path,
+        target_dir: Path,
+        budget: Optional[ExtractionBudget] = None,
+    ) -> None:
         """
         Extract ZIP archive contents safely.
 
         Validates each entry's path before extraction to prevent
-        path traversal attacks.
+        path traversal attacks. Inner archives are expanded in place.
         """
+        if budget is None:
+            budget = ExtractionBudget()
         try:
             # Ensure target directory exists
             target_dir.mkdir(parents=True, exist_ok=True)
 
             with zipfile.ZipFile(archive_path, "r") as zf:
-                for member_name in zf.namelist():
-                    # Skip directory entries (they end with /)
-                    if member_name.endswith("/"):
-                        # Create the directory
-                        dir_path = _validate_extraction_path(target_dir, member_name)
-                        dir_path.mkdir(parents=True, exist_ok=True)
-                        continue
-
-                    # Validate path is safe before extraction
-                    target_path = _validate_extraction_path(target_dir, member_name)
-
-                    # Create parent directories if needed
-                    target_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    # Extract the file
-                    with zf.open(member_name) as source:
-                        target_path.write_bytes(source.read())
+                _extract_zip_members(zf, target_dir, budget)
         except SecurityError:
             # Re-raise security errors unchanged
             raise
@@ -162,16 +650,42 @@ class ZipHandler(IArchiveHandler):
             ) from e
 
 
+def _extract_tar_members(
+    tf: tarfile.TarFile, target_dir: Path, budget: ExtractionBudget
+) -> None:
+    """
+    Extract regular files and directories of an open TAR archive.
+
+    Members are consumed in archive order, so this also works for TAR files
+    opened in stream mode ("r|"). Links and device files are skipped.
+    """
+    for member in tf:
+        budget.add_entry()
+
+        # Validate path is safe before extraction
+        target_path = _validate_extraction_path(target_dir, member.name)
+
+        if member.isdir():
+            target_path.mkdir(parents=True, exist_ok=True)
+        elif member.isfile():
+            # Extract file content
+            source = tf.extractfile(member)
+            if source is not None:
+                _extract_member(source, member.name, target_dir, budget, member.size)
+
+
 class TarHandler(IArchiveHandler):
     """
     Handler for TAR archives (compressed variants) with path traversal protection.
 
-    Supports: .tar, .tar.gz, .tgz, .tar.bz2, .tar.xz (case-insensitive)
+    Supports: .tar, .tar.gz, .tgz, .tar.bz2, .tbz2, .tar.xz, .txz
+    (case-insensitive)
     """
 
+    FORMATS = frozenset(["tar"])
     SUPPORTED_EXTENSIONS: list[str] = [".tar"]
     SUPPORTED_COMPOUND_EXTENSIONS: list[str] = [".tar.gz", ".tar.bz2", ".tar.xz"]
-    SUPPORTED_ALIASES: list[str] = [".tgz", ".txz"]
+    SUPPORTED_ALIASES: list[str] = [".tgz", ".tbz2", ".txz"]
 
     def is_supported(self, file_path: Path) -> bool:
         """Check if file is a TAR archive based on extension."""
@@ -190,33 +704,28 @@ class TarHandler(IArchiveHandler):
         # Check simple extension
         return suffix in self.SUPPORTED_EXTENSIONS
 
-    def extract(self, archive_path: Path, target_dir: Path) -> None:
+    def extract(
+        self,
+        archive_path: Path,
+        target_dir: Path,
+        budget: Optional[ExtractionBudget] = None,
+    ) -> None:
         """
         Extract TAR archive contents safely.
 
         Validates each entry's path before extraction to prevent
         path traversal attacks. Supports auto-detection of compression.
+        Inner archives are expanded in place.
         """
+        if budget is None:
+            budget = ExtractionBudget()
         try:
             # Ensure target directory exists
             target_dir.mkdir(parents=True, exist_ok=True)
 
             # Open with auto-detection of compression format
             with tarfile.open(archive_path, "r:*") as tf:
-                for member in tf.getmembers():
-                    # Validate path is safe before extraction
-                    target_path = _validate_extraction_path(target_dir, member.name)
-
-                    if member.isdir():
-                        target_path.mkdir(parents=True, exist_ok=True)
-                    elif member.isfile():
-                        # Create parent directories if needed
-                        target_path.parent.mkdir(parents=True, exist_ok=True)
-
-                        # Extract file content
-                        source = tf.extractfile(member)
-                        if source is not None:
-                            target_path.write_bytes(source.read())
+                _extract_tar_members(tf, target_dir, budget)
         except SecurityError:
             # Re-raise security errors unchanged
             raise
@@ -230,10 +739,353 @@ class TarHandler(IArchiveHandler):
             ) from e
 
 
+class ZstdTarHandler(IArchiveHandler):
+    """
+    Handler for zstd-compressed TAR archives with path traversal protection.
+
+    Uses the optional ``zstandard`` package and falls back to the ``zstd``
+    command line tool. The archive is decompressed as a stream, so no
+    intermediate .tar file is written.
+
+    Supports: .tar.zst, .tzst (case-insensitive)
+    """
+
+    FORMATS = frozenset(["tar.zst"])
+    SUPPORTED_COMPOUND_EXTENSIONS: list[str] = [".tar.zst"]
+    SUPPORTED_ALIASES: list[str] = [".tzst"]
+
+    def is_available(self) -> bool:
+        """zstd support requires the zstandard package or the zstd tool."""
+        return zstandard is not None or _find_tool(("zstd",)) is not None
+
+    def is_supported(self, file_path: Path) -> bool:
+        """Check if file is a zstd TAR archive based on extension."""
+        name_lower = file_path.name.lower()
+        has_extension = file_path.suffix.lower() in self.SUPPORTED_ALIASES or any(
+            name_lower.endswith(ext) for ext in self.SUPPORTED_COMPOUND_EXTENSIONS
+        )
+        return has_extension and self.is_available()
+
+    def extract(
+        self,
+        archive_path: Path,
+        target_dir: Path,
+        budget: Optional[ExtractionBudget] = None,
+    ) -> None:
+        """
+        Extract zstd TAR archive contents safely.
+
+        Validates each entry's path before extraction to prevent
+        path traversal attacks. Inner archives are expanded in place.
+        """
+        if budget is None:
+            budget = ExtractionBudget()
+        try:
+            target_dir.mkdir(parents=True, exist_ok=True)
+
+            if zstandard is not None:
+                with open(archive_path, "rb") as raw:
+                    reader = zstandard.ZstdDecompressor().stream_reader(raw)
+                    with tarfile.open(fileobj=reader, mode="r|") as tf:
+                        _extract_tar_members(tf, target_dir, budget)
+                return
+
+            tool = _find_tool(("zstd",))
+            if tool is None:
+                raise FileOperationError(
+                    f"No zstd decoder available for '{archive_path}'"
+                )
+            with subprocess.Popen(
+                [tool, "-dcq", str(archive_path)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            ) as proc:
+                try:
+                    with tarfile.open(fileobj=proc.stdout, mode="r|") as tf:
+                        _extract_tar_members(tf, target_dir, budget)
+                finally:
+                    # Stop the decoder if extraction ended early (e.g. Zip Slip)
+                    proc.kill()
+            if proc.returncode not in (0, -9):
+                raise FileOperationError(
+                    f"Invalid or corrupted zstd archive: {archive_path}"
+                )
+        except (SecurityError, FileOperationError):
+            raise
+        except tarfile.TarError as e:
+            raise FileOperationError(
+                f"Invalid or corrupted TAR archive: {archive_path}"
+            ) from e
+        except Exception as e:
+            # OSError or zstandard.ZstdError for corrupted streams
+            raise FileOperationError(
+                f"Failed to extract zstd TAR archive '{archive_path}': {e}"
+            ) from e
+
+
+class CompressedFileHandler(IArchiveHandler):
+    """
+    Handler for single compressed files (not TAR archives).
+
+    Decompresses e.g. ``report.pdf.gz`` to ``report.pdf`` inside the target
+    directory.
+
+    Supports: .gz, .bz2, .xz (case-insensitive, excluding .tar.* variants)
+    """
+
+    FORMATS = frozenset(["gzip", "bzip2", "xz"])
+    SUPPORTED_EXTENSIONS: list[str] = [".gz", ".bz2", ".xz"]
+
+    _EXTENSION_FORMATS = {".gz": "gzip", ".bz2": "bzip2", ".xz": "xz"}
+
+    def is_supported(self, file_path: Path) -> bool:
+        """Check if file is a single compressed file based on extension."""
+        suffix = file_path.suffix.lower()
+        if suffix not in self.SUPPORTED_EXTENSIONS:
+            return False
+        # Compressed TAR archives belong to TarHandler
+        return not file_path.stem.lower().endswith(".tar")
+
+    def extract(
+        self,
+        archive_path: Path,
+        target_dir: Path,
+        budget: Optional[ExtractionBudget] = None,
+    ) -> None:
+        """
+        Decompress the file into target directory.
+
+        The compression is taken from the file content and falls back to
+        the extension if the content is not recognized. A decompressed
+        archive (e.g. ``docs.zip.gz``) is expanded in place.
+        """
+        if budget is None:
+            budget = ExtractionBudget()
+        stream_format = detect_archive_format(archive_path)
+        if stream_format not in _STREAM_OPENERS:
+            stream_format = self._EXTENSION_FORMATS.get(
+                archive_path.suffix.lower(), "gzip"
+            )
+
+        output_name = archive_path.stem or f"{archive_path.name}.out"
+
+        try:
+            target_dir.mkdir(parents=True, exist_ok=True)
+
+            with _STREAM_OPENERS[stream_format](archive_path, "rb") as source:
+                budget.add_entry()
+                _extract_member(source, output_name, target_dir, budget)
+        except SecurityError:
+            raise
+        except (OSError, EOFError, lzma.LZMAError) as e:
+            # gzip.BadGzipFile is an OSError
+            raise FileOperationError(
+                f"Invalid or corrupted compressed file '{archive_path}': {e}"
+            ) from e
+
+
+@lru_cache(maxsize=None)
+def _find_tool(candidates: tuple[str, ...]) -> Optional[str]:
+    """Return the path of the first installed tool among candidates."""
+    for name in candidates:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+class ExternalToolHandler(IArchiveHandler):
+    """
+    Base class for formats extracted through a locally installed tool.
+
+    Entry names are listed and validated before anything is written. After
+    extraction, the tree is checked once more so that links created by the
+    tool cannot point outside the target directory.
+
+    Subclasses define FORMATS, SUPPORTED_EXTENSIONS and TOOLS (in order of
+    preference). Supported tool families: 7-Zip (7z, 7zz, 7za), libarchive
+    (bsdtar) and unrar.
+    """
+
+    SUPPORTED_EXTENSIONS: list[str] = []
+    TOOLS: tuple[str, ...] = ()
+
+    def _tool(self) -> Optional[str]:
+        return _find_tool(self.TOOLS)
+
+    def is_available(self) -> bool:
+        """Check if one of the supported tools is installed."""
+        return self._tool() is not None
+
+    def is_supported(self, file_path: Path) -> bool:
+        """Check extension and that an extraction tool is installed."""
+        suffix = file_path.suffix.lower()
+        return suffix in self.SUPPORTED_EXTENSIONS and self.is_available()
+
+    @staticmethod
+    def _commands(
+        tool: str, archive_path: Path, target_dir: Path
+    ) -> tuple[list[str], list[str]]:
+        """Build (list command, extract command) for the given tool."""
+        name = Path(tool).name.lower()
+        archive = str(archive_path)
+        if name.startswith("7z"):
+            return (
+                [tool, "l", "-ba", "-slt", archive],
+                [tool, "x", "-y", f"-o{target_dir}", archive],
+            )
+        if name.startswith("unrar"):
+            return (
+                [tool, "lb", archive],
+                [tool, "x", "-o+", "-y", archive, f"{target_dir}{os.sep}"],
+            )
+        return (
+            [tool, "-tf", archive],
+            [tool, "-xf", archive, "-C", str(target_dir)],
+        )
+
+    @staticmethod
+    def _parse_listing(tool: str, output: str) -> list[str]:
+        """Extract entry names from the tool's list output."""
+        if Path(tool).name.lower().startswith("7z"):
+            return [
+                line[len("Path = ") :]
+                for line in output.splitlines()
+                if line.startswith("Path = ")
+            ]
+        return [line for line in output.splitlines() if line.strip()]
+
+    def extract(
+        self,
+        archive_path: Path,
+        target_dir: Path,
+        budget: Optional[ExtractionBudget] = None,
+    ) -> None:
+        """
+        Extract archive contents safely using the external tool.
+
+        Validates each entry's path before extraction to prevent
+        path traversal attacks. Size limits are checked after the tool has
+        finished; inner archives are then expanded from disk.
+        """
+        if budget is None:
+            budget = ExtractionBudget()
+        tool = self._tool()
+        if tool is None:
+            raise FileOperationError(
+                f"No extraction tool ({', '.join(self.TOOLS)}) found "
+                f"for '{archive_path}'"
+            )
+
+        list_cmd, extract_cmd = self._commands(tool, archive_path, target_dir)
+        try:
+            target_dir.mkdir(parents=True, exist_ok=True)
+
+            listing = subprocess.run(
+                list_cmd, capture_output=True, text=True, check=True
+            )
+            for member_name in self._parse_listing(tool, listing.stdout):
+                budget.add_entry()
+                _validate_extraction_path(target_dir, member_name)
+
+            subprocess.run(extract_cmd, capture_output=True, check=True)
+
+            # Links created by the tool must not escape the target directory
+            extracted_files = []
+            for root, dirs, files in os.walk(target_dir):
+                for name in dirs + files:
+                    entry = Path(root) / name
+                    if entry.is_symlink():
+                        _validate_extraction_path(
+                            target_dir, str(entry.relative_to(target_dir))
+                        )
+                    elif name in files:
+                        budget.add_bytes(entry.stat().st_size)
+                        extracted_files.append(entry)
+
+            if budget.can_nest():
+                with budget.nested():
+                    for entry in extracted_files:
+                        stem = _archive_stem(entry.name)
+                        if stem is not None:
+                            _expand_archive_file(entry, stem, budget)
+        except SecurityError:
+            raise
+        except subprocess.CalledProcessError as e:
+            raise FileOperationError(
+                f"Invalid or corrupted archive: {archive_path}"
+            ) from e
+        except OSError as e:
+            raise FileOperationError(
+                f"Failed to extract archive '{archive_path}': {e}"
+            ) from e
+
+
+class SevenZipHandler(ExternalToolHandler):
+    """
+    Handler for 7z archives (requires 7-Zip or bsdtar).
+
+    Supports: .7z (case-insensitive)
+    """
+
+    FORMATS = frozenset(["7z"])
+    SUPPORTED_EXTENSIONS: list[str] = [".7z"]
+    TOOLS = ("7zz", "7z", "7za", "bsdtar")
+
+
+class RarHandler(ExternalToolHandler):
+    """
+    Handler for RAR archives (requires unrar, 7-Zip or bsdtar).
+
+    Supports: .rar (case-insensitive)
+    """
+
+    FORMATS = frozenset(["rar"])
+    SUPPORTED_EXTENSIONS: list[str] = [".rar"]
+    TOOLS = ("unrar", "7zz", "7z", "bsdtar")
+
+
+# =============================================================================
+# Handler Registry
+# =============================================================================
+
+_ARCHIVE_HANDLERS: list[IArchiveHandler] = [
+    ZipHandler(),
+    TarHandler(),
+    ZstdTarHandler(),
+    CompressedFileHandler(),
+    SevenZipHandler(),
+    RarHandler(),
+]
+
+
+def register_archive_handler(handler: IArchiveHandler) -> None:
+    """
+    Register an additional archive handler.
+
+    Registered handlers take precedence over the built-in ones, so a
+    handler can also replace the default implementation for a format.
+
+    Args:
+        handler: Handler instance to register
+    """
+    _ARCHIVE_HANDLERS.insert(0, handler)
+
+
+def get_registered_handlers() -> list[IArchiveHandler]:
+    """Return the registered archive handlers in lookup order."""
+    return list(_ARCHIVE_HANDLERS)
+
+
 def get_archive_handler(file_path: Path) -> Optional[IArchiveHandler]:
     """
     Factory function to get the appropriate handler for an archive file.
 
+    Only files with a known archive extension are candidates. For existing
+    files, the handler is chosen by content (magic bytes), so mislabelled
+    archives and e.g. tarballs named ``.gz`` are extracted correctly. If the
+    content is not recognized, the extension decides.
+
     Args:
         file_path: Path to the archive file
 
@@ -245,13 +1097,14 @@ def get_archive_handler(file_path: Path) -> Optional[IArchiveHandler]:
         if handler:
             handler.extract(archive_path, target_dir)
     """
-    handlers: list[IArchiveHandler] = [
-        ZipHandler(),
-        TarHandler(),
-    ]
+    candidates = [h for h in _ARCHIVE_HANDLERS if h.is_supported(file_path)]
+    if not candidates:
+        return None
 
-    for handler in handlers:
-        if handler.is_supported(file_path):
-            return handler
+    archive_format = detect_archive_format(file_path)
+    if archive_format is not None:
+        for handler in _ARCHIVE_HANDLERS:
+            if archive_format in handler.FORMATS and handler.is_available():
+                return handler
 
-    return None
+    return candidates[0]
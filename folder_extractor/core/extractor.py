@@ -5,19 +5,35 @@ Coordinates file discovery, filtering, and moving operations
 with integrated progress tracking and state management.
 """
 
+import logging
 import shutil
 import tempfile
 from abc import ABC, abstractmethod
 from contextlib import suppress
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 if TYPE_CHECKING:
     from folder_extractor.core.archives import IArchiveHandler
 
-from folder_extractor.config.constants import HISTORY_FILE_NAME, MESSAGES
+from folder_extractor.config.constants import (
+    ARCHIVE_MAX_ENTRIES,
+    ARCHIVE_MAX_NESTING_DEPTH,
+    ARCHIVE_MAX_TOTAL_SIZE,
+    HISTORY_FILE_NAME,
+    MESSAGES,
+)
 from folder_extractor.config.settings import Settings
-from folder_extractor.core.archives import SecurityError
+from folder_extractor.core.archives import ExtractionBudget, SecurityError
 from folder_extractor.core.file_discovery import FileDiscovery, IFileDiscovery
 from folder_extractor.core.file_operations import (
     FileMover,
@@ -35,6 +51,10 @@ from folder_extractor.utils.path_validators import is_safe_path
 
 # Type alias for progress callback: (current, total, filename, error) -> None
 ProgressCallback = Optional[Callable[[int, int, str, Optional[str]], None]]
+# Type alias for move callback: [(old path, new path), ...] -> None
+MoveCallback = Callable[[List[Tuple[str, str]]], None]
+
+logger = logging.getLogger(__name__)
 
 
 class ExtractionError(Exception):
@@ -89,6 +109,7 @@ class EnhancedFileExtractor(IEnhancedExtractor):
         file_discovery: Optional[IFileDiscovery] = None,
         file_operations: Optional[IFileOperations] = None,
         state_manager: Optional[IStateManager] = None,
+        move_callback: Optional[MoveCallback] = None,
     ):
         """Initialize enhanced extractor.
 
@@ -98,26 +119,27 @@ class EnhancedFileExtractor(IEnhancedExtractor):
             file_operations: File operations implementation (optional)
             state_manager: State manager implementation
                 (optional, creates default if None)
+            move_callback: Called with (old path, new path) pairs after files
+                were moved or restored, e.g. GraphMaintenance.record_moves
+                (optional)
         """
         self.settings = settings
         self.file_discovery = file_discovery or FileDiscovery()
         self.file_operations = file_operations or FileOperations()
         self.state_manager = state_manager or StateManager()
         self.history_manager = HistoryManager()
+        self.move_callback = move_callback
 
     # -------------------------------------------------------------------------
     # Archive Detection and Handling
     # -------------------------------------------------------------------------
 
-    # Supported archive extensions
-    _ARCHIVE_EXTENSIONS = frozenset([".zip"])
-    _TAR_EXTENSIONS = frozenset([".tar"])
-    _COMPRESSED_TAR_SUFFIXES = [".tar.gz", ".tar.bz2", ".tar.xz"]
-    _TAR_ALIASES = frozenset([".tgz", ".txz"])
-
     def _is_archive(self, filepath: Path) -> bool:
         """
-        Check if a file is a supported archive based on its extension.
+        Check if a file is a supported archive.
+
+        Delegates to the archive handler registry: the extension selects
+        candidates, the file header (read once and cached) confirms the format.
 
         Args:
             filepath: Path to the file to check
@@ -125,25 +147,7 @@ class EnhancedFileExtractor(IEnhancedExtractor):
         Returns:
             True if the file is a supported archive format
         """
-        path = filepath
-        name_lower = path.name.lower()
-        suffix_lower = path.suffix.lower()
-
-        # Check ZIP files
-        if suffix_lower in self._ARCHIVE_EXTENSIONS:
-            return True
-
-        # Check TAR aliases (e.g., .tgz)
-        if suffix_lower in self._TAR_ALIASES:
-            return True
-
-        # Check compressed TAR files (e.g., .tar.gz, .tar.bz2)
-        for compound_ext in self._COMPRESSED_TAR_SUFFIXES:
-            if name_lower.endswith(compound_ext):
-                return True
-
-        # Check plain TAR files
-        return suffix_lower in self._TAR_EXTENSIONS
+        return self._get_archive_handler(filepath) is not None
 
     def _get_archive_handler(self, filepath: Path) -> "Optional[IArchiveHandler]":
         """
@@ -159,6 +163,18 @@ class EnhancedFileExtractor(IEnhancedExtractor):
 
         return get_archive_handler(filepath)
 
+    def _create_extraction_budget(self) -> ExtractionBudget:
+        """Create the limits for one top-level archive and its inner archives."""
+        return ExtractionBudget(
+            max_depth=self.settings.get(
+                "archive_nesting_depth", ARCHIVE_MAX_NESTING_DEPTH
+            ),
+            max_total_size=self.settings.get(
+                "archive_max_total_size", ARCHIVE_MAX_TOTAL_SIZE
+            ),
+            max_entries=self.settings.get("archive_max_entries", ARCHIVE_MAX_ENTRIES),
+        )
+
     def _process_archives(
         self,
         files: List[str],
@@ -251,8 +267,11 @@ class EnhancedFileExtractor(IEnhancedExtractor):
                     remaining_files.append(archive_path)
                     continue
 
-                # Extract archive
-                handler.extract(archive_path_obj, temp_path)
+                # Extract archive - inner archives are expanded by the handler
+                # within the nesting depth and limits of the shared budget
+                handler.extract(
+                    archive_path_obj, temp_path, self._create_extraction_budget()
+                )
 
                 # Discover extracted files
                 extracted_files = self.file_discovery.find_files(
@@ -264,9 +283,10 @@ class EnhancedFileExtractor(IEnhancedExtractor):
                 if extracted_files:
                     archive_results["files_extracted"] += len(extracted_files)
 
-                    # Recursively process extracted files (to destination)
-                    # Applies same filters, deduplication, etc.
-                    recursive_results = self.extract_files(
+                    # Move extracted files (to destination)
+                    # Applies same filters, deduplication, etc. Archives left
+                    # over beyond the nesting depth stay regular files.
+                    recursive_results = self._move_files(
                         files=extracted_files,
                         destination=destination,
                         operation_id=operation_id,
@@ -419,6 +439,39 @@ class EnhancedFileExtractor(IEnhancedExtractor):
         if not files:
             return results
 
+        results.update(
+            self._move_files(
+                files=files,
+                destination=destination,
+                operation_id=operation_id,
+                progress_callback=progress_callback,
+                indexing_callback=indexing_callback,
+            )
+        )
+        return results
+
+    def _move_files(
+        self,
+        files: List[str],
+        destination: Path,
+        operation_id: Optional[str],
+        progress_callback: ProgressCallback,
+        indexing_callback: Optional[Callable[[str], None]],
+    ) -> Dict[str, Any]:
+        """Move (non-archive) files to destination with operation tracking.
+
+        Args:
+            files: List of files to move
+            destination: Destination directory
+            operation_id: Optional operation ID for tracking
+            progress_callback: Optional progress callback
+            indexing_callback: Optional callback for indexing start/end events
+
+        Returns:
+            Dictionary with move results (without archive statistics)
+        """
+        results: Dict[str, Any] = {}
+
         # Get abort signal from state manager
         abort_signal = self.state_manager.get_abort_signal()
 
@@ -546,6 +599,11 @@ class EnhancedFileExtractor(IEnhancedExtractor):
         # (includes both moved files and content duplicates)
         if not self.settings.get("dry_run", False) and move_results["history"]:
             self.history_manager.save_history(move_results["history"], destination)
+            self._report_moves(
+                (entry["original_pfad"], entry["neuer_pfad"])
+                for entry in move_results["history"]
+                if entry.get("original_pfad") and entry.get("neuer_pfad")
+            )
 
         # Check if aborted
         if abort_signal.is_set():
@@ -578,6 +636,18 @@ class EnhancedFileExtractor(IEnhancedExtractor):
 
         return results
 
+    def _report_moves(self, moves: Iterable[Tuple[str, str]]) -> None:
+        """Pass moved files to the move callback; its errors are only logged."""
+        if self.move_callback is None:
+            return
+        pairs = list(moves)
+        if not pairs:
+            return
+        try:
+            self.move_callback(pairs)
+        except Exception as e:
+            logger.warning(f"Move callback failed: {e}")
+
     def _remove_empty_directories(self, path: Path, temp_files: list) -> Dict[str, Any]:
         """Remove empty directories after extraction.
 
@@ -682,6 +752,7 @@ class EnhancedFileExtractor(IEnhancedExtractor):
         with ManagedOperation(self.state_manager, "undo") as op:
             restored = 0
             errors = 0
+            moved_back: List[Tuple[str, str]] = []
 
             # Create progress tracker
             progress_tracker = ProgressTracker()
@@ -727,6 +798,7 @@ class EnhancedFileExtractor(IEnhancedExtractor):
                             source_path,
                             original_path,
                         )
+                        moved_back.append((str(source_path), str(original_path)))
 
                     restored += 1
 
@@ -747,6 +819,7 @@ class EnhancedFileExtractor(IEnhancedExtractor):
 
             # Finish progress
             progress_tracker.finish()
+            self._report_moves(moved_back)
 
             # Clear history after successful undo
             if restored > 0 and not op.abort_signal.is_set():
@@ -945,6 +1018,73 @@ class EnhancedExtractionOrchestrator:
                     "error": True,
                 }
 
+    def process_files(
+        self,
+        filepaths: List[Path],
+        destination: Path,
+        progress_callback: ProgressCallback = None,
+    ) -> Dict[str, Any]:
+        """Process a batch of files without directory discovery.
+
+        Watch mode variant of process_single_file() for bursts of new files.
+        All files go through a single extract_files() call, so the
+        destination scan and the global hash index are built once per
+        batch instead of once per file.
+
+        Args:
+            filepaths: Files to process
+            destination: Destination directory for the files
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            Dictionary with operation results; "missing" lists files that
+            no longer existed when the batch started
+        """
+        destination = Path(destination)
+        existing = [Path(f) for f in filepaths if Path(f).exists()]
+        missing = [str(f) for f in filepaths if not Path(f).exists()]
+
+        with ManagedOperation(self.state_manager, "batch") as op:
+            try:
+                self.extractor.validate_security(destination)
+
+                if not existing:
+                    return {
+                        "status": "error",
+                        "message": "Keine der Dateien existiert",
+                        "missing": missing,
+                        "error": True,
+                    }
+
+                if op.abort_signal.is_set():
+                    return {
+                        "status": "aborted",
+                        "message": "Operation abgebrochen",
+                    }
+
+                results = self.extractor.extract_files(
+                    files=[str(f) for f in existing],
+                    destination=destination,
+                    operation_id=op.operation_id,
+                    progress_callback=progress_callback,
+                )
+
+                results["status"] = "success"
+                results["operation_id"] = op.operation_id
+                results["missing"] = missing
+
+                return results
+
+            except SecurityError as e:
+                return {"status": "security_error", "message": str(e), "error": True}
+
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "message": f"Fehler: {str(e)}",
+                    "error": True,
+                }
+
     def execute_undo(self, path: Path) -> Dict[str, Any]:
         """Execute undo operation.
 
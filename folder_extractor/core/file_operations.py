@@ -22,6 +22,7 @@ from folder_extractor.config.constants import (
     HISTORY_FILE_NAME,
     NO_EXTENSION_FOLDER,
 )
+from folder_extractor.core.metrics import timed
 
 
 def get_config_dir() -> Path:
@@ -164,6 +165,7 @@ class FileOperations(IFileOperations):
         """
         self.abort_signal = abort_signal
 
+    @timed("move_file")
     def move_file(
         self,
         source: Path,
@@ -312,6 +314,7 @@ class FileOperations(IFileOperations):
             # No extension
             return NO_EXTENSION_FOLDER
 
+    @timed("file_hash")
     def calculate_file_hash(self, filepath: Path, algorithm: str = "sha256") -> str:
         """
         Calculate the hash of a file using the specified algorithm.
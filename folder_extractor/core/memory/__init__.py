@@ -6,17 +6,25 @@ entities, and their relationships using KùzuDB.
 """
 
 from folder_extractor.core.memory.graph import (
+    DocumentPage,
     IKnowledgeGraph,
+    InvalidCursorError,
     KnowledgeGraph,
     KnowledgeGraphError,
     get_knowledge_graph,
     reset_knowledge_graph,
 )
+from folder_extractor.core.memory.maintenance import GraphMaintenance
+from folder_extractor.core.memory.writer import KnowledgeGraphWriter
 
 __all__ = [
+    "DocumentPage",
+    "GraphMaintenance",
     "IKnowledgeGraph",
+    "InvalidCursorError",
     "KnowledgeGraph",
     "KnowledgeGraphError",
+    "KnowledgeGraphWriter",
     "get_knowledge_graph",
     "reset_knowledge_graph",
 ]
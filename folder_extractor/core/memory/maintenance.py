@@ -0,0 +1,360 @@
+"""
+Background maintenance of the knowledge graph.
+
+Documents are keyed by path, but files move: sorting, undo and users move
+them all the time. Without maintenance the graph keeps nodes for paths
+that no longer exist and misses the files at their new location.
+GraphMaintenance keeps it current:
+
+- Moves reported by FileMover, undo or the smart sorter are applied as
+  re-keys, so a moved document keeps its metadata and relationships.
+- A sweep walks the documents in path order, a bounded time per cycle,
+  and deletes documents whose files are gone. Before deleting, a missing
+  document is matched by content hash against recently moved files whose
+  old path the graph did not know (e.g. a file that was moved again before
+  its analysis was written).
+- After each complete sweep, entities and categories no document refers
+  to are removed.
+
+Usage:
+    maintenance = GraphMaintenance(graph_writer=writer)
+    maintenance.start()  # Sweep every KG_MAINTENANCE_INTERVAL seconds
+    maintenance.record_moves([(old_path, new_path)])  # Re-keyed shortly
+    ...
+    maintenance.close()  # Applies moves still queued
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+from folder_extractor.config.constants import (
+    KG_MAINTENANCE_BATCH_SIZE,
+    KG_MAINTENANCE_INTERVAL,
+    KG_MAINTENANCE_MAX_MOVES,
+    KG_MAINTENANCE_MOVE_TTL,
+    KG_MAINTENANCE_TIME_BUDGET,
+)
+from folder_extractor.core.file_operations import FileOperations, IFileOperations
+from folder_extractor.core.memory.graph import KnowledgeGraph, get_knowledge_graph
+
+if TYPE_CHECKING:
+    from folder_extractor.core.memory.writer import KnowledgeGraphWriter
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class _Move:
+    """A reported file move."""
+
+    old: str
+    new: str
+    recorded: float
+    # Content hash of the new file, calculated when first needed
+    hash: Optional[str] = None
+
+
+def _location_available(path: str) -> bool:
+    """Whether the volume or home folder of a path is reachable.
+
+    Protects documents on unmounted drives ("/Volumes/Backup/...") from
+    being treated as deleted.
+    """
+    parts = Path(path).parts
+    return Path(*parts[:3]).exists() if len(parts) > 3 else True
+
+
+class GraphMaintenance:
+    """
+    Re-keys moved documents and removes stale ones in a background thread.
+
+    Maintenance is fail-safe like the write-behind queue: errors are
+    logged, never raised to the code that reports moves.
+
+    Thread-safe: record_moves() may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        knowledge_graph: Optional[KnowledgeGraph] = None,
+        graph_writer: Optional[KnowledgeGraphWriter] = None,
+        interval: float = KG_MAINTENANCE_INTERVAL,
+        time_budget: float = KG_MAINTENANCE_TIME_BUDGET,
+        batch_size: int = KG_MAINTENANCE_BATCH_SIZE,
+        max_moves: int = KG_MAINTENANCE_MAX_MOVES,
+        move_ttl: float = KG_MAINTENANCE_MOVE_TTL,
+        file_operations: Optional[IFileOperations] = None,
+    ) -> None:
+        """
+        Initialize maintenance; nothing runs until start() or a method call.
+
+        Args:
+            knowledge_graph: Graph to maintain (default: the shared instance
+                from get_knowledge_graph(), opened on first use)
+            graph_writer: Write-behind queue to flush before re-keying, so
+                documents analyzed just before their move are found
+            interval: Seconds between sweeps of the background thread
+            time_budget: Seconds a sweep may run per cycle
+            batch_size: Documents checked per step of a sweep
+            max_moves: Unmatched moves kept for matching by content hash
+            move_ttl: Seconds an unmatched move is kept
+            file_operations: Used to hash moved files (default:
+                FileOperations)
+        """
+        self._knowledge_graph = knowledge_graph
+        self._graph_writer = graph_writer
+        self.interval = interval
+        self.time_budget = time_budget
+        self.batch_size = max(1, batch_size)
+        self.move_ttl = move_ttl
+        self._file_ops = file_operations or FileOperations()
+
+        self._moves: list[_Move] = []
+        self._unmatched: deque[_Move] = deque(maxlen=max(1, max_moves))
+        self._cursor = ""
+        self._closed = False
+        self._condition = threading.Condition()
+        # Serializes graph work of the thread and of direct calls
+        self._work_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"rekeyed": 0, "removed": 0, "orphans": 0, "sweeps": 0}
+
+    def record_moves(self, moves: Iterable[tuple[PathLike, PathLike]]) -> None:
+        """
+        Report moved files; their documents are re-keyed shortly.
+
+        Args:
+            moves: Pairs of (old path, new path)
+        """
+        now = time.monotonic()
+        entries = [
+            _Move(str(Path(old).resolve()), str(Path(new).resolve()), now)
+            for old, new in moves
+        ]
+        if not entries:
+            return
+        with self._condition:
+            if self._closed:
+                logger.warning(f"Graph maintenance closed, {len(entries)} moves lost")
+                return
+            self._moves.extend(entries)
+            self._condition.notify_all()
+
+    def start(self) -> None:
+        """Start the background thread (sweeps and prompt re-keying)."""
+        with self._condition:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="kg-maintenance", daemon=True
+                )
+                self._thread.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background thread and apply moves still queued.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self.apply_moves()
+
+    def stats(self) -> dict[str, int]:
+        """Return counters of maintenance work since creation."""
+        with self._condition:
+            return {
+                **self._stats,
+                "pending_moves": len(self._moves),
+                "unmatched_moves": len(self._unmatched),
+            }
+
+    def apply_moves(self) -> int:
+        """
+        Re-key the documents of all reported moves now.
+
+        Moves whose old path is not in the graph are kept for matching by
+        content hash during the next sweeps.
+
+        Returns:
+            Number of re-keyed documents
+        """
+        with self._work_lock:
+            with self._condition:
+                moves, self._moves = self._moves, []
+            if not moves:
+                return 0
+            try:
+                kg = self._graph()
+                if self._graph_writer is not None:
+                    self._graph_writer.flush()
+                rekeyed = set(kg.rekey_documents([(m.old, m.new) for m in moves]))
+            except Exception as e:
+                logger.warning(f"Re-keying {len(moves)} moved documents failed: {e}")
+                rekeyed = set()
+
+            with self._condition:
+                self._unmatched.extend(m for m in moves if m.old not in rekeyed)
+                self._stats["rekeyed"] += len(rekeyed)
+            return len(rekeyed)
+
+    def run_cycle(self, time_budget: Optional[float] = None) -> dict[str, int]:
+        """
+        Apply reported moves and continue the sweep for a bounded time.
+
+        Args:
+            time_budget: Seconds the sweep may run (default: time_budget
+                of the instance). The sweep continues where the previous
+                cycle stopped.
+
+        Returns:
+            Counts of this cycle: "rekeyed" and "removed" documents and
+            "orphans" (entities and categories) removed
+        """
+        moved = self.apply_moves()
+        result = {"rekeyed": 0, "removed": 0, "orphans": 0}
+        budget = self.time_budget if time_budget is None else time_budget
+        deadline = time.monotonic() + budget
+
+        with self._work_lock:
+            try:
+                kg = self._graph()
+                self._expire_moves()
+                while True:
+                    documents = kg.list_documents(self._cursor, self.batch_size)
+                    if not documents:
+                        orphans = kg.remove_orphans()
+                        result["orphans"] = sum(orphans.values())
+                        self._cursor = ""
+                        with self._condition:
+                            self._stats["sweeps"] += 1
+                        break
+                    self._cursor = documents[-1][0]
+                    rekeyed, removed = self._clean(kg, documents)
+                    result["rekeyed"] += rekeyed
+                    result["removed"] += removed
+                    if time.monotonic() >= deadline:
+                        break
+            except Exception as e:
+                logger.warning(f"Knowledge graph maintenance failed: {e}")
+
+        with self._condition:
+            for key, value in result.items():
+                self._stats[key] += value
+        result["rekeyed"] += moved
+        if result["removed"] or result["orphans"]:
+            logger.info(
+                f"Knowledge graph maintenance: {result['removed']} stale documents, "
+                f"{result['orphans']} orphaned entities/categories removed"
+            )
+        return result
+
+    def _graph(self) -> KnowledgeGraph:
+        return self._knowledge_graph or get_knowledge_graph()
+
+    def _expire_moves(self) -> None:
+        """Drop unmatched moves older than move_ttl."""
+        oldest = time.monotonic() - self.move_ttl
+        with self._condition:
+            while self._unmatched and self._unmatched[0].recorded < oldest:
+                self._unmatched.popleft()
+
+    def _clean(
+        self, kg: KnowledgeGraph, documents: list[tuple[str, str]]
+    ) -> tuple[int, int]:
+        """
+        Handle the documents of one sweep step whose files are missing.
+
+        Returns:
+            Tuple of (re-keyed, deleted) documents
+        """
+        lost = [
+            (path, file_hash)
+            for path, file_hash in documents
+            if not os.path.exists(path) and _location_available(path)
+        ]
+        if not lost:
+            return 0, 0
+
+        relocated = self._relocate(lost)
+        rekeyed = kg.rekey_documents(relocated) if relocated else []
+        kept = set(rekeyed)
+        removed = kg.delete_documents([path for path, _ in lost if path not in kept])
+        return len(rekeyed), removed
+
+    def _relocate(self, lost: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """
+        Find the new location of missing documents among unmatched moves.
+
+        A candidate must have the document's file name as its old or new
+        name and the same content hash.
+
+        Returns:
+            Pairs of (document path, new path)
+        """
+        with self._condition:
+            candidates = list(self._unmatched)
+        by_name: dict[str, list[_Move]] = {}
+        for move in candidates:
+            for name in {Path(move.old).name, Path(move.new).name}:
+                by_name.setdefault(name, []).append(move)
+
+        relocated: list[tuple[str, str]] = []
+        used: set[int] = set()
+        for path, file_hash in lost:
+            if not file_hash:
+                continue
+            for move in by_name.get(Path(path).name, []):
+                if id(move) in used or not os.path.exists(move.new):
+                    continue
+                if move.hash is None:
+                    try:
+                        move.hash = self._file_ops.calculate_file_hash(Path(move.new))
+                    except Exception as e:
+                        logger.debug(f"Could not hash {move.new}: {e}")
+                        move.hash = ""
+                if move.hash == file_hash:
+                    relocated.append((path, move.new))
+                    used.add(id(move))
+                    break
+
+        if used:
+            with self._condition:
+                remaining = [m for m in self._unmatched if id(m) not in used]
+                self._unmatched.clear()
+                self._unmatched.extend(remaining)
+        return relocated
+
+    def _run(self) -> None:
+        """Background loop: apply reported moves promptly, sweep periodically."""
+        next_sweep = time.monotonic() + self.interval
+        while True:
+            with self._condition:
+                while not self._closed and not self._moves:
+                    remaining = next_sweep - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed:
+                    return
+                sweep_due = time.monotonic() >= next_sweep
+
+            if sweep_due:
+                self.run_cycle()
+                next_sweep = time.monotonic() + self.interval
+            else:
+                self.apply_moves()
@@ -0,0 +1,203 @@
+"""
+Persistent cache for natural language → Cypher translations.
+
+Translating a question costs a model request, although users ask the same
+questions again ("Rechnungen von Telekom 2024"). Validated translations are
+stored in a SQLite database next to the knowledge graph, keyed by the
+normalized question and a fingerprint of the translation prompt and model.
+The prompt contains the graph schema, so a schema change leads to cache
+misses; old entries age out through LRU eviction.
+
+Only the translation is cached. The Cypher query itself runs on every
+request, so results always reflect the current graph.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from folder_extractor.config.constants import (
+    QUERY_CACHE_FILE_NAME,
+    QUERY_CACHE_MAX_ENTRIES,
+)
+from folder_extractor.core.file_operations import get_config_dir
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cypher_translations (
+    query TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (query, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS idx_cypher_translations_last_access
+    ON cypher_translations (last_access);
+"""
+
+# Punctuation that does not change the meaning of a question
+_PUNCTUATION = re.compile(r"[?!.,;:\"'„“”‚‘’()]+")
+
+
+def normalize_query(text: str) -> str:
+    """Normalize a question so that trivial variants share a cache entry.
+
+    Case, surrounding punctuation and repeated whitespace are ignored.
+
+    Args:
+        text: Natural language question.
+
+    Returns:
+        Normalized question.
+
+    Example:
+        >>> normalize_query("  Rechnungen von Telekom 2024? ")
+        'rechnungen von telekom 2024'
+    """
+    return " ".join(_PUNCTUATION.sub(" ", text).casefold().split())
+
+
+class CypherQueryCache:
+    """SQLite-backed cache of Cypher translations with LRU eviction.
+
+    Like AIResultCache, the cache is fail-safe: database errors are logged
+    and treated as cache misses.
+
+    Attributes:
+        db_path: Location of the SQLite database.
+        max_entries: Maximum number of entries before LRU eviction.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            db_path: Database file (default: query_cache.db in the config dir).
+            max_entries: Maximum number of entries before LRU eviction.
+        """
+        self.db_path = db_path or get_config_dir() / QUERY_CACHE_FILE_NAME
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Query cache disabled ({self.db_path}): {e}")
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the database could be opened."""
+        return self._conn is not None
+
+    def get(self, query: str, fingerprint: str) -> Optional[dict[str, Any]]:
+        """Look up a cached translation.
+
+        Args:
+            query: Question as asked; it is normalized here.
+            fingerprint: Fingerprint of the translation prompt and model.
+
+        Returns:
+            The cached translation with "cypher" and "explanation", or None.
+        """
+        key = normalize_query(query)
+        with self._lock:
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT translation FROM cypher_translations "
+                    "WHERE query = ? AND fingerprint = ?",
+                    (key, fingerprint),
+                ).fetchone()
+                if row is None:
+                    self._misses += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE cypher_translations SET last_access = ? "
+                    "WHERE query = ? AND fingerprint = ?",
+                    (time.time(), key, fingerprint),
+                )
+                self._conn.commit()
+                translation = json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"Query cache lookup failed: {e}")
+                self._misses += 1
+                return None
+            self._hits += 1
+            return translation
+
+    def put(self, query: str, fingerprint: str, translation: dict[str, Any]) -> None:
+        """Store a validated translation and evict least recently used entries.
+
+        Args:
+            query: Question as asked; it is normalized here.
+            fingerprint: Fingerprint of the translation prompt and model.
+            translation: Dictionary with "cypher" and "explanation".
+        """
+        key = normalize_query(query)
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cypher_translations "
+                    "(query, fingerprint, translation, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, fingerprint, json.dumps(translation), time.time()),
+                )
+                self._conn.execute(
+                    "DELETE FROM cypher_translations WHERE rowid IN ("
+                    "SELECT rowid FROM cypher_translations "
+                    "ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self._conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Query cache update failed: {e}")
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("DELETE FROM cypher_translations")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Query cache clear failed: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of entries, hits and misses."""
+        with self._lock:
+            entries = 0
+            if self._conn is not None:
+                with contextlib.suppress(sqlite3.Error):
+                    entries = self._conn.execute(
+                        "SELECT COUNT(*) FROM cypher_translations"
+                    ).fetchone()[0]
+            return {"entries": entries, "hits": self._hits, "misses": self._misses}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
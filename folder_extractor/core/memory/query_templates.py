@@ -0,0 +1,107 @@
+"""
+Local templates for common knowledge graph questions.
+
+Most questions name a sender, a category and/or a year ("Rechnungen von
+Telekom", "Verträge aus 2024", "Telekom Finanzen 2023"). Such questions are
+answered with a fixed, parameterized Cypher query instead of an AI
+translation. A question only matches if every remaining word is a filler
+word (QUERY_TEMPLATE_FILLER_WORDS); anything else, e.g. "oder", "ohne" or
+a search term for the summary, is left to the AI.
+"""
+
+from __future__ import annotations
+
+import calendar
+import re
+from typing import Any, Iterable, Optional
+
+from folder_extractor.config.constants import QUERY_TEMPLATE_FILLER_WORDS
+from folder_extractor.core.memory.query_cache import normalize_query
+
+_FILLER_WORDS = frozenset(QUERY_TEMPLATE_FILLER_WORDS)
+_YEAR_PATTERN = re.compile(r"(?<!\w)(19\d{2}|20\d{2})(?!\w)")
+
+
+def _find_names(text: str, names: Iterable[str]) -> tuple[list[str], str]:
+    """Find known names in a normalized question.
+
+    Longer names are matched first, so "Telekom Deutschland" wins over
+    "Telekom". Every match is removed from the text.
+
+    Args:
+        text: Normalized question.
+        names: Names as stored in the graph.
+
+    Returns:
+        Tuple of (matched names as stored, remaining text).
+    """
+    found: list[str] = []
+    for name in sorted(set(names), key=len, reverse=True):
+        key = normalize_query(name)
+        if not key:
+            continue
+        pattern = re.compile(rf"(?<!\w){re.escape(key)}(?!\w)")
+        if pattern.search(text):
+            found.append(name)
+            text = pattern.sub(" ", text)
+    return found, text
+
+
+def match_query_template(
+    query: str, categories: Iterable[str], entities: Iterable[str]
+) -> Optional[dict[str, Any]]:
+    """Translate a simple question into Cypher without the AI.
+
+    Args:
+        query: Natural language question.
+        categories: Category names in the graph.
+        entities: Entity names in the graph.
+
+    Returns:
+        Dictionary with "cypher", "parameters" and "explanation", or None
+        if the question names more than one entity, category or year, names
+        none of them, or contains other words.
+
+    Example:
+        >>> match_query_template("Verträge aus 2024", ["Verträge"], [])["parameters"]
+        {'category': 'Verträge', 'year_start': 1704067200, 'year_end': 1735689600}
+    """
+    text = normalize_query(query)
+    found_categories, text = _find_names(text, categories)
+    found_entities, text = _find_names(text, entities)
+    years = _YEAR_PATTERN.findall(text)
+    text = _YEAR_PATTERN.sub(" ", text)
+
+    if len(found_categories) > 1 or len(found_entities) > 1 or len(years) > 1:
+        return None
+    if not (found_categories or found_entities or years):
+        return None
+    if any(word not in _FILLER_WORDS for word in re.findall(r"\w+", text)):
+        return None
+
+    patterns = ["(d:Document)"]
+    parameters: dict[str, Any] = {}
+    explanation: list[str] = []
+    if found_categories:
+        patterns.append("(d)-[:BELONGS_TO]->(:Category {name: $category})")
+        parameters["category"] = found_categories[0]
+        explanation.append(f"Kategorie {found_categories[0]}")
+    if found_entities:
+        patterns.append("(d)-[:MENTIONS]->(:Entity {name: $entity})")
+        parameters["entity"] = found_entities[0]
+        explanation.append(f"erwähnt {found_entities[0]}")
+
+    cypher = "MATCH " + ", ".join(patterns)
+    if years:
+        year = int(years[0])
+        cypher += " WHERE d.timestamp >= $year_start AND d.timestamp < $year_end"
+        parameters["year_start"] = calendar.timegm((year, 1, 1, 0, 0, 0))
+        parameters["year_end"] = calendar.timegm((year + 1, 1, 1, 0, 0, 0))
+        explanation.append(f"aus {year}")
+    cypher += " RETURN DISTINCT d.path"
+
+    return {
+        "cypher": cypher,
+        "parameters": parameters,
+        "explanation": "Lokale Vorlage: Dokumente, " + ", ".join(explanation),
+    }
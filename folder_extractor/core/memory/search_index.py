@@ -0,0 +1,307 @@
+"""
+Local full-text index for instant document search.
+
+The knowledge graph answers questions through an AI translation to Cypher,
+which needs the network and takes seconds. This index answers keyword
+questions ("Telekom 2024", "Arztbriefe Dr. Müller") locally in
+milliseconds. It is a SQLite FTS5 table over filename, summary, category,
+sender, year and entity names, written by KnowledgeGraph.ingest_many() so
+it always lists the same documents as the graph.
+
+Every word of a question must match (filler words such as "zeig mir" or
+"von" are ignored); words match as prefixes after stripping common plural
+endings, so "Rechnungen" finds "Rechnung". Results are ranked by BM25.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from folder_extractor.config.constants import (
+    QUERY_TEMPLATE_FILLER_WORDS,
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_INDEX_FILE_NAME,
+)
+from folder_extractor.core.file_operations import get_config_dir
+from folder_extractor.core.memory.query_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    filename TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    category TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    year TEXT NOT NULL,
+    entities TEXT NOT NULL,
+    timestamp INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    filename, summary, category, sender, year, entities,
+    content='documents', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS documents_after_insert AFTER INSERT ON documents
+BEGIN
+    INSERT INTO documents_fts (rowid, filename, summary, category, sender, year,
+                               entities)
+    VALUES (new.id, new.filename, new.summary, new.category, new.sender,
+            new.year, new.entities);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_after_delete AFTER DELETE ON documents
+BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, filename, summary, category,
+                               sender, year, entities)
+    VALUES ('delete', old.id, old.filename, old.summary, old.category,
+            old.sender, old.year, old.entities);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_after_update AFTER UPDATE ON documents
+BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, filename, summary, category,
+                               sender, year, entities)
+    VALUES ('delete', old.id, old.filename, old.summary, old.category,
+            old.sender, old.year, old.entities);
+    INSERT INTO documents_fts (rowid, filename, summary, category, sender, year,
+                               entities)
+    VALUES (new.id, new.filename, new.summary, new.category, new.sender,
+            new.year, new.entities);
+END;
+"""
+
+_COLUMNS = (
+    "path",
+    "filename",
+    "summary",
+    "category",
+    "sender",
+    "year",
+    "entities",
+    "timestamp",
+)
+
+_FILLER_WORDS = frozenset(QUERY_TEMPLATE_FILLER_WORDS)
+# Plural and inflection endings stripped before prefix matching
+_ENDINGS = ("en", "er", "e", "n", "s")
+
+
+def _search_terms(query: str) -> list[str]:
+    """Turn a question into FTS5 prefix terms.
+
+    Args:
+        query: Natural language question.
+
+    Returns:
+        Quoted prefix terms, e.g. ['"rechnung"*', '"telekom"*'].
+    """
+    terms: list[str] = []
+    for word in re.findall(r"\w+", normalize_query(query)):
+        if word in _FILLER_WORDS:
+            continue
+        if len(word) > 5 and not word.isdigit():
+            for ending in _ENDINGS:
+                if word.endswith(ending):
+                    word = word[: -len(ending)]
+                    break
+        terms.append(f'"{word}"*')
+    return terms
+
+
+def _row(file_info: dict[str, Any]) -> tuple[Any, ...]:
+    """Build an index row from a document in the format of ingest()."""
+    entities = [
+        str(entity["name"])
+        for entity in file_info.get("entities") or []
+        if isinstance(entity, dict) and entity.get("name")
+    ]
+    return (
+        str(file_info["path"]),
+        Path(str(file_info["path"])).name,
+        str(file_info.get("summary") or ""),
+        str(file_info.get("category") or ""),
+        str(file_info.get("sender") or ""),
+        str(file_info.get("year") or ""),
+        " ".join(entities),
+        int(file_info.get("timestamp") or 0),
+    )
+
+
+class DocumentSearchIndex:
+    """SQLite FTS5 index of the documents in the knowledge graph.
+
+    Like the caches, the index is fail-safe: database errors are logged, a
+    failed write leaves the graph untouched and a failed search returns no
+    results.
+
+    Attributes:
+        db_path: Location of the SQLite database.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        """Open (or create) the index database.
+
+        Args:
+            db_path: Database file (default: search_index.db in the config dir).
+        """
+        self.db_path = db_path or get_config_dir() / SEARCH_INDEX_FILE_NAME
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Search index disabled ({self.db_path}): {e}")
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the database could be opened."""
+        return self._conn is not None
+
+    def add_many(
+        self, file_infos: Iterable[dict[str, Any]], replace: bool = True
+    ) -> None:
+        """Add or update documents.
+
+        Args:
+            file_infos: Documents in the format accepted by
+                KnowledgeGraph.ingest(), optionally with "sender" and "year".
+            replace: Whether to overwrite documents already in the index.
+                Without it, existing entries are kept.
+        """
+        rows = [_row(file_info) for file_info in file_infos]
+        if not rows:
+            return
+        if replace:
+            updates = ", ".join(f"{name} = excluded.{name}" for name in _COLUMNS[1:])
+            conflict = f"ON CONFLICT (path) DO UPDATE SET {updates}"
+        else:
+            conflict = "ON CONFLICT (path) DO NOTHING"
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        f"INSERT INTO documents ({', '.join(_COLUMNS)}) "
+                        f"VALUES ({placeholders}) {conflict}",
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Search index update failed: {e}")
+
+    def rename_many(self, moves: Iterable[tuple[str, str]]) -> None:
+        """Move documents to new paths.
+
+        If a document already exists at the new path, it is kept and the
+        entry of the old path is dropped.
+
+        Args:
+            moves: Pairs of (old path, new path), applied in order.
+        """
+        pairs = [(str(old), str(new)) for old, new in moves]
+        if not pairs:
+            return
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                with self._conn:
+                    for old, new in pairs:
+                        cursor = self._conn.execute(
+                            "UPDATE OR IGNORE documents SET path = ?, filename = ? "
+                            "WHERE path = ?",
+                            (new, Path(new).name, old),
+                        )
+                        if cursor.rowcount == 0:
+                            self._conn.execute(
+                                "DELETE FROM documents WHERE path = ?", (old,)
+                            )
+            except sqlite3.Error as e:
+                logger.warning(f"Search index rename failed: {e}")
+
+    def remove_many(self, paths: Iterable[str]) -> None:
+        """Remove documents.
+
+        Args:
+            paths: Paths of the documents to remove.
+        """
+        rows = [(str(path),) for path in paths]
+        if not rows:
+            return
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM documents WHERE path = ?", rows)
+            except sqlite3.Error as e:
+                logger.warning(f"Search index removal failed: {e}")
+
+    def search(self, query: str, limit: int = SEARCH_DEFAULT_LIMIT) -> list[str]:
+        """Find documents matching every word of a question.
+
+        Args:
+            query: Question or keywords.
+            limit: Maximum number of results.
+
+        Returns:
+            Document paths, best match first. Empty if no word remains after
+            removing filler words.
+        """
+        terms = _search_terms(query)
+        if not terms:
+            return []
+        with self._lock:
+            if self._conn is None:
+                return []
+            try:
+                rows = self._conn.execute(
+                    "SELECT documents.path FROM documents_fts "
+                    "JOIN documents ON documents.id = documents_fts.rowid "
+                    "WHERE documents_fts MATCH ? "
+                    "ORDER BY bm25(documents_fts) LIMIT ?",
+                    (" ".join(terms), limit),
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Search failed for {query!r}: {e}")
+                return []
+        return [row[0] for row in rows]
+
+    def count(self) -> int:
+        """Return the number of indexed documents."""
+        with self._lock:
+            if self._conn is None:
+                return 0
+            with contextlib.suppress(sqlite3.Error):
+                row = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+                return int(row[0])
+            return 0
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                with self._conn:
+                    self._conn.execute("DELETE FROM documents")
+            except sqlite3.Error as e:
+                logger.warning(f"Search index clear failed: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,227 @@
+"""
+Write-behind queue for knowledge graph ingestion.
+
+Writing a document to the graph takes a transaction; doing it for every
+analyzed file puts database latency on the critical path of each analysis.
+KnowledgeGraphWriter collects documents and writes them in batches with
+KnowledgeGraph.ingest_many() from a background thread, either when
+KG_WRITE_BATCH_SIZE documents are queued or after KG_WRITE_FLUSH_INTERVAL
+seconds.
+
+Usage:
+    writer = KnowledgeGraphWriter()
+    writer.submit(file_info)  # Returns immediately
+    ...
+    writer.close()  # Writes everything still queued
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from folder_extractor.config.constants import (
+    KG_WRITE_BATCH_SIZE,
+    KG_WRITE_FLUSH_INTERVAL,
+    KG_WRITE_MAX_PENDING,
+)
+from folder_extractor.core.memory.graph import IKnowledgeGraph, get_knowledge_graph
+
+logger = logging.getLogger(__name__)
+
+
+class KnowledgeGraphWriter:
+    """
+    Batches knowledge graph writes in a background thread.
+
+    Writes are fail-safe like the direct ingestion in SmartSorter: errors
+    are logged, never raised to the submitter. If a batch fails, its
+    documents are retried one by one so a single bad document does not
+    drop the others.
+
+    Thread-safe: submit() may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        knowledge_graph: Optional[IKnowledgeGraph] = None,
+        batch_size: int = KG_WRITE_BATCH_SIZE,
+        flush_interval: float = KG_WRITE_FLUSH_INTERVAL,
+        max_pending: int = KG_WRITE_MAX_PENDING,
+    ) -> None:
+        """
+        Initialize the writer; the background thread starts on first use.
+
+        Args:
+            knowledge_graph: Graph to write to (default: the shared instance
+                from get_knowledge_graph(), opened on the first write)
+            batch_size: Documents per transaction
+            flush_interval: Seconds a queued document waits at most
+            max_pending: Queued documents before submit() blocks until the
+                background thread caught up
+        """
+        self._knowledge_graph = knowledge_graph
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(self.batch_size, max_pending)
+
+        self._pending: list[dict[str, Any]] = []
+        self._in_flight = 0
+        self._closed = False
+        self._flush_requested = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._written = 0
+        self._failed = 0
+
+    def submit(self, file_info: dict[str, Any]) -> None:
+        """
+        Queue a document for ingestion.
+
+        Args:
+            file_info: Document in the format accepted by
+                KnowledgeGraph.ingest()
+
+        Raises:
+            RuntimeError: If the writer was closed
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("KnowledgeGraphWriter is closed")
+            self._ensure_thread()
+            while len(self._pending) >= self.max_pending:
+                self._condition.wait()
+            self._pending.append(file_info)
+            # Wake the thread to start the flush interval or write a full batch
+            if len(self._pending) in (1, self.batch_size):
+                self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write all queued documents now and wait until they are written.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the queue was drained, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Write all queued documents and stop the background thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the remaining writes
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of documents waiting to be written."""
+        with self._condition:
+            return len(self._pending) + self._in_flight
+
+    def stats(self) -> dict[str, int]:
+        """Return counters of queued, written and failed documents."""
+        with self._condition:
+            return {
+                "pending": len(self._pending) + self._in_flight,
+                "written": self._written,
+                "failed": self._failed,
+            }
+
+    def _ensure_thread(self) -> None:
+        """Start the background thread (caller holds the condition)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="kg-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Background loop: take batches from the queue and write them."""
+        while True:
+            with self._condition:
+                deadline: Optional[float] = None
+                while True:
+                    if not self._pending:
+                        self._flush_requested = False
+                        if self._closed:
+                            return
+                        deadline = None
+                        self._condition.wait()
+                        continue
+                    if deadline is None:
+                        # The oldest queued document waits at most this long
+                        deadline = time.monotonic() + self.flush_interval
+                    remaining = deadline - time.monotonic()
+                    if (
+                        len(self._pending) >= self.batch_size
+                        or self._closed
+                        or self._flush_requested
+                        or remaining <= 0
+                    ):
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._pending[: self.batch_size]
+                del self._pending[: self.batch_size]
+                self._in_flight = len(batch)
+                # Wake submitters blocked on a full queue
+                self._condition.notify_all()
+
+            written = self._write(batch)
+            with self._condition:
+                self._in_flight = 0
+                self._written += written
+                self._failed += len(batch) - written
+                self._condition.notify_all()
+
+    def _write(self, batch: list[dict[str, Any]]) -> int:
+        """
+        Write a batch, falling back to single documents if it fails.
+
+        Returns:
+            Number of documents written
+        """
+        try:
+            kg = self._knowledge_graph or get_knowledge_graph()
+        except Exception as e:
+            logger.warning(f"Knowledge graph unavailable, {len(batch)} lost: {e}")
+            return 0
+
+        try:
+            kg.ingest_many(batch)
+            logger.info(f"Knowledge graph updated for {len(batch)} documents")
+            return len(batch)
+        except Exception as e:
+            logger.warning(f"Batch ingestion failed, writing singly: {e}")
+
+        written = 0
+        for file_info in batch:
+            try:
+                kg.ingest(file_info)
+                written += 1
+            except Exception as e:
+                logger.warning(
+                    f"Failed to update knowledge graph for {file_info.get('path')}: {e}"
+                )
+        return written
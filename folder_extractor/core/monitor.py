@@ -4,17 +4,214 @@ This module provides the StabilityMonitor class which determines when files
 are fully written and ready for processing. It checks file size stability
 and lock status to avoid processing incomplete downloads or files still
 being written by other applications.
+
+On Linux, readiness is event-driven: an inotify watch reports when the
+writer closes the file (IN_CLOSE_WRITE) or when a finished download is
+renamed into place (IN_MOVED_TO), so files become ready within milliseconds.
+Watch handlers register files with track() as soon as they appear, so these
+events are also seen while the handler is still coalescing events, before
+the wait starts. Without such an event - on other platforms, when inotify is
+unavailable, or for files completed before they were registered - a file is
+ready once its size has been unchanged for a quiet period
+(MONITOR_STABILITY_WINDOW); it is re-checked at short, adaptive intervals
+during that period.
 """
 
+import ctypes
+import ctypes.util
 import logging
+import os
+import select
+import struct
+import sys
+import threading
 import time
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+from folder_extractor.config.constants import (
+    MONITOR_EVENT_POLL_INTERVAL,
+    MONITOR_MAX_POLL_INTERVAL,
+    MONITOR_POLL_INTERVAL,
+    MONITOR_STABILITY_WINDOW,
+)
+from folder_extractor.core.metrics import timed
 from folder_extractor.core.state_manager import IStateManager
 
 logger = logging.getLogger(__name__)
 
 
+# inotify constants (see <sys/inotify.h>)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; }
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _FileWaiter:
+    """Readiness state of one file, updated by the inotify reader thread."""
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.completed = False
+        self.modified = False
+
+    def take_modified(self) -> bool:
+        """Return whether the file was written since the last call."""
+        modified = self.modified
+        self.modified = False
+        return modified
+
+
+class _InotifyWatcher:
+    """Process-wide inotify instance shared by all stability monitors.
+
+    Watches the parent directories of files being waited for and wakes the
+    corresponding waiters. A single reader thread serves all waiters, and
+    directory watches are reference counted and removed when unused.
+    """
+
+    def __init__(self, libc: ctypes.CDLL, fd: int) -> None:
+        self._libc = libc
+        self._fd = fd
+        self._lock = threading.Lock()
+        # wd -> directory, directory -> (wd, refcount)
+        self._dirs: Dict[int, str] = {}
+        self._watches: Dict[str, Tuple[int, int]] = {}
+        # (directory, name) -> waiters
+        self._waiters: Dict[Tuple[str, str], List[_FileWaiter]] = {}
+        self._thread = threading.Thread(
+            target=self._read_loop, name="inotify-stability", daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def create(cls) -> Optional["_InotifyWatcher"]:
+        """Create the watcher, or return None if inotify is unavailable."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [
+                ctypes.c_int,
+                ctypes.c_char_p,
+                ctypes.c_uint32,
+            ]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        except (OSError, AttributeError) as e:
+            logger.debug(f"inotify not available: {e}")
+            return None
+        if fd < 0:
+            logger.debug("inotify_init1 failed, falling back to polling")
+            return None
+        return cls(libc, fd)
+
+    def subscribe(self, filepath: Path) -> Optional[_FileWaiter]:
+        """Start receiving events for a file.
+
+        Returns:
+            A waiter to pass to unsubscribe(), or None if the parent
+            directory cannot be watched (polling is used then).
+        """
+        directory = os.fsdecode(os.path.abspath(filepath.parent))
+        key = (directory, filepath.name)
+        waiter = _FileWaiter()
+        with self._lock:
+            wd, refcount = self._watches.get(directory, (-1, 0))
+            if refcount == 0:
+                wd = self._libc.inotify_add_watch(
+                    self._fd, os.fsencode(directory), _WATCH_MASK
+                )
+                if wd < 0:
+                    return None
+                self._dirs[wd] = directory
+            self._watches[directory] = (wd, refcount + 1)
+            self._waiters.setdefault(key, []).append(waiter)
+        return waiter
+
+    def unsubscribe(self, filepath: Path, waiter: _FileWaiter) -> None:
+        """Stop receiving events for a file."""
+        directory = os.fsdecode(os.path.abspath(filepath.parent))
+        key = (directory, filepath.name)
+        with self._lock:
+            waiters = self._waiters.get(key, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                self._waiters.pop(key, None)
+            wd, refcount = self._watches.get(directory, (-1, 0))
+            if refcount <= 1:
+                self._watches.pop(directory, None)
+                self._dirs.pop(wd, None)
+                if wd >= 0:
+                    self._libc.inotify_rm_watch(self._fd, wd)
+            else:
+                self._watches[directory] = (wd, refcount - 1)
+
+    def _read_loop(self) -> None:
+        """Dispatch inotify events to waiters (runs in a daemon thread)."""
+        while True:
+            try:
+                readable, _, _ = select.select([self._fd], [], [], 1.0)
+                if not readable:
+                    continue
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                logger.warning(f"inotify reader stopped: {e}")
+                return
+            self._dispatch(data)
+
+    def _dispatch(self, data: bytes) -> None:
+        """Parse a buffer of inotify events and wake matching waiters."""
+        offset = 0
+        with self._lock:
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & _IN_IGNORED:
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                for waiter in self._waiters.get((directory, os.fsdecode(raw_name)), []):
+                    if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                        waiter.completed = True
+                    else:
+                        # Reopened for writing: wait for the next close
+                        waiter.modified = True
+                        waiter.completed = False
+                    waiter.event.set()
+
+
+_inotify_watcher: Optional[_InotifyWatcher] = None
+_inotify_initialized = False
+_inotify_lock = threading.Lock()
+
+
+def _get_inotify_watcher() -> Optional[_InotifyWatcher]:
+    """Return the shared inotify watcher (created on first use)."""
+    global _inotify_watcher, _inotify_initialized
+    with _inotify_lock:
+        if not _inotify_initialized:
+            _inotify_watcher = _InotifyWatcher.create()
+            _inotify_initialized = True
+        return _inotify_watcher
+
+
 class StabilityMonitor:
     """Monitor files to determine when they are ready for processing.
 
@@ -22,23 +219,122 @@ class StabilityMonitor:
     fully written before processing. Integrates with StateManager
     for graceful abort handling.
 
+    With inotify (Linux), a file is ready as soon as its writer closes it
+    or it is renamed into place. Files registered with track() when they
+    appear also count close and rename events seen before the wait.
+    Otherwise its size must stay unchanged - and, with inotify, no write
+    may be reported - for stability_window seconds. The short check
+    intervals only decide how often the file is re-checked: they start
+    short and double whenever the file is still changing (up to a maximum).
+
     Attributes:
         state_manager: State manager for abort signal checking.
+        use_inotify: Whether event-driven detection is used when available.
+        poll_interval: Initial interval between stability checks in seconds.
+        max_poll_interval: Upper bound for the interval after backoff.
+        stability_window: Quiet period in seconds before a file without a
+            close or rename event is ready.
     """
 
-    def __init__(self, state_manager: IStateManager) -> None:
+    def __init__(
+        self,
+        state_manager: IStateManager,
+        use_inotify: bool = True,
+        poll_interval: Optional[float] = None,
+        max_poll_interval: float = MONITOR_MAX_POLL_INTERVAL,
+        stability_window: float = MONITOR_STABILITY_WINDOW,
+    ) -> None:
         """Initialize the stability monitor.
 
         Args:
             state_manager: State manager instance for abort signal handling.
+            use_inotify: Use inotify events on Linux. Defaults to True.
+            poll_interval: Initial check interval in seconds. Defaults to a
+                short interval with inotify and a longer one for pure polling.
+            max_poll_interval: Maximum check interval after backoff.
+            stability_window: Seconds the size must stay unchanged before a
+                file without a close or rename event is ready.
         """
         self.state_manager = state_manager
+        self._inotify = _get_inotify_watcher() if use_inotify else None
+        self.use_inotify = self._inotify is not None
+        if poll_interval is None:
+            poll_interval = (
+                MONITOR_EVENT_POLL_INTERVAL
+                if self.use_inotify
+                else MONITOR_POLL_INTERVAL
+            )
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(max_poll_interval, poll_interval)
+        self.stability_window = max(0.0, stability_window)
+        # Files registered before their wait: path -> (waiter, subscribed)
+        self._tracked: Dict[str, Tuple[_FileWaiter, bool]] = {}
+        self._tracked_lock = threading.Lock()
+
+    def track(self, filepath: Path, completed: bool = False) -> None:
+        """Start recording close and rename events for a file.
+
+        Called when a file appears, before events are coalesced, so a file
+        closed or renamed into place before wait_for_file_ready() is
+        still ready at once. The registration ends with the next wait for
+        the file or with forget().
+
+        Args:
+            filepath: Path of the new file.
+            completed: The file was renamed into place and is complete.
+        """
+        key = os.path.abspath(filepath)
+        with self._tracked_lock:
+            entry = self._tracked.get(key)
+            if entry is None:
+                waiter = self._inotify.subscribe(filepath) if self._inotify else None
+                entry = (waiter or _FileWaiter(), waiter is not None)
+                self._tracked[key] = entry
+            if completed:
+                self._complete(entry[0])
+
+    def mark_completed(self, filepath: Path) -> None:
+        """Record that the writer of a tracked file closed it (no-op otherwise).
+
+        Args:
+            filepath: Path of the closed file.
+        """
+        with self._tracked_lock:
+            entry = self._tracked.get(os.path.abspath(filepath))
+            if entry is not None:
+                self._complete(entry[0])
+
+    def forget(self, filepath: Path) -> None:
+        """Stop tracking a file that was deleted or renamed (no-op if untracked).
+
+        Args:
+            filepath: Path the file was tracked under.
+        """
+        with self._tracked_lock:
+            entry = self._tracked.pop(os.path.abspath(filepath), None)
+        if entry is not None:
+            self._release(filepath, *entry)
+
+    @staticmethod
+    def _complete(waiter: _FileWaiter) -> None:
+        """Mark a waiter's file as completely written and wake its wait."""
+        waiter.completed = True
+        waiter.modified = False
+        waiter.event.set()
+
+    def _release(self, filepath: Path, waiter: _FileWaiter, subscribed: bool) -> None:
+        """End the inotify subscription of a waiter, if it has one."""
+        if subscribed and self._inotify is not None:
+            self._inotify.unsubscribe(filepath, waiter)
 
+    @timed("wait_for_file_ready")
     def wait_for_file_ready(self, filepath: Path, timeout: int = 60) -> bool:
         """Wait until file is fully written and ready for processing.
 
         Monitors file size stability and lock status. Returns True when
-        the file size has been stable for at least one check interval
+        the writer closed the file or renamed it into place (inotify, or
+        reported to track()/mark_completed() since the last write), or
+        when the file size has been unchanged for stability_window seconds,
         and the file is not locked by another process.
 
         Args:
@@ -49,8 +345,29 @@ class StabilityMonitor:
             True if file is ready for processing.
             False if timeout reached, abort requested, or file doesn't exist.
         """
+        with self._tracked_lock:
+            entry = self._tracked.pop(os.path.abspath(filepath), None)
+        if entry is not None:
+            waiter: Optional[_FileWaiter] = entry[0]
+            subscribed = entry[1]
+        else:
+            waiter = self._inotify.subscribe(filepath) if self._inotify else None
+            subscribed = waiter is not None
+        try:
+            return self._wait(filepath, timeout, waiter)
+        finally:
+            if waiter is not None:
+                self._release(filepath, waiter, subscribed)
+
+    def _wait(
+        self, filepath: Path, timeout: float, waiter: Optional[_FileWaiter]
+    ) -> bool:
+        """Readiness loop shared by the inotify and polling modes."""
         start_time = time.monotonic()
-        last_size = -1
+        interval = self.poll_interval
+        last_size: Optional[int] = None
+        # Start of the current quiet period (no size change, no write event)
+        quiet_since = start_time
 
         while time.monotonic() - start_time < timeout:
             # Check for abort signal
@@ -60,28 +377,64 @@ class StabilityMonitor:
 
             # Check if file exists
             if not filepath.exists():
-                time.sleep(1)
+                self._sleep(waiter, interval, start_time, timeout)
                 continue
 
+            # Writer closed the file or it was renamed into place
+            if (
+                waiter is not None
+                and waiter.completed
+                and not self._is_file_locked(filepath)
+            ):
+                logger.debug(f"File ready (close/move event): {filepath}")
+                return True
+
             # Get current file size
             try:
                 current_size = filepath.stat().st_size
             except OSError as e:
                 logger.warning(f"Could not stat file {filepath}: {e}")
-                time.sleep(1)
+                self._sleep(waiter, interval, start_time, timeout)
                 continue
 
-            # Check if size is stable and file is not locked
-            if current_size == last_size and not self._is_file_locked(filepath):
+            # Writes seen via inotify mean the file is still changing
+            written = waiter.take_modified() if waiter is not None else False
+
+            if current_size != last_size or written:
+                quiet_since = time.monotonic()
+                # Back off while the file keeps changing
+                if last_size is not None:
+                    interval = min(interval * 2, self.max_poll_interval)
+            elif (
+                time.monotonic() - quiet_since >= self.stability_window
+                and not self._is_file_locked(filepath)
+            ):
+                # Size stable for the whole quiet period and not locked
                 logger.debug(f"File ready: {filepath}")
                 return True
 
             last_size = current_size
-            time.sleep(1)
+            self._sleep(waiter, interval, start_time, timeout)
 
         logger.warning(f"Timeout waiting for {filepath} to be ready")
         return False
 
+    @staticmethod
+    def _sleep(
+        waiter: Optional[_FileWaiter],
+        interval: float,
+        start_time: float,
+        timeout: float,
+    ) -> None:
+        """Wait for the next check, waking early on inotify events."""
+        remaining = timeout - (time.monotonic() - start_time)
+        delay = max(0.0, min(interval, remaining))
+        if waiter is None:
+            time.sleep(delay)
+            return
+        if waiter.event.wait(delay):
+            waiter.event.clear()
+
     def _is_file_locked(self, filepath: Path) -> bool:
         """Check if file is locked by another process.
 
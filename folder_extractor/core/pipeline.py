@@ -0,0 +1,691 @@
+"""Queue-based processing pipeline for watch mode.
+
+Watchdog delivers filesystem events on a single observer thread. Waiting for
+file stability or running an extraction inside the event callback stalls that
+thread, so a burst of new files would be handled strictly one after another.
+
+WatchPipeline decouples the stages:
+
+1. Intake: ``submit()`` enqueues a path and returns immediately.
+2. Stability: a pool of workers waits until each file is ready.
+3. Processing: a (usually smaller) pool of workers processes ready files,
+   optionally several at once in a single batch.
+
+Both queues are bounded. When the pipeline is saturated, ``submit()`` blocks
+until there is room again (backpressure on the event source); events are
+never dropped.
+
+EventCoalescer sits in front of the intake. Copying a folder fires created,
+modified and moved events for every file, often several times; the coalescer
+merges them per path and forwards each final path once the events have
+settled.
+
+AsyncLoopThread runs the async part of smart sorting. Instead of creating a
+new event loop per file with ``asyncio.run()``, a watcher keeps one loop alive
+on a background thread, so the AI client can reuse its connections, and
+several files are analyzed concurrently up to a configurable limit.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple
+
+from folder_extractor.config.constants import (
+    BATCH_SIZE,
+    WATCH_AI_CONCURRENCY,
+    WATCH_COALESCE_WINDOW,
+    WATCH_MAX_QUEUE_SIZE,
+    WATCH_PROCESSING_WORKERS,
+    WATCH_STABILITY_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Callable signatures for the pipeline stages
+ReadyCheck = Callable[[Path, float], bool]
+ProcessFunc = Callable[[Path], None]
+BatchProcessFunc = Callable[[List[Path]], None]
+DoneCallback = Callable[[Path], None]
+# Receives the final path and the kind of the last event ("created", "moved")
+CoalescedCallback = Callable[[Path, str], None]
+
+_QUEUE_POLL_INTERVAL = 0.2  # seconds between stop checks while idle
+
+
+@dataclass
+class PipelineStats:
+    """Snapshot of queue depths and counters of a WatchPipeline."""
+
+    pending: int = 0  # queued for the stability stage
+    waiting: int = 0  # currently waiting for file stability
+    ready: int = 0  # stable, queued for processing
+    processing: int = 0  # currently being processed
+    processed: int = 0  # finished successfully
+    failed: int = 0  # processing raised an exception
+    not_ready: int = 0  # never became ready (timeout, abort, deleted)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of files submitted but not yet being processed."""
+        return self.pending + self.waiting + self.ready
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert to a plain dictionary including the queue depth."""
+        data = asdict(self)
+        data["queue_depth"] = self.queue_depth
+        return data
+
+
+class WatchPipeline:
+    """Two-stage worker pool for files detected in watch mode.
+
+    Attributes:
+        stability_workers: Number of threads waiting for file stability.
+        workers: Number of threads processing ready files.
+        batch_size: Maximum number of ready files per batch call.
+        max_queue_size: Capacity of each stage queue.
+    """
+
+    def __init__(
+        self,
+        ready_check: ReadyCheck,
+        process: Optional[ProcessFunc],
+        on_done: Optional[DoneCallback] = None,
+        stability_workers: int = WATCH_STABILITY_WORKERS,
+        workers: int = WATCH_PROCESSING_WORKERS,
+        process_batch: Optional[BatchProcessFunc] = None,
+        batch_size: int = BATCH_SIZE,
+        max_queue_size: int = WATCH_MAX_QUEUE_SIZE,
+        name: str = "watch",
+    ) -> None:
+        """Initialize the pipeline (threads are started on first submit).
+
+        Args:
+            ready_check: Stability stage. Called with (filepath, timeout) and
+                returns True when the file is ready for processing.
+            process: Processing stage. Called with the ready filepath. May be
+                None when process_batch is given.
+            on_done: Optional callback invoked once per submitted file when it
+                leaves the pipeline (processed, failed, not ready or discarded).
+            stability_workers: Concurrent stability waits.
+            workers: Concurrent processing calls.
+            process_batch: Batch processing stage. If given, it is called with
+                all ready files available at that moment (up to batch_size)
+                instead of calling process once per file.
+            batch_size: Maximum number of files per process_batch call.
+            max_queue_size: Capacity of the intake and processing queues;
+                submit() blocks while the intake queue is full.
+            name: Prefix for worker thread names.
+        """
+        if workers < 1 or stability_workers < 1:
+            raise ValueError("WatchPipeline needs at least one worker per stage")
+        if process is None and process_batch is None:
+            raise ValueError("WatchPipeline needs process or process_batch")
+
+        self.stability_workers = stability_workers
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.max_queue_size = max_queue_size
+        self._ready_check = ready_check
+        self._process = process
+        self._process_batch = process_batch
+        self._on_done = on_done
+        self._name = name
+
+        self._intake: queue.Queue[Tuple[Path, float]] = queue.Queue(max_queue_size)
+        self._ready: queue.Queue[Path] = queue.Queue(max_queue_size)
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight: Set[str] = set()
+        self._stats = PipelineStats()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether worker threads have been started and not stopped."""
+        return bool(self._threads) and not self._stop_event.is_set()
+
+    def start(self) -> None:
+        """Start the worker threads (no-op if already running)."""
+        with self._lock:
+            if self._threads or self._stop_event.is_set():
+                return
+            for i in range(self.stability_workers):
+                self._threads.append(
+                    self._spawn(self._stability_worker, f"{self._name}-stable-{i}")
+                )
+            for i in range(self.workers):
+                self._threads.append(
+                    self._spawn(self._processing_worker, f"{self._name}-process-{i}")
+                )
+
+    def submit(self, filepath: Path, timeout: float) -> bool:
+        """Queue a file for the stability and processing stages.
+
+        Args:
+            filepath: File detected by the event source.
+            timeout: Stability timeout passed to the ready check.
+
+        Blocks while the intake queue is full, so a burst slows the event
+        source down instead of losing files.
+
+        Returns:
+            True if the file was queued, False if it is already in the
+            pipeline or the pipeline is (or was while blocking) stopped.
+        """
+        if self._stop_event.is_set():
+            return False
+        if not self._threads:
+            self.start()
+
+        key = str(filepath)
+        with self._lock:
+            if key in self._in_flight:
+                return False
+            self._in_flight.add(key)
+            self._stats.pending += 1
+
+        while not self._stop_event.is_set():
+            try:
+                self._intake.put((filepath, timeout), timeout=_QUEUE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+
+        # Stopped while waiting for room, like files discarded by stop()
+        with self._lock:
+            self._stats.pending -= 1
+        self._finish(filepath)
+        return False
+
+    def stats(self) -> PipelineStats:
+        """Return a snapshot of the current queue depths and counters."""
+        with self._lock:
+            return PipelineStats(**asdict(self._stats))
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted file has left the pipeline.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if the pipeline is idle, False on timeout.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._in_flight, timeout)
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the workers and discard files that were not started yet.
+
+        Files that are currently waiting or processing finish their stage;
+        queued files are released via the done callback.
+
+        Args:
+            timeout: Maximum seconds to wait for all worker threads.
+        """
+        self._stop_event.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            thread.join(None if remaining is None else max(0.0, remaining))
+        self._drain(self._intake, "pending")
+        self._drain(self._ready, "ready")
+
+    def _spawn(self, target: Callable[[], None], name: str) -> threading.Thread:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    def _stability_worker(self) -> None:
+        """Wait for file stability and forward ready files."""
+        while not self._stop_event.is_set():
+            try:
+                filepath, timeout = self._intake.get(timeout=_QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            self._move_stat("pending", "waiting")
+
+            try:
+                ready = self._ready_check(filepath, timeout)
+            except Exception as e:
+                logger.error(f"Stability check failed for {filepath}: {e}")
+                ready = False
+
+            if not ready or not self._put_ready(filepath):
+                self._move_stat("waiting", "not_ready")
+                self._finish(filepath)
+                continue
+            self._move_stat("waiting", "ready")
+
+    def _put_ready(self, filepath: Path) -> bool:
+        """Forward a ready file, blocking while the processing queue is full."""
+        while not self._stop_event.is_set():
+            try:
+                self._ready.put(filepath, timeout=_QUEUE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _processing_worker(self) -> None:
+        """Process ready files, batching whatever is queued when enabled."""
+        while not self._stop_event.is_set():
+            try:
+                filepath = self._ready.get(timeout=_QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+            batch = [filepath]
+            if self._process_batch is not None:
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._ready.get_nowait())
+                    except queue.Empty:
+                        break
+            self._move_stat("ready", "processing", len(batch))
+
+            try:
+                if self._process_batch is not None:
+                    self._process_batch(batch)
+                elif self._process is not None:
+                    self._process(filepath)
+            except Exception as e:
+                logger.error(f"Error processing {batch}: {e}", exc_info=True)
+                self._move_stat("processing", "failed", len(batch))
+            else:
+                self._move_stat("processing", "processed", len(batch))
+            finally:
+                for done in batch:
+                    self._finish(done)
+
+    def _move_stat(self, source: str, target: str, count: int = 1) -> None:
+        """Move files between two stats counters."""
+        with self._lock:
+            setattr(self._stats, source, getattr(self._stats, source) - count)
+            setattr(self._stats, target, getattr(self._stats, target) + count)
+
+    def _drain(self, stage_queue: "queue.Queue[Any]", counter: str) -> None:
+        """Release all files still queued in a stage after stop()."""
+        while True:
+            try:
+                item = stage_queue.get_nowait()
+            except queue.Empty:
+                return
+            filepath = item[0] if isinstance(item, tuple) else item
+            with self._lock:
+                setattr(self._stats, counter, getattr(self._stats, counter) - 1)
+            self._finish(filepath)
+
+    def _finish(self, filepath: Path) -> None:
+        """Mark a file as having left the pipeline."""
+        if self._on_done is not None:
+            try:
+                self._on_done(filepath)
+            except Exception as e:
+                logger.warning(f"Pipeline done callback raised exception: {e}")
+        with self._idle:
+            self._in_flight.discard(str(filepath))
+            self._idle.notify_all()
+
+
+class EventCoalescer:
+    """Merge bursts of filesystem events per path.
+
+    Every event (re)starts a quiet window for its path. A path is forwarded
+    to the callback once no further event arrived for ``window`` seconds.
+    A move of a pending path replaces it with the destination, so chains
+    like ``file.part`` created -> modified -> moved to ``file.pdf`` result in
+    a single callback for ``file.pdf``.
+
+    Attributes:
+        window: Quiet period in seconds before a path is forwarded.
+    """
+
+    def __init__(
+        self, callback: CoalescedCallback, window: float = WATCH_COALESCE_WINDOW
+    ) -> None:
+        """Initialize the coalescer (the flush thread starts on first event).
+
+        Args:
+            callback: Called with (filepath, kind) for each settled path.
+                kind is "moved" if the last event was a move, else "created".
+            window: Quiet period in seconds.
+        """
+        self.window = window
+        self._callback = callback
+        # key -> (path, kind, deadline)
+        self._pending: Dict[str, Tuple[Path, str, float]] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._emitting = 0
+        self._merged = 0
+
+    @property
+    def pending_count(self) -> int:
+        """Number of paths waiting for their quiet window to pass."""
+        with self._cond:
+            return len(self._pending)
+
+    @property
+    def merged_count(self) -> int:
+        """Number of events folded into an already pending path."""
+        with self._cond:
+            return self._merged
+
+    def add(self, filepath: Path, kind: str = "created") -> None:
+        """Record a created (or moved-in) event for a path."""
+        with self._cond:
+            if self._stopped:
+                return
+            key = str(filepath)
+            if key in self._pending:
+                self._merged += 1
+            self._pending[key] = (filepath, kind, time.monotonic() + self.window)
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def touch(self, filepath: Path) -> None:
+        """Record a modified event; only extends the window of pending paths."""
+        with self._cond:
+            entry = self._pending.get(str(filepath))
+            if entry is None:
+                return
+            self._merged += 1
+            self._pending[str(filepath)] = (
+                entry[0],
+                entry[1],
+                time.monotonic() + self.window,
+            )
+            self._cond.notify_all()
+
+    def move(self, src_path: Path, dest_path: Path) -> None:
+        """Record a move; a pending source path is replaced by the destination."""
+        with self._cond:
+            if self._pending.pop(str(src_path), None) is not None:
+                self._merged += 1
+        self.add(dest_path, kind="moved")
+
+    def discard(self, filepath: Path) -> None:
+        """Forget a pending path (e.g. the file was deleted again)."""
+        with self._cond:
+            if self._pending.pop(str(filepath), None) is not None:
+                self._merged += 1
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Forward all pending paths immediately."""
+        with self._cond:
+            due = list(self._pending.values())
+            self._pending.clear()
+            self._emitting += 1
+        self._emit(due)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no path is pending and no callback is running.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if idle, False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._emitting, timeout
+            )
+
+    def stop(self) -> None:
+        """Stop the flush thread and discard pending paths."""
+        with self._cond:
+            self._stopped = True
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="watch-coalescer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Forward paths whose quiet window has passed."""
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    now = time.monotonic()
+                    due = [
+                        key
+                        for key, (_, _, deadline) in self._pending.items()
+                        if deadline <= now
+                    ]
+                    if due:
+                        break
+                    next_deadline = min(
+                        (deadline for _, _, deadline in self._pending.values()),
+                        default=None,
+                    )
+                    self._cond.wait(
+                        None if next_deadline is None else next_deadline - now
+                    )
+                entries = [self._pending.pop(key) for key in due]
+                self._emitting += 1
+            self._emit(entries)
+
+    def _emit(self, entries: List[Tuple[Path, str, float]]) -> None:
+        """Invoke the callback for settled paths (called without the lock)."""
+        try:
+            for filepath, kind, _ in entries:
+                try:
+                    self._callback(filepath, kind)
+                except Exception as e:
+                    logger.error(f"Error forwarding event for {filepath}: {e}")
+        finally:
+            with self._cond:
+                self._emitting -= 1
+                self._cond.notify_all()
+
+
+class AsyncLoopThread:
+    """Long-lived asyncio event loop on a background thread.
+
+    Threads hand coroutines over with ``submit()`` (non-blocking) or ``run()``
+    (blocking); both use ``asyncio.run_coroutine_threadsafe``. At most
+    ``concurrency`` submitted coroutines run at the same time, the rest wait
+    on a semaphore inside the loop. The thread starts on first use.
+
+    Attributes:
+        concurrency: Maximum number of coroutines running at once.
+        name: Name of the loop thread.
+    """
+
+    def __init__(
+        self, concurrency: int = WATCH_AI_CONCURRENCY, name: str = "async-loop"
+    ) -> None:
+        """Initialize the loop thread.
+
+        Args:
+            concurrency: Maximum number of coroutines running at once.
+            name: Name of the loop thread.
+
+        Raises:
+            ValueError: If concurrency is smaller than 1.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._closed = False
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the loop thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of submitted coroutines that have not finished yet."""
+        with self._cond:
+            return self._pending
+
+    def start(self) -> None:
+        """Start the loop thread (no-op if already running).
+
+        Raises:
+            RuntimeError: If the loop thread has been stopped.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"{self.name} has been stopped")
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+            thread = threading.Thread(
+                target=self._run, args=(loop, started), name=self.name, daemon=True
+            )
+            thread.start()
+            started.wait()
+            self._loop = loop
+            self._thread = thread
+
+    def submit(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        on_done: Optional[Callable[[concurrent.futures.Future], None]] = None,
+    ) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop without waiting for it.
+
+        Args:
+            coro: Coroutine to run.
+            on_done: Optional callback invoked with the finished future before
+                the coroutine stops counting as pending (see ``wait_idle()``).
+
+        Returns:
+            Future resolving to the coroutine's result.
+
+        Raises:
+            RuntimeError: If the loop thread has been stopped.
+        """
+        try:
+            self.start()
+        except RuntimeError:
+            coro.close()
+            raise
+        assert self._loop is not None
+        with self._cond:
+            self._pending += 1
+        future = asyncio.run_coroutine_threadsafe(self._limited(coro), self._loop)
+        future.add_done_callback(lambda f: self._on_done(f, on_done))
+        return future
+
+    def run(
+        self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None
+    ) -> Any:
+        """Run a coroutine on the loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run.
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            The coroutine's result.
+
+        Raises:
+            RuntimeError: If called from the loop thread itself or after stop.
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run() must not be called from the loop thread")
+        return self.submit(coro).result(timeout)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until all submitted coroutines have finished.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if idle, False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Let running coroutines finish, then stop and close the loop.
+
+        Coroutines still running after ``timeout`` seconds are cancelled.
+
+        Args:
+            timeout: Seconds to wait for running coroutines.
+        """
+        with self._cond:
+            self._closed = True
+            loop, thread = self._loop, self._thread
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        self.wait_idle(timeout)
+        try:
+            loop.call_soon_threadsafe(loop.stop)
+        except RuntimeError:
+            return  # Already closed by a concurrent stop()
+        thread.join(timeout)
+
+    async def _limited(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Await a coroutine while holding a concurrency slot."""
+        assert self._semaphore is not None
+        try:
+            async with self._semaphore:
+                return await coro
+        finally:
+            # Never awaited if cancelled while waiting for a slot
+            coro.close()
+
+    def _on_done(
+        self,
+        future: concurrent.futures.Future,
+        callback: Optional[Callable[[concurrent.futures.Future], None]],
+    ) -> None:
+        try:
+            if callback is not None:
+                callback(future)
+        except Exception as e:
+            logger.error(f"Error in {self.name} completion callback: {e}")
+        finally:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()
+
+    def _run(self, loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        """Thread target: run the loop until stopped, then clean up."""
+        asyncio.set_event_loop(loop)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
@@ -0,0 +1,396 @@
+"""
+Local pre-classification of files before AI analysis.
+
+Many files can be sorted from metadata alone: installers, archives,
+screenshots, media and source files, or documents of a sender whose
+documents always ended up in the same category. The PreClassifier
+recognizes these cheaply and returns a result in the same format as the
+AI analysis, so SmartSorter can skip the API request.
+
+Three kinds of evidence are used, in this order:
+
+1. Rules (custom rules from the settings, then PRECLASSIFIER_RULES) that
+   match the extension, the file type group of FILE_TYPE_FOLDERS,
+   filename patterns or text in the embedded metadata.
+2. EXIF data of images and the document information of PDFs, which feed
+   the metadata rules, the sender lookup and the year.
+3. Sender rules learned from the knowledge graph: a sender with at least
+   PRECLASSIFIER_MIN_SENDER_DOCUMENTS documents of which at least
+   PRECLASSIFIER_MIN_SENDER_SHARE share one category.
+
+Only results with a confidence of at least the configured minimum are
+returned; everything else goes to the AI as before.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from folder_extractor.config.constants import (
+    FILE_TYPE_FOLDERS,
+    PRECLASSIFIER_MIN_CONFIDENCE,
+    PRECLASSIFIER_MIN_SENDER_DOCUMENTS,
+    PRECLASSIFIER_MIN_SENDER_SHARE,
+    PRECLASSIFIER_RULES,
+    PRECLASSIFIER_SENDER_REFRESH,
+)
+
+if TYPE_CHECKING:
+    from folder_extractor.config.settings import Settings
+    from folder_extractor.core.memory.graph import KnowledgeGraph
+
+logger = logging.getLogger(__name__)
+
+# EXIF tags holding free text and dates
+_EXIF_TEXT_TAGS = (270, 305, 37510)  # ImageDescription, Software, UserComment
+_EXIF_DATE_TAGS = (36867, 306)  # DateTimeOriginal, DateTime
+_EXIF_IFD = 0x8769
+
+_YEAR_PATTERN = re.compile(r"(?<!\d)(19[7-9]\d|20\d{2})(?!\d)")
+_PDF_DATE_PATTERN = re.compile(r"^(?:D:)?(19[7-9]\d|20\d{2})")
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Legal form suffixes ignored when matching sender names
+_LEGAL_SUFFIXES = {
+    "ag",
+    "co",
+    "e",
+    "ev",
+    "gmbh",
+    "inc",
+    "kg",
+    "kgaa",
+    "llc",
+    "ltd",
+    "mbh",
+    "ohg",
+    "se",
+    "v",
+}
+_MIN_SENDER_NAME_LENGTH = 3
+
+
+def _normalize(text: str) -> str:
+    """Lowercase text and collapse everything but letters and digits."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _normalize_sender(name: str) -> str:
+    """Normalize a sender name and drop legal form suffixes."""
+    words = _normalize(name).split()
+    while words and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+class PreClassifier:
+    """
+    Rule and metadata based classifier in front of the AI analysis.
+
+    Thread-safe: classify() may be called from several worker threads.
+
+    Attributes:
+        min_confidence: Minimum confidence of a returned result
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        knowledge_graph: Optional[KnowledgeGraph] = None,
+    ) -> None:
+        """
+        Initialize the classifier.
+
+        Args:
+            settings: Settings to read custom rules ("preclassifier_rules")
+                and the minimum confidence from. Defaults are used if None.
+            knowledge_graph: Knowledge graph to learn sender rules from.
+                The shared instance is used if None; without kuzu, sender
+                rules are disabled.
+        """
+        custom_rules: list[dict[str, Any]] = []
+        self.min_confidence = PRECLASSIFIER_MIN_CONFIDENCE
+        if settings is not None:
+            custom_rules = list(settings.get("preclassifier_rules", []) or [])
+            self.min_confidence = float(
+                settings.get("preclassifier_min_confidence", self.min_confidence)
+            )
+        self._rules = custom_rules + list(PRECLASSIFIER_RULES)
+        self._knowledge_graph = knowledge_graph
+
+        self._lock = threading.Lock()
+        self._senders: dict[str, tuple[str, str, float]] = {}
+        self._senders_loaded_at: Optional[float] = None
+        self._checked = 0
+        self._hits = 0
+
+    def classify(
+        self, filepath: Path, categories: list[str]
+    ) -> Optional[dict[str, Any]]:
+        """
+        Try to categorize a file without AI.
+
+        Args:
+            filepath: File to classify
+            categories: Active categories; rules for other categories
+                are ignored
+
+        Returns:
+            Result dictionary like the AI analysis (category, sender, year,
+            entities) plus "source" and "confidence", or None if the file
+            needs an AI analysis.
+        """
+        result = self._classify(filepath, categories)
+        with self._lock:
+            self._checked += 1
+            if result is not None:
+                self._hits += 1
+        if result is not None:
+            logger.info(
+                f"Pre-classified {filepath.name} as {result['category']} "
+                f"({result['confidence']:.2f})"
+            )
+        return result
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return hit statistics.
+
+        Returns:
+            Dictionary with files checked, hits, hit rate and the number of
+            AI analyses saved (one per hit).
+        """
+        with self._lock:
+            checked = self._checked
+            hits = self._hits
+        return {
+            "checked": checked,
+            "hits": hits,
+            "hit_rate": hits / checked if checked else 0.0,
+            "api_calls_saved": hits,
+        }
+
+    def _classify(
+        self, filepath: Path, categories: list[str]
+    ) -> Optional[dict[str, Any]]:
+        """Classify a file; see classify()."""
+        name = filepath.name.lower()
+        suffix = filepath.suffix.lower()
+        file_type = FILE_TYPE_FOLDERS.get(suffix)
+        metadata: Optional[tuple[str, Optional[str]]] = None
+
+        for rule in self._rules:
+            category = rule.get("category")
+            confidence = float(rule.get("confidence", 0.0))
+            if category not in categories or confidence < self.min_confidence:
+                continue
+            matched = (
+                suffix in {e.lower() for e in rule.get("extensions", [])}
+                or (file_type is not None and file_type in rule.get("file_types", []))
+                or any(
+                    fnmatch.fnmatch(name, pattern.lower())
+                    for pattern in rule.get("patterns", [])
+                )
+            )
+            if not matched and rule.get("metadata"):
+                if metadata is None:
+                    metadata = self._read_metadata(filepath)
+                text = metadata[0].lower()
+                matched = any(m.lower() in text for m in rule["metadata"])
+            if matched:
+                if metadata is None:
+                    metadata = self._read_metadata(filepath)
+                return self._result(
+                    category,
+                    None,
+                    metadata[1] or self._year_from_name(name),
+                    confidence,
+                )
+
+        if metadata is None:
+            metadata = self._read_metadata(filepath)
+        sender = self._match_sender(f"{filepath.stem} {metadata[0]}", categories)
+        if sender is None:
+            return None
+        sender_name, category, share = sender
+        return self._result(
+            category,
+            sender_name,
+            metadata[1] or self._year_from_name(name),
+            share,
+        )
+
+    @staticmethod
+    def _result(
+        category: str, sender: Optional[str], year: Optional[str], confidence: float
+    ) -> dict[str, Any]:
+        """Build a result in the format of the AI analysis."""
+        entities = [{"name": sender, "type": "Organization"}] if sender else []
+        return {
+            "category": category,
+            "sender": sender,
+            "year": year,
+            "entities": entities,
+            "source": "preclassifier",
+            "confidence": round(confidence, 3),
+        }
+
+    @staticmethod
+    def _year_from_name(name: str) -> Optional[str]:
+        """Extract a plausible year from a filename."""
+        match = _YEAR_PATTERN.search(name)
+        return match.group(1) if match else None
+
+    def _read_metadata(self, filepath: Path) -> tuple[str, Optional[str]]:
+        """
+        Read embedded metadata of images and PDFs.
+
+        Returns:
+            Tuple of (metadata text, year). Empty text and None if the file
+            has no readable metadata.
+        """
+        suffix = filepath.suffix.lower()
+        try:
+            if suffix == ".pdf":
+                return self._read_pdf_metadata(filepath)
+            if FILE_TYPE_FOLDERS.get(suffix) in {"JPEG", "PNG", "TIFF", "WEBP", "HEIC"}:
+                return self._read_exif(filepath)
+        except Exception as e:
+            logger.debug(f"Could not read metadata of {filepath.name}: {e}")
+        return "", None
+
+    @staticmethod
+    def _read_exif(filepath: Path) -> tuple[str, Optional[str]]:
+        """Read descriptive EXIF/XMP text and the capture year of an image."""
+        from PIL import Image
+
+        with Image.open(filepath) as img:
+            exif = img.getexif()
+            tags = dict(exif)
+            tags.update(exif.get_ifd(_EXIF_IFD))
+            texts = []
+            for tag in _EXIF_TEXT_TAGS:
+                value = tags.get(tag)
+                if isinstance(value, bytes):
+                    # UserComment starts with an 8-byte character code
+                    value = value[8:].decode("utf-8", errors="ignore")
+                if value:
+                    texts.append(str(value))
+            xmp = img.info.get("XML:com.adobe.xmp") or img.info.get("xmp")
+            if isinstance(xmp, bytes):
+                xmp = xmp.decode("utf-8", errors="ignore")
+            if xmp:
+                texts.append(str(xmp))
+
+        year = None
+        for tag in _EXIF_DATE_TAGS:
+            match = _YEAR_PATTERN.match(str(tags.get(tag, "")))
+            if match:
+                year = match.group(1)
+                break
+        return " ".join(texts), year
+
+    @staticmethod
+    def _read_pdf_metadata(filepath: Path) -> tuple[str, Optional[str]]:
+        """Read author, title, subject and creation year of a PDF."""
+        from pypdf import PdfReader
+
+        with open(filepath, "rb") as handle:
+            info = PdfReader(handle).metadata
+            if info is None:
+                return "", None
+            texts = [
+                str(value)
+                for value in (info.author, info.title, info.subject, info.creator)
+                if value
+            ]
+            created = info.get("/CreationDate")
+        match = _PDF_DATE_PATTERN.match(str(created or ""))
+        return " ".join(texts), match.group(1) if match else None
+
+    def _match_sender(
+        self, text: str, categories: list[str]
+    ) -> Optional[tuple[str, str, float]]:
+        """
+        Find a learned sender mentioned in text.
+
+        Returns:
+            Tuple of (sender name, category, share), or None if no sender or
+            senders of different categories are mentioned.
+        """
+        haystack = f" {_normalize(text)} "
+        found: dict[str, tuple[str, str, float]] = {}
+        for key, (sender, category, share) in self._get_senders().items():
+            if (
+                category in categories
+                and share >= self.min_confidence
+                and f" {key} " in haystack
+            ):
+                found[key] = (sender, category, share)
+        if len({category for _, category, _ in found.values()}) != 1:
+            return None
+        # Prefer the most specific (longest) name
+        return found[max(found, key=len)]
+
+    def _get_senders(self) -> dict[str, tuple[str, str, float]]:
+        """Return learned sender rules, reloading them periodically."""
+        with self._lock:
+            loaded_at = self._senders_loaded_at
+            if (
+                loaded_at is not None
+                and time.monotonic() - loaded_at < PRECLASSIFIER_SENDER_REFRESH
+            ):
+                return self._senders
+            # Mark as loaded first so concurrent callers do not reload too
+            self._senders_loaded_at = time.monotonic()
+
+        senders = self._load_senders()
+        with self._lock:
+            self._senders = senders
+        return senders
+
+    def _load_senders(self) -> dict[str, tuple[str, str, float]]:
+        """
+        Learn sender rules from past decisions in the knowledge graph.
+
+        Fail-safe: returns an empty mapping if the graph is unavailable.
+        """
+        try:
+            kg = self._knowledge_graph
+            if kg is None:
+                # Lazy import to handle missing kuzu dependency gracefully
+                from folder_extractor.core.memory.graph import get_knowledge_graph
+
+                kg = get_knowledge_graph()
+            counts = kg.get_sender_category_counts()
+        except Exception as e:
+            logger.debug(f"Sender rules unavailable: {e}")
+            return {}
+
+        per_sender: dict[str, dict[str, int]] = {}
+        names: dict[str, str] = {}
+        for name, category, count in counts:
+            key = _normalize_sender(name or "")
+            if len(key) < _MIN_SENDER_NAME_LENGTH:
+                continue
+            names.setdefault(key, name)
+            by_category = per_sender.setdefault(key, {})
+            by_category[category] = by_category.get(category, 0) + count
+
+        senders: dict[str, tuple[str, str, float]] = {}
+        for key, by_category in per_sender.items():
+            total = sum(by_category.values())
+            category, count = max(by_category.items(), key=lambda item: item[1])
+            share = count / total
+            if (
+                total >= PRECLASSIFIER_MIN_SENDER_DOCUMENTS
+                and share >= PRECLASSIFIER_MIN_SENDER_SHARE
+            ):
+                senders[key] = (names[key], category, share)
+        return senders
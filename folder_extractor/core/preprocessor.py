@@ -6,26 +6,46 @@ Automatically validates and optimizes files before sending to AI API:
 - Format check: Exotic formats (TIFF, BMP, WebP) converted to JPG
 - Image optimization: Resize to max 2048px, JPG quality 85
 - PDF optimization: Extract first 5 pages only
+- Text extraction: Digital PDFs can be sent as text instead of a file
+
+Optimization is CPU-bound; prepare_file_async() runs it in a shared process
+pool and optimized outputs can be cached by the hash of their source file.
 """
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import contextlib
 import logging
+import multiprocessing
+import os
 import shutil
 import tempfile
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Any, Callable, Optional
 
 from PIL import Image
 from pypdf import PdfReader, PdfWriter
 from pypdf.errors import PdfReadError
 
 from folder_extractor.config.constants import (
+    PREPROCESSOR_CACHE_MAX_BYTES,
     PREPROCESSOR_EXOTIC_IMAGE_FORMATS,
     PREPROCESSOR_JPG_QUALITY,
     PREPROCESSOR_MAX_FILE_SIZE_MB,
     PREPROCESSOR_MAX_IMAGE_DIMENSION,
     PREPROCESSOR_MAX_PDF_PAGES,
+    PREPROCESSOR_TEXT_FIRST,
+    PREPROCESSOR_TEXT_MAX_BYTES,
+    PREPROCESSOR_TEXT_MIN_CHARS,
+    PREPROCESSOR_WORKERS,
 )
+from folder_extractor.core.file_operations import FileOperations
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +56,59 @@ class PreprocessorError(Exception):
     pass
 
 
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """Return the shared preprocessing process pool, creating it on first use.
+
+    Args:
+        workers: Number of worker processes (0 disables the pool)
+
+    Returns:
+        The process pool, or None if disabled or not available
+    """
+    global _pool
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            try:
+                # "spawn" avoids forking a process that runs watcher threads
+                _pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, NotImplementedError, ValueError) as e:
+                logger.warning(f"Preprocessing pool not available: {e}")
+                return None
+            atexit.register(shutdown_preprocessing_pool)
+        return _pool
+
+
+def shutdown_preprocessing_pool() -> None:
+    """Shut down the shared preprocessing process pool (if it was started)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _optimize_in_worker(filepath: str) -> tuple[str, bool]:
+    """Process pool entry point: optimize a file without touching the cache."""
+    optimized_path, needs_cleanup = FilePreprocessor(workers=0)._optimize(
+        Path(filepath)
+    )
+    return str(optimized_path), needs_cleanup
+
+
+def _extract_text_in_worker(filepath: str) -> Optional[str]:
+    """Process pool entry point: extract the text of a PDF."""
+    return FilePreprocessor(workers=0)._extract_text(Path(filepath))
+
+
 class FilePreprocessor:
     """Preprocesses files before AI API upload."""
 
@@ -44,7 +117,34 @@ class FilePreprocessor:
     # that always triggers optimization
     _IMAGE_FORMATS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".tif", ".webp"}
 
-    def prepare_file(self, filepath: Path) -> tuple[Path, bool]:
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        workers: int = PREPROCESSOR_WORKERS,
+        cache_max_bytes: int = PREPROCESSOR_CACHE_MAX_BYTES,
+        text_first: bool = PREPROCESSOR_TEXT_FIRST,
+    ):
+        """Initialize the preprocessor.
+
+        Args:
+            cache_dir: Directory for optimized outputs, keyed by the hash of
+                their source file (None disables caching)
+            workers: Processes used by prepare_file_async() (0 = optimize in
+                a thread of the default executor)
+            cache_max_bytes: Total size of cached outputs; the least recently
+                used outputs are removed beyond it
+            text_first: Extract the text of digital PDFs (see
+                extract_text_async()) instead of uploading the file
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.workers = workers
+        self.cache_max_bytes = cache_max_bytes
+        self.text_first = text_first
+        self._file_ops = FileOperations()
+
+    def prepare_file(
+        self, filepath: Path, content_hash: Optional[str] = None
+    ) -> tuple[Path, bool]:
         """Prepare a file for AI API upload by optimizing if necessary.
 
         This is the main public interface for file preprocessing. It validates
@@ -53,12 +153,155 @@ class FilePreprocessor:
 
         Args:
             filepath: Path to the file to prepare
+            content_hash: Hash of the file content if already known (saves
+                hashing the file again for the cache lookup)
 
         Returns:
             Tuple of (optimized_path, needs_cleanup):
             - optimized_path: Path to optimized file (or original if no optimization)
             - needs_cleanup: True if a temporary file was created. Caller is responsible
               for deleting the temporary file and its parent directory after use.
+              Cached outputs are owned by the cache and never need cleanup.
+
+        Raises:
+            PreprocessorError: If file does not exist or is not a file
+        """
+        needed, cached_path, cache_key = self._check(filepath, content_hash)
+        if not needed:
+            return (filepath, False)
+        if cached_path is not None:
+            return (cached_path, False)
+
+        optimized_path, needs_cleanup = self._optimize(filepath)
+        return self._store(cache_key, optimized_path, needs_cleanup)
+
+    async def prepare_file_async(
+        self, filepath: Path, content_hash: Optional[str] = None
+    ) -> tuple[Path, bool]:
+        """Prepare a file like prepare_file() without blocking the event loop.
+
+        File checks and hashing run in the default thread pool, the
+        optimization itself in the shared process pool, so several large
+        scans are optimized in parallel on all cores while others upload.
+
+        Args:
+            filepath: Path to the file to prepare
+            content_hash: Hash of the file content if already known
+
+        Returns:
+            Tuple of (optimized_path, needs_cleanup) as for prepare_file()
+
+        Raises:
+            PreprocessorError: If the file is invalid or optimization fails
+        """
+        loop = asyncio.get_running_loop()
+        needed, cached_path, cache_key = await loop.run_in_executor(
+            None, self._check, filepath, content_hash
+        )
+        if not needed:
+            return (filepath, False)
+        if cached_path is not None:
+            return (cached_path, False)
+
+        path_str, needs_cleanup = await self._run_cpu_bound(
+            _optimize_in_worker, self._optimize, filepath
+        )
+        return await loop.run_in_executor(
+            None, self._store, cache_key, Path(path_str), needs_cleanup
+        )
+
+    async def extract_text_async(self, filepath: Path) -> Optional[str]:
+        """Extract the text of a digital PDF for a text-only AI request.
+
+        Sending the text layer instead of the file saves the upload and most
+        of the tokens. The text of the first PREPROCESSOR_MAX_PDF_PAGES pages
+        is extracted in the shared process pool and cut to
+        PREPROCESSOR_TEXT_MAX_BYTES.
+
+        Args:
+            filepath: Path to the file
+
+        Returns:
+            The extracted text, or None if the file must be uploaded: text
+            mode is disabled, the file is no PDF, it cannot be read, or it
+            has fewer than PREPROCESSOR_TEXT_MIN_CHARS characters of text
+            (scanned documents).
+        """
+        if not self.text_first or filepath.suffix.lower() != ".pdf":
+            return None
+        return await self._run_cpu_bound(
+            _extract_text_in_worker, self._extract_text, filepath
+        )
+
+    async def _run_cpu_bound(
+        self,
+        worker_func: Callable[[str], Any],
+        fallback_func: Callable[[Path], Any],
+        filepath: Path,
+    ) -> Any:
+        """Run CPU-bound work on a file in the process pool.
+
+        Falls back to a thread of the default executor if the pool is
+        disabled or broken.
+
+        Args:
+            worker_func: Module-level function called with the path as string
+            fallback_func: Method called with the path in a thread instead
+            filepath: File to process
+
+        Returns:
+            Result of the called function
+        """
+        loop = asyncio.get_running_loop()
+        pool = _get_process_pool(self.workers)
+        if pool is not None:
+            try:
+                return await loop.run_in_executor(pool, worker_func, str(filepath))
+            except BrokenProcessPool:
+                logger.warning("Preprocessing pool failed, continuing in a thread")
+                shutdown_preprocessing_pool()
+        return await loop.run_in_executor(None, fallback_func, filepath)
+
+    def _extract_text(self, filepath: Path) -> Optional[str]:
+        """Extract text from the first pages of a PDF; see extract_text_async()."""
+        parts: list[str] = []
+        size = 0
+        try:
+            with open(filepath, "rb") as stream:
+                reader = PdfReader(stream)
+                if reader.is_encrypted and not reader.decrypt(""):
+                    return None
+                for index, page in enumerate(reader.pages):
+                    if index >= PREPROCESSOR_MAX_PDF_PAGES:
+                        break
+                    text = (page.extract_text() or "").strip()
+                    if text:
+                        parts.append(text)
+                        size += len(text.encode("utf-8"))
+                    if size >= PREPROCESSOR_TEXT_MAX_BYTES:
+                        break
+        except Exception as e:
+            logger.debug(f"No text extracted from {filepath.name}: {e}")
+            return None
+
+        text = "\n\n".join(parts)
+        if sum(not c.isspace() for c in text) < PREPROCESSOR_TEXT_MIN_CHARS:
+            return None
+        # Cut at the byte limit without splitting a multi-byte character
+        encoded = text.encode("utf-8")[:PREPROCESSOR_TEXT_MAX_BYTES]
+        return encoded.decode("utf-8", errors="ignore")
+
+    def _check(
+        self, filepath: Path, content_hash: Optional[str] = None
+    ) -> tuple[bool, Optional[Path], Optional[str]]:
+        """Validate a file and look up a cached optimized output.
+
+        Args:
+            filepath: Path to the file to prepare
+            content_hash: Hash of the file content if already known
+
+        Returns:
+            Tuple of (needs_optimization, cached_path, cache_key)
 
         Raises:
             PreprocessorError: If file does not exist or is not a file
@@ -71,8 +314,102 @@ class FilePreprocessor:
 
         # Check if optimization is needed
         if not self._needs_optimization(filepath):
-            return (filepath, False)
+            return (False, None, None)
+
+        if self.cache_dir is None:
+            return (True, None, None)
 
+        try:
+            if content_hash is None:
+                content_hash = self._file_ops.calculate_file_hash(filepath)
+        except Exception as e:
+            logger.debug(f"Could not hash {filepath.name}, output not cached: {e}")
+            return (True, None, None)
+
+        # Settings are part of the key so changed limits produce new outputs
+        cache_key = (
+            f"{content_hash}_{PREPROCESSOR_MAX_IMAGE_DIMENSION}"
+            f"_{PREPROCESSOR_JPG_QUALITY}_{PREPROCESSOR_MAX_PDF_PAGES}"
+        )
+        suffix = ".pdf" if filepath.suffix.lower() == ".pdf" else ".jpg"
+        cached_path = self.cache_dir / f"{cache_key}{suffix}"
+        if cached_path.is_file():
+            # Refresh modification time: eviction removes the oldest outputs
+            with contextlib.suppress(OSError):
+                os.utime(cached_path)
+            logger.debug(f"Using cached optimized file for {filepath.name}")
+            return (True, cached_path, cache_key)
+        return (True, None, cache_key)
+
+    def _store(
+        self,
+        cache_key: Optional[str],
+        optimized_path: Path,
+        needs_cleanup: bool,
+    ) -> tuple[Path, bool]:
+        """Move a freshly optimized temporary file into the cache.
+
+        Args:
+            cache_key: Key from _check() (None if caching is disabled)
+            optimized_path: Output of _optimize()
+            needs_cleanup: Whether optimized_path is a temporary file
+
+        Returns:
+            Tuple of (path, needs_cleanup) to hand to the caller
+        """
+        if self.cache_dir is None or cache_key is None or not needs_cleanup:
+            return (optimized_path, needs_cleanup)
+
+        target = self.cache_dir / f"{cache_key}{optimized_path.suffix}"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Unique per call: threads storing the same key must not share it
+            partial = target.with_name(f"{target.name}.{uuid.uuid4().hex}.part")
+            shutil.move(str(optimized_path), str(partial))
+            os.replace(partial, target)
+        except OSError as e:
+            logger.warning(f"Could not cache optimized file {optimized_path}: {e}")
+            return (optimized_path, needs_cleanup)
+
+        # Remove the now empty temporary directory
+        with contextlib.suppress(OSError):
+            optimized_path.parent.rmdir()
+        self._evict(keep=target)
+        return (target, False)
+
+    def _evict(self, keep: Path) -> None:
+        """Remove the least recently used outputs beyond cache_max_bytes."""
+        assert self.cache_dir is not None
+        try:
+            entries = []
+            for entry in self.cache_dir.iterdir():
+                if entry.is_file() and entry != keep:
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry))
+            total = sum(size for _, size, _ in entries) + keep.stat().st_size
+        except OSError as e:
+            logger.debug(f"Could not scan preprocessing cache: {e}")
+            return
+
+        for _, size, entry in sorted(entries):
+            if total <= self.cache_max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                entry.unlink()
+                total -= size
+
+    def _optimize(self, filepath: Path) -> tuple[Path, bool]:
+        """Optimize a file that needs optimization, by file type.
+
+        Args:
+            filepath: Path to the file to optimize
+
+        Returns:
+            Tuple of (optimized_path, needs_cleanup) as for prepare_file()
+
+        Raises:
+            PreprocessorError: If optimization fails
+        """
         # Determine file type and optimize accordingly
         ext = filepath.suffix.lower()
 
@@ -133,8 +470,20 @@ class FilePreprocessor:
             # Create temporary directory
             temp_dir = Path(tempfile.mkdtemp(prefix="preprocessor_"))
 
+            max_dim = PREPROCESSOR_MAX_IMAGE_DIMENSION
+
             # Load image using context manager to ensure file handle is closed
             with Image.open(filepath) as img:
+                # Fast path: let the JPEG decoder downscale by 1/2, 1/4 or 1/8
+                # while decoding instead of decoding every pixel of a large scan
+                width, height = img.size
+                if img.format == "JPEG" and max(width, height) > max_dim:
+                    ratio = max_dim / max(width, height)
+                    img.draft(
+                        "RGB",
+                        (max(1, int(width * ratio)), max(1, int(height * ratio))),
+                    )
+
                 # Load image data into memory before context exits
                 img.load()
 
@@ -148,7 +497,6 @@ class FilePreprocessor:
 
             # Check dimensions and scale if necessary
             width, height = image.size
-            max_dim = PREPROCESSOR_MAX_IMAGE_DIMENSION
             if max(width, height) > max_dim:
                 # Use thumbnail to resize while preserving aspect ratio
                 image.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
@@ -186,31 +534,33 @@ class FilePreprocessor:
         """
         temp_dir = None
         try:
-            # Load PDF
-            reader = PdfReader(filepath)
-            num_pages = len(reader.pages)
-
-            # Check if optimization is needed
-            if num_pages <= PREPROCESSOR_MAX_PDF_PAGES:
-                return filepath
-
-            logger.info(
-                f"PDF has {num_pages} pages, "
-                f"extracting first {PREPROCESSOR_MAX_PDF_PAGES}"
-            )
-
-            # Create temporary directory
-            temp_dir = Path(tempfile.mkdtemp(prefix="preprocessor_"))
-
-            # Extract first MAX_PDF_PAGES pages
-            writer = PdfWriter()
-            for i in range(PREPROCESSOR_MAX_PDF_PAGES):
-                writer.add_page(reader.pages[i])
-
-            # Save optimized PDF
-            output_path = temp_dir / f"{filepath.stem}_optimized.pdf"
-            with open(output_path, "wb") as f:
-                writer.write(f)
+            # Read from the open file instead of a path: pypdf would load the
+            # whole file into memory, but only the page tree is needed here
+            with open(filepath, "rb") as stream:
+                reader = PdfReader(stream)
+                num_pages = self._count_pdf_pages(reader)
+
+                # Check if optimization is needed
+                if num_pages <= PREPROCESSOR_MAX_PDF_PAGES:
+                    return filepath
+
+                logger.info(
+                    f"PDF has {num_pages} pages, "
+                    f"extracting first {PREPROCESSOR_MAX_PDF_PAGES}"
+                )
+
+                # Create temporary directory
+                temp_dir = Path(tempfile.mkdtemp(prefix="preprocessor_"))
+
+                # Extract first MAX_PDF_PAGES pages
+                writer = PdfWriter()
+                for i in range(PREPROCESSOR_MAX_PDF_PAGES):
+                    writer.add_page(reader.pages[i])
+
+                # Save optimized PDF
+                output_path = temp_dir / f"{filepath.stem}_optimized.pdf"
+                with open(output_path, "wb") as f:
+                    writer.write(f)
 
             logger.info(
                 f"PDF optimized: {filepath.name} -> {output_path.name} "
@@ -231,3 +581,24 @@ class FilePreprocessor:
                 shutil.rmtree(temp_dir, ignore_errors=True)
             error_msg = f"Failed to optimize PDF {filepath.name}: {e}"
             raise PreprocessorError(error_msg) from e
+
+    @staticmethod
+    def _count_pdf_pages(reader: PdfReader) -> int:
+        """Count PDF pages from the /Count entry of the page tree root.
+
+        Avoids flattening the whole page tree just to learn the page count;
+        falls back to pypdf's page list for malformed documents.
+
+        Args:
+            reader: Reader of the PDF
+
+        Returns:
+            Number of pages
+        """
+        try:
+            count = int(reader.root_object["/Pages"]["/Count"])
+            if count >= 0:
+                return count
+        except Exception:
+            pass
+        return len(reader.pages)
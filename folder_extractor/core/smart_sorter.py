@@ -8,18 +8,27 @@ for document metadata storage and entity tracking.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
+from folder_extractor.config.constants import (
+    AI_BATCH_CONCURRENCY,
+    AI_BATCH_MAX_FILE_SIZE,
+    AI_BATCH_SIZE,
+)
 from folder_extractor.config.settings import get_all_categories
-from folder_extractor.core.ai_async import IAIClient
+from folder_extractor.core.ai_async import AIClientError, IAIClient
+from folder_extractor.core.ai_cache import AIResultCache, analysis_fingerprint
 from folder_extractor.core.ai_prompts import get_system_prompt
 from folder_extractor.core.file_operations import FileOperations
 
 if TYPE_CHECKING:
     from folder_extractor.config.settings import Settings
+    from folder_extractor.core.memory.writer import KnowledgeGraphWriter
+    from folder_extractor.core.preclassifier import PreClassifier
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +44,9 @@ class SmartSorter:
     Attributes:
         client: AI client for file analysis
         settings: Settings instance for category configuration
+        cache: Optional persistent cache of analysis results
+        preclassifier: Optional local classifier tried before the AI
+        graph_writer: Optional write-behind queue for graph ingestion
 
     Example:
         >>> client = AsyncGeminiClient()
@@ -50,6 +62,9 @@ class SmartSorter:
         self,
         client: IAIClient,
         settings: Settings,
+        cache: Optional[AIResultCache] = None,
+        preclassifier: Optional[PreClassifier] = None,
+        graph_writer: Optional[KnowledgeGraphWriter] = None,
     ) -> None:
         """
         Initialize SmartSorter with AI client and settings.
@@ -57,10 +72,21 @@ class SmartSorter:
         Args:
             client: AI client implementing IAIClient (e.g., AsyncGeminiClient)
             settings: Settings instance for category configuration (required)
+            cache: Optional cache of analysis results. Files whose content was
+                analyzed before with the same prompt and model are not sent
+                to the AI client again.
+            preclassifier: Optional local classifier. Files it categorizes
+                with high confidence are not sent to the AI client.
+            graph_writer: Optional write-behind queue. Results are handed to
+                it and written to the KnowledgeGraph in batches instead of
+                one transaction per file on the analysis path.
         """
         self._client = client
         self._file_ops = FileOperations()
         self._settings = settings
+        self._cache = cache
+        self.preclassifier = preclassifier
+        self.graph_writer = graph_writer
 
     async def process_file(
         self,
@@ -71,8 +97,10 @@ class SmartSorter:
         Analyze and categorize a file using AI.
 
         Loads available categories, generates the analysis prompt,
-        sends the file to the AI client for processing, and ingests
-        the results into the KnowledgeGraph.
+        sends the file to the AI client for processing (unless the
+        pre-classifier recognizes the file or a cached result exists for the
+        same content, prompt and model), and ingests the results into the
+        KnowledgeGraph.
 
         Args:
             filepath: Path to the file to analyze
@@ -105,39 +133,200 @@ class SmartSorter:
         categories = get_all_categories(self._settings)
         prompt = get_system_prompt(categories)
 
-        # Call AI client - AIClientError is not caught, propagated to caller
-        result = await self._client.analyze_file(
-            filepath=filepath,
-            mime_type=mime_type,
-            prompt=prompt,
-        )
+        file_hash = await self._hash_file(filepath)
+        fingerprint = None
+        result = await self._preclassify(filepath, categories)
+        if result is None and self._cache is not None and file_hash is not None:
+            model_name = getattr(self._client, "model_name", "")
+            fingerprint = analysis_fingerprint(prompt, str(model_name))
+            result = self._cache.get(file_hash, fingerprint)
+            if result is not None:
+                logger.info(f"Using cached analysis for: {filepath.name}")
+
+        if result is None:
+            # Call AI client - AIClientError is not caught, propagated to caller
+            result = await self._client.analyze_file(
+                filepath=filepath,
+                mime_type=mime_type,
+                prompt=prompt,
+                content_hash=file_hash,
+            )
+            if self._cache is not None and file_hash and fingerprint:
+                self._cache.put(file_hash, fingerprint, result)
 
         # KnowledgeGraph Integration - errors are logged but not propagated
-        self._ingest_to_knowledge_graph(filepath, result)
+        self._ingest_to_knowledge_graph(filepath, result, file_hash)
 
         return result
 
+    async def process_files(
+        self,
+        files: list[tuple[Path, str]],
+        batch_size: int = AI_BATCH_SIZE,
+    ) -> list[dict[str, Any] | Exception]:
+        """
+        Analyze and categorize many files, packing small ones into batches.
+
+        Pre-classified and cached results are used where available. The
+        remaining files up to
+        AI_BATCH_MAX_FILE_SIZE are sent in batch requests of ``batch_size``
+        files; larger files, files missing from a batch response and files
+        of a failed batch are analyzed individually. Every result is
+        ingested into the KnowledgeGraph.
+
+        Args:
+            files: List of (filepath, mime_type) tuples
+            batch_size: Maximum files per request (1 disables batching)
+
+        Returns:
+            One entry per file, in the order of ``files``: the categorization
+            result, or the exception raised while analyzing that file.
+        """
+        categories = get_all_categories(self._settings)
+        prompt = get_system_prompt(categories)
+        model_name = getattr(self._client, "model_name", "")
+        fingerprint = analysis_fingerprint(prompt, str(model_name))
+
+        results: list[dict[str, Any] | Exception | None] = [None] * len(files)
+        hashes = await asyncio.gather(*(self._hash_file(path) for path, _ in files))
+        cached: set[int] = set()  # Already in the cache, not written again
+        batchable: list[int] = []
+        single: list[int] = []
+        for index, (filepath, _) in enumerate(files):
+            file_hash = hashes[index]
+            result = await self._preclassify(filepath, categories)
+            if result is not None:
+                results[index] = result
+                continue
+            if self._cache is not None and file_hash is not None:
+                hit = self._cache.get(file_hash, fingerprint)
+                if hit is not None:
+                    results[index] = hit
+                    cached.add(index)
+                    continue
+            try:
+                small = filepath.stat().st_size <= AI_BATCH_MAX_FILE_SIZE
+            except OSError:
+                small = False
+            (batchable if small and batch_size > 1 else single).append(index)
+
+        limit = asyncio.Semaphore(AI_BATCH_CONCURRENCY)
+
+        async def analyze_one(index: int) -> None:
+            filepath, mime_type = files[index]
+            async with limit:
+                try:
+                    results[index] = await self._client.analyze_file(
+                        filepath=filepath,
+                        mime_type=mime_type,
+                        prompt=prompt,
+                        content_hash=hashes[index],
+                    )
+                except Exception as e:
+                    results[index] = e
+
+        async def analyze_batch(indices: list[int]) -> None:
+            async with limit:
+                try:
+                    batch = await self._client.analyze_files(
+                        [files[i] for i in indices],
+                        prompt,
+                        hashes=[hashes[i] for i in indices],
+                    )
+                except Exception as e:
+                    logger.warning(f"Batch analysis failed, retrying singly: {e}")
+                    batch = [None] * len(indices)
+            missing = []
+            for index, result in zip(indices, batch):
+                if result is None:
+                    missing.append(index)
+                else:
+                    results[index] = result
+            await asyncio.gather(*(analyze_one(i) for i in missing))
+
+        chunks = [
+            batchable[i : i + batch_size] for i in range(0, len(batchable), batch_size)
+        ]
+        await asyncio.gather(
+            *(analyze_batch(chunk) for chunk in chunks),
+            *(analyze_one(index) for index in single),
+        )
+
+        for index, result in enumerate(results):
+            if not isinstance(result, dict):
+                continue
+            file_hash = hashes[index]
+            cacheable = index not in cached and result.get("source") != "preclassifier"
+            if cacheable and self._cache is not None and file_hash is not None:
+                self._cache.put(file_hash, fingerprint, result)
+            self._ingest_to_knowledge_graph(files[index][0], result, file_hash)
+
+        return [r if r is not None else AIClientError("No result") for r in results]
+
+    async def _preclassify(
+        self, filepath: Path, categories: list[str]
+    ) -> Optional[dict[str, Any]]:
+        """
+        Run the pre-classifier off the event loop (it reads file metadata).
+
+        Errors are logged and treated as "no result", so the file is
+        analyzed by the AI instead.
+        """
+        if self.preclassifier is None:
+            return None
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                None, self.preclassifier.classify, filepath, categories
+            )
+        except Exception as e:
+            logger.debug(f"Pre-classification failed for {filepath.name}: {e}")
+            return None
+
+    async def _hash_file(self, filepath: Path) -> Optional[str]:
+        """
+        Calculate the content hash of a file off the event loop.
+
+        The hash is used for the result cache and the KnowledgeGraph and is
+        passed to the AI client, so the file is read only once.
+
+        Returns:
+            The hash, or None if the file cannot be read.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                None, self._file_ops.calculate_file_hash, filepath
+            )
+        except Exception as e:
+            logger.debug(f"Could not hash {filepath.name}: {e}")
+            return None
+
     def _ingest_to_knowledge_graph(
         self,
         filepath: Path,
         result: dict[str, Any],
+        file_hash: Optional[str] = None,
     ) -> None:
         """
         Ingest document metadata into KnowledgeGraph.
 
         This method is fail-safe: any errors are logged but not propagated,
-        ensuring the main file processing workflow continues.
+        ensuring the main file processing workflow continues. With a graph
+        writer the document is only queued; it is written in a later batch.
 
         Args:
             filepath: Path to the analyzed file
             result: AI analysis result containing category, sender, year, entities
+            file_hash: Content hash if already known (calculated otherwise)
         """
         try:
             # Lazy import inside try to handle missing kuzu dependency gracefully
             from folder_extractor.core.memory.graph import get_knowledge_graph
 
             # Calculate file hash
-            file_hash = self._file_ops.calculate_file_hash(filepath)
+            if file_hash is None:
+                file_hash = self._file_ops.calculate_file_hash(filepath)
 
             # Prepare file_info dictionary for ingestion
             file_info = {
@@ -147,8 +336,14 @@ class SmartSorter:
                 "timestamp": int(time.time()),
                 "category": result.get("category"),
                 "entities": result.get("entities", []),  # Entities from AI response
+                "sender": result.get("sender"),  # For the search index
+                "year": result.get("year"),
             }
 
+            if self.graph_writer is not None:
+                self.graph_writer.submit(file_info)
+                return
+
             # Ingest into Knowledge Graph
             kg = get_knowledge_graph()
             kg.ingest(file_info)
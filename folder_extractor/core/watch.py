@@ -17,16 +17,26 @@ import logging
 import mimetypes
 import re
 import shutil
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 
-from folder_extractor.config.constants import TEMP_EXTENSIONS
-from folder_extractor.core.extractor import EnhancedExtractionOrchestrator
+from folder_extractor.config.constants import TEMP_EXTENSIONS, WATCH_AI_CONCURRENCY
+from folder_extractor.core.extractor import (
+    EnhancedExtractionOrchestrator,
+    MoveCallback,
+)
 from folder_extractor.core.file_operations import FileOperations
 from folder_extractor.core.monitor import StabilityMonitor
+from folder_extractor.core.pipeline import (
+    AsyncLoopThread,
+    EventCoalescer,
+    WatchPipeline,
+)
 from folder_extractor.core.state_manager import IStateManager
 from folder_extractor.utils.path_validators import is_safe_path
 
@@ -64,8 +74,13 @@ class FolderEventHandler(FileSystemEventHandler):
         exclude_subfolders: Subfolders to exclude when recursive=True.
         recursive: Whether subdirectories are watched.
         progress_callback: Optional callback for progress updates.
+        pipeline: Worker pipeline for stability waits and processing, or
+            None if events are processed inline on the observer thread.
     """
 
+    # Stability timeout for new files
+    STABILITY_TIMEOUT = 60
+
     def __init__(
         self,
         orchestrator: EnhancedExtractionOrchestrator,
@@ -79,6 +94,7 @@ class FolderEventHandler(FileSystemEventHandler):
         progress_callback: ProgressCallback = None,
         on_event_callback: EventCallback = None,
         websocket_callback: WebSocketCallback = None,
+        workers: int = 0,
     ) -> None:
         """Initialize folder event handler for watch mode.
 
@@ -100,6 +116,10 @@ class FolderEventHandler(FileSystemEventHandler):
             websocket_callback: Optional callback for WebSocket real-time updates.
                 Receives structured dict with type, data, and filename.
                 Can be sync or async - handler schedules appropriately.
+            workers: Number of processing workers. With 0 (default), events
+                are processed inline on the observer thread. Otherwise files
+                are queued into a WatchPipeline so that stability waits and
+                extraction do not block event delivery.
         """
         super().__init__()
         self.orchestrator = orchestrator
@@ -114,6 +134,22 @@ class FolderEventHandler(FileSystemEventHandler):
         self.on_event_callback = on_event_callback
         self.websocket_callback = websocket_callback
         self._processing_files: set[str] = set()
+        self._processing_lock = threading.Lock()
+        self._extract_lock = threading.Lock()
+        self.pipeline: Optional[WatchPipeline] = None
+        self._coalescer: Optional[EventCoalescer] = None
+        if workers > 0:
+            self.pipeline = WatchPipeline(
+                ready_check=self._wait_until_ready,
+                process=None,
+                process_batch=self._process_ready_batch,
+                on_done=self._release_file,
+                workers=workers,
+                name="watch",
+            )
+            self._coalescer = EventCoalescer(
+                lambda filepath, _kind: self._process_file(filepath)
+            )
 
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation events.
@@ -128,7 +164,11 @@ class FolderEventHandler(FileSystemEventHandler):
             return
 
         filepath = Path(event.src_path)
-        self._process_file(filepath)
+        self._track(filepath)
+        if self._coalescer is not None:
+            self._coalescer.add(filepath)
+        else:
+            self._process_file(filepath)
 
     def on_moved(self, event: FileSystemEvent) -> None:
         """Handle file move events (e.g., browser downloads completing).
@@ -143,7 +183,52 @@ class FolderEventHandler(FileSystemEventHandler):
             return
 
         filepath = Path(event.dest_path)
-        self._process_file(filepath)
+        self.monitor.forget(Path(event.src_path))
+        # Renamed into place: the file is complete
+        self._track(filepath, completed=True)
+        if self._coalescer is not None:
+            self._coalescer.move(Path(event.src_path), filepath)
+        else:
+            self._process_file(filepath)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        """Handle file modification events (extends the coalescing window).
+
+        Args:
+            event: File system event from watchdog.
+        """
+        if not event.is_directory and self._coalescer is not None:
+            self._coalescer.touch(Path(event.src_path))
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        """Handle file deletion events (drops files that are still settling).
+
+        Args:
+            event: File system event from watchdog.
+        """
+        if event.is_directory:
+            return
+        self.monitor.forget(Path(event.src_path))
+        if self._coalescer is not None:
+            self._coalescer.discard(Path(event.src_path))
+
+    def on_closed(self, event: FileSystemEvent) -> None:
+        """Handle close-after-write events (the file is complete).
+
+        Args:
+            event: File system event from watchdog.
+        """
+        if not event.is_directory:
+            self.monitor.mark_completed(Path(event.src_path))
+
+    def _track(self, filepath: Path, completed: bool = False) -> None:
+        """Let the monitor record close and rename events of a new file.
+
+        Registered at intake, so events during the coalescing window are
+        not missed; skipped files are not tracked.
+        """
+        if not self._should_skip_file(filepath):
+            self.monitor.track(filepath, completed=completed)
 
     def _safe_progress(
         self,
@@ -334,6 +419,10 @@ class FolderEventHandler(FileSystemEventHandler):
     def _process_file(self, filepath: Path) -> None:
         """Process a new file: wait for stability, then extract.
 
+        Without a pipeline both stages run inline on the calling (observer)
+        thread. With a pipeline the file is only queued here and the stages
+        run on the pipeline's worker threads.
+
         Args:
             filepath: Path to the file to process.
 
@@ -347,13 +436,11 @@ class FolderEventHandler(FileSystemEventHandler):
                 return
 
             # Prevent duplicate processing
-            if str(filepath) in self._processing_files:
+            if not self._claim_file(filepath):
                 logger.debug(f"Already processing: {filepath}")
                 return
 
-            # Track this file as being processed
-            self._processing_files.add(str(filepath))
-
+            queued = False
             try:
                 logger.info(f"Detected new file: {filepath.name}")
 
@@ -366,48 +453,276 @@ class FolderEventHandler(FileSystemEventHandler):
                 # Notify progress: waiting
                 self._safe_progress(0, 1, f"\u23f3 Warte auf {filepath.name}...")
 
-                # Wait for file to be ready
-                ready = self.monitor.wait_for_file_ready(filepath, timeout=60)
-                if not ready:
-                    logger.warning(f"File not ready after timeout: {filepath}")
+                if self.pipeline is not None:
+                    queued = self.pipeline.submit(filepath, self.STABILITY_TIMEOUT)
                     return
 
-                # Check for abort signal
-                if self.state_manager.is_abort_requested():
-                    logger.info("Abort requested, skipping file processing")
-                    return
+                # Wait for file to be ready, then process it
+                if self._wait_until_ready(filepath, self.STABILITY_TIMEOUT):
+                    self._process_ready_file(filepath)
 
-                # Notify UI: analyzing
-                self._safe_event("analyzing", filepath.name)
+            finally:
+                # Always clean up processing set (the pipeline does it when done)
+                if not queued:
+                    self._release_file(filepath)
+
+        except Exception as e:
+            self._report_error(filepath, e)
+
+    def _wait_until_ready(self, filepath: Path, timeout: float) -> bool:
+        """Stability stage: wait until the file is fully written.
+
+        Args:
+            filepath: Path to the file to check.
+            timeout: Maximum time to wait in seconds.
 
-                # Notify progress: analyzing
-                self._safe_progress(0, 1, f"\U0001f916 Analysiere {filepath.name}...")
+        Returns:
+            True if the file is ready and no abort was requested.
+        """
+        try:
+            ready = self.monitor.wait_for_file_ready(filepath, timeout=timeout)
+        except Exception as e:
+            self._report_error(filepath, e)
+            return False
 
-                # Process single file directly - avoid full directory scan
+        if not ready:
+            logger.warning(f"File not ready after timeout: {filepath}")
+            return False
+
+        # Check for abort signal
+        if self.state_manager.is_abort_requested():
+            logger.info("Abort requested, skipping file processing")
+            return False
+
+        return True
+
+    def _process_ready_file(self, filepath: Path) -> None:
+        """Processing stage: extract a file that is ready.
+
+        Args:
+            filepath: Path to the ready file.
+        """
+        try:
+            # Notify UI: analyzing
+            self._safe_event("analyzing", filepath.name)
+
+            # Notify progress: analyzing
+            self._safe_progress(0, 1, f"\U0001f916 Analysiere {filepath.name}...")
+
+            # Process single file directly - avoid full directory scan.
+            # Unique-name generation and the history file are not safe for
+            # concurrent writers, so extractions into the zone are serialized.
+            with self._extract_lock:
                 results = self.orchestrator.process_single_file(
                     filepath=filepath,
                     destination=self.base_path or filepath.parent,
                     progress_callback=self.progress_callback,
                 )
 
-                # Check results
-                if results.get("status") == "success":
-                    logger.info(f"Successfully processed: {filepath.name}")
-                    # Notify UI: sorted
-                    self._safe_event("sorted", filepath.name)
-                    self._safe_progress(1, 1, f"\u2705 {filepath.name} sortiert")
-                else:
-                    logger.error(f"Failed to process: {filepath.name}")
+            # Check results
+            if results.get("status") == "success":
+                logger.info(f"Successfully processed: {filepath.name}")
+                # Notify UI: sorted
+                self._safe_event("sorted", filepath.name)
+                self._safe_progress(1, 1, f"\u2705 {filepath.name} sortiert")
+            else:
+                logger.error(f"Failed to process: {filepath.name}")
 
-            finally:
-                # Always clean up processing set
-                self._processing_files.discard(str(filepath))
+        except Exception as e:
+            self._report_error(filepath, e)
+
+    def _process_ready_batch(self, filepaths: list[Path]) -> None:
+        """Processing stage for pipeline workers: extract ready files.
+
+        All files that became ready together are extracted with a single
+        orchestrator call, so the destination scan and hash index are shared.
+
+        Args:
+            filepaths: Ready files (at least one).
+        """
+        if len(filepaths) == 1:
+            self._process_ready_file(filepaths[0])
+            return
+
+        try:
+            for filepath in filepaths:
+                self._safe_event("analyzing", filepath.name)
+            self._safe_progress(
+                0, len(filepaths), f"\U0001f916 Verarbeite {len(filepaths)} Dateien..."
+            )
+
+            with self._extract_lock:
+                results = self.orchestrator.process_files(
+                    filepaths=filepaths,
+                    destination=self.base_path or filepaths[0].parent,
+                    progress_callback=self.progress_callback,
+                )
+
+            if results.get("status") != "success":
+                message = results.get("message") or "Verarbeitung fehlgeschlagen"
+                logger.error(
+                    f"Failed to process batch of {len(filepaths)} files: {message}"
+                )
+                for filepath in filepaths:
+                    self._safe_event("error", filepath.name, message)
+                return
+
+            missing = set(results.get("missing", []))
+            # With errors, only files recorded in the history (moved or
+            # duplicates) or gone from their place were handled
+            history = results.get("history", [])
+            handled = {entry.get("original_pfad") for entry in history}
+            sorted_count = 0
+            for filepath in filepaths:
+                if str(filepath) in missing:
+                    continue
+                if (
+                    results.get("errors")
+                    and str(filepath) not in handled
+                    and filepath.exists()
+                ):
+                    self._safe_event(
+                        "error", filepath.name, "Datei konnte nicht verschoben werden"
+                    )
+                    continue
+                sorted_count += 1
+                self._safe_event("sorted", filepath.name)
+            logger.info(
+                f"Processed batch: {sorted_count}/{len(filepaths)} files sorted"
+            )
+            self._safe_progress(
+                len(filepaths),
+                len(filepaths),
+                f"\u2705 {sorted_count} Dateien sortiert",
+            )
 
         except Exception as e:
-            logger.error(f"Error processing {filepath}: {e}", exc_info=True)
-            # Notify UI: error
-            self._safe_event("error", filepath.name, str(e))
-            self._safe_progress(1, 1, filepath.name, str(e))
+            for filepath in filepaths:
+                self._report_error(filepath, e)
+
+    def _report_error(self, filepath: Path, error: Exception) -> None:
+        """Log a processing error and notify callbacks."""
+        logger.error(f"Error processing {filepath}: {error}", exc_info=True)
+        # Notify UI: error
+        self._safe_event("error", filepath.name, str(error))
+        self._safe_progress(1, 1, filepath.name, str(error))
+
+    def _claim_file(self, filepath: Path) -> bool:
+        """Mark a file as being processed.
+
+        Returns:
+            False if the file is already being processed.
+        """
+        with self._processing_lock:
+            if str(filepath) in self._processing_files:
+                return False
+            self._processing_files.add(str(filepath))
+            return True
+
+    def _release_file(self, filepath: Path) -> None:
+        """Remove a file from the processing set."""
+        with self._processing_lock:
+            self._processing_files.discard(str(filepath))
+
+    def get_pipeline_stats(self) -> Optional[dict[str, int]]:
+        """Return queue depth metrics of the pipeline.
+
+        Returns:
+            Pipeline statistics including files still being coalesced,
+            or None when processing runs inline.
+        """
+        if self.pipeline is None or self._coalescer is None:
+            return None
+        stats = self.pipeline.stats().to_dict()
+        stats["coalescing"] = self._coalescer.pending_count
+        stats["coalesced_events"] = self._coalescer.merged_count
+        stats["queue_depth"] += stats["coalescing"]
+        return stats
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until all detected files have been handled.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if idle (always True when processing runs inline).
+        """
+        if self.pipeline is None or self._coalescer is None:
+            return True
+        return self._coalescer.wait_idle(timeout) and self.pipeline.wait_idle(timeout)
+
+    def stop(self) -> None:
+        """Stop the pipeline workers (no-op when processing runs inline)."""
+        if self._coalescer is not None:
+            self._coalescer.stop()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+
+
+def sanitize_path_component(value: str) -> str:
+    """Sanitize a value for use in filesystem paths.
+
+    Removes or replaces characters that are invalid in paths.
+
+    Args:
+        value: String to sanitize.
+
+    Returns:
+        Sanitized string safe for filesystem use.
+    """
+    # Replace path separators and other problematic chars
+    sanitized = re.sub(r'[<>:"/\\|?*]', "_", value)
+    # Remove leading/trailing whitespace and dots
+    sanitized = sanitized.strip(". ")
+    # Collapse multiple underscores
+    sanitized = re.sub(r"_+", "_", sanitized)
+    return sanitized or "Unbekannt"
+
+
+def build_target_path(
+    result: dict[str, Any],
+    filepath: Path,
+    base_path: Path,
+    folder_structure: str = "{category}/{sender}/{year}",
+) -> Path:
+    """Build target directory path from template and AI result.
+
+    Supported placeholders:
+    - {category}: Category from AI analysis (default: "Sonstiges")
+    - {sender}: Sender from AI analysis (default: "Unbekannt")
+    - {year}: Year from AI analysis or current year
+    - {month}: Current month (01-12)
+    - {filename}: Original filename (without extension)
+
+    Args:
+        result: SmartSorter result with category, sender, year.
+        filepath: Original file path.
+        base_path: Directory the template is resolved against.
+        folder_structure: Template for the target path.
+
+    Returns:
+        Resolved target directory path.
+    """
+    now = datetime.now()
+
+    # Extract values with defaults
+    category = result.get("category") or "Sonstiges"
+    sender = result.get("sender") or "Unbekannt"
+    year = result.get("year") or str(now.year)
+    month = f"{now.month:02d}"
+    filename = filepath.stem
+
+    # Build path from template with filesystem-safe values
+    path_str = folder_structure.format(
+        category=sanitize_path_component(category),
+        sender=sanitize_path_component(sender),
+        year=sanitize_path_component(str(year)),
+        month=month,
+        filename=sanitize_path_component(filename),
+    )
+
+    return Path(base_path) / path_str
 
 
 class SmartFolderEventHandler(FileSystemEventHandler):
@@ -427,6 +742,9 @@ class SmartFolderEventHandler(FileSystemEventHandler):
         ignore_patterns: Patterns for files to ignore.
         exclude_subfolders: Subfolders to exclude when recursive=True.
         recursive: Whether to watch subdirectories.
+        pipeline: Worker pipeline for stability waits and processing, or
+            None if events are processed inline on the observer thread.
+        loop_thread: Long-lived event loop running the AI analysis.
     """
 
     # Timeout constants
@@ -447,6 +765,9 @@ class SmartFolderEventHandler(FileSystemEventHandler):
         progress_callback: ProgressCallback = None,
         on_event_callback: EventCallback = None,
         websocket_callback: WebSocketCallback = None,
+        workers: int = 0,
+        ai_concurrency: int = WATCH_AI_CONCURRENCY,
+        move_callback: Optional[MoveCallback] = None,
     ) -> None:
         """Initialize smart folder event handler.
 
@@ -464,6 +785,14 @@ class SmartFolderEventHandler(FileSystemEventHandler):
             progress_callback: Optional callback for progress updates.
             on_event_callback: Optional callback for UI event updates.
             websocket_callback: Optional callback for WebSocket real-time updates.
+            workers: Number of processing workers. With 0 (default), events
+                are processed inline on the observer thread. Otherwise files
+                are queued into a WatchPipeline and analyzed concurrently;
+                at least ai_concurrency workers are started then.
+            ai_concurrency: Maximum number of files analyzed at the same time
+                on the handler's event loop.
+            move_callback: Optional callback receiving (old path, new path)
+                of each sorted file, e.g. GraphMaintenance.record_moves.
         """
         super().__init__()
         self.smart_sorter = smart_sorter
@@ -487,8 +816,26 @@ class SmartFolderEventHandler(FileSystemEventHandler):
         self.progress_callback = progress_callback
         self.on_event_callback = on_event_callback
         self.websocket_callback = websocket_callback
+        self.move_callback = move_callback
         self._processing_files: set[str] = set()
+        self._processing_lock = threading.Lock()
+        self._move_lock = threading.Lock()
         self._file_ops = FileOperations()
+        # One event loop for all files, so the AI client keeps its connections
+        self.loop_thread = AsyncLoopThread(ai_concurrency, name="smart-watch-loop")
+        self.pipeline: Optional[WatchPipeline] = None
+        self._coalescer: Optional[EventCoalescer] = None
+        if workers > 0:
+            self.pipeline = WatchPipeline(
+                ready_check=self._wait_until_ready,
+                process=self._run_smart_sort,
+                on_done=self._release_file,
+                # Each worker waits for one analysis on the loop, so fewer
+                # workers than ai_concurrency would cap the analyses in flight
+                workers=max(workers, ai_concurrency),
+                name="smart-watch",
+            )
+            self._coalescer = EventCoalescer(self._on_coalesced)
 
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation events with 30s stability timeout.
@@ -500,7 +847,11 @@ class SmartFolderEventHandler(FileSystemEventHandler):
             return
 
         filepath = Path(event.src_path)
-        self._schedule_processing(filepath, timeout=self.CREATED_TIMEOUT)
+        self._track(filepath)
+        if self._coalescer is not None:
+            self._coalescer.add(filepath)
+        else:
+            self._schedule_processing(filepath, timeout=self.CREATED_TIMEOUT)
 
     def on_moved(self, event: FileSystemEvent) -> None:
         """Handle file move events with 2s stability timeout.
@@ -512,7 +863,57 @@ class SmartFolderEventHandler(FileSystemEventHandler):
             return
 
         filepath = Path(event.dest_path)
-        self._schedule_processing(filepath, timeout=self.MOVED_TIMEOUT)
+        self.monitor.forget(Path(event.src_path))
+        # Renamed into place: the file is complete
+        self._track(filepath, completed=True)
+        if self._coalescer is not None:
+            self._coalescer.move(Path(event.src_path), filepath)
+        else:
+            self._schedule_processing(filepath, timeout=self.MOVED_TIMEOUT)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        """Handle file modification events (extends the coalescing window).
+
+        Args:
+            event: File system event from watchdog.
+        """
+        if not event.is_directory and self._coalescer is not None:
+            self._coalescer.touch(Path(event.src_path))
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        """Handle file deletion events (drops files that are still settling).
+
+        Args:
+            event: File system event from watchdog.
+        """
+        if event.is_directory:
+            return
+        self.monitor.forget(Path(event.src_path))
+        if self._coalescer is not None:
+            self._coalescer.discard(Path(event.src_path))
+
+    def on_closed(self, event: FileSystemEvent) -> None:
+        """Handle close-after-write events (the file is complete).
+
+        Args:
+            event: File system event from watchdog.
+        """
+        if not event.is_directory:
+            self.monitor.mark_completed(Path(event.src_path))
+
+    def _track(self, filepath: Path, completed: bool = False) -> None:
+        """Let the monitor record close and rename events of a new file.
+
+        Registered at intake, so events during the coalescing window are
+        not missed; skipped files are not tracked.
+        """
+        if not self._should_skip_file(filepath):
+            self.monitor.track(filepath, completed=completed)
+
+    def _on_coalesced(self, filepath: Path, kind: str) -> None:
+        """Schedule a settled path with the timeout matching its last event."""
+        timeout = self.MOVED_TIMEOUT if kind == "moved" else self.CREATED_TIMEOUT
+        self._schedule_processing(filepath, timeout=timeout)
 
     def _schedule_processing(self, filepath: Path, timeout: int) -> None:
         """Schedule file processing with the given stability timeout.
@@ -526,21 +927,108 @@ class SmartFolderEventHandler(FileSystemEventHandler):
             return
 
         # Prevent duplicate processing
-        if str(filepath) in self._processing_files:
+        if not self._claim_file(filepath):
             logger.debug(f"Already processing: {filepath}")
             return
 
-        self._processing_files.add(str(filepath))
+        if self.pipeline is not None:
+            self._announce(filepath)
+            if not self.pipeline.submit(filepath, timeout):
+                self._release_file(filepath)
+            return
 
         try:
-            # Run async processing
-            asyncio.run(self._process_file_smart(filepath, timeout))
+            self._announce(filepath)
+            if not self._wait_until_ready(filepath, timeout):
+                self._release_file(filepath)
+                return
+            # Analysis runs on the loop thread; the observer thread moves on
+            self.loop_thread.submit(
+                self._sort_ready_file(filepath),
+                on_done=lambda f: self._on_sort_done(filepath, f),
+            )
         except Exception as e:
             logger.error(f"Error processing {filepath}: {e}", exc_info=True)
             self._safe_event("error", filepath.name, str(e))
+            self._release_file(filepath)
+
+    def _on_sort_done(self, filepath: Path, future: Future) -> None:
+        """Report errors of an inline smart sort and release the file."""
+        try:
+            error = None if future.cancelled() else future.exception()
+            if error is not None:
+                logger.error(f"Error processing {filepath}: {error}")
+                self._safe_event("error", filepath.name, str(error))
         finally:
+            self._release_file(filepath)
+
+    def _claim_file(self, filepath: Path) -> bool:
+        """Mark a file as being processed.
+
+        Returns:
+            False if the file is already being processed.
+        """
+        with self._processing_lock:
+            if str(filepath) in self._processing_files:
+                return False
+            self._processing_files.add(str(filepath))
+            return True
+
+    def _release_file(self, filepath: Path) -> None:
+        """Remove a file from the processing set."""
+        with self._processing_lock:
             self._processing_files.discard(str(filepath))
 
+    def get_pipeline_stats(self) -> Optional[dict[str, int]]:
+        """Return queue depth metrics of the pipeline.
+
+        Returns:
+            Pipeline statistics including files still being coalesced,
+            or None when processing runs inline.
+        """
+        if self.pipeline is None or self._coalescer is None:
+            return None
+        stats = self.pipeline.stats().to_dict()
+        stats["coalescing"] = self._coalescer.pending_count
+        stats["coalesced_events"] = self._coalescer.merged_count
+        stats["queue_depth"] += stats["coalescing"]
+        return stats
+
+    def get_preclassifier_stats(self) -> Optional[dict[str, float]]:
+        """Return hit statistics of the sorter's pre-classifier.
+
+        Returns:
+            Files checked, hits, hit rate and AI calls saved, or None when
+            the sorter has no pre-classifier.
+        """
+        preclassifier = getattr(self.smart_sorter, "preclassifier", None)
+        if preclassifier is None:
+            return None
+        return preclassifier.stats()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until all detected files have been handled.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if idle, False on timeout.
+        """
+        if self._coalescer is not None and not self._coalescer.wait_idle(timeout):
+            return False
+        if self.pipeline is not None and not self.pipeline.wait_idle(timeout):
+            return False
+        return self.loop_thread.wait_idle(timeout)
+
+    def stop(self) -> None:
+        """Stop the pipeline workers and the analysis event loop."""
+        if self._coalescer is not None:
+            self._coalescer.stop()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        self.loop_thread.stop()
+
     def _should_skip_file(self, filepath: Path) -> bool:
         """Check if file should be skipped based on filters.
 
@@ -590,16 +1078,8 @@ class SmartFolderEventHandler(FileSystemEventHandler):
 
         return False
 
-    async def _process_file_smart(self, filepath: Path, timeout: int) -> None:
-        """Process file with SmartSorter for AI categorization.
-
-        Waits for file stability, detects MIME type, calls SmartSorter,
-        builds target path from template, and moves file with duplicate-safe naming.
-
-        Args:
-            filepath: Path to the file to process.
-            timeout: Stability timeout in seconds.
-        """
+    def _announce(self, filepath: Path) -> None:
+        """Notify callbacks that a new file arrived and is being waited for."""
         logger.info(f"Detected new file: {filepath.name}")
         self._safe_event("incoming", filepath.name)
 
@@ -607,22 +1087,55 @@ class SmartFolderEventHandler(FileSystemEventHandler):
         self._safe_event("waiting", filepath.name)
         self._safe_progress(0, 1, f"⏳ Warte auf {filepath.name}...")
 
+    def _wait_until_ready(self, filepath: Path, timeout: float) -> bool:
+        """Stability stage: wait until the file is fully written.
+
+        Args:
+            filepath: Path to the file to check.
+            timeout: Stability timeout in seconds.
+
+        Returns:
+            True if the file is ready, still exists and no abort was requested.
+        """
         ready = self.monitor.wait_for_file_ready(filepath, timeout=timeout)
         if not ready:
             logger.warning(f"File not ready after {timeout}s timeout: {filepath}")
             self._safe_event("error", filepath.name, "Timeout: Datei nicht bereit")
-            return
+            return False
 
         # Check abort signal
         if self.state_manager.is_abort_requested():
             logger.info("Abort requested, skipping file processing")
-            return
+            return False
 
         # Verify file still exists
         if not filepath.exists():
             logger.warning(f"File no longer exists: {filepath}")
-            return
+            return False
+
+        return True
+
+    def _run_smart_sort(self, filepath: Path) -> None:
+        """Processing stage for pipeline workers: analyze and move a file.
 
+        Args:
+            filepath: Path to the ready file.
+        """
+        try:
+            self.loop_thread.run(self._sort_ready_file(filepath))
+        except Exception as e:
+            logger.error(f"Error processing {filepath}: {e}", exc_info=True)
+            self._safe_event("error", filepath.name, str(e))
+
+    async def _sort_ready_file(self, filepath: Path) -> None:
+        """Analyze a ready file with SmartSorter and move it into place.
+
+        Args:
+            filepath: Path to the ready file.
+
+        Raises:
+            ValueError: If the target directory escapes the safe folders.
+        """
         # Detect MIME type
         mime_type, _ = mimetypes.guess_type(str(filepath))
         if mime_type is None:
@@ -648,20 +1161,17 @@ class SmartFolderEventHandler(FileSystemEventHandler):
                 f"Security violation: target directory escapes safe folders. "
                 f"Target: {target_dir}. Allowed folders: Desktop, Downloads, Documents."
             )
-            logger.error(error_msg)
-            self._safe_event("error", filepath.name, error_msg)
             raise ValueError(error_msg)
 
-        target_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate unique filename
-        unique_name = self._file_ops.generate_unique_name(target_dir, filepath.name)
-        target_path = target_dir / unique_name
-
-        # Move file
+        # Move off the loop: a slow or cross-device move must not stall the
+        # other analyses sharing it
+        loop = asyncio.get_running_loop()
         try:
-            shutil.move(str(filepath), str(target_path))
+            target_path = await loop.run_in_executor(
+                None, self._move_to_target, filepath, target_dir
+            )
             logger.info(f"Moved {filepath.name} -> {target_path}")
+            self._safe_moved(filepath, target_path)
             self._safe_event("sorted", filepath.name)
             self._safe_progress(
                 1, 1, f"✅ {filepath.name} → {result.get('category', 'Sortiert')}"
@@ -670,67 +1180,57 @@ class SmartFolderEventHandler(FileSystemEventHandler):
             logger.error(f"Failed to move {filepath.name}: {e}")
             self._safe_event("error", filepath.name, str(e))
 
-    def _build_target_path(self, result: dict[str, Any], filepath: Path) -> Path:
-        """Build target directory path from template and AI result.
+    def _move_to_target(self, filepath: Path, target_dir: Path) -> Path:
+        """Move a file into target_dir under a name not taken there yet.
 
-        Supported placeholders:
-        - {category}: Category from AI analysis (default: "Sonstiges")
-        - {sender}: Sender from AI analysis (default: "Unbekannt")
-        - {year}: Year from AI analysis or current year
-        - {month}: Current month (01-12)
-        - {filename}: Original filename (without extension)
+        Unique name generation and move must not interleave with other
+        files targeting the same folder, so both run under the move lock.
 
         Args:
-            result: SmartSorter result with category, sender, year.
-            filepath: Original file path.
+            filepath: File to move.
+            target_dir: Directory to move it into (created if missing).
 
         Returns:
-            Resolved target directory path.
+            Path the file was moved to.
         """
-        now = datetime.now()
-
-        # Extract values with defaults
-        category = result.get("category") or "Sonstiges"
-        sender = result.get("sender") or "Unbekannt"
-        year = result.get("year") or str(now.year)
-        month = f"{now.month:02d}"
-        filename = filepath.stem
-
-        # Sanitize values for filesystem
-        category = self._sanitize_path_component(category)
-        sender = self._sanitize_path_component(sender)
-        year = self._sanitize_path_component(str(year))
-        filename = self._sanitize_path_component(filename)
-
-        # Build path from template
-        path_str = self.folder_structure.format(
-            category=category,
-            sender=sender,
-            year=year,
-            month=month,
-            filename=filename,
-        )
+        target_dir.mkdir(parents=True, exist_ok=True)
+        with self._move_lock:
+            unique_name = self._file_ops.generate_unique_name(target_dir, filepath.name)
+            target_path = target_dir / unique_name
+            shutil.move(str(filepath), str(target_path))
+        return target_path
 
-        return self.base_path / path_str
+    def _safe_moved(self, source: Path, target: Path) -> None:
+        """Safely invoke move callback, suppressing any exceptions.
 
-    def _sanitize_path_component(self, value: str) -> str:
-        """Sanitize a value for use in filesystem paths.
+        Args:
+            source: Path the file was moved from.
+            target: Path the file was moved to.
+        """
+        if self.move_callback is None:
+            return
+        try:
+            self.move_callback([(str(source), str(target))])
+        except Exception as e:
+            logger.debug(f"Move callback failed: {e}")
 
-        Removes or replaces characters that are invalid in paths.
+    def _build_target_path(self, result: dict[str, Any], filepath: Path) -> Path:
+        """Build target directory path from template and AI result.
 
         Args:
-            value: String to sanitize.
+            result: SmartSorter result with category, sender, year.
+            filepath: Original file path.
 
         Returns:
-            Sanitized string safe for filesystem use.
-        """
-        # Replace path separators and other problematic chars
-        sanitized = re.sub(r'[<>:"/\\|?*]', "_", value)
-        # Remove leading/trailing whitespace and dots
-        sanitized = sanitized.strip(". ")
-        # Collapse multiple underscores
-        sanitized = re.sub(r"_+", "_", sanitized)
-        return sanitized or "Unbekannt"
+            Resolved target directory path.
+        """
+        return build_target_path(
+            result, filepath, self.base_path, self.folder_structure
+        )
+
+    def _sanitize_path_component(self, value: str) -> str:
+        """Sanitize a value for use in filesystem paths."""
+        return sanitize_path_component(value)
 
     def _safe_progress(
         self,
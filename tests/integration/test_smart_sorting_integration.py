@@ -592,7 +592,7 @@ class TestFileTypeVariations:
 
         # Mock preprocessor to skip actual image processing
         with patch.object(
-            smart_sorter_client.preprocessor, "prepare_file"
+            smart_sorter_client.preprocessor, "prepare_file_async"
         ) as mock_prep:
             # Return original file path with no cleanup needed
             mock_prep.return_value = (test_file, False)
@@ -606,7 +606,8 @@ class TestFileTypeVariations:
         assert result["category"] == "Archiv"
         assert result["year"] == 2020
         # Verify preprocessing was attempted
-        mock_prep.assert_called_once_with(test_file)
+        mock_prep.assert_called_once()
+        assert mock_prep.call_args[0][0] == test_file
 
     def test_multiple_file_types_in_sequence(
         self,
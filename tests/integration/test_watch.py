@@ -984,6 +984,7 @@ class TestEndToEndWatchMode:
                     # Trigger on_created event through captured handler
                     event = FileCreatedEvent(str(test_file))
                     captured_handler.on_created(event)
+                    captured_handler.wait_idle(5)
 
                 # Give time for processing
                 time.sleep(0.2)
@@ -1059,6 +1060,7 @@ class TestEndToEndWatchMode:
                         dest_path=str(final_file),
                     )
                     captured_handler.on_moved(event)
+                    captured_handler.wait_idle(5)
 
                 time.sleep(0.2)
                 cli.state_manager.request_abort()
@@ -1123,6 +1125,7 @@ class TestEndToEndWatchMode:
                 ):
                     event = FileCreatedEvent(str(test_file))
                     captured_handler.on_created(event)
+                    captured_handler.wait_idle(5)
 
                 time.sleep(0.2)
                 cli.state_manager.request_abort()
@@ -1188,6 +1191,7 @@ class TestEndToEndWatchMode:
                     # This should not crash
                     event = FileCreatedEvent(str(test_file))
                     captured_handler.on_created(event)
+                    captured_handler.wait_idle(5)
 
                 time.sleep(0.2)
 
@@ -1355,6 +1359,7 @@ class TestWatchModeWithFeatures:
                     event = FileCreatedEvent(str(f))
                     captured_handler.on_created(event)
                     time.sleep(0.1)  # Small delay between events
+                captured_handler.wait_idle(5)
 
             time.sleep(0.3)
             cli.state_manager.request_abort()
@@ -1426,6 +1431,7 @@ class TestWatchModeWithFeatures:
             ):
                 event = FileCreatedEvent(str(duplicate_file))
                 captured_handler.on_created(event)
+                captured_handler.wait_idle(5)
 
             time.sleep(0.3)
             cli.state_manager.request_abort()
@@ -1493,6 +1499,7 @@ class TestWatchModeWithFeatures:
             ):
                 event = FileCreatedEvent(str(different_name_file))
                 captured_handler.on_created(event)
+                captured_handler.wait_idle(5)
 
             time.sleep(0.3)
             cli.state_manager.request_abort()
@@ -1559,6 +1566,7 @@ class TestWatchModeWithFeatures:
             ):
                 event = FileCreatedEvent(str(archive_path))
                 captured_handler.on_created(event)
+                captured_handler.wait_idle(5)
 
             time.sleep(0.5)  # Give more time for archive extraction
             cli.state_manager.request_abort()
@@ -1639,6 +1647,7 @@ class TestWatchModeWithFeatures:
                 # Then process new file
                 event2 = FileCreatedEvent(str(new_pdf))
                 captured_handler.on_created(event2)
+                captured_handler.wait_idle(5)
 
             time.sleep(0.3)
             cli.state_manager.request_abort()
@@ -1729,6 +1738,7 @@ class TestWatchModeErrorAndAbort:
                 ):
                     event = FileCreatedEvent(str(test_file))
                     captured_handler.on_created(event)
+                    captured_handler.wait_idle(5)
 
                 time.sleep(0.3)
 
@@ -1799,6 +1809,7 @@ class TestWatchModeErrorAndAbort:
                 ):
                     event = FileCreatedEvent(str(test_file))
                     captured_handler.on_created(event)
+                    captured_handler.wait_idle(5)
 
                 time.sleep(0.3)
 
@@ -1870,6 +1881,7 @@ class TestWatchModeErrorAndAbort:
                 ):
                     event = FileCreatedEvent(str(missing_file))
                     captured_handler.on_created(event)
+                    captured_handler.wait_idle(5)
 
                 time.sleep(0.2)
 
@@ -2036,6 +2048,7 @@ class TestWatchModeErrorAndAbort:
                         event = FileCreatedEvent(str(f))
                         captured_handler.on_created(event)
                         time.sleep(0.05)  # Brief delay between events
+                    captured_handler.wait_idle(5)
 
                 time.sleep(0.3)
 
@@ -2113,6 +2126,7 @@ class TestWatchModeErrorAndAbort:
                 ):
                     event = FileCreatedEvent(str(test_file))
                     captured_handler.on_created(event)
+                    captured_handler.wait_idle(5)
 
                 time.sleep(0.3)
                 cli.state_manager.request_abort()
@@ -2175,16 +2189,18 @@ class TestWatchModeErrorAndAbort:
 
                 assert captured_handler is not None, "Handler should be captured"
 
-                # Simulate stability check timing out
+                # Simulate stability check timing out (kept active until
+                # shutdown, the stability stage runs on a pipeline worker)
                 with patch.object(
                     StabilityMonitor, "wait_for_file_ready", return_value=False
                 ):
                     event = FileCreatedEvent(str(unstable_file))
                     captured_handler.on_created(event)
+                    captured_handler.wait_idle(5)
 
-                time.sleep(0.2)
-                cli.state_manager.request_abort()
-                watch_thread.join(timeout=3)
+                    time.sleep(0.2)
+                    cli.state_manager.request_abort()
+                    watch_thread.join(timeout=3)
 
         # File should NOT have been processed (stability timed out)
         assert len(process_calls) == 0, "Unstable file should not be processed"
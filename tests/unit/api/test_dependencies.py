@@ -270,3 +270,28 @@ class TestGetKnowledgeGraphFromAppState:
 
         assert exc_info.value.status_code == 503
         assert "Knowledge Graph" in exc_info.value.detail
+
+
+class TestGetJobManagerFromAppState:
+    """Tests for get_job_manager_from_app_state dependency."""
+
+    def test_returns_job_manager_from_app_state(self) -> None:
+        """Dependency returns the JobManager stored in app state."""
+        from folder_extractor.api.dependencies import get_job_manager_from_app_state
+
+        mock_request = MagicMock()
+        job_manager = mock_request.app.state.job_manager
+
+        assert get_job_manager_from_app_state(mock_request) is job_manager
+
+    def test_raises_503_when_job_manager_unavailable(self) -> None:
+        """Dependency raises 503 when the server has no JobManager."""
+        from folder_extractor.api.dependencies import get_job_manager_from_app_state
+
+        mock_request = MagicMock()
+        mock_request.app.state.job_manager = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_job_manager_from_app_state(mock_request)
+
+        assert exc_info.value.status_code == 503
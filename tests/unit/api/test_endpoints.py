@@ -7,10 +7,12 @@ and dropzone management.
 
 from __future__ import annotations
 
+import json
+import time
 import uuid
 from pathlib import Path
 from typing import Generator
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -97,6 +99,13 @@ def mock_orchestrator() -> MagicMock:
         "errors": 0,
         "duplicates": 0,
     }
+    orchestrator.process_files.return_value = {
+        "status": "success",
+        "moved": 1,
+        "errors": 0,
+        "duplicates": 0,
+        "missing": [],
+    }
     return orchestrator
 
 
@@ -163,12 +172,12 @@ def temp_dir(tmp_path: Path) -> Path:
 class TestProcessEndpoint:
     """Tests for POST /api/v1/process endpoint."""
 
-    def test_process_file_starts_background_task(
+    def test_process_file_queues_task(
         self,
         app_with_endpoints: TestClient,
         temp_file: Path,
     ) -> None:
-        """Processing a valid file starts a background task and returns immediately."""
+        """Processing a valid file queues a task and returns immediately."""
         response = app_with_endpoints.post(
             "/api/v1/process",
             json={"filepath": str(temp_file)},
@@ -176,7 +185,7 @@ class TestProcessEndpoint:
 
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "processing"
+        assert data["status"] == "queued"
         assert "task_id" in data
         assert temp_file.name in data["message"]
 
@@ -197,7 +206,189 @@ class TestProcessEndpoint:
 
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "processing"
+        assert data["status"] == "queued"
+
+    def test_task_status_reports_result(
+        self,
+        app_with_endpoints: TestClient,
+        mock_orchestrator: MagicMock,
+        temp_file: Path,
+        temp_dir: Path,
+    ) -> None:
+        """GET /tasks/{task_id} returns the outcome of the processed file."""
+        mock_orchestrator.process_files.return_value = {
+            "status": "success",
+            "moved": 1,
+            "history": [
+                {
+                    "original_pfad": str(temp_file),
+                    "neuer_pfad": str(temp_dir / temp_file.name),
+                }
+            ],
+            "missing": [],
+        }
+        task_id = app_with_endpoints.post(
+            "/api/v1/process",
+            json={
+                "filepath": str(temp_file),
+                "destination": str(temp_dir),
+                "deduplicate": True,
+            },
+        ).json()["task_id"]
+
+        for _ in range(500):
+            data = app_with_endpoints.get(f"/api/v1/tasks/{task_id}").json()
+            if data["status"] == "completed":
+                break
+            time.sleep(0.01)
+
+        assert data["status"] == "completed"
+        assert data["result"]["new_path"] == str(temp_dir / temp_file.name)
+        args = mock_orchestrator.process_files.call_args.args
+        assert args[:2] == ([temp_file], temp_dir)
+
+    def test_unknown_task_returns_404(self, app_with_endpoints: TestClient) -> None:
+        """Unknown task IDs are reported as not found."""
+        assert app_with_endpoints.get("/api/v1/tasks/unbekannt").status_code == 404
+        assert app_with_endpoints.delete("/api/v1/tasks/unbekannt").status_code == 404
+
+    def test_cancel_task(self, app_with_endpoints: TestClient) -> None:
+        """Queued tasks are cancelled; others answer 409."""
+        from folder_extractor.api.jobs import Job
+        from folder_extractor.api.server import app
+
+        job = Job(task_id="t1", filepath=Path("/a.pdf"), destination=Path("/"))
+        jobs = MagicMock()
+        jobs.cancel.return_value = Job(**{**job.__dict__, "status": "cancelled"})
+
+        with patch.object(app.state, "job_manager", jobs):
+            response = app_with_endpoints.delete("/api/v1/tasks/t1")
+            assert response.status_code == 200
+            assert response.json()["status"] == "cancelled"
+
+            jobs.cancel.return_value = Job(**{**job.__dict__, "status": "completed"})
+            assert app_with_endpoints.delete("/api/v1/tasks/t1").status_code == 409
+
+    def test_full_queue_returns_429(
+        self, app_with_endpoints: TestClient, temp_file: Path
+    ) -> None:
+        """Backpressure: a full queue answers 429 with Retry-After."""
+        from folder_extractor.api.jobs import JobQueueFullError
+        from folder_extractor.api.server import app
+
+        jobs = MagicMock()
+        jobs.submit.side_effect = JobQueueFullError("Warteschlange voll")
+
+        with patch.object(app.state, "job_manager", jobs):
+            response = app_with_endpoints.post(
+                "/api/v1/process", json={"filepath": str(temp_file)}
+            )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+    def test_batch_processes_directory_as_one_task(
+        self,
+        app_with_endpoints: TestClient,
+        mock_orchestrator: MagicMock,
+        temp_dir: Path,
+        tmp_path: Path,
+    ) -> None:
+        """POST /process/batch discovers a directory and processes it at once."""
+        for name in ("a.pdf", "b.pdf"):
+            (temp_dir / name).write_text("Inhalt")
+        mock_orchestrator.process_files.return_value = {
+            "status": "success",
+            "moved": 2,
+            "missing": [],
+        }
+        with patch("folder_extractor.core.extractor.is_safe_path", return_value=True):
+            response = app_with_endpoints.post(
+                "/api/v1/process/batch",
+                json={
+                    "directory": str(temp_dir),
+                    "destination": str(tmp_path / "Ziel"),
+                },
+            )
+            assert response.status_code == 200
+            assert response.json()["status"] == "queued"
+            task_id = response.json()["task_id"]
+
+            stream = app_with_endpoints.get(f"/api/v1/tasks/{task_id}/stream")
+        lines = [json.loads(line) for line in stream.text.splitlines()]
+
+        assert stream.headers["content-type"].startswith("application/x-ndjson")
+        assert lines[-1]["status"] == "completed"
+        assert lines[-1]["directory"] == str(temp_dir)
+        assert lines[-1]["result"]["files"] == 2
+        assert lines[-1]["result"]["moved"] == 2
+        mock_orchestrator.process_files.assert_called_once()
+        files, destination, _ = mock_orchestrator.process_files.call_args.args
+        assert sorted(f.name for f in files) == ["a.pdf", "b.pdf"]
+        assert destination == tmp_path / "Ziel"
+
+    def test_batch_with_file_list(
+        self,
+        app_with_endpoints: TestClient,
+        mock_orchestrator: MagicMock,
+        temp_file: Path,
+        temp_dir: Path,
+    ) -> None:
+        """A list of files is processed with one call."""
+        other = temp_file.with_name("other.pdf")
+        task_id = app_with_endpoints.post(
+            "/api/v1/process/batch",
+            json={
+                "filepaths": [str(temp_file), str(other)],
+                "destination": str(temp_dir),
+            },
+        ).json()["task_id"]
+
+        for _ in range(500):
+            data = app_with_endpoints.get(f"/api/v1/tasks/{task_id}").json()
+            if data["status"] == "completed":
+                break
+            time.sleep(0.01)
+
+        assert data["status"] == "completed"
+        assert data["file_count"] == 2
+        assert data["filepath"] is None
+        args = mock_orchestrator.process_files.call_args.args
+        assert args[:2] == ([temp_file, other], temp_dir)
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {},
+            {"filepaths": ["/a.pdf"], "directory": "/tmp"},
+            {"filepaths": ["/a.pdf"]},
+        ],
+    )
+    def test_batch_invalid_request_returns_400(
+        self, app_with_endpoints: TestClient, body: dict
+    ) -> None:
+        """Exactly one source, and a destination for file lists, is required."""
+        response = app_with_endpoints.post("/api/v1/process/batch", json=body)
+
+        assert response.status_code == 400
+
+    def test_batch_missing_directory_returns_404(
+        self, app_with_endpoints: TestClient, tmp_path: Path
+    ) -> None:
+        """An unknown directory is reported as not found."""
+        response = app_with_endpoints.post(
+            "/api/v1/process/batch", json={"directory": str(tmp_path / "weg")}
+        )
+
+        assert response.status_code == 404
+
+    def test_stream_unknown_task_returns_404(
+        self, app_with_endpoints: TestClient
+    ) -> None:
+        """Streaming an unknown task answers 404 before the stream starts."""
+        response = app_with_endpoints.get("/api/v1/tasks/unbekannt/stream")
+
+        assert response.status_code == 404
 
     def test_process_nonexistent_file_returns_404(
         self,
@@ -565,6 +756,264 @@ class TestZoneUpdateEndpoint:
         assert data["enabled"] is False
 
 
+# =============================================================================
+# Search Endpoint Tests
+# =============================================================================
+
+
+class TestSearchEndpoint:
+    """Tests for GET /api/v1/search endpoint."""
+
+    def test_search_returns_index_results(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """Results come from the local index without an AI call."""
+        mock_knowledge_graph.search_documents.return_value = ["/docs/telekom.pdf"]
+
+        response = app_with_endpoints.get(
+            "/api/v1/search", params={"q": "Telekom 2024", "limit": 10}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["results"] == ["/docs/telekom.pdf"]
+        assert data["total"] == 1
+        assert data["source"] == "index"
+        assert data["took_ms"] >= 0
+        mock_knowledge_graph.search_documents.assert_called_once_with(
+            "Telekom 2024", 10
+        )
+        mock_knowledge_graph.query_documents.assert_not_called()
+
+    def test_search_without_fallback_returns_empty(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """The AI is not asked unless requested."""
+        mock_knowledge_graph.search_documents.return_value = []
+
+        response = app_with_endpoints.get("/api/v1/search", params={"q": "Telekom"})
+
+        assert response.status_code == 200
+        assert response.json()["results"] == []
+        mock_knowledge_graph.query_documents.assert_not_called()
+
+    def test_search_with_ai_fallback(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """An empty index result is answered by the AI if requested."""
+        mock_knowledge_graph.search_documents.return_value = []
+        mock_knowledge_graph.query_documents = AsyncMock(
+            return_value=["/docs/a.pdf", "/docs/b.pdf", "/docs/c.pdf"]
+        )
+
+        response = app_with_endpoints.get(
+            "/api/v1/search",
+            params={
+                "q": "Welche Verträge laufen aus?",
+                "ai_fallback": True,
+                "limit": 2,
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source"] == "ai"
+        assert data["results"] == ["/docs/a.pdf", "/docs/b.pdf"]
+
+    def test_failed_ai_fallback_returns_502(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """Errors of the AI fallback are reported as bad gateway."""
+        from folder_extractor.core.memory.graph import KnowledgeGraphError
+
+        mock_knowledge_graph.search_documents.return_value = []
+        mock_knowledge_graph.query_documents = AsyncMock(
+            side_effect=KnowledgeGraphError("offline")
+        )
+
+        response = app_with_endpoints.get(
+            "/api/v1/search", params={"q": "Telekom", "ai_fallback": True}
+        )
+
+        assert response.status_code == 502
+
+    def test_blank_query_returns_400(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """A query of spaces is rejected."""
+        from folder_extractor.core.memory.graph import KnowledgeGraphError
+
+        mock_knowledge_graph.search_documents.side_effect = KnowledgeGraphError(
+            "Query cannot be empty"
+        )
+
+        response = app_with_endpoints.get("/api/v1/search", params={"q": "   "})
+
+        assert response.status_code == 400
+
+    def test_missing_query_returns_422(self, app_with_endpoints: TestClient) -> None:
+        """The q parameter is required."""
+        response = app_with_endpoints.get("/api/v1/search")
+
+        assert response.status_code == 422
+
+
+class TestQueryEndpoints:
+    """Tests for GET /api/v1/query and GET /api/v1/query/stream."""
+
+    @staticmethod
+    def _pages(*pages, error=None):
+        """Build a fake iter_documents() yielding the given pages."""
+
+        async def iter_documents(q, page_size):
+            for page in pages:
+                yield page
+            if error is not None:
+                raise error
+
+        return iter_documents
+
+    def test_query_returns_page_with_cursor(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """The page and the cursor of the next page are returned."""
+        from folder_extractor.core.memory.graph import DocumentPage
+
+        mock_knowledge_graph.query_documents_page = AsyncMock(
+            return_value=DocumentPage(paths=["/docs/a.pdf"], cursor="next")
+        )
+
+        response = app_with_endpoints.get(
+            "/api/v1/query", params={"q": "Telekom", "page_size": 1, "cursor": "c1"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "query": "Telekom",
+            "results": ["/docs/a.pdf"],
+            "count": 1,
+            "next_cursor": "next",
+        }
+        mock_knowledge_graph.query_documents_page.assert_awaited_once_with(
+            "Telekom", 1, "c1"
+        )
+
+    def test_invalid_cursor_returns_400(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """A cursor of another question is a client error."""
+        from folder_extractor.core.memory.graph import InvalidCursorError
+
+        mock_knowledge_graph.query_documents_page = AsyncMock(
+            side_effect=InvalidCursorError("Invalid cursor")
+        )
+
+        response = app_with_endpoints.get(
+            "/api/v1/query", params={"q": "Telekom", "cursor": "x"}
+        )
+
+        assert response.status_code == 400
+
+    def test_page_size_is_bounded(self, app_with_endpoints: TestClient) -> None:
+        """Page sizes above the maximum are rejected."""
+        from folder_extractor.config.constants import QUERY_MAX_PAGE_SIZE
+
+        response = app_with_endpoints.get(
+            "/api/v1/query",
+            params={"q": "Telekom", "page_size": QUERY_MAX_PAGE_SIZE + 1},
+        )
+
+        assert response.status_code == 422
+
+    def test_stream_returns_ndjson(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """Every path is one line, followed by a summary line."""
+        import json
+
+        mock_knowledge_graph.iter_documents = self._pages(
+            ["/docs/a.pdf", "/docs/b.pdf"], ["/docs/c.pdf"]
+        )
+
+        response = app_with_endpoints.get(
+            "/api/v1/query/stream", params={"q": "Alle Dokumente"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [
+            {"path": "/docs/a.pdf"},
+            {"path": "/docs/b.pdf"},
+            {"path": "/docs/c.pdf"},
+            {"done": True, "total": 3},
+        ]
+
+    def test_stream_without_results(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """An empty result is a single summary line."""
+        mock_knowledge_graph.iter_documents = self._pages()
+
+        response = app_with_endpoints.get("/api/v1/query/stream", params={"q": "X"})
+
+        assert response.status_code == 200
+        assert response.text == '{"done": true, "total": 0}\n'
+
+    def test_stream_failing_before_first_page_returns_502(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """Translation errors are reported with a status code."""
+        from folder_extractor.core.memory.graph import KnowledgeGraphError
+
+        mock_knowledge_graph.iter_documents = self._pages(
+            error=KnowledgeGraphError("offline")
+        )
+
+        response = app_with_endpoints.get("/api/v1/query/stream", params={"q": "X"})
+
+        assert response.status_code == 502
+
+    def test_stream_failing_later_ends_with_error_line(
+        self,
+        app_with_endpoints: TestClient,
+        mock_knowledge_graph: MagicMock,
+    ) -> None:
+        """Errors after the first page end the stream with an error record."""
+        import json
+
+        from folder_extractor.core.memory.graph import KnowledgeGraphError
+
+        mock_knowledge_graph.iter_documents = self._pages(
+            ["/docs/a.pdf"], error=KnowledgeGraphError("read failed")
+        )
+
+        response = app_with_endpoints.get("/api/v1/query/stream", params={"q": "X"})
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [{"path": "/docs/a.pdf"}, {"error": "read failed"}]
+
+
 # =============================================================================
 # API Versioning Tests
 # =============================================================================
@@ -0,0 +1,284 @@
+"""
+Unit tests for the processing job queue.
+
+Tests cover:
+- Coalescing files of the same destination and options into batches
+- Per-job results, failures and missing files
+- Backpressure, cancellation and shutdown
+- Bulk jobs with progress
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+from folder_extractor.api.jobs import JobManager, JobQueueFullError
+
+Batch = Tuple[List[Path], Path, Dict[str, Any]]
+
+
+class _Runner:
+    """Batch runner that records calls and can be held back."""
+
+    def __init__(self) -> None:
+        self.calls: list[Batch] = []
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+        self.directories: list[Path | None] = []
+
+    def __call__(
+        self,
+        filepaths: list[Path],
+        destination: Path,
+        options: dict[str, Any],
+        directory: Path | None = None,
+        progress_callback: Callable[..., None] | None = None,
+    ) -> dict[str, Any]:
+        self.calls.append((list(filepaths), destination, options))
+        self.directories.append(directory)
+        self.started.set()
+        if progress_callback is not None:
+            for i, f in enumerate(filepaths, 1):
+                progress_callback(i, len(filepaths), f.name)
+        self.release.wait(5)
+        return {
+            "status": "success",
+            "moved": len(filepaths),
+            "history": [
+                {"original_pfad": str(f), "neuer_pfad": str(destination / f.name)}
+                for f in filepaths
+            ],
+            "missing": [],
+        }
+
+
+def _wait_finished(jobs: JobManager, task_ids: list[str]) -> None:
+    for _ in range(500):
+        states = [jobs.get(task_id).status for task_id in task_ids]
+        if all(s in ("completed", "failed", "cancelled") for s in states):
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"Jobs did not finish: {states}")
+
+
+@pytest.fixture
+def runner() -> _Runner:
+    return _Runner()
+
+
+class TestBatching:
+    """Tests for coalescing queued files."""
+
+    def test_files_of_one_destination_are_processed_together(
+        self, runner: _Runner, tmp_path: Path
+    ) -> None:
+        """Files queued while a batch runs form the next batch."""
+        jobs = JobManager(runner, workers=1)
+        runner.release.clear()
+        first = jobs.submit(tmp_path / "0.pdf", tmp_path / "Ziel")
+        assert runner.started.wait(5)
+        queued = [
+            jobs.submit(tmp_path / f"{i}.pdf", tmp_path / "Ziel") for i in range(1, 4)
+        ]
+        other = jobs.submit(
+            tmp_path / "x.pdf", tmp_path / "Ziel", {"deduplicate": True}
+        )
+        runner.release.set()
+        _wait_finished(jobs, [first.task_id, other.task_id])
+        _wait_finished(jobs, [job.task_id for job in queued])
+        jobs.close(timeout=5)
+
+        assert [len(paths) for paths, _, _ in runner.calls] == [1, 3, 1]
+        assert runner.calls[2][2] == {"deduplicate": True}
+
+    def test_completed_job_has_its_new_path(
+        self, runner: _Runner, tmp_path: Path
+    ) -> None:
+        """The result names where the job's file was moved."""
+        jobs = JobManager(runner)
+        job = jobs.submit(tmp_path / "a.pdf", tmp_path / "Ziel")
+        _wait_finished(jobs, [job.task_id])
+        jobs.close(timeout=5)
+
+        done = jobs.get(job.task_id)
+        assert done.status == "completed"
+        assert done.result["new_path"] == str(tmp_path / "Ziel" / "a.pdf")
+        assert done.started_at is not None and done.finished_at is not None
+
+    def test_one_batch_per_destination_at_a_time(self, tmp_path: Path) -> None:
+        """Overflowing batches wait; other destinations still run in parallel."""
+        lock = threading.Lock()
+        active: dict[Path, int] = {}
+        peak: dict[Path, int] = {}
+        release = threading.Event()
+
+        def run(filepaths, destination, options, **kwargs):
+            with lock:
+                active[destination] = active.get(destination, 0) + 1
+                peak[destination] = max(peak.get(destination, 0), active[destination])
+            release.wait(5)
+            with lock:
+                active[destination] -= 1
+            return {"status": "success", "missing": []}
+
+        jobs = JobManager(run, workers=3, batch_size=2)
+        ziel, anderes = tmp_path / "Ziel", tmp_path / "Anderes"
+        submitted = [jobs.submit(tmp_path / f"{i}.pdf", ziel) for i in range(5)]
+        submitted.append(jobs.submit(tmp_path / "x.pdf", anderes))
+        for _ in range(500):
+            with lock:
+                parallel = active.get(ziel) == 1 and active.get(anderes) == 1
+            if parallel:
+                break
+            threading.Event().wait(0.01)
+        release.set()
+        _wait_finished(jobs, [job.task_id for job in submitted])
+        jobs.close(timeout=5)
+
+        assert parallel
+        assert peak == {ziel: 1, anderes: 1}
+
+    def test_failures_and_missing_files(self, tmp_path: Path) -> None:
+        """A failing batch fails its jobs; missing files fail individually."""
+
+        def run(filepaths, destination, options, **kwargs):
+            if destination.name == "kaputt":
+                raise OSError("Laufwerk fehlt")
+            return {"status": "success", "missing": [str(filepaths[0])]}
+
+        jobs = JobManager(run, workers=1)
+        missing = jobs.submit(tmp_path / "weg.pdf", tmp_path / "Ziel")
+        broken = jobs.submit(tmp_path / "a.pdf", tmp_path / "kaputt")
+        _wait_finished(jobs, [missing.task_id, broken.task_id])
+        jobs.close(timeout=5)
+
+        assert jobs.get(missing.task_id).status == "failed"
+        assert "existiert nicht" in jobs.get(missing.task_id).error
+        assert jobs.get(broken.task_id).status == "failed"
+        assert "Laufwerk fehlt" in jobs.get(broken.task_id).error
+
+
+class TestQueue:
+    """Tests for backpressure, cancellation and shutdown."""
+
+    def test_full_queue_rejects_files(self, runner: _Runner, tmp_path: Path) -> None:
+        """Beyond max_queue_size, submit() raises."""
+        runner.release.clear()
+        jobs = JobManager(runner, workers=1, max_queue_size=2)
+        jobs.submit(tmp_path / "0.pdf", tmp_path)
+        assert runner.started.wait(5)  # Processing, no longer queued
+        jobs.submit(tmp_path / "1.pdf", tmp_path)
+        jobs.submit(tmp_path / "2.pdf", tmp_path)
+
+        with pytest.raises(JobQueueFullError):
+            jobs.submit(tmp_path / "3.pdf", tmp_path)
+        assert jobs.stats() == {"queued": 2, "processing": 1, "workers": 1}
+        runner.release.set()
+        jobs.close(timeout=5)
+
+    def test_only_queued_jobs_can_be_cancelled(
+        self, runner: _Runner, tmp_path: Path
+    ) -> None:
+        """A running job keeps its status; a queued one is never processed."""
+        runner.release.clear()
+        jobs = JobManager(runner, workers=1)
+        running = jobs.submit(tmp_path / "0.pdf", tmp_path)
+        assert runner.started.wait(5)
+        queued = jobs.submit(tmp_path / "1.pdf", tmp_path)
+
+        assert jobs.cancel(queued.task_id).status == "cancelled"
+        assert jobs.cancel(running.task_id).status == "processing"
+        assert jobs.cancel("unbekannt") is None
+        runner.release.set()
+        _wait_finished(jobs, [running.task_id])
+        jobs.close(timeout=5)
+
+        assert [paths for paths, _, _ in runner.calls] == [[tmp_path / "0.pdf"]]
+
+    def test_close_cancels_queued_jobs(self, runner: _Runner, tmp_path: Path) -> None:
+        """Shutdown finishes running batches and cancels the rest."""
+        runner.release.clear()
+        jobs = JobManager(runner, workers=1)
+        running = jobs.submit(tmp_path / "0.pdf", tmp_path)
+        assert runner.started.wait(5)
+        queued = jobs.submit(tmp_path / "1.pdf", tmp_path)
+        threading.Timer(0.05, runner.release.set).start()
+        jobs.close(timeout=5)
+
+        assert jobs.get(running.task_id).status == "completed"
+        assert jobs.get(queued.task_id).status == "cancelled"
+        with pytest.raises(JobQueueFullError):
+            jobs.submit(tmp_path / "2.pdf", tmp_path)
+
+    def test_old_finished_jobs_are_forgotten(
+        self, runner: _Runner, tmp_path: Path
+    ) -> None:
+        """Only history_size finished jobs are kept."""
+        runner.release.clear()
+        jobs = JobManager(runner, workers=1, history_size=2)
+        jobs.submit(tmp_path / "busy.pdf", tmp_path)
+        assert runner.started.wait(5)
+        ids = [jobs.submit(tmp_path / f"{i}.pdf", tmp_path).task_id for i in range(3)]
+        for task_id in ids:
+            jobs.cancel(task_id)
+        runner.release.set()
+        jobs.close(timeout=5)
+
+        assert jobs.get(ids[0]) is None
+        assert jobs.get(ids[2]) is not None
+
+
+class TestBulkJobs:
+    """Tests for bulk jobs covering many files."""
+
+    def test_bulk_job_is_processed_alone_with_progress(
+        self, runner: _Runner, tmp_path: Path
+    ) -> None:
+        """A bulk job is one batch call and reports counts and progress."""
+        files = [tmp_path / f"{i}.pdf" for i in range(3)]
+        jobs = JobManager(runner, workers=1)
+        single = jobs.submit(tmp_path / "x.pdf", tmp_path / "Ziel")
+        bulk = jobs.submit_bulk(tmp_path / "Ziel", filepaths=files)
+        _wait_finished(jobs, [single.task_id, bulk.task_id])
+        jobs.close(timeout=5)
+
+        done = jobs.get(bulk.task_id)
+        assert done.status == "completed"
+        assert done.result == {
+            "files": 3,
+            "moved": 3,
+            "duplicates": 0,
+            "errors": 0,
+            "missing": [],
+        }
+        assert done.progress == {"current": 3, "total": 3, "filename": "2.pdf"}
+        assert sorted(len(paths) for paths, _, _ in runner.calls) == [1, 3]
+
+    def test_bulk_job_passes_directory(self, runner: _Runner, tmp_path: Path) -> None:
+        """The directory is handed to the runner for discovery."""
+        jobs = JobManager(runner)
+        bulk = jobs.submit_bulk(tmp_path / "Ziel", directory=tmp_path)
+        _wait_finished(jobs, [bulk.task_id])
+        jobs.close(timeout=5)
+
+        assert runner.directories == [tmp_path]
+        assert jobs.get(bulk.task_id).directory == tmp_path
+
+    def test_failed_bulk_job(self, tmp_path: Path) -> None:
+        """A bulk job fails with the message of the runner."""
+
+        def run(filepaths, destination, options, **kwargs):
+            return {"status": "security_error", "message": "Nicht erlaubt"}
+
+        jobs = JobManager(run)
+        bulk = jobs.submit_bulk(tmp_path, directory=tmp_path)
+        _wait_finished(jobs, [bulk.task_id])
+        jobs.close(timeout=5)
+
+        assert jobs.get(bulk.task_id).status == "failed"
+        assert jobs.get(bulk.task_id).error == "Nicht erlaubt"
@@ -321,6 +321,42 @@ class TestHealthEndpoint:
         assert "." in data["version"]
 
 
+class TestMetricsEndpoint:
+    """Tests for /metrics endpoint."""
+
+    def test_metrics_returns_prometheus_text(
+        self,
+        app_with_mocks: TestClient,
+    ) -> None:
+        """Observations of instrumented operations are exposed."""
+        from folder_extractor.core.metrics import metrics
+
+        metrics.observe("file_hash", 0.002)
+
+        response = app_with_mocks.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'folder_extractor_operation_duration_seconds_count{operation="file_hash"}'
+            in response.text
+        )
+        assert "# TYPE folder_extractor_watcher_queue_depth gauge" in response.text
+
+    def test_metrics_disabled_returns_404(
+        self,
+        app_with_mocks: TestClient,
+    ) -> None:
+        """Without recording, the endpoint is not available."""
+        from folder_extractor.core.metrics import metrics
+
+        metrics.disable()
+        try:
+            assert app_with_mocks.get("/metrics").status_code == 404
+        finally:
+            metrics.enable()
+
+
 # =============================================================================
 # Root Endpoint Tests
 # =============================================================================
@@ -488,3 +524,112 @@ class TestDependencyInjection:
                     get_smart_sorter_dependency()
                 assert exc_info.value.status_code == 503
                 assert "SmartSorter" in exc_info.value.detail
+
+
+# =============================================================================
+# WebSocket Query Tests
+# =============================================================================
+
+
+class TestWebSocketQuery:
+    """Tests for chunked knowledge graph queries over the WebSocket."""
+
+    @staticmethod
+    def _sent_messages(manager: MagicMock) -> list:
+        return [call.args[0] for call in manager.send_personal_message.await_args_list]
+
+    @pytest.mark.asyncio
+    async def test_results_are_sent_per_page(
+        self, mock_knowledge_graph: MagicMock
+    ) -> None:
+        """Every page is one message, followed by a done message."""
+        from folder_extractor.api.server import _handle_query, app
+
+        async def iter_documents(query, page_size):
+            assert (query, page_size) == ("Telekom", 2)
+            yield ["/docs/a.pdf", "/docs/b.pdf"]
+            yield ["/docs/c.pdf"]
+
+        mock_knowledge_graph.iter_documents = iter_documents
+        manager = MagicMock()
+        manager.send_personal_message = AsyncMock()
+
+        with patch.object(
+            app.state, "knowledge_graph", mock_knowledge_graph, create=True
+        ):
+            await _handle_query(
+                MagicMock(), manager, {"query": " Telekom ", "page_size": 2}
+            )
+
+        data = [message["data"] for message in self._sent_messages(manager)]
+        assert [d["results"] for d in data] == [
+            ["/docs/a.pdf", "/docs/b.pdf"],
+            ["/docs/c.pdf"],
+            [],
+        ]
+        assert [d["done"] for d in data] == [False, False, True]
+        assert data[-1]["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_query_sends_error(
+        self, mock_knowledge_graph: MagicMock
+    ) -> None:
+        """Query errors are reported as error messages."""
+        from folder_extractor.api.server import _handle_query, app
+        from folder_extractor.core.memory.graph import KnowledgeGraphError
+
+        async def iter_documents(query, page_size):
+            raise KnowledgeGraphError("offline")
+            yield  # pragma: no cover
+
+        mock_knowledge_graph.iter_documents = iter_documents
+        manager = MagicMock()
+        manager.send_personal_message = AsyncMock()
+
+        with patch.object(
+            app.state, "knowledge_graph", mock_knowledge_graph, create=True
+        ):
+            await _handle_query(MagicMock(), manager, {"query": "Telekom"})
+
+        messages = self._sent_messages(manager)
+        assert len(messages) == 1
+        assert messages[0]["type"] == "error"
+        assert messages[0]["data"]["code"] == "QUERY_ERROR"
+
+
+class TestWebSocketSubscribe:
+    """Tests for broadcast filters set over the WebSocket."""
+
+    @pytest.mark.asyncio
+    async def test_subscription_is_confirmed(self) -> None:
+        """A valid filter is stored and echoed back."""
+        from folder_extractor.api.server import _handle_subscribe
+
+        manager = MagicMock()
+        manager.send_personal_message = AsyncMock()
+        websocket = MagicMock()
+        data = {"zones": ["inbox"], "types": ["progress"], "log_level": "ERROR"}
+
+        await _handle_subscribe(websocket, manager, data)
+
+        manager.subscribe.assert_called_once_with(
+            websocket, zones=["inbox"], types=["progress"], log_level="ERROR"
+        )
+        message = manager.send_personal_message.await_args.args[0]
+        assert message["type"] == "subscribed"
+        assert message["data"] == data
+
+    @pytest.mark.asyncio
+    async def test_invalid_subscription_sends_error(self) -> None:
+        """Invalid filters are reported as error messages."""
+        from folder_extractor.api.server import _handle_subscribe
+
+        manager = MagicMock()
+        manager.subscribe.side_effect = ValueError("Unknown log level: LOUD")
+        manager.send_personal_message = AsyncMock()
+
+        await _handle_subscribe(MagicMock(), manager, {"log_level": "LOUD"})
+
+        message = manager.send_personal_message.await_args.args[0]
+        assert message["type"] == "error"
+        assert message["data"]["code"] == "INVALID_SUBSCRIPTION"
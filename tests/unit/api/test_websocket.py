@@ -8,15 +8,19 @@ Following TDD principles: these tests are written before the implementation.
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import threading
 from datetime import datetime
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from folder_extractor.api.websocket import (
     ConnectionManager,
+    ProgressAggregator,
+    WebSocketBridge,
     WebSocketLogHandler,
     WebSocketMessage,
     WebSocketProgressBroadcaster,
@@ -127,9 +131,12 @@ class TestConnectionManager:
 
         message = {"type": "progress", "data": {"current": 5, "total": 10}}
         await manager.broadcast(message)
+        assert await manager.drain(timeout=5)
 
-        for ws in [ws1, ws2, ws3]:
-            ws.send_json.assert_called_once_with(message)
+        texts = [ws.send_text.call_args[0][0] for ws in [ws1, ws2, ws3]]
+        assert json.loads(texts[0]) == message
+        # Serialized once, the same text is sent to every client
+        assert texts[1] is texts[0] and texts[2] is texts[0]
 
     @pytest.mark.asyncio
     async def test_broadcast_handles_client_disconnect_gracefully(
@@ -138,23 +145,24 @@ class TestConnectionManager:
         """Broadcasting to a disconnected client removes it from active connections."""
         ws_healthy = AsyncMock()
         ws_healthy.accept = AsyncMock()
-        ws_healthy.send_json = AsyncMock()
 
         ws_dead = AsyncMock()
         ws_dead.accept = AsyncMock()
-        ws_dead.send_json = AsyncMock(side_effect=Exception("Connection closed"))
+        ws_dead.send_text = AsyncMock(side_effect=Exception("Connection closed"))
 
         await manager.connect(ws_healthy)
         await manager.connect(ws_dead)
 
         message = {"type": "status", "data": {"status": "sorted"}}
         await manager.broadcast(message)
+        assert await manager.drain(timeout=5)
 
         # Dead connection should be removed
         assert ws_dead not in manager.active_connections
         # Healthy connection should remain and receive message
         assert ws_healthy in manager.active_connections
-        ws_healthy.send_json.assert_called_once_with(message)
+        ws_healthy.send_text.assert_called_once()
+        assert json.loads(ws_healthy.send_text.call_args[0][0]) == message
 
     @pytest.mark.asyncio
     async def test_broadcast_with_no_connections_does_nothing(
@@ -182,6 +190,159 @@ class TestConnectionManager:
         ws2.close.assert_called_once()
         assert len(manager.active_connections) == 0
 
+    @pytest.mark.asyncio
+    async def test_broadcast_does_not_wait_for_slow_client(self) -> None:
+        """A stalled client neither blocks broadcast() nor other clients."""
+        manager = ConnectionManager()
+        release = asyncio.Event()
+
+        async def stalled_send(text: str) -> None:
+            await release.wait()
+
+        ws_slow, ws_fast = AsyncMock(), AsyncMock()
+        ws_slow.send_text = AsyncMock(side_effect=stalled_send)
+        await manager.connect(ws_slow)
+        await manager.connect(ws_fast)
+
+        for i in range(3):
+            await asyncio.wait_for(
+                manager.broadcast({"type": "status", "data": {"i": i}}), timeout=1
+            )
+        await asyncio.sleep(0.01)
+
+        assert ws_fast.send_text.call_count == 3
+        assert ws_slow.send_text.call_count == 1
+        release.set()
+        assert await manager.drain(timeout=5)
+        assert ws_slow.send_text.call_count == 3
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_progress_messages_are_coalesced(self) -> None:
+        """A client that falls behind only receives the latest progress."""
+        manager = ConnectionManager()
+        release = asyncio.Event()
+        sent: list[dict[str, Any]] = []
+
+        async def send_text(text: str) -> None:
+            await release.wait()
+            sent.append(json.loads(text))
+
+        ws = AsyncMock()
+        ws.send_text = AsyncMock(side_effect=send_text)
+        await manager.connect(ws)
+
+        await manager.broadcast({"type": "status", "data": {"status": "first"}})
+        await asyncio.sleep(0.01)  # The writer is now stuck sending "first"
+        for current in range(1, 101):
+            await manager.broadcast({"type": "progress", "data": {"current": current}})
+        await manager.broadcast({"type": "status", "data": {"status": "sorted"}})
+        release.set()
+        assert await manager.drain(timeout=5)
+
+        assert [m["data"] for m in sent] == [
+            {"status": "first"},
+            {"current": 100},
+            {"status": "sorted"},
+        ]
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("policy", ["drop_oldest", "disconnect"])
+    async def test_full_queue_applies_slow_client_policy(self, policy: str) -> None:
+        """A full queue drops the oldest message or disconnects the client."""
+        manager = ConnectionManager(queue_size=2, slow_client_policy=policy)
+        release = asyncio.Event()
+
+        async def stalled_send(text: str) -> None:
+            await release.wait()
+
+        ws = AsyncMock()
+        ws.send_text = AsyncMock(side_effect=stalled_send)
+        await manager.connect(ws)
+
+        for i in range(4):  # One is being sent, two are queued, one overflows
+            await manager.broadcast({"type": "log", "data": {"i": i}})
+            await asyncio.sleep(0)
+
+        if policy == "drop_oldest":
+            assert manager.stats() == {"connections": 1, "queued": 2, "dropped": 1}
+        else:
+            assert ws not in manager.active_connections
+            ws.close.assert_called_once_with(code=1013)
+        release.set()
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_client_exceeding_send_timeout_is_disconnected(self) -> None:
+        """A send that never completes disconnects the client."""
+        manager = ConnectionManager(send_timeout=0.05)
+
+        async def hanging_send(text: str) -> None:
+            await asyncio.sleep(10)
+
+        ws = AsyncMock()
+        ws.send_text = AsyncMock(side_effect=hanging_send)
+        await manager.connect(ws)
+
+        await manager.broadcast({"type": "log", "data": {}})
+        assert await manager.drain(timeout=5)
+
+        assert ws not in manager.active_connections
+        ws.close.assert_called_once_with(code=1013)
+
+    @pytest.mark.asyncio
+    async def test_subscription_filters_broadcasts(self) -> None:
+        """A subscribed client only receives matching zones, types and levels."""
+        manager = ConnectionManager()
+        ws_all, ws_filtered = AsyncMock(), AsyncMock()
+        await manager.connect(ws_all)
+        await manager.connect(ws_filtered)
+        manager.subscribe(
+            ws_filtered, zones=["inbox"], types=["progress", "log"], log_level="warning"
+        )
+
+        messages = [
+            {"type": "progress", "data": {"zone_id": "inbox"}},
+            {"type": "progress", "data": {"zone_id": "scans"}},
+            {"type": "status", "data": {"zone_id": "inbox"}},
+            {"type": "log", "data": {"level": "INFO"}},
+            {"type": "log", "data": {"level": "ERROR"}},
+        ]
+        for message in messages:
+            await manager.broadcast(message)
+        assert await manager.drain(timeout=5)
+
+        def received(ws: AsyncMock) -> list[dict[str, Any]]:
+            return [json.loads(c.args[0]) for c in ws.send_text.call_args_list]
+
+        assert received(ws_all) == messages
+        assert received(ws_filtered) == [messages[0], messages[4]]
+
+        manager.subscribe(ws_filtered)  # Empty filter: everything again
+        await manager.broadcast(messages[1])
+        assert await manager.drain(timeout=5)
+        assert received(ws_filtered)[-1] == messages[1]
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_invalid_subscription_is_rejected(self) -> None:
+        """Unknown log levels and non-list filters raise."""
+        manager = ConnectionManager()
+        ws = AsyncMock()
+        await manager.connect(ws)
+
+        with pytest.raises(ValueError, match="log level"):
+            manager.subscribe(ws, log_level="LOUD")
+        with pytest.raises(TypeError, match="zones"):
+            manager.subscribe(ws, zones="inbox")
+        await manager.close_all()
+
+    def test_unknown_slow_client_policy_is_rejected(self) -> None:
+        """Only the documented policies are accepted."""
+        with pytest.raises(ValueError, match="policy"):
+            ConnectionManager(slow_client_policy="block")
+
     def test_connection_count_returns_number_of_active_connections(
         self, manager: ConnectionManager
     ) -> None:
@@ -193,6 +354,243 @@ class TestConnectionManager:
         assert manager.connection_count == 1
 
 
+# =============================================================================
+# WebSocketBridge Tests
+# =============================================================================
+
+
+class TestWebSocketBridge:
+    """Tests for handing messages from worker threads to the event loop."""
+
+    @pytest.fixture
+    def manager(self) -> MagicMock:
+        """ConnectionManager recording broadcasts and the thread they ran on."""
+        manager = MagicMock(spec=ConnectionManager)
+        manager.calls = []
+
+        async def broadcast(message: dict[str, Any]) -> None:
+            manager.calls.append((message, threading.get_ident()))
+
+        manager.broadcast = broadcast
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_messages_from_threads_are_broadcast_on_the_loop(
+        self, manager: MagicMock
+    ) -> None:
+        """Messages submitted by worker threads arrive in order on the loop."""
+        bridge = WebSocketBridge(manager, frame_rate=100)
+        bridge.start()
+
+        def worker() -> None:
+            for i in range(100):
+                assert bridge.submit({"type": "log", "data": {"i": i}})
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.1)
+        await bridge.close()
+
+        assert [m["data"]["i"] for m, _ in manager.calls] == list(range(100))
+        assert {ident for _, ident in manager.calls} == {threading.get_ident()}
+
+    @pytest.mark.asyncio
+    async def test_loop_is_woken_once_per_frame(self, manager: MagicMock) -> None:
+        """A burst of messages schedules a single flush."""
+        loop = asyncio.get_running_loop()
+        bridge = WebSocketBridge(manager, frame_rate=10)
+        bridge.start()
+
+        with patch.object(
+            loop, "call_soon_threadsafe", wraps=loop.call_soon_threadsafe
+        ) as wakeups:
+            for i in range(1000):
+                bridge.submit({"type": "progress", "data": {"current": i}})
+            await asyncio.sleep(0.2)
+
+        assert wakeups.call_count == 1
+        assert len(manager.calls) == 1000
+        await bridge.close()
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_drops_oldest(self, manager: MagicMock) -> None:
+        """The buffer between flushes is bounded."""
+        bridge = WebSocketBridge(manager, frame_rate=10, max_pending=3)
+        bridge.start()
+
+        for i in range(5):
+            bridge.submit({"type": "log", "data": {"i": i}})
+        await bridge.close()
+
+        assert [m["data"]["i"] for m, _ in manager.calls] == [2, 3, 4]
+        assert bridge.dropped == 2
+
+    def test_submit_before_start_or_after_close_is_dropped(
+        self, manager: MagicMock
+    ) -> None:
+        """Without a loop, submit() returns False instead of creating one."""
+        bridge = WebSocketBridge(manager)
+
+        assert bridge.submit({"type": "log", "data": {}}) is False
+        assert not bridge.running
+
+        loop = asyncio.new_event_loop()
+        try:
+            bridge.start(loop)
+            loop.run_until_complete(bridge.close())
+        finally:
+            loop.close()
+
+        assert bridge.submit({"type": "log", "data": {}}) is False
+
+    @pytest.mark.asyncio
+    async def test_broadcaster_callbacks_use_bridge(self, manager: MagicMock) -> None:
+        """Synchronous progress and event callbacks go through the bridge."""
+        bridge = WebSocketBridge(manager, frame_rate=100)
+        bridge.start()
+        broadcaster = WebSocketProgressBroadcaster(manager, bridge=bridge)
+
+        thread = threading.Thread(
+            target=lambda: (
+                broadcaster.get_progress_callback()(1, 2, "a.pdf"),
+                broadcaster.get_event_callback()("sorted", "a.pdf"),
+            )
+        )
+        thread.start()
+        thread.join()
+        await bridge.close()
+
+        assert [m["type"] for m, _ in manager.calls] == ["progress", "status"]
+
+    def test_log_records_from_threads_go_through_bridge(
+        self, manager: MagicMock
+    ) -> None:
+        """emit() on a thread without an event loop uses the bridge."""
+        bridge = MagicMock(spec=WebSocketBridge)
+        handler = WebSocketLogHandler(manager, bridge=bridge)
+        record = logging.LogRecord(
+            "folder_extractor.core.watch", logging.INFO, "watch.py", 1, "x", (), None
+        )
+
+        thread = threading.Thread(target=handler.emit, args=(record,))
+        thread.start()
+        thread.join()
+
+        bridge.submit.assert_called_once()
+        assert bridge.submit.call_args[0][0]["type"] == "log"
+
+
+# =============================================================================
+# ProgressAggregator Tests
+# =============================================================================
+
+
+class TestProgressAggregator:
+    """Tests for collapsing events into per-zone snapshots."""
+
+    @pytest.fixture
+    def manager(self) -> AsyncMock:
+        """Create a mock ConnectionManager."""
+        manager = AsyncMock(spec=ConnectionManager)
+        manager.broadcast = AsyncMock()
+        return manager
+
+    def test_events_are_collapsed_per_zone(self, manager: AsyncMock) -> None:
+        """Many events of a zone result in one snapshot with counts."""
+        aggregator = ProgressAggregator(manager, recent_files=2)
+        for i in range(5):
+            aggregator.record_event("inbox", "incoming", f"{i}.pdf")
+        for i in range(3):
+            aggregator.record_event("inbox", "sorted", f"{i}.pdf")
+        aggregator.record_progress("inbox", 1, 1, "✅ 2.pdf sortiert")
+        aggregator.record_event("scans", "error", "x.pdf", "kaputt")
+
+        snapshots = {m["data"]["zone_id"]: m for m in aggregator.snapshots()}
+
+        inbox = snapshots["inbox"]
+        assert inbox["type"] == "progress"
+        assert inbox["data"]["counts"] == {"incoming": 5, "sorted": 3}
+        assert (inbox["data"]["current"], inbox["data"]["total"]) == (3, 5)
+        assert inbox["data"]["filename"] == "✅ 2.pdf sortiert"
+        assert inbox["data"]["recent"] == ["1.pdf", "2.pdf"]
+        assert snapshots["scans"]["data"]["error"] == "kaputt"
+
+    def test_rate_and_eta(self, manager: AsyncMock) -> None:
+        """The rate follows finished files; ETA covers the pending ones."""
+        aggregator = ProgressAggregator(manager)
+        for _ in range(30):
+            aggregator.record_event("inbox", "incoming", "a.pdf")
+        assert aggregator.snapshots()[0]["data"]["eta"] is None  # No rate yet
+
+        # Pretend the previous snapshot was one second before the next one
+        aggregator._zones["inbox"].updated = 100.0
+        for _ in range(10):
+            aggregator.record_event("inbox", "sorted", "a.pdf")
+        data = aggregator.snapshots(now=101.0)[0]["data"]
+
+        assert data["rate"] == 5.0  # Half of the 10 files/s (smoothed from 0)
+        assert data["eta"] == 4.0  # 20 pending files at 5 files/s
+
+    def test_unchanged_zones_are_not_repeated(self, manager: AsyncMock) -> None:
+        """A snapshot is only built after something happened."""
+        aggregator = ProgressAggregator(manager)
+        aggregator.record_event("inbox", "incoming", "a.pdf")
+
+        assert len(aggregator.snapshots()) == 1
+        assert aggregator.snapshots() == []
+
+        aggregator.reset("inbox")
+        assert aggregator.snapshots() == []
+
+    @pytest.mark.asyncio
+    async def test_snapshots_are_broadcast_periodically(
+        self, manager: AsyncMock
+    ) -> None:
+        """Events from threads reach clients at the snapshot rate."""
+        aggregator = ProgressAggregator(manager, rate=100)
+        aggregator.start()
+        worker = threading.Thread(
+            target=lambda: [
+                aggregator.record_event("inbox", "sorted", f"{i}.pdf")
+                for i in range(1000)
+            ]
+        )
+        worker.start()
+        worker.join()
+        for _ in range(100):
+            if manager.broadcast.await_count:
+                break
+            await asyncio.sleep(0.01)
+        aggregator.record_event("inbox", "sorted", "last.pdf")
+        await aggregator.close()
+
+        last = manager.broadcast.await_args_list[-1].args[0]["data"]
+        assert last["counts"] == {"sorted": 1001}
+        assert manager.broadcast.await_count < 100
+
+    def test_broadcaster_records_into_aggregator(self, manager: AsyncMock) -> None:
+        """With an aggregator, callbacks are recorded instead of broadcast."""
+        aggregator = ProgressAggregator(manager)
+        bridge = MagicMock(spec=WebSocketBridge)
+        broadcaster = WebSocketProgressBroadcaster(
+            manager, bridge=bridge, aggregator=aggregator, zone_id="inbox"
+        )
+
+        broadcaster.get_event_callback()("sorted", "a.pdf")
+        broadcaster.get_progress_callback()(1, 1, "a.pdf")
+
+        bridge.submit.assert_not_called()
+        data = aggregator.snapshots()[0]["data"]
+        assert data["zone_id"] == "inbox"
+        assert data["counts"] == {"sorted": 1}
+
+    def test_non_positive_rate_is_rejected(self, manager: AsyncMock) -> None:
+        """A snapshot rate of zero would never broadcast."""
+        with pytest.raises(ValueError, match="rate"):
+            ProgressAggregator(manager, rate=0)
+
+
 # =============================================================================
 # WebSocketProgressBroadcaster Tests
 # =============================================================================
@@ -18,6 +18,7 @@ import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from tenacity import wait_none
 
 # Skip all tests if google-generativeai is not installed (Python 3.8)
 pytest.importorskip("google.api_core.exceptions")
@@ -32,6 +33,12 @@ from folder_extractor.core.ai_async import (  # noqa: E402
     AIClientError,
     AsyncGeminiClient,
     IAIClient,
+    _UploadCache,
+)
+from folder_extractor.core.ai_scheduler import (  # noqa: E402
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    AIRequestScheduler,
 )
 from folder_extractor.core.security import APIKeyError  # noqa: E402
 
@@ -432,6 +439,426 @@ class TestAsyncGeminiClientAnalyzeFile:
                 )
 
 
+class TestAsyncGeminiClientScheduling:
+    """Tests for request scheduling of AsyncGeminiClient."""
+
+    @pytest.fixture
+    def mock_genai(self):
+        """Fixture providing mocked genai module."""
+        with patch("folder_extractor.core.ai_async.genai") as mock:
+            yield mock
+
+    @pytest.fixture
+    def scheduler(self):
+        """Fixture providing a scheduler without practical limits."""
+        return AIRequestScheduler(requests_per_minute=60_000)
+
+    def test_creates_default_scheduler(self, mock_genai):
+        """Without a scheduler argument the client creates its own."""
+        client = AsyncGeminiClient(api_key="test-key")
+
+        assert isinstance(client.scheduler, AIRequestScheduler)
+
+    def test_chat_uses_interactive_lane(self, mock_genai, scheduler):
+        """Text generation is scheduled in the interactive lane."""
+        mock_model = MagicMock()
+        mock_model.generate_content_async = AsyncMock(
+            return_value=MagicMock(text="Hallo")
+        )
+        mock_genai.GenerativeModel.return_value = mock_model
+        client = AsyncGeminiClient(api_key="test-key", scheduler=scheduler)
+
+        with patch.object(scheduler, "request", wraps=scheduler.request) as request:
+            asyncio.run(client.generate_response("Wie geht es?"))
+
+        assert request.call_args[0][0] == PRIORITY_INTERACTIVE
+
+    def test_file_analysis_uses_bulk_lane(self, mock_genai, scheduler, tmp_path):
+        """File analysis is scheduled in the bulk lane."""
+        test_file = tmp_path / "test.jpg"
+        test_file.write_bytes(b"fake image data")
+        mock_model = MagicMock()
+        mock_model.generate_content_async = AsyncMock(
+            return_value=MagicMock(text='{"category": "Rechnungen"}')
+        )
+        mock_genai.GenerativeModel.return_value = mock_model
+        client = AsyncGeminiClient(api_key="test-key", scheduler=scheduler)
+
+        with patch.object(scheduler, "request", wraps=scheduler.request) as request:
+            asyncio.run(client.analyze_file(test_file, "image/jpeg", "Beschreibe"))
+
+        assert request.call_args[0][0] == PRIORITY_BULK
+        assert scheduler.stats()["uploads_in_flight"] == 0
+
+    def test_rate_limit_is_reported_to_scheduler(self, mock_genai, scheduler):
+        """A 429 response slows down the scheduler before the retry."""
+        mock_model = MagicMock()
+        mock_model.generate_content_async = AsyncMock(
+            side_effect=ResourceExhausted("Rate limited")
+        )
+        mock_genai.GenerativeModel.return_value = mock_model
+        client = AsyncGeminiClient(api_key="test-key", scheduler=scheduler)
+
+        # Call the undecorated method to skip the retry waits
+        with pytest.raises(ResourceExhausted):
+            asyncio.run(
+                AsyncGeminiClient.generate_response.__wrapped__(client, "Hallo")
+            )
+
+        assert scheduler.stats()["rate_limited"] == 1
+        assert scheduler.rate_factor == pytest.approx(0.5)
+
+    def test_reported_token_usage_is_recorded(self, mock_genai, scheduler):
+        """The real token count of a response corrects the estimate."""
+        response = MagicMock(text="Antwort")
+        response.usage_metadata.total_token_count = 5000
+        mock_model = MagicMock()
+        mock_model.generate_content_async = AsyncMock(return_value=response)
+        mock_genai.GenerativeModel.return_value = mock_model
+        client = AsyncGeminiClient(api_key="test-key", scheduler=scheduler)
+
+        with patch.object(scheduler, "record_usage") as record_usage:
+            asyncio.run(client.generate_response("Hallo"))
+
+        assert record_usage.call_args[0][1] == 5000
+
+
+class TestAsyncGeminiClientAnalyzeFiles:
+    """Tests for batch analysis with AsyncGeminiClient.analyze_files()."""
+
+    @pytest.fixture
+    def mock_genai(self):
+        """Fixture providing mocked genai module."""
+        with patch("folder_extractor.core.ai_async.genai") as mock:
+            yield mock
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        """Fixture providing three small files."""
+        result = []
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            path = tmp_path / name
+            path.write_bytes(b"fake image data")
+            result.append((path, "image/jpeg"))
+        return result
+
+    def _client(self, mock_genai, response_text):
+        mock_model = MagicMock()
+        mock_model.generate_content_async = AsyncMock(
+            return_value=MagicMock(text=response_text)
+        )
+        mock_genai.GenerativeModel.return_value = mock_model
+        scheduler = AIRequestScheduler(requests_per_minute=60_000)
+        return AsyncGeminiClient(api_key="test-key", scheduler=scheduler)
+
+    def test_sends_all_files_in_one_request(self, mock_genai, files):
+        """One generate call carries every uploaded file."""
+        client = self._client(mock_genai, "[]")
+
+        asyncio.run(client.analyze_files(files, "Analysiere"))
+
+        assert mock_genai.upload_file.call_count == 3
+        assert client.model.generate_content_async.call_count == 1
+        contents = client.model.generate_content_async.call_args[0][0]
+        assert contents[0] == "Dokument 0:"
+        assert contents[4] == "Dokument 2:"
+        assert "JSON-Array" in contents[-1]
+
+    def test_maps_results_back_by_index(self, mock_genai, files):
+        """Results are returned in file order regardless of response order."""
+        response = json.dumps(
+            [
+                {"index": 2, "category": "Privat"},
+                {"index": 0, "category": "Finanzen"},
+                {"index": 1, "category": "Medizin"},
+            ]
+        )
+        client = self._client(mock_genai, response)
+
+        results = asyncio.run(client.analyze_files(files, "Analysiere"))
+
+        assert results == [
+            {"category": "Finanzen"},
+            {"category": "Medizin"},
+            {"category": "Privat"},
+        ]
+
+    def test_missing_and_invalid_entries_become_none(self, mock_genai, files):
+        """Files without a valid result are reported as None."""
+        response = json.dumps([{"index": 1, "category": "Finanzen"}, {"index": 7}])
+        client = self._client(mock_genai, response)
+
+        results = asyncio.run(client.analyze_files(files, "Analysiere"))
+
+        assert results == [None, {"category": "Finanzen"}, None]
+
+    def test_raises_error_when_response_is_not_an_array(self, mock_genai, files):
+        """A single object instead of an array is rejected."""
+        client = self._client(mock_genai, '{"category": "Finanzen"}')
+
+        with pytest.raises(AIClientError, match="JSON array"):
+            asyncio.run(client.analyze_files(files, "Analysiere"))
+
+    def test_raises_error_for_nonexistent_file(self, mock_genai, files, tmp_path):
+        """Missing files are rejected before anything is uploaded."""
+        client = self._client(mock_genai, "[]")
+        files.append((tmp_path / "missing.jpg", "image/jpeg"))
+
+        with pytest.raises(AIClientError, match="does not exist"):
+            asyncio.run(client.analyze_files(files, "Analysiere"))
+
+        mock_genai.upload_file.assert_not_called()
+
+    def test_empty_list_makes_no_request(self, mock_genai):
+        """An empty batch returns immediately."""
+        client = self._client(mock_genai, "[]")
+
+        assert asyncio.run(client.analyze_files([], "Analysiere")) == []
+        client.model.generate_content_async.assert_not_called()
+
+
+class TestAsyncGeminiClientUploadReuse:
+    """Tests for reusing uploads across retries and identical files."""
+
+    @pytest.fixture
+    def mock_genai(self):
+        """Fixture providing mocked genai module."""
+        with patch("folder_extractor.core.ai_async.genai") as mock:
+            mock.upload_file.side_effect = lambda path, mime_type: MagicMock(
+                name=f"upload:{path}"
+            )
+            yield mock
+
+    @pytest.fixture(autouse=True)
+    def no_retry_wait(self):
+        """Retry immediately instead of waiting with exponential backoff."""
+        with patch.object(AsyncGeminiClient._generate.retry, "wait", wait_none()):
+            with patch.object(AsyncGeminiClient._upload.retry, "wait", wait_none()):
+                yield
+
+    @pytest.fixture
+    def test_file(self, tmp_path):
+        """Fixture providing a small image file."""
+        path = tmp_path / "test.jpg"
+        path.write_bytes(b"fake image data")
+        return path
+
+    def _client(self, mock_genai, side_effect):
+        mock_model = MagicMock()
+        mock_model.generate_content_async = AsyncMock(side_effect=side_effect)
+        mock_genai.GenerativeModel.return_value = mock_model
+        scheduler = AIRequestScheduler(requests_per_minute=60_000)
+        return AsyncGeminiClient(api_key="test-key", scheduler=scheduler)
+
+    def test_retry_only_repeats_generation(self, mock_genai, test_file):
+        """A 5xx during generation does not upload the file again."""
+        client = self._client(
+            mock_genai,
+            [InternalServerError("Server error"), MagicMock(text='{"a": 1}')],
+        )
+
+        result = asyncio.run(client.analyze_file(test_file, "image/jpeg", "Prompt"))
+
+        assert result == {"a": 1}
+        assert client.model.generate_content_async.call_count == 2
+        mock_genai.upload_file.assert_called_once()
+
+    def test_failed_upload_is_retried_alone(self, mock_genai, test_file):
+        """A 503 during upload retries the upload before generating once."""
+        handle = MagicMock()
+        mock_genai.upload_file.side_effect = [ServiceUnavailable("Busy"), handle]
+        client = self._client(mock_genai, [MagicMock(text="{}")])
+
+        asyncio.run(client.analyze_file(test_file, "image/jpeg", "Prompt"))
+
+        assert mock_genai.upload_file.call_count == 2
+        contents = client.model.generate_content_async.call_args[0][0]
+        assert contents[0] is handle
+
+    def test_identical_content_reuses_upload(self, mock_genai, test_file, tmp_path):
+        """A byte-identical copy is analyzed with the cached handle."""
+        copy = tmp_path / "copy.jpg"
+        copy.write_bytes(test_file.read_bytes())
+        client = self._client(mock_genai, lambda *a, **k: MagicMock(text="{}"))
+
+        asyncio.run(client.analyze_file(test_file, "image/jpeg", "Prompt"))
+        asyncio.run(client.analyze_file(copy, "image/jpeg", "Prompt"))
+
+        mock_genai.upload_file.assert_called_once()
+        first, second = client.model.generate_content_async.call_args_list
+        assert first[0][0][0] is second[0][0][0]
+
+    def test_batch_reuses_uploads_of_single_analysis(self, mock_genai, test_file):
+        """Files already uploaded for a single analysis are not sent again."""
+        client = self._client(mock_genai, lambda *a, **k: MagicMock(text="[]"))
+        asyncio.run(client.analyze_file(test_file, "image/jpeg", "Prompt"))
+
+        asyncio.run(client.analyze_files([(test_file, "image/jpeg")], "Prompt"))
+
+        mock_genai.upload_file.assert_called_once()
+
+    def test_known_hash_is_not_calculated_again(self, mock_genai, test_file):
+        """A content hash passed by the caller keys the upload cache."""
+        client = self._client(mock_genai, lambda *a, **k: MagicMock(text="{}"))
+
+        with patch.object(client._file_ops, "calculate_file_hash") as mock_hash:
+            asyncio.run(
+                client.analyze_file(test_file, "image/jpeg", "Prompt", "abc123")
+            )
+
+        mock_hash.assert_not_called()
+        assert client._uploads.get(("abc123", "image/jpeg")) is not None
+
+    def test_temp_file_is_kept_until_last_attempt(
+        self, mock_genai, test_file, tmp_path
+    ):
+        """Optimized copies survive retries and are removed afterwards."""
+        temp_dir = tmp_path / "optimized"
+        temp_dir.mkdir()
+        temp_file = temp_dir / "test_optimized.jpg"
+        temp_file.write_bytes(b"smaller")
+        seen_during_attempts = []
+
+        def generate(*args, **kwargs):
+            seen_during_attempts.append(temp_file.exists())
+            if len(seen_during_attempts) == 1:
+                raise InternalServerError("Server error")
+            return MagicMock(text="{}")
+
+        client = self._client(mock_genai, generate)
+        with patch.object(
+            client.preprocessor,
+            "prepare_file_async",
+            AsyncMock(return_value=(temp_file, True)),
+        ):
+            asyncio.run(client.analyze_file(test_file, "image/jpeg", "Prompt"))
+
+        assert seen_during_attempts == [True, True]
+        assert not temp_file.exists()
+
+    def test_rejected_handle_is_forgotten(self, mock_genai, test_file):
+        """After an unexpected generation error the next call uploads again."""
+        client = self._client(
+            mock_genai, [RuntimeError("File not found"), MagicMock(text="{}")]
+        )
+
+        with pytest.raises(AIClientError):
+            asyncio.run(client.analyze_file(test_file, "image/jpeg", "Prompt"))
+        asyncio.run(client.analyze_file(test_file, "image/jpeg", "Prompt"))
+
+        assert mock_genai.upload_file.call_count == 2
+
+
+class TestAsyncGeminiClientTextFirst:
+    """Tests for sending extracted text of digital PDFs instead of the file."""
+
+    @pytest.fixture
+    def mock_genai(self):
+        """Fixture providing mocked genai module."""
+        with patch("folder_extractor.core.ai_async.genai") as mock:
+            yield mock
+
+    def _client(self, mock_genai, response_text, extracted):
+        mock_model = MagicMock()
+        mock_model.generate_content_async = AsyncMock(
+            return_value=MagicMock(text=response_text)
+        )
+        mock_genai.GenerativeModel.return_value = mock_model
+        scheduler = AIRequestScheduler(requests_per_minute=60_000)
+        client = AsyncGeminiClient(api_key="test-key", scheduler=scheduler)
+        client.preprocessor.extract_text_async = AsyncMock(
+            side_effect=lambda path: extracted.get(path.name)
+        )
+        return client
+
+    def test_digital_pdf_is_sent_as_text(self, mock_genai, tmp_path):
+        """No upload happens; the request carries filename and text."""
+        pdf = tmp_path / "rechnung.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+        client = self._client(
+            mock_genai, '{"category": "Finanzen"}', {"rechnung.pdf": "Telekom"}
+        )
+
+        result = asyncio.run(client.analyze_file(pdf, "application/pdf", "Analysiere"))
+
+        assert result == {"category": "Finanzen"}
+        mock_genai.upload_file.assert_not_called()
+        contents = client.model.generate_content_async.call_args[0][0]
+        assert "rechnung.pdf" in contents[0]
+        assert "Telekom" in contents[0]
+        assert contents[1] == "Analysiere"
+
+    def test_file_without_text_is_uploaded(self, mock_genai, tmp_path):
+        """Scans and images fall back to the upload."""
+        scan = tmp_path / "scan.pdf"
+        scan.write_bytes(b"%PDF-1.4")
+        client = self._client(mock_genai, '{"category": "Finanzen"}', {})
+
+        asyncio.run(client.analyze_file(scan, "application/pdf", "Analysiere"))
+
+        mock_genai.upload_file.assert_called_once()
+
+    def test_batch_mixes_text_and_uploads(self, mock_genai, tmp_path):
+        """Only documents without text are uploaded in a batch."""
+        files = []
+        for name in ("a.pdf", "b.jpg"):
+            (tmp_path / name).write_bytes(b"data")
+            files.append((tmp_path / name, "application/octet-stream"))
+        client = self._client(mock_genai, "[]", {"a.pdf": "Vertrag"})
+
+        asyncio.run(client.analyze_files(files, "Analysiere"))
+
+        assert mock_genai.upload_file.call_count == 1
+        contents = client.model.generate_content_async.call_args[0][0]
+        assert contents[0] == "Dokument 0:"
+        assert "Vertrag" in contents[1]
+        assert contents[3] is mock_genai.upload_file.return_value
+
+
+class TestUploadCache:
+    """Tests for the upload handle cache."""
+
+    def test_returns_stored_handle(self):
+        """A stored handle is returned for the same key."""
+        cache = _UploadCache()
+        handle = object()
+        cache.put(("hash", "image/jpeg"), handle)
+
+        assert cache.get(("hash", "image/jpeg")) is handle
+        assert cache.get(("hash", "application/pdf")) is None
+
+    def test_expired_handles_are_dropped(self):
+        """Handles are not reused after their server-side lifetime."""
+        cache = _UploadCache(ttl=10)
+        with patch("folder_extractor.core.ai_async.time.monotonic", return_value=0):
+            cache.put(("hash", "image/jpeg"), object())
+        with patch("folder_extractor.core.ai_async.time.monotonic", return_value=11):
+            assert cache.get(("hash", "image/jpeg")) is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_handle_is_evicted(self):
+        """The cache keeps at most max_entries handles."""
+        cache = _UploadCache(max_entries=2)
+        cache.put(("a", "x"), "A")
+        cache.put(("b", "x"), "B")
+        cache.get(("a", "x"))
+        cache.put(("c", "x"), "C")
+
+        assert cache.get(("b", "x")) is None
+        assert cache.get(("a", "x")) == "A"
+
+    def test_discard_removes_handles(self):
+        """Discarded handles are uploaded again next time."""
+        cache = _UploadCache()
+        cache.put(("a", "x"), "A")
+        cache.put(("b", "x"), "B")
+
+        cache.discard(["A"])
+
+        assert cache.get(("a", "x")) is None
+        assert cache.get(("b", "x")) == "B"
+
+
 class TestAsyncGeminiClientConstants:
     """Tests for AsyncGeminiClient class-level constants."""
 
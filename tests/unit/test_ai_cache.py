@@ -0,0 +1,133 @@
+"""
+Unit tests for the persistent AI result cache.
+
+Tests cover:
+- Storing and retrieving results by content hash and fingerprint
+- Fingerprint changes (categories, model) causing misses
+- TTL expiry and LRU eviction
+- Fail-safe behavior with an unusable database
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+
+from folder_extractor.core.ai_cache import AIResultCache, analysis_fingerprint
+
+
+class TestAnalysisFingerprint:
+    """Tests for analysis_fingerprint function."""
+
+    def test_same_inputs_give_same_fingerprint(self):
+        """Fingerprint is deterministic."""
+        assert analysis_fingerprint("prompt", "model") == analysis_fingerprint(
+            "prompt", "model"
+        )
+
+    def test_prompt_and_model_change_fingerprint(self):
+        """Changed categories (prompt) or model produce a new fingerprint."""
+        base = analysis_fingerprint("Kategorien: A, B", "gemini")
+
+        assert analysis_fingerprint("Kategorien: A, B, C", "gemini") != base
+        assert analysis_fingerprint("Kategorien: A, B", "gemini-pro") != base
+
+
+class TestAIResultCache:
+    """Tests for AIResultCache class."""
+
+    def test_put_and_get_roundtrip(self, tmp_path: Path):
+        """A stored result is returned for the same key."""
+        cache = AIResultCache(db_path=tmp_path / "cache.db")
+        result = {"category": "Finanzen", "entities": [{"name": "Telekom"}]}
+
+        cache.put("hash1", "fp", result)
+
+        assert cache.get("hash1", "fp") == result
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 0}
+
+    def test_different_fingerprint_misses(self, tmp_path: Path):
+        """Results are not reused after the prompt or model changed."""
+        cache = AIResultCache(db_path=tmp_path / "cache.db")
+        cache.put("hash1", "old-fp", {"category": "Finanzen"})
+
+        assert cache.get("hash1", "new-fp") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_results_persist_across_instances(self, tmp_path: Path):
+        """The cache survives a restart."""
+        db_path = tmp_path / "cache.db"
+        cache = AIResultCache(db_path=db_path)
+        cache.put("hash1", "fp", {"category": "Finanzen"})
+        cache.close()
+
+        assert AIResultCache(db_path=db_path).get("hash1", "fp") == {
+            "category": "Finanzen"
+        }
+
+    def test_expired_entries_are_not_returned(self, tmp_path: Path):
+        """Entries older than the TTL are treated as misses and removed."""
+        cache = AIResultCache(db_path=tmp_path / "cache.db", ttl=0.05)
+        cache.put("hash1", "fp", {"category": "Finanzen"})
+
+        time.sleep(0.1)
+
+        assert cache.get("hash1", "fp") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path: Path):
+        """Beyond max_entries the least recently used results are dropped."""
+        cache = AIResultCache(db_path=tmp_path / "cache.db", max_entries=2)
+        cache.put("a", "fp", {"n": 1})
+        time.sleep(0.01)
+        cache.put("b", "fp", {"n": 2})
+        time.sleep(0.01)
+        cache.get("a", "fp")  # "a" is now more recent than "b"
+        time.sleep(0.01)
+        cache.put("c", "fp", {"n": 3})
+
+        assert cache.get("b", "fp") is None
+        assert cache.get("a", "fp") == {"n": 1}
+        assert cache.get("c", "fp") == {"n": 3}
+
+    def test_clear_removes_all_entries(self, tmp_path: Path):
+        """clear() empties the cache."""
+        cache = AIResultCache(db_path=tmp_path / "cache.db")
+        cache.put("hash1", "fp", {"category": "Finanzen"})
+
+        cache.clear()
+
+        assert cache.stats()["entries"] == 0
+
+    def test_unusable_database_disables_cache(self, tmp_path: Path):
+        """A corrupt database file does not raise, the cache just misses."""
+        db_path = tmp_path / "cache.db"
+        db_path.write_bytes(b"this is not a sqlite database" * 100)
+
+        cache = AIResultCache(db_path=db_path)
+        cache.put("hash1", "fp", {"category": "Finanzen"})
+
+        assert not cache.enabled
+        assert cache.get("hash1", "fp") is None
+
+    def test_closed_cache_is_safe_to_use(self, tmp_path: Path):
+        """Operations after close() are no-ops."""
+        cache = AIResultCache(db_path=tmp_path / "cache.db")
+        cache.close()
+
+        cache.put("hash1", "fp", {"category": "Finanzen"})
+        assert cache.get("hash1", "fp") is None
+
+    def test_default_location_is_config_dir(self, tmp_path: Path, monkeypatch):
+        """Without db_path the cache lives in the config root directory."""
+        monkeypatch.setattr(
+            "folder_extractor.core.ai_cache.get_config_dir", lambda: tmp_path
+        )
+
+        cache = AIResultCache()
+
+        assert cache.db_path == tmp_path / "ai_cache.db"
+        assert sqlite3.connect(str(cache.db_path)).execute(
+            "SELECT COUNT(*) FROM ai_results"
+        ).fetchone() == (0,)
@@ -537,7 +537,7 @@ def mock_preprocessor_with_optimization(temp_dir):
     temp_path.write_bytes(b"optimized content")
 
     mock = Mock(spec=FilePreprocessor)
-    mock.prepare_file = Mock(return_value=(temp_path, True))
+    mock.prepare_file_async = AsyncMock(return_value=(temp_path, True))
     return mock, temp_path
 
 
@@ -563,8 +563,8 @@ class TestPreprocessorIntegration:
             "folder_extractor.core.ai_async.FilePreprocessor"
         ) as mock_preprocessor_class:
             # Setup mock preprocessor
-            mock_preprocessor = Mock()
-            mock_preprocessor.prepare_file.return_value = (test_image_file, False)
+            mock_preprocessor = Mock(spec=FilePreprocessor)
+            mock_preprocessor.prepare_file_async.return_value = (test_image_file, False)
             mock_preprocessor_class.return_value = mock_preprocessor
 
             # Setup mock model
@@ -581,7 +581,10 @@ class TestPreprocessorIntegration:
                 prompt="Analyze this",
             )
 
-            mock_preprocessor.prepare_file.assert_called_once_with(test_image_file)
+            mock_preprocessor.prepare_file_async.assert_called_once()
+            assert (
+                mock_preprocessor.prepare_file_async.call_args[0][0] == test_image_file
+            )
 
     @pytest.mark.asyncio
     async def test_analyze_file_uses_optimized_path_for_upload(
@@ -600,8 +603,8 @@ class TestPreprocessorIntegration:
             "folder_extractor.core.ai_async.FilePreprocessor"
         ) as mock_preprocessor_class:
             # Preprocessor returns different path
-            mock_preprocessor = Mock()
-            mock_preprocessor.prepare_file.return_value = (optimized_path, True)
+            mock_preprocessor = Mock(spec=FilePreprocessor)
+            mock_preprocessor.prepare_file_async.return_value = (optimized_path, True)
             mock_preprocessor_class.return_value = mock_preprocessor
 
             mock_model = Mock()
@@ -641,8 +644,8 @@ class TestPreprocessorIntegration:
         ), patch(
             "folder_extractor.core.ai_async.FilePreprocessor"
         ) as mock_preprocessor_class:
-            mock_preprocessor = Mock()
-            mock_preprocessor.prepare_file.return_value = (temp_file, True)
+            mock_preprocessor = Mock(spec=FilePreprocessor)
+            mock_preprocessor.prepare_file_async.return_value = (temp_file, True)
             mock_preprocessor_class.return_value = mock_preprocessor
 
             mock_model = Mock()
@@ -681,8 +684,8 @@ class TestPreprocessorIntegration:
         ), patch(
             "folder_extractor.core.ai_async.FilePreprocessor"
         ) as mock_preprocessor_class:
-            mock_preprocessor = Mock()
-            mock_preprocessor.prepare_file.return_value = (temp_file, True)
+            mock_preprocessor = Mock(spec=FilePreprocessor)
+            mock_preprocessor.prepare_file_async.return_value = (temp_file, True)
             mock_preprocessor_class.return_value = mock_preprocessor
 
             mock_model = Mock()
@@ -717,9 +720,9 @@ class TestPreprocessorIntegration:
         ), patch(
             "folder_extractor.core.ai_async.FilePreprocessor"
         ) as mock_preprocessor_class:
-            mock_preprocessor = Mock()
+            mock_preprocessor = Mock(spec=FilePreprocessor)
             # Returns original path, needs_cleanup=False
-            mock_preprocessor.prepare_file.return_value = (test_image_file, False)
+            mock_preprocessor.prepare_file_async.return_value = (test_image_file, False)
             mock_preprocessor_class.return_value = mock_preprocessor
 
             mock_model = Mock()
@@ -746,8 +749,8 @@ class TestPreprocessorIntegration:
         ), patch(
             "folder_extractor.core.ai_async.FilePreprocessor"
         ) as mock_preprocessor_class:
-            mock_preprocessor = Mock()
-            mock_preprocessor.prepare_file.side_effect = PreprocessorError(
+            mock_preprocessor = Mock(spec=FilePreprocessor)
+            mock_preprocessor.prepare_file_async.side_effect = PreprocessorError(
                 "Image optimization failed: corrupt file"
             )
             mock_preprocessor_class.return_value = mock_preprocessor
@@ -785,8 +788,8 @@ class TestPreprocessorIntegration:
             "folder_extractor.core.ai_async.FilePreprocessor"
         ) as mock_preprocessor_class:
             # Preprocessor simulates optimization
-            mock_preprocessor = Mock()
-            mock_preprocessor.prepare_file.return_value = (optimized_path, True)
+            mock_preprocessor = Mock(spec=FilePreprocessor)
+            mock_preprocessor.prepare_file_async.return_value = (optimized_path, True)
             mock_preprocessor_class.return_value = mock_preprocessor
 
             mock_model = Mock()
@@ -12,7 +12,11 @@ This module follows TDD principles - tests were written before implementation.
 
 from __future__ import annotations
 
-from folder_extractor.core.ai_prompts import get_system_prompt
+from folder_extractor.core.ai_prompts import (
+    format_extracted_text,
+    get_batch_prompt,
+    get_system_prompt,
+)
 
 
 class TestGetSystemPrompt:
@@ -243,3 +247,40 @@ class TestEntityExtractionPrompt:
         assert "Telekom" in prompt or "GmbH" in prompt, (
             "Prompt should show realistic organization example"
         )
+
+
+class TestGetBatchPrompt:
+    """Tests for the batch analysis prompt."""
+
+    def test_extends_single_document_prompt(self):
+        """The batch prompt keeps the single-document rules."""
+        system_prompt = get_system_prompt(["Finanzen", "Privat"])
+
+        prompt = get_batch_prompt(system_prompt, 3)
+
+        assert prompt.startswith(system_prompt)
+
+    def test_mentions_document_count_and_index_range(self):
+        """The prompt states how many documents are included."""
+        prompt = get_batch_prompt(get_system_prompt(["Finanzen"]), 3)
+
+        assert "3 Dokumente" in prompt
+        assert "index 0 bis 2" in prompt
+
+    def test_requests_json_array_keyed_by_index(self):
+        """Results are mapped back through an "index" field."""
+        prompt = get_batch_prompt(get_system_prompt(["Finanzen"]), 2)
+
+        assert "JSON-Array" in prompt
+        assert '"index"' in prompt
+
+
+class TestFormatExtractedText:
+    """Tests for format_extracted_text function."""
+
+    def test_contains_filename_and_text(self):
+        """The block names the file and carries the extracted text."""
+        block = format_extracted_text("rechnung_2024.pdf", "Telekom Deutschland")
+
+        assert "rechnung_2024.pdf" in block
+        assert "Telekom Deutschland" in block
@@ -0,0 +1,262 @@
+"""
+Unit tests for the AI request scheduler.
+
+Tests cover:
+- Token bucket pacing of requests and tokens
+- Priority lanes
+- Upload concurrency limit
+- Adaptation to rate limit (429) responses
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from folder_extractor.core import ai_scheduler
+from folder_extractor.core.ai_scheduler import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    AIRequestScheduler,
+    estimate_tokens,
+)
+
+
+def _fast_scheduler(**kwargs) -> AIRequestScheduler:
+    """Scheduler with 10 requests/s and a bucket holding one request."""
+    options = {
+        "requests_per_minute": 600,
+        "tokens_per_minute": 10_000_000,
+        "burst_seconds": 0.1,
+        "poll_interval": 0.01,
+    }
+    options.update(kwargs)
+    return AIRequestScheduler(**options)
+
+
+class TestAIRequestSchedulerPacing:
+    """Tests for token bucket pacing."""
+
+    def test_first_request_is_granted_immediately(self):
+        """A full bucket grants a request without waiting."""
+        scheduler = _fast_scheduler()
+
+        async def run():
+            start = time.monotonic()
+            async with scheduler.request():
+                pass
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) < 0.05
+        assert scheduler.stats()["granted"] == 1
+
+    def test_requests_are_paced_by_rate(self):
+        """Requests beyond the bucket capacity wait for the refill."""
+        scheduler = _fast_scheduler()
+
+        async def run():
+            start = time.monotonic()
+            for _ in range(4):
+                async with scheduler.request():
+                    pass
+            return time.monotonic() - start
+
+        # 1 request from the bucket, then 3 more at 10 requests/second
+        elapsed = asyncio.run(run())
+        assert 0.25 <= elapsed < 1.0
+
+    def test_token_budget_limits_requests(self):
+        """Large requests wait for the token bucket."""
+        scheduler = _fast_scheduler(
+            requests_per_minute=60_000, tokens_per_minute=60_000, burst_seconds=1
+        )
+
+        async def run():
+            start = time.monotonic()
+            async with scheduler.request(tokens=1000):
+                pass
+            async with scheduler.request(tokens=300):
+                pass
+            return time.monotonic() - start
+
+        # 1000 tokens per second: the second request waits ~0.3s
+        assert 0.2 <= asyncio.run(run()) < 1.0
+
+    def test_record_usage_corrects_token_bucket(self):
+        """Underestimated requests are charged with the real token count."""
+        scheduler = _fast_scheduler(tokens_per_minute=60_000, burst_seconds=1)
+
+        scheduler.record_usage(estimated=100, actual=600)
+
+        assert scheduler._tokens.tokens == pytest.approx(500, abs=1)
+
+
+class TestAIRequestSchedulerPriorities:
+    """Tests for priority lanes."""
+
+    def test_interactive_requests_jump_ahead_of_bulk(self):
+        """Queued bulk requests are served after a later interactive one."""
+        scheduler = _fast_scheduler()
+        order = []
+
+        async def call(name, priority, delay):
+            await asyncio.sleep(delay)
+            async with scheduler.request(priority):
+                order.append(name)
+
+        async def run():
+            await asyncio.gather(
+                call("bulk1", PRIORITY_BULK, 0),
+                call("bulk2", PRIORITY_BULK, 0.01),
+                call("bulk3", PRIORITY_BULK, 0.01),
+                call("chat", PRIORITY_INTERACTIVE, 0.03),
+            )
+
+        asyncio.run(run())
+
+        assert order[0] == "bulk1"
+        assert order[1] == "chat"
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """A request cancelled while waiting does not block later ones."""
+        scheduler = _fast_scheduler(requests_per_minute=6)
+
+        async def run():
+            await scheduler.acquire()
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(scheduler.acquire(), timeout=0.05)
+
+        asyncio.run(run())
+
+        assert scheduler.stats()["waiting"] == 0
+
+
+class TestAIRequestSchedulerUploads:
+    """Tests for the upload concurrency limit."""
+
+    def test_upload_concurrency_is_limited(self):
+        """No more than max_concurrent_uploads uploads run at once."""
+        scheduler = _fast_scheduler(max_concurrent_uploads=2)
+        active = [0]
+        peak = [0]
+
+        async def upload():
+            async with scheduler.upload():
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.03)
+                active[0] -= 1
+
+        async def run():
+            await asyncio.gather(*(upload() for _ in range(6)))
+
+        asyncio.run(run())
+
+        assert peak[0] == 2
+        assert scheduler.stats()["uploads_in_flight"] == 0
+
+    def test_scheduler_is_shared_across_event_loops(self):
+        """Threads with their own event loops share the upload limit."""
+        scheduler = _fast_scheduler(max_concurrent_uploads=1)
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        async def upload():
+            async with scheduler.upload():
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+
+        threads = [
+            threading.Thread(target=lambda: asyncio.run(upload())) for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert peak[0] == 1
+
+
+class TestAIRequestSchedulerAdaptation:
+    """Tests for adapting to 429 responses."""
+
+    def test_rate_limit_pauses_requests(self, monkeypatch):
+        """After a 429 no request is granted during the cooldown."""
+        monkeypatch.setattr(ai_scheduler, "AI_RATE_LIMIT_COOLDOWN", 0.2)
+        scheduler = _fast_scheduler(requests_per_minute=60_000)
+
+        scheduler.record_rate_limited()
+
+        async def run():
+            start = time.monotonic()
+            async with scheduler.request():
+                pass
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) >= 0.15
+
+    def test_rate_limit_halves_and_success_restores_rate(self):
+        """The used quota share drops on 429s and recovers on success."""
+        scheduler = _fast_scheduler()
+
+        scheduler.record_rate_limited()
+        scheduler.record_rate_limited()
+        assert scheduler.rate_factor == pytest.approx(0.25)
+
+        for _ in range(100):
+            scheduler.record_success()
+        assert scheduler.rate_factor == 1.0
+        assert scheduler.stats()["rate_limited"] == 2
+
+    def test_rate_factor_has_lower_bound(self):
+        """Repeated 429s never stop the scheduler completely."""
+        scheduler = _fast_scheduler()
+
+        for _ in range(20):
+            scheduler.record_rate_limited()
+
+        assert scheduler.rate_factor == pytest.approx(ai_scheduler.AI_MIN_RATE_FACTOR)
+
+
+class TestAIRequestSchedulerConfiguration:
+    """Tests for scheduler construction."""
+
+    def test_from_env_reads_quota(self, monkeypatch):
+        """Quota overrides are read from the environment."""
+        monkeypatch.setenv("AI_REQUESTS_PER_MINUTE", "1000")
+        monkeypatch.setenv("AI_TOKENS_PER_MINUTE", "4000000")
+        monkeypatch.setenv("AI_MAX_CONCURRENT_UPLOADS", "8")
+
+        scheduler = AIRequestScheduler.from_env()
+
+        assert scheduler.requests_per_minute == 1000
+        assert scheduler.tokens_per_minute == 4_000_000
+        assert scheduler.max_concurrent_uploads == 8
+
+    def test_from_env_ignores_invalid_values(self, monkeypatch):
+        """Invalid overrides fall back to the defaults."""
+        monkeypatch.setenv("AI_REQUESTS_PER_MINUTE", "viele")
+
+        scheduler = AIRequestScheduler.from_env()
+
+        assert scheduler.requests_per_minute == ai_scheduler.AI_REQUESTS_PER_MINUTE
+
+    def test_rejects_invalid_limits(self):
+        """Non-positive limits are rejected."""
+        with pytest.raises(ValueError):
+            AIRequestScheduler(requests_per_minute=0)
+        with pytest.raises(ValueError):
+            AIRequestScheduler(max_concurrent_uploads=0)
+
+    def test_estimate_tokens(self):
+        """Token estimate is about one token per four characters."""
+        assert estimate_tokens("a" * 400) == 100
+        assert estimate_tokens("") == 1
@@ -9,19 +9,36 @@ These tests verify:
 
 from __future__ import annotations
 
+import bz2
+import errno
+import gzip
 import io
+import lzma
+import shutil
+import subprocess
 import tarfile
 import zipfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 # These imports will fail until we implement the module - that's expected in TDD
+from folder_extractor.core import archives as archives_module
 from folder_extractor.core.archives import (
+    ArchiveLimitError,
+    CompressedFileHandler,
+    ExtractionBudget,
     IArchiveHandler,
+    RarHandler,
+    SevenZipHandler,
     TarHandler,
     ZipHandler,
+    ZstdTarHandler,
+    detect_archive_format,
     get_archive_handler,
+    get_registered_handlers,
+    register_archive_handler,
 )
 from folder_extractor.core.extractor import SecurityError
 from folder_extractor.core.file_operations import FileOperationError
@@ -523,3 +540,440 @@ class TestArchiveHandlerFactory:
         assert hasattr(zip_handler, "is_supported")
         assert hasattr(tar_handler, "extract")
         assert hasattr(tar_handler, "is_supported")
+
+
+# =============================================================================
+# TestFormatDetection - Magic Byte Sniffing
+# =============================================================================
+
+
+class TestFormatDetection:
+    """Tests for content-based archive format detection."""
+
+    def test_detects_zip_by_content(self, create_zip_archive):
+        """ZIP archives are detected by their PK signature."""
+        zip_path = create_zip_archive({"file.txt": "content"})
+
+        assert detect_archive_format(zip_path) == "zip"
+
+    @pytest.mark.parametrize("compression", ["", "gz", "xz"])
+    def test_detects_tar_by_content(self, create_tar_archive, compression):
+        """Plain and compressed tarballs are detected as TAR."""
+        tar_path = create_tar_archive({"file.txt": "content"}, compression=compression)
+
+        assert detect_archive_format(tar_path) == "tar"
+
+    def test_detects_tarball_with_misleading_gz_name(self, tmp_path):
+        """A tarball named .gz is detected as TAR from its decompressed header."""
+        archive = tmp_path / "download.gz"
+        with tarfile.open(archive, "w:gz") as tf:
+            data = b"content"
+            info = tarfile.TarInfo(name="file.txt")
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+        assert detect_archive_format(archive) == "tar"
+        assert isinstance(get_archive_handler(archive), TarHandler)
+
+    def test_detects_single_gzip_file(self, tmp_path):
+        """A gzip file that is not a tarball is detected as gzip."""
+        archive = tmp_path / "notes.txt.gz"
+        archive.write_bytes(gzip.compress(b"just some text"))
+
+        assert detect_archive_format(archive) == "gzip"
+        assert isinstance(get_archive_handler(archive), CompressedFileHandler)
+
+    def test_returns_none_for_regular_and_missing_files(self, tmp_path):
+        """Non-archives and missing files have no archive format."""
+        text_file = tmp_path / "readme.txt"
+        text_file.write_text("hello")
+
+        assert detect_archive_format(text_file) is None
+        assert detect_archive_format(tmp_path / "missing.zip") is None
+
+    def test_content_overrides_wrong_extension(self, create_tar_archive, tmp_path):
+        """A TAR archive named .zip gets the TAR handler."""
+        tar_path = create_tar_archive({"file.txt": "content"})
+        mislabelled = tmp_path / "mislabelled.zip"
+        tar_path.rename(mislabelled)
+
+        assert isinstance(get_archive_handler(mislabelled), TarHandler)
+
+    def test_header_is_read_only_once(self, create_zip_archive):
+        """Repeated detection of an unchanged file is served from the cache."""
+        zip_path = create_zip_archive({"file.txt": "content"}, name="cached.zip")
+
+        with patch("builtins.open", wraps=open) as mock_open:
+            get_archive_handler(zip_path)
+            get_archive_handler(zip_path)
+            detect_archive_format(zip_path)
+
+        opened = [c for c in mock_open.call_args_list if c.args[0] == str(zip_path)]
+        assert len(opened) <= 1
+
+    def test_changed_file_is_sniffed_again(self, tmp_path):
+        """Rewriting a file invalidates the cached detection result."""
+        path = tmp_path / "changing.gz"
+        path.write_bytes(gzip.compress(b"plain"))
+        assert detect_archive_format(path) == "gzip"
+
+        path.write_bytes(b"no longer compressed at all")
+
+        assert detect_archive_format(path) is None
+
+
+# =============================================================================
+# TestCompressedFileHandler - Single Compressed Files
+# =============================================================================
+
+
+class TestCompressedFileHandler:
+    """Tests for single-file .gz/.bz2/.xz decompression."""
+
+    @pytest.mark.parametrize(
+        "filename,compress",
+        [
+            ("notes.txt.gz", gzip.compress),
+            ("notes.txt.bz2", bz2.compress),
+            ("notes.txt.xz", lzma.compress),
+        ],
+    )
+    def test_extract_decompresses_to_stem(
+        self, tmp_path, extraction_dir, filename, compress
+    ):
+        """The decompressed file is named after the archive without suffix."""
+        archive = tmp_path / filename
+        archive.write_bytes(compress(b"hello world"))
+
+        CompressedFileHandler().extract(archive, extraction_dir)
+
+        assert (extraction_dir / "notes.txt").read_bytes() == b"hello world"
+
+    @pytest.mark.parametrize(
+        "filename", ["backup.tar.gz", "backup.tar.bz2", "document.pdf", "a.gz.txt"]
+    )
+    def test_is_supported_rejects_tarballs_and_other_files(self, filename):
+        """Compressed tarballs and regular files are not single compressed files."""
+        assert CompressedFileHandler().is_supported(Path(filename)) is False
+
+    def test_extract_raises_file_operation_error_for_corrupted_file(
+        self, tmp_path, extraction_dir
+    ):
+        """Corrupted compressed files raise FileOperationError."""
+        archive = tmp_path / "broken.gz"
+        archive.write_bytes(b"\x1f\x8b" + b"garbage" * 10)
+
+        with pytest.raises(FileOperationError, match="Invalid or corrupted"):
+            CompressedFileHandler().extract(archive, extraction_dir)
+
+
+# =============================================================================
+# TestToolBasedHandlers - zstd TAR, 7z, RAR
+# =============================================================================
+
+
+class TestToolBasedHandlers:
+    """Tests for handlers relying on optional packages or local tools."""
+
+    @pytest.mark.skipif(
+        shutil.which("zstd") is None, reason="zstd command line tool not installed"
+    )
+    def test_zstd_tar_extracts_via_stream(self, create_tar_archive, tmp_path):
+        """.tar.zst archives are extracted without an intermediate .tar file."""
+        tar_path = create_tar_archive({"dir/file.txt": "zstd content"})
+        zst_path = tmp_path / "backup.tar.zst"
+        subprocess.run(["zstd", "-q", str(tar_path), "-o", str(zst_path)], check=True)
+        target = tmp_path / "out"
+
+        handler = get_archive_handler(zst_path)
+        assert isinstance(handler, ZstdTarHandler)
+        handler.extract(zst_path, target)
+
+        assert (target / "dir" / "file.txt").read_text() == "zstd content"
+
+    @pytest.mark.skipif(shutil.which("bsdtar") is None, reason="bsdtar not installed")
+    def test_seven_zip_extracts_with_bsdtar(self, tmp_path):
+        """7z archives are extracted with an installed tool."""
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "file.txt").write_text("seven")
+        archive = tmp_path / "archive.7z"
+        subprocess.run(
+            ["bsdtar", "--format", "7zip", "-cf", str(archive), "-C", str(source), "."],
+            check=True,
+        )
+        target = tmp_path / "out"
+
+        with patch(
+            "folder_extractor.core.archives._find_tool",
+            return_value=shutil.which("bsdtar"),
+        ):
+            handler = get_archive_handler(archive)
+            assert isinstance(handler, SevenZipHandler)
+            handler.extract(archive, target)
+
+        assert (target / "file.txt").read_text() == "seven"
+
+    def test_tool_handler_blocks_path_traversal_before_extracting(
+        self, tmp_path, extraction_dir
+    ):
+        """Entry names from the tool listing are validated before extraction."""
+        archive = tmp_path / "evil.rar"
+        archive.write_bytes(b"Rar!\x1a\x07\x00")
+        listing = subprocess.CompletedProcess([], 0, stdout="../../evil.txt\n")
+
+        with patch(
+            "folder_extractor.core.archives._find_tool", return_value="/usr/bin/unrar"
+        ), patch(
+            "folder_extractor.core.archives.subprocess.run", return_value=listing
+        ) as mock_run:
+            with pytest.raises(SecurityError):
+                RarHandler().extract(archive, extraction_dir)
+
+        # Only the listing command ran
+        assert mock_run.call_count == 1
+
+    def test_tool_handlers_unavailable_without_tool(self):
+        """Without a tool, 7z/RAR files are not supported."""
+        with patch("folder_extractor.core.archives._find_tool", return_value=None):
+            assert get_archive_handler(Path("archive.7z")) is None
+            assert get_archive_handler(Path("archive.rar")) is None
+
+
+# =============================================================================
+# TestHandlerRegistry - Custom Handlers
+# =============================================================================
+
+
+class TestHandlerRegistry:
+    """Tests for registering additional archive handlers."""
+
+    def test_registered_handler_takes_precedence(self, monkeypatch):
+        """Custom handlers are consulted before the built-in ones."""
+
+        class CustomZipHandler(ZipHandler):
+            pass
+
+        monkeypatch.setattr(
+            "folder_extractor.core.archives._ARCHIVE_HANDLERS",
+            get_registered_handlers(),
+        )
+        custom = CustomZipHandler()
+        register_archive_handler(custom)
+
+        assert get_archive_handler(Path("archive.zip")) is custom
+        assert get_registered_handlers()[0] is custom
+
+
+# =============================================================================
+# TestNestedArchives - Recursion, Depth and Limits
+# =============================================================================
+
+
+def _zip_bytes(files: dict[str, bytes]) -> bytes:
+    """Build an in-memory ZIP archive."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+def _tar_gz_bytes(files: dict[str, bytes]) -> bytes:
+    """Build an in-memory gzip-compressed TAR archive."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tf:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name=name)
+            info.size = len(content)
+            tf.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class TestNestedArchives:
+    """Tests for recursive extraction of archives inside archives."""
+
+    def test_zip_in_zip_is_expanded_in_place(self, tmp_path, extraction_dir):
+        """An inner ZIP is expanded into a folder named after it."""
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"inner.zip": _zip_bytes({"doc.txt": b"deep"})}))
+
+        ZipHandler().extract(outer, extraction_dir)
+
+        assert (extraction_dir / "inner" / "doc.txt").read_bytes() == b"deep"
+        assert not (extraction_dir / "inner.zip").exists()
+
+    def test_inner_archive_is_read_without_temp_file(self, tmp_path, extraction_dir):
+        """Inner archives are streamed, not written to disk first."""
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"inner.zip": _zip_bytes({"doc.txt": b"x"})}))
+        written = []
+        real_copy = archives_module._copy_to_file
+
+        def tracking_copy(source, target_path, budget):
+            written.append(target_path.name)
+            real_copy(source, target_path, budget)
+
+        with patch.object(archives_module, "_copy_to_file", tracking_copy):
+            ZipHandler().extract(outer, extraction_dir)
+
+        assert written == ["doc.txt"]
+
+    def test_tar_gz_in_zip_is_streamed(self, tmp_path, extraction_dir):
+        """Compressed tarballs inside a ZIP are expanded."""
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(
+            _zip_bytes({"data.tar.gz": _tar_gz_bytes({"a/b.txt": b"tarred"})})
+        )
+
+        ZipHandler().extract(outer, extraction_dir)
+
+        assert (extraction_dir / "data" / "a" / "b.txt").read_bytes() == b"tarred"
+
+    def test_zip_in_tar_is_expanded(self, tmp_path, extraction_dir):
+        """ZIP archives inside a TAR are expanded."""
+        outer = tmp_path / "outer.tar.gz"
+        outer.write_bytes(_tar_gz_bytes({"inner.zip": _zip_bytes({"z.txt": b"z"})}))
+
+        TarHandler().extract(outer, extraction_dir)
+
+        assert (extraction_dir / "inner" / "z.txt").read_bytes() == b"z"
+
+    def test_depth_limit_keeps_deeper_archives_as_files(self, tmp_path, extraction_dir):
+        """Archives beyond max_depth are extracted as regular files."""
+        level2 = _zip_bytes({"deepest.txt": b"bottom"})
+        level1 = _zip_bytes({"level2.zip": level2})
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"level1.zip": level1}))
+
+        ZipHandler().extract(outer, extraction_dir, ExtractionBudget(max_depth=1))
+
+        assert (extraction_dir / "level1" / "level2.zip").read_bytes() == level2
+
+    def test_depth_zero_disables_nesting(self, tmp_path, extraction_dir):
+        """With max_depth=0, inner archives stay untouched."""
+        inner = _zip_bytes({"doc.txt": b"x"})
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"inner.zip": inner}))
+
+        ZipHandler().extract(outer, extraction_dir, ExtractionBudget(max_depth=0))
+
+        assert (extraction_dir / "inner.zip").read_bytes() == inner
+
+    def test_entry_limit_applies_across_nesting(self, tmp_path, extraction_dir):
+        """Entries of inner archives count against the same limit."""
+        inner = _zip_bytes({f"f{i}.txt": b"x" for i in range(5)})
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"inner.zip": inner, "top.txt": b"t"}))
+
+        with pytest.raises(ArchiveLimitError, match="entries"):
+            ZipHandler().extract(outer, extraction_dir, ExtractionBudget(max_entries=4))
+
+    def test_size_limit_applies_across_nesting(self, tmp_path, extraction_dir):
+        """Bytes written from inner archives count against the size limit."""
+        inner = _zip_bytes({"big.bin": b"\0" * 10_000})
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"inner.zip": inner}))
+
+        with pytest.raises(ArchiveLimitError, match="bytes"):
+            ZipHandler().extract(
+                outer, extraction_dir, ExtractionBudget(max_total_size=5_000)
+            )
+
+    def test_limit_error_is_a_security_error(self):
+        """Limit violations are reported like other security violations."""
+        assert issubclass(ArchiveLimitError, SecurityError)
+
+    def test_corrupted_inner_archive_is_kept_as_file(self, tmp_path, extraction_dir):
+        """An inner archive that cannot be read is extracted as a regular file."""
+        broken = b"PK\x03\x04" + b"not really a zip" * 4
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"broken.zip": broken, "ok.txt": b"ok"}))
+
+        ZipHandler().extract(outer, extraction_dir)
+
+        assert (extraction_dir / "broken.zip").read_bytes() == broken
+        assert (extraction_dir / "ok.txt").read_bytes() == b"ok"
+        assert not (extraction_dir / "broken").exists()
+
+    def test_corrupted_inner_bz2_is_kept_as_file(self, tmp_path, extraction_dir):
+        """Corrupt bz2 data (an OSError without errno) is not a write failure."""
+        data = bz2.compress(b"x" * 1000)
+        broken = data[:20] + b"\0" * 40 + data[60:]
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"notes.txt.bz2": broken}))
+
+        ZipHandler().extract(outer, extraction_dir)
+
+        assert (extraction_dir / "notes.txt.bz2").read_bytes() == broken
+
+    @pytest.mark.parametrize("memory_limit", [64 * 1024 * 1024, 0])
+    def test_inner_archives_of_tar_streams(
+        self, extraction_dir, memory_limit, monkeypatch
+    ):
+        """Members of non-seekable TAR streams are expanded or kept as files."""
+
+        class _Pipe(io.RawIOBase):
+            """Non-seekable stream, like the output of a decompressor process."""
+
+            def __init__(self, data: bytes) -> None:
+                self._data = io.BytesIO(data)
+
+            def readable(self) -> bool:
+                return True
+
+            def readinto(self, buffer) -> int:
+                chunk = self._data.read(len(buffer))
+                buffer[: len(chunk)] = chunk
+                return len(chunk)
+
+        monkeypatch.setattr(archives_module, "_NESTED_MEMORY_LIMIT", memory_limit)
+        broken = b"PK\x03\x04" + b"not really a zip" * 4
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tf:
+            for name, content in {
+                "broken.zip": broken,
+                "inner.zip": _zip_bytes({"doc.txt": b"deep"}),
+                "ok.txt": b"ok",
+            }.items():
+                info = tarfile.TarInfo(name=name)
+                info.size = len(content)
+                tf.addfile(info, io.BytesIO(content))
+
+        stream = io.BufferedReader(_Pipe(buffer.getvalue()))
+        with tarfile.open(fileobj=stream, mode="r|") as tf:
+            archives_module._extract_tar_members(tf, extraction_dir, ExtractionBudget())
+
+        assert (extraction_dir / "broken.zip").read_bytes() == broken
+        assert not (extraction_dir / "broken").exists()
+        assert (extraction_dir / "inner" / "doc.txt").read_bytes() == b"deep"
+        assert not (extraction_dir / "inner.zip").exists()
+        assert (extraction_dir / "ok.txt").read_bytes() == b"ok"
+
+    def test_write_error_in_inner_archive_is_reported(self, tmp_path, extraction_dir):
+        """A full disk while writing inner members fails the extraction."""
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"inner.zip": _zip_bytes({"doc.txt": b"x"})}))
+        copy = archives_module._copy_to_file
+
+        def disk_full(source, target_path, budget):
+            if target_path.name == "doc.txt":
+                raise OSError(errno.ENOSPC, "No space left on device")
+            copy(source, target_path, budget)
+
+        with patch.object(archives_module, "_copy_to_file", side_effect=disk_full):
+            with pytest.raises(FileOperationError, match="No space left"):
+                ZipHandler().extract(outer, extraction_dir)
+
+        assert not (extraction_dir / "inner.zip").exists()
+
+    def test_inner_archive_path_traversal_is_blocked(self, tmp_path, extraction_dir):
+        """Zip Slip protection applies to entries of inner archives."""
+        inner = _zip_bytes({"../../escape.txt": b"evil"})
+        outer = tmp_path / "outer.zip"
+        outer.write_bytes(_zip_bytes({"inner.zip": inner}))
+
+        with pytest.raises(SecurityError):
+            ZipHandler().extract(outer, extraction_dir)
+
+        assert not (tmp_path / "escape.txt").exists()
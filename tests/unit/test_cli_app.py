@@ -1030,6 +1030,39 @@ class TestQueryMode:
         # Should mention "3" somewhere (the count)
         assert any("3" in c for c in calls)
 
+    def test_execute_query_uses_search_index_first(self):
+        """Index hits are shown without asking the AI."""
+        self.cli.interface.show_message = Mock()
+
+        mock_kg = Mock()
+        mock_kg.search_documents = Mock(return_value=["/docs/telekom.pdf"])
+        mock_kg.query_documents = Mock()
+
+        with patch("folder_extractor.cli.app.KnowledgeGraph", return_value=mock_kg):
+            result = self.cli._execute_query("Telekom 2024")
+
+        assert result == 0
+        mock_kg.query_documents.assert_not_called()
+        calls = [str(c[0][0]) for c in self.cli.interface.show_message.call_args_list]
+        assert any("/docs/telekom.pdf" in c for c in calls)
+
+    def test_execute_query_offline_skips_ai_fallback(self):
+        """With --offline an empty index result is final."""
+        self.cli.interface.show_message = Mock()
+        self.cli.settings.set("ask_ai_fallback", False)
+
+        mock_kg = Mock()
+        mock_kg.search_documents = Mock(return_value=[])
+        mock_kg.query_documents = Mock()
+
+        with patch("folder_extractor.cli.app.KnowledgeGraph", return_value=mock_kg):
+            result = self.cli._execute_query("Welche Verträge laufen aus?")
+
+        assert result == 0
+        mock_kg.query_documents.assert_not_called()
+        calls = self.cli.interface.show_message.call_args_list
+        assert any(c[1].get("message_type") == "warning" for c in calls)
+
     def test_undo_takes_priority_over_ask(self):
         """Test that --undo has priority over --ask."""
         # Both flags set, undo should take priority
@@ -1498,3 +1531,113 @@ class TestSmartWatchMode:
         assert profile["recursive"] is True
         assert profile["exclude_subfolders"] == ["temp", "cache"]
         assert profile["ignore_patterns"] == ["*.tmp", ".DS_Store"]
+
+
+class TestSmartSortMode:
+    """Tests for one-off AI sorting of an existing folder (--smart-sort)."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings_fixture, state_manager_fixture):
+        """Set up test fixtures."""
+        try:
+            os.getcwd()
+        except (FileNotFoundError, OSError):
+            os.chdir(os.path.expanduser("~"))
+
+        with patch("folder_extractor.cli.app.create_parser"):
+            with patch("folder_extractor.cli.app.create_console_interface"):
+                self.cli = EnhancedFolderExtractorCLI()
+                self.cli.settings = settings_fixture
+                self.cli.state_manager = state_manager_fixture
+        self.cli.interface.show_message = Mock()
+
+    def _run(self, path: Path, results: list) -> tuple[int, Mock]:
+        mock_sorter = Mock()
+
+        async def process_files(files, batch_size=1):
+            return results
+
+        mock_sorter.process_files = Mock(side_effect=process_files)
+        with patch("folder_extractor.cli.app.is_safe_path", return_value=True):
+            with patch("folder_extractor.cli.app.AsyncGeminiClient"):
+                with patch("folder_extractor.cli.app.AIResultCache"):
+                    with patch(
+                        "folder_extractor.cli.app.SmartSorter",
+                        return_value=mock_sorter,
+                    ):
+                        exit_code = self.cli._execute_smart_sort(path)
+        return exit_code, mock_sorter
+
+    def test_smart_sort_flag_triggers_execute_smart_sort(self):
+        """Test that --smart-sort dispatches to _execute_smart_sort."""
+        mock_args = Mock(undo=False, watch=False, ask=None, smart_sort=True)
+        self.cli.parser.parse_args = Mock(return_value=mock_args)
+
+        with patch.object(self.cli, "_execute_smart_sort", return_value=0) as mock_sort:
+            with patch("folder_extractor.cli.app.configure_from_args"):
+                assert self.cli.run() == 0
+
+        mock_sort.assert_called_once()
+
+    def test_moves_files_into_category_structure(self, tmp_path):
+        """Analyzed files are moved to {category}/{sender}/{year}."""
+        (tmp_path / "rechnung.pdf").write_bytes(b"invoice")
+        (tmp_path / "foto.jpg").write_bytes(b"photo")
+        results = [
+            {"category": "Privat", "sender": None, "year": "2023"},
+            {"category": "Finanzen", "sender": "Telekom", "year": "2024"},
+        ]
+
+        exit_code, _ = self._run(tmp_path, results)
+
+        assert exit_code == 0
+        assert (tmp_path / "Privat" / "Unbekannt" / "2023" / "foto.jpg").exists()
+        assert (tmp_path / "Finanzen" / "Telekom" / "2024" / "rechnung.pdf").exists()
+
+    def test_passes_batch_size_and_skips_hidden_files(self, tmp_path):
+        """Only visible top-level files are analyzed, with the batch size."""
+        (tmp_path / "beleg.jpg").write_bytes(b"receipt")
+        (tmp_path / ".DS_Store").write_bytes(b"hidden")
+        (tmp_path / "sub").mkdir()
+        self.cli.settings.set("ai_batch_size", 10)
+
+        _, mock_sorter = self._run(tmp_path, [{"category": "Finanzen"}])
+
+        files, kwargs = mock_sorter.process_files.call_args
+        assert [path.name for path, _ in files[0]] == ["beleg.jpg"]
+        assert files[0][0][1] == "image/jpeg"
+        assert kwargs["batch_size"] == 10
+
+    def test_dry_run_does_not_move_files(self, tmp_path):
+        """Dry run only reports the target folders."""
+        (tmp_path / "beleg.jpg").write_bytes(b"receipt")
+        self.cli.settings.set("dry_run", True)
+
+        exit_code, _ = self._run(tmp_path, [{"category": "Finanzen"}])
+
+        assert exit_code == 0
+        assert (tmp_path / "beleg.jpg").exists()
+        assert not (tmp_path / "Finanzen").exists()
+
+    def test_failed_analysis_is_reported(self, tmp_path):
+        """Files whose analysis failed stay in place and set exit code 1."""
+        (tmp_path / "beleg.jpg").write_bytes(b"receipt")
+
+        exit_code, _ = self._run(tmp_path, [RuntimeError("API down")])
+
+        assert exit_code == 1
+        assert (tmp_path / "beleg.jpg").exists()
+        messages = [c[0][0] for c in self.cli.interface.show_message.call_args_list]
+        assert any("API down" in m for m in messages)
+
+    def test_empty_folder_makes_no_request(self, tmp_path):
+        """Without files no AI client is needed."""
+        exit_code, mock_sorter = self._run(tmp_path, [])
+
+        assert exit_code == 0
+        mock_sorter.process_files.assert_not_called()
+
+    def test_unsafe_path_is_rejected(self, tmp_path):
+        """Smart sort only runs in the safe folders."""
+        with patch("folder_extractor.cli.app.is_safe_path", return_value=False):
+            assert self.cli._execute_smart_sort(tmp_path) == 1
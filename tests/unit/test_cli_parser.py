@@ -302,3 +302,29 @@ class TestArgumentParser:
         """Test --ask flag handles German umlauts correctly."""
         args = self.parser.parse_args(["--ask", "Verträge und Kündigungsschreiben"])
         assert args.ask == "Verträge und Kündigungsschreiben"
+
+    def test_offline_flag(self):
+        """Test --offline is off by default and can be combined with --ask."""
+        assert self.parser.parse_args([]).offline is False
+        args = self.parser.parse_args(["--ask", "Telekom 2024", "--offline"])
+        assert args.offline is True
+
+    # --smart-sort / --batch flags for one-off AI sorting
+    def test_smart_sort_defaults(self):
+        """Test --smart-sort is off and --batch unset by default."""
+        args = self.parser.parse_args([])
+        assert args.smart_sort is False
+        assert args.batch is None
+
+    def test_batch_without_value_uses_default_size(self):
+        """Test --batch without a number uses AI_BATCH_SIZE."""
+        from folder_extractor.config.constants import AI_BATCH_SIZE
+
+        args = self.parser.parse_args(["--smart-sort", "--batch"])
+        assert args.smart_sort is True
+        assert args.batch == AI_BATCH_SIZE
+
+    def test_batch_accepts_size(self):
+        """Test --batch accepts an explicit batch size."""
+        args = self.parser.parse_args(["--smart-sort", "--batch", "20"])
+        assert args.batch == 20
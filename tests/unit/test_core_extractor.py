@@ -3,7 +3,7 @@ Unit tests for the core extractor module.
 """
 
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 
 import pytest
 
@@ -404,3 +404,40 @@ class TestIntegration:
 
             if test_dir.exists():
                 shutil.rmtree(test_dir)
+
+    @pytest.mark.skipif(
+        not (Path.home() / "Desktop").exists(),
+        reason="Desktop directory not available (CI environment)",
+    )
+    def test_moves_are_reported_to_move_callback(
+        self, settings_fixture, state_manager_fixture
+    ):
+        """Extraction and undo report (old, new) pairs to the move callback."""
+        test_dir = Path.home() / "Desktop" / "extractor_move_callback_test"
+        source_dir = test_dir / "source"
+        source_dir.mkdir(parents=True, exist_ok=True)
+        (source_dir / "doc.pdf").write_text("content")
+        move_callback = Mock()
+
+        try:
+            extractor = EnhancedFileExtractor(
+                settings=settings_fixture,
+                state_manager=state_manager_fixture,
+                move_callback=move_callback,
+            )
+            orchestrator = EnhancedExtractionOrchestrator(
+                extractor, state_manager_fixture
+            )
+
+            orchestrator.execute_extraction(test_dir)
+            orchestrator.execute_undo(test_dir)
+
+            old, new = str(source_dir / "doc.pdf"), str(test_dir / "doc.pdf")
+            assert move_callback.call_args_list == [
+                call([(old, new)]),
+                call([(new, old)]),
+            ]
+        finally:
+            import shutil
+
+            shutil.rmtree(test_dir, ignore_errors=True)
@@ -1611,3 +1611,77 @@ class TestProcessSingleFile:
         # Verify progress_callback was passed to extract_files
         call_kwargs = orchestrator_with_mocks.mock_extractor.extract_files.call_args[1]
         assert call_kwargs.get("progress_callback") == progress_callback
+
+
+class TestProcessFiles:
+    """Test process_files method for batched watch mode processing."""
+
+    @staticmethod
+    def _mock_operation(abort: bool = False) -> Mock:
+        mock_operation = Mock()
+        mock_operation.operation_id = "batch-op"
+        mock_abort_signal = Mock()
+        mock_abort_signal.is_set.return_value = abort
+        mock_operation.abort_signal = mock_abort_signal
+        mock_operation.__enter__ = Mock(return_value=mock_operation)
+        mock_operation.__exit__ = Mock(return_value=False)
+        return mock_operation
+
+    def test_process_files_uses_single_extract_call(
+        self, orchestrator_with_mocks, tmp_path
+    ):
+        """All files of a batch are extracted with one extract_files call."""
+        files = [tmp_path / f"file{i}.pdf" for i in range(3)]
+        for f in files:
+            f.touch()
+        orchestrator_with_mocks.mock_extractor.extract_files.return_value = {
+            "moved": 3,
+            "errors": 0,
+        }
+
+        with patch(
+            "folder_extractor.core.extractor.ManagedOperation",
+            return_value=self._mock_operation(),
+        ):
+            result = orchestrator_with_mocks.process_files(files, tmp_path)
+
+        orchestrator_with_mocks.mock_extractor.extract_files.assert_called_once()
+        call_kwargs = orchestrator_with_mocks.mock_extractor.extract_files.call_args[1]
+        assert call_kwargs["files"] == [str(f) for f in files]
+        assert result["status"] == "success"
+        assert result["missing"] == []
+
+    def test_process_files_skips_and_reports_missing_files(
+        self, orchestrator_with_mocks, tmp_path
+    ):
+        """Files deleted before the batch runs are reported, not extracted."""
+        present = tmp_path / "present.pdf"
+        present.touch()
+        missing = tmp_path / "gone.pdf"
+        orchestrator_with_mocks.mock_extractor.extract_files.return_value = {"moved": 1}
+
+        with patch(
+            "folder_extractor.core.extractor.ManagedOperation",
+            return_value=self._mock_operation(),
+        ):
+            result = orchestrator_with_mocks.process_files([present, missing], tmp_path)
+
+        call_kwargs = orchestrator_with_mocks.mock_extractor.extract_files.call_args[1]
+        assert call_kwargs["files"] == [str(present)]
+        assert result["missing"] == [str(missing)]
+
+    def test_process_files_respects_abort_signal(
+        self, orchestrator_with_mocks, tmp_path
+    ):
+        """No extraction happens when abort is requested."""
+        filepath = tmp_path / "file.pdf"
+        filepath.touch()
+
+        with patch(
+            "folder_extractor.core.extractor.ManagedOperation",
+            return_value=self._mock_operation(abort=True),
+        ):
+            result = orchestrator_with_mocks.process_files([filepath], tmp_path)
+
+        orchestrator_with_mocks.mock_extractor.extract_files.assert_not_called()
+        assert result["status"] == "aborted"
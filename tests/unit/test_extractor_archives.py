@@ -127,14 +127,24 @@ class TestIsArchive:
             "script.py",
             "noextension",
             "fake.zip.txt",  # Extension is .txt, not .zip
-            "archive.rar",  # RAR is not supported
-            "archive.7z",  # 7z is not supported
+            "report.docx",  # ZIP container, but not an archive to extract
         ],
     )
     def test_rejects_non_archive_files(self, extractor, filename):
         """Non-archive files are not recognized as archives."""
         assert extractor._is_archive(Path(filename)) is False
 
+    @pytest.mark.parametrize("filename", ["archive.rar", "archive.7z"])
+    def test_rejects_tool_based_formats_without_tool(self, extractor, filename):
+        """7z and RAR are only archives when an extraction tool is installed."""
+        with patch("folder_extractor.core.archives._find_tool", return_value=None):
+            assert extractor._is_archive(Path(filename)) is False
+
+    def test_recognizes_single_compressed_files(self, extractor):
+        """Plain .gz/.bz2/.xz files are recognized as archives."""
+        for filename in ["notes.txt.gz", "dump.sql.bz2", "data.json.xz"]:
+            assert extractor._is_archive(Path(filename)) is True
+
 
 class TestGetArchiveHandler:
     """Tests for archive handler selection based on file type."""
@@ -387,3 +397,83 @@ class TestProcessArchives:
 
         # Clean up abort signal
         extractor.state_manager.clear_abort()
+
+    def test_expands_nested_archives_within_depth(
+        self, extractor, settings_fixture, tmp_path
+    ):
+        """Contents of inner archives end up in the destination."""
+        settings_fixture.set("extract_archives", True)
+
+        inner = io.BytesIO()
+        with zipfile.ZipFile(inner, "w") as zf:
+            zf.writestr("deep.txt", "deep")
+        outer = tmp_path / "outer.zip"
+        with zipfile.ZipFile(outer, "w") as zf:
+            zf.writestr("inner.zip", inner.getvalue())
+
+        destination = tmp_path / "dest"
+        destination.mkdir()
+
+        with patch("folder_extractor.core.extractor.is_safe_path", return_value=True):
+            _, archive_results = extractor._process_archives(
+                files=[str(outer)],
+                destination=destination,
+                operation_id=None,
+                progress_callback=None,
+                indexing_callback=None,
+            )
+
+        assert (destination / "deep.txt").read_text() == "deep"
+        assert archive_results["archives_processed"] == 1
+
+    def test_archives_beyond_nesting_depth_are_moved_as_files(
+        self, extractor, settings_fixture, tmp_path
+    ):
+        """With archive_nesting_depth=0, inner archives are regular files."""
+        settings_fixture.set("extract_archives", True)
+        settings_fixture.set("archive_nesting_depth", 0)
+
+        inner = io.BytesIO()
+        with zipfile.ZipFile(inner, "w") as zf:
+            zf.writestr("deep.txt", "deep")
+        outer = tmp_path / "outer.zip"
+        with zipfile.ZipFile(outer, "w") as zf:
+            zf.writestr("inner.zip", inner.getvalue())
+
+        destination = tmp_path / "dest"
+        destination.mkdir()
+
+        with patch("folder_extractor.core.extractor.is_safe_path", return_value=True):
+            extractor._process_archives(
+                files=[str(outer)],
+                destination=destination,
+                operation_id=None,
+                progress_callback=None,
+                indexing_callback=None,
+            )
+
+        assert (destination / "inner.zip").exists()
+        assert not (destination / "deep.txt").exists()
+
+    def test_limit_violation_counts_as_archive_error(
+        self, extractor, settings_fixture, create_zip_archive, tmp_path
+    ):
+        """Archives exceeding the entry limit are reported as errors."""
+        settings_fixture.set("extract_archives", True)
+        settings_fixture.set("archive_max_entries", 1)
+
+        zip_path = create_zip_archive({"a.txt": "a", "b.txt": "b"})
+        destination = tmp_path / "dest"
+        destination.mkdir()
+
+        with patch("folder_extractor.core.extractor.is_safe_path", return_value=True):
+            _, archive_results = extractor._process_archives(
+                files=[str(zip_path)],
+                destination=destination,
+                operation_id=None,
+                progress_callback=None,
+                indexing_callback=None,
+            )
+
+        assert archive_results["archive_errors"] == 1
+        assert not (destination / "a.txt").exists()
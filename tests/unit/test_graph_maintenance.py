@@ -0,0 +1,248 @@
+"""
+Unit tests for background knowledge graph maintenance.
+
+Tests cover:
+- Re-keying documents of reported moves
+- Sweeping documents whose files are gone, within a time budget
+- Relocating missing documents by content hash
+- Fail-safe behavior and the background thread
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from folder_extractor.core.file_operations import FileOperations
+from folder_extractor.core.memory import GraphMaintenance, KnowledgeGraph
+
+
+def _ingest(kg: KnowledgeGraph, path: Path, entity: str = "Telekom") -> None:
+    kg.ingest(
+        {
+            "path": str(path),
+            "hash": FileOperations().calculate_file_hash(path),
+            "timestamp": 1710000000,
+            "category": "Finanzen",
+            "entities": [{"name": entity, "type": "ORGANIZATION"}],
+        }
+    )
+
+
+def _paths(kg: KnowledgeGraph) -> list[str]:
+    return [path for path, _ in kg.list_documents()]
+
+
+@pytest.fixture
+def kg(tmp_path: Path):
+    """Knowledge graph in a temporary directory."""
+    with KnowledgeGraph(db_path=tmp_path / "graph.db") as graph:
+        yield graph
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> Path:
+    """Directory for documents."""
+    directory = tmp_path / "files"
+    directory.mkdir()
+    return directory
+
+
+class TestMoves:
+    """Tests for re-keying reported moves."""
+
+    def test_reported_move_is_rekeyed(self, kg, files):
+        """The document follows its file to the new path."""
+        old = files / "rechnung.pdf"
+        old.write_text("Rechnung")
+        _ingest(kg, old)
+        new = files / "Finanzen" / "rechnung.pdf"
+        new.parent.mkdir()
+        old.rename(new)
+
+        maintenance = GraphMaintenance(knowledge_graph=kg)
+        maintenance.record_moves([(old, new)])
+
+        assert maintenance.apply_moves() == 1
+        assert _paths(kg) == [str(new)]
+        assert maintenance.stats()["rekeyed"] == 1
+
+    def test_writer_is_flushed_before_rekeying(self, kg, files):
+        """Documents still queued in the write-behind queue are re-keyed."""
+        writer = MagicMock()
+        maintenance = GraphMaintenance(knowledge_graph=kg, graph_writer=writer)
+        maintenance.record_moves([(files / "a.pdf", files / "b.pdf")])
+
+        maintenance.apply_moves()
+
+        writer.flush.assert_called_once()
+
+    def test_graph_errors_are_not_raised(self, files):
+        """A failing graph keeps the moves for later matching."""
+        graph = MagicMock()
+        graph.rekey_documents.side_effect = RuntimeError("database locked")
+        maintenance = GraphMaintenance(knowledge_graph=graph)
+        maintenance.record_moves([(files / "a.pdf", files / "b.pdf")])
+
+        assert maintenance.apply_moves() == 0
+        assert maintenance.stats()["unmatched_moves"] == 1
+
+    def test_close_applies_queued_moves(self, kg, files):
+        """Moves reported just before close() are not lost."""
+        old = files / "a.pdf"
+        old.write_text("A")
+        _ingest(kg, old)
+        new = files / "b.pdf"
+        old.rename(new)
+
+        maintenance = GraphMaintenance(knowledge_graph=kg)
+        maintenance.start()
+        maintenance.close(timeout=5)
+        maintenance.record_moves([(old, new)])  # Ignored after close
+
+        assert _paths(kg) == [str(old)]
+
+        maintenance = GraphMaintenance(knowledge_graph=kg)
+        maintenance.record_moves([(old, new)])
+        maintenance.close(timeout=5)
+
+        assert _paths(kg) == [str(new)]
+
+
+class TestSweep:
+    """Tests for removing and relocating documents of missing files."""
+
+    def test_missing_files_are_removed_with_orphans(self, kg, files):
+        """A full sweep deletes stale documents and orphaned entities."""
+        kept = files / "kept.pdf"
+        kept.write_text("kept")
+        gone = files / "gone.pdf"
+        gone.write_text("gone")
+        _ingest(kg, kept, entity="Apple")
+        _ingest(kg, gone, entity="Telekom")
+        gone.unlink()
+
+        result = GraphMaintenance(knowledge_graph=kg).run_cycle()
+
+        assert result == {"rekeyed": 0, "removed": 1, "orphans": 1}
+        assert _paths(kg) == [str(kept)]
+
+    def test_sweep_is_incremental_within_time_budget(self, kg, files):
+        """With no time left, each cycle checks one batch and resumes."""
+        for i in range(3):
+            path = files / f"{i}.pdf"
+            path.write_text(str(i))
+            _ingest(kg, path)
+            path.unlink()
+
+        maintenance = GraphMaintenance(knowledge_graph=kg, batch_size=2)
+
+        assert maintenance.run_cycle(time_budget=0)["removed"] == 2
+        assert maintenance.stats()["sweeps"] == 0
+        assert maintenance.run_cycle(time_budget=0)["removed"] == 1
+        maintenance.run_cycle(time_budget=0)
+
+        assert _paths(kg) == []
+        assert maintenance.stats()["sweeps"] == 1
+
+    def test_missing_document_is_relocated_by_hash(self, kg, files):
+        """An unmatched move with the same content re-keys the document."""
+        original = files / "scan.pdf"
+        original.write_text("Vertrag")
+        _ingest(kg, original)
+        # The file was moved twice; only the second move was reported
+        intermediate = files / "tmp" / "scan.pdf"
+        final = files / "Verträge" / "scan.pdf"
+        final.parent.mkdir()
+        original.rename(final)
+
+        maintenance = GraphMaintenance(knowledge_graph=kg)
+        maintenance.record_moves([(intermediate, final)])
+        result = maintenance.run_cycle()
+
+        assert result["removed"] == 0
+        assert result["rekeyed"] == 1
+        assert _paths(kg) == [str(final)]
+
+    def test_different_content_is_not_relocated(self, kg, files):
+        """A file with the same name but other content does not match."""
+        original = files / "scan.pdf"
+        original.write_text("Vertrag")
+        _ingest(kg, original)
+        original.unlink()
+        other = files / "neu" / "scan.pdf"
+        other.parent.mkdir()
+        other.write_text("etwas anderes")
+
+        maintenance = GraphMaintenance(knowledge_graph=kg)
+        maintenance.record_moves([(files / "x" / "scan.pdf", other)])
+
+        assert maintenance.run_cycle()["removed"] == 1
+        assert _paths(kg) == []
+
+    def test_expired_moves_are_not_matched(self, kg, files):
+        """Unmatched moves are dropped after move_ttl."""
+        maintenance = GraphMaintenance(knowledge_graph=kg, move_ttl=0)
+        maintenance.record_moves([(files / "a.pdf", files / "b.pdf")])
+        maintenance.apply_moves()
+        time.sleep(0.01)
+
+        maintenance.run_cycle()
+
+        assert maintenance.stats()["unmatched_moves"] == 0
+
+    def test_documents_on_unavailable_volumes_are_kept(self, kg):
+        """Files on an unmounted drive are not treated as deleted."""
+        kg.ingest(
+            {
+                "path": "/Volumes/Backup-Not-Mounted/Archiv/a.pdf",
+                "hash": "h",
+                "timestamp": 1710000000,
+            }
+        )
+
+        assert GraphMaintenance(knowledge_graph=kg).run_cycle()["removed"] == 0
+        assert len(kg.list_documents()) == 1
+
+
+class TestBackgroundThread:
+    """Tests for the background thread."""
+
+    def test_recorded_moves_are_applied_promptly(self, files):
+        """Moves are re-keyed without waiting for the sweep interval."""
+        graph = MagicMock()
+        graph.rekey_documents.return_value = []
+        maintenance = GraphMaintenance(knowledge_graph=graph, interval=3600)
+        maintenance.start()
+        try:
+            maintenance.record_moves([(files / "a.pdf", files / "b.pdf")])
+
+            deadline = time.monotonic() + 5
+            while not graph.rekey_documents.called and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            maintenance.close(timeout=5)
+
+        graph.rekey_documents.assert_called_once_with(
+            [(str(files / "a.pdf"), str(files / "b.pdf"))]
+        )
+        graph.list_documents.assert_not_called()
+
+    def test_sweeps_run_every_interval(self):
+        """A sweep starts once the interval has elapsed."""
+        graph = MagicMock()
+        graph.list_documents.return_value = []
+        graph.remove_orphans.return_value = {"entities": 0, "categories": 0}
+        maintenance = GraphMaintenance(knowledge_graph=graph, interval=0.01)
+        maintenance.start()
+        try:
+            deadline = time.monotonic() + 5
+            while maintenance.stats()["sweeps"] < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            maintenance.close(timeout=5)
+
+        assert maintenance.stats()["sweeps"] >= 2
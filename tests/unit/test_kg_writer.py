@@ -0,0 +1,156 @@
+"""
+Unit tests for the knowledge graph write-behind queue.
+
+Tests cover:
+- Batching by size and by flush interval
+- flush() and close() draining the queue
+- Fallback to single ingestion when a batch fails
+- Backpressure and statistics
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from folder_extractor.core.memory import KnowledgeGraph, KnowledgeGraphWriter
+
+
+def _doc(i: int) -> dict:
+    return {"path": f"/docs/{i}.pdf", "hash": f"h{i}", "timestamp": i}
+
+
+@pytest.fixture
+def graph():
+    """Mocked knowledge graph."""
+    return MagicMock()
+
+
+class TestBatching:
+    """Tests for how documents are grouped into writes."""
+
+    def test_full_batch_is_written_without_waiting(self, graph):
+        """Reaching batch_size triggers a write before the interval ends."""
+        writer = KnowledgeGraphWriter(graph, batch_size=3, flush_interval=60)
+        for i in range(3):
+            writer.submit(_doc(i))
+
+        deadline = time.monotonic() + 5
+        while not graph.ingest_many.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.close()
+
+        graph.ingest_many.assert_called_once_with([_doc(0), _doc(1), _doc(2)])
+
+    def test_partial_batch_is_written_after_interval(self, graph):
+        """A lone document waits at most flush_interval."""
+        writer = KnowledgeGraphWriter(graph, batch_size=50, flush_interval=0.05)
+        writer.submit(_doc(0))
+
+        deadline = time.monotonic() + 5
+        while not graph.ingest_many.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.close()
+
+        graph.ingest_many.assert_called_once_with([_doc(0)])
+
+    def test_flush_writes_everything_queued(self, graph):
+        """flush() returns once all documents are written."""
+        writer = KnowledgeGraphWriter(graph, batch_size=4, flush_interval=60)
+        for i in range(10):
+            writer.submit(_doc(i))
+
+        assert writer.flush(timeout=5) is True
+
+        batches = [call.args[0] for call in graph.ingest_many.call_args_list]
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+        assert writer.pending_count == 0
+        writer.close()
+
+    def test_close_writes_remaining_documents(self, graph):
+        """Queued documents are not lost on close."""
+        writer = KnowledgeGraphWriter(graph, batch_size=50, flush_interval=60)
+        writer.submit(_doc(0))
+        writer.submit(_doc(1))
+
+        writer.close(timeout=5)
+
+        graph.ingest_many.assert_called_once_with([_doc(0), _doc(1)])
+        assert writer.stats() == {"pending": 0, "written": 2, "failed": 0}
+
+    def test_submit_after_close_raises(self, graph):
+        """A closed writer accepts no documents."""
+        writer = KnowledgeGraphWriter(graph)
+        writer.close()
+
+        with pytest.raises(RuntimeError):
+            writer.submit(_doc(0))
+
+    def test_close_without_documents_starts_no_thread(self, graph):
+        """An unused writer closes immediately."""
+        writer = KnowledgeGraphWriter(graph)
+
+        writer.close()
+
+        graph.ingest_many.assert_not_called()
+
+
+class TestFailures:
+    """Tests for failing writes."""
+
+    def test_failed_batch_is_retried_singly(self, graph):
+        """One bad document does not drop the others."""
+        graph.ingest_many.side_effect = RuntimeError("constraint")
+        graph.ingest.side_effect = [None, RuntimeError("bad"), None]
+        writer = KnowledgeGraphWriter(graph, batch_size=3, flush_interval=60)
+        for i in range(3):
+            writer.submit(_doc(i))
+
+        writer.flush(timeout=5)
+        writer.close()
+
+        assert graph.ingest.call_count == 3
+        assert writer.stats() == {"pending": 0, "written": 2, "failed": 1}
+
+    def test_submit_blocks_while_queue_is_full(self, graph):
+        """Submitters wait for the writer when max_pending is reached."""
+        release = threading.Event()
+        graph.ingest_many.side_effect = lambda batch: release.wait(5)
+        writer = KnowledgeGraphWriter(
+            graph, batch_size=1, flush_interval=60, max_pending=1
+        )
+        writer.submit(_doc(0))  # Taken by the writer, which then blocks
+        deadline = time.monotonic() + 5
+        while writer.stats()["pending"] != 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.submit(_doc(1))  # Fills the queue
+
+        blocked = threading.Thread(target=writer.submit, args=(_doc(2),))
+        blocked.start()
+        blocked.join(0.1)
+        assert blocked.is_alive()
+
+        release.set()
+        blocked.join(5)
+        assert not blocked.is_alive()
+        writer.close(timeout=5)
+        assert writer.stats()["written"] == 3
+
+
+class TestWithKnowledgeGraph:
+    """Tests against a real database."""
+
+    def test_documents_reach_the_graph(self, tmp_path: Path):
+        """Queued documents are written with ingest_many()."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            writer = KnowledgeGraphWriter(kg, batch_size=10, flush_interval=60)
+            for i in range(25):
+                writer.submit(_doc(i))
+            writer.close(timeout=10)
+
+            result = kg._conn.execute("MATCH (d:Document) RETURN count(d)")
+            assert result.get_next()[0] == 25
@@ -4,6 +4,8 @@ Unit tests for core/memory/graph.py module.
 Tests follow TDD principles - testing behavior, not implementation details.
 """
 
+import asyncio
+import threading
 import time
 from pathlib import Path
 from typing import Any, Dict
@@ -16,6 +18,7 @@ from folder_extractor.core.memory.graph import (
     KnowledgeGraph,
     KnowledgeGraphError,
     _get_cypher_translation_prompt,
+    _paged_cypher,
     get_knowledge_graph,
     reset_knowledge_graph,
 )
@@ -578,6 +581,659 @@ class TestKnowledgeGraphIntegration:
             assert "/docs/invoice_001.pdf" in paths
 
 
+class TestIngestMany:
+    """Tests for batched ingestion with ingest_many()."""
+
+    @staticmethod
+    def _count(kg: KnowledgeGraph, query: str) -> int:
+        result = kg._conn.execute(query)
+        return result.get_next()[0]
+
+    def _documents(self, count: int) -> list:
+        return [
+            {
+                "path": f"/docs/doc_{i}.pdf",
+                "hash": f"hash{i}",
+                "timestamp": int(time.time()),
+                "category": "Finanzen" if i % 2 else "Verträge",
+                "entities": [
+                    {"name": "Telekom", "type": "ORGANIZATION"},
+                    {"name": f"Person {i}", "type": "PERSON"},
+                ],
+            }
+            for i in range(count)
+        ]
+
+    def test_writes_documents_categories_and_entities(self, tmp_path: Path):
+        """A batch creates the same nodes and relationships as single ingests."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest_many(self._documents(10))
+
+            assert self._count(kg, "MATCH (d:Document) RETURN count(d)") == 10
+            assert self._count(kg, "MATCH (c:Category) RETURN count(c)") == 2
+            assert self._count(kg, "MATCH (e:Entity) RETURN count(e)") == 11
+            assert self._count(kg, "MATCH ()-[r:BELONGS_TO]->() RETURN count(r)") == 10
+            assert self._count(kg, "MATCH ()-[r:MENTIONS]->() RETURN count(r)") == 20
+
+    def test_batch_is_recorded_in_metrics(self, tmp_path: Path):
+        """Batched ingests show up under their own operation name."""
+        from folder_extractor.core.metrics import metrics
+
+        metrics.reset()
+        metrics.enable()
+        try:
+            with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+                kg.ingest_many(self._documents(3))
+        finally:
+            metrics.disable()
+            stats = metrics.snapshot()
+            metrics.reset()
+
+        assert stats["kg_ingest_many"]["count"] == 1
+
+    def test_repeated_batch_is_idempotent(self, tmp_path: Path):
+        """Ingesting the same batch twice creates no duplicates."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest_many(self._documents(3))
+            kg.ingest_many(self._documents(3))
+
+            assert self._count(kg, "MATCH (d:Document) RETURN count(d)") == 3
+            assert self._count(kg, "MATCH ()-[r:MENTIONS]->() RETURN count(r)") == 6
+
+    def test_repeated_path_in_batch_keeps_last_entry(self, tmp_path: Path):
+        """A document queued twice gets its last values; others are untouched."""
+        documents = self._documents(3)
+        repeated = {**documents[0], "hash": "hash0-neu", "timestamp": 42}
+
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest_many(documents + [repeated])
+
+            result = kg._conn.execute(
+                "MATCH (d:Document) RETURN d.path, d.hash, d.timestamp ORDER BY d.path"
+            )
+            rows = []
+            while result.has_next():
+                rows.append(tuple(result.get_next()))
+
+            assert rows == [
+                ("/docs/doc_0.pdf", "hash0-neu", 42),
+                ("/docs/doc_1.pdf", "hash1", documents[1]["timestamp"]),
+                ("/docs/doc_2.pdf", "hash2", documents[2]["timestamp"]),
+            ]
+            assert self._count(kg, "MATCH ()-[r:MENTIONS]->() RETURN count(r)") == 6
+            assert self._count(kg, "MATCH ()-[r:BELONGS_TO]->() RETURN count(r)") == 3
+
+    def test_missing_field_writes_nothing(self, tmp_path: Path):
+        """The batch is validated before anything is written."""
+        documents = self._documents(2)
+        del documents[1]["hash"]
+
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            with pytest.raises(KnowledgeGraphError, match="hash"):
+                kg.ingest_many(documents)
+
+            assert self._count(kg, "MATCH (d:Document) RETURN count(d)") == 0
+
+    def test_failed_batch_is_rolled_back(self, tmp_path: Path):
+        """A failing statement leaves no partial batch behind."""
+        documents = self._documents(2)
+        documents[1]["timestamp"] = "not a number"
+
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            with pytest.raises(KnowledgeGraphError, match="Failed to ingest"):
+                kg.ingest_many(documents)
+
+            assert self._count(kg, "MATCH (d:Document) RETURN count(d)") == 0
+
+            # The connection is usable again after the rollback
+            kg.ingest_many(self._documents(1))
+            assert self._count(kg, "MATCH (d:Document) RETURN count(d)") == 1
+
+    def test_empty_batch_is_noop(self, tmp_path: Path):
+        """An empty batch opens no transaction."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest_many([])
+
+            assert self._count(kg, "MATCH (d:Document) RETURN count(d)") == 0
+
+
+class TestMaintenanceOperations:
+    """Tests for re-keying, listing and deleting documents and orphan removal."""
+
+    @staticmethod
+    def _count(kg: KnowledgeGraph, query: str) -> int:
+        result = kg._conn.execute(query)
+        return result.get_next()[0]
+
+    @staticmethod
+    def _document(path: str, entity: str = "Telekom") -> dict:
+        return {
+            "path": path,
+            "hash": f"hash-{Path(path).name}",
+            "timestamp": 1710000000,
+            "summary": "Rechnung",
+            "category": "Finanzen",
+            "entities": [{"name": entity, "type": "ORGANIZATION"}],
+        }
+
+    def test_rekey_keeps_properties_and_relationships(self, tmp_path: Path):
+        """A moved document keeps its hash, category and entities."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest(self._document("/in/a.pdf"))
+
+            assert kg.rekey_documents([("/in/a.pdf", "/out/a.pdf")]) == ["/in/a.pdf"]
+
+            result = kg._conn.execute(
+                "MATCH (d:Document)-[:BELONGS_TO]->(c:Category), "
+                "(d)-[:MENTIONS]->(e:Entity) RETURN d.path, d.hash, c.name, e.name"
+            )
+            assert result.get_next() == [
+                "/out/a.pdf",
+                "hash-a.pdf",
+                "Finanzen",
+                "Telekom",
+            ]
+            assert self._count(kg, "MATCH (d:Document) RETURN count(d)") == 1
+            assert kg.search_documents("Telekom") == ["/out/a.pdf"]
+
+    def test_rekey_applies_chained_moves_in_order(self, tmp_path: Path):
+        """A → B → C in one call ends at C."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest(self._document("/a.pdf"))
+
+            kg.rekey_documents([("/a.pdf", "/b.pdf"), ("/b.pdf", "/c.pdf")])
+
+            assert kg.list_documents() == [("/c.pdf", "hash-a.pdf")]
+
+    def test_rekey_ignores_unknown_paths(self, tmp_path: Path):
+        """Moves of files the graph does not know are reported as not found."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest(self._document("/a.pdf"))
+
+            assert kg.rekey_documents([("/x.pdf", "/y.pdf")]) == []
+            assert kg.list_documents() == [("/a.pdf", "hash-a.pdf")]
+
+    def test_rekey_onto_existing_document_merges(self, tmp_path: Path):
+        """A document at the new path keeps its properties and gains edges."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest(self._document("/a.pdf", entity="Telekom"))
+            kg.ingest(self._document("/b.pdf", entity="Apple"))
+
+            kg.rekey_documents([("/a.pdf", "/b.pdf")])
+
+            assert kg.list_documents() == [("/b.pdf", "hash-b.pdf")]
+            assert self._count(kg, "MATCH ()-[r:MENTIONS]->() RETURN count(r)") == 2
+
+    def test_list_documents_pages_by_path(self, tmp_path: Path):
+        """list_documents() continues after the given path."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest_many([self._document(f"/d/{i}.pdf") for i in range(5)])
+
+            first = kg.list_documents(limit=2)
+            rest = kg.list_documents(after=first[-1][0], limit=10)
+
+            assert [p for p, _ in first] == ["/d/0.pdf", "/d/1.pdf"]
+            assert [p for p, _ in rest] == ["/d/2.pdf", "/d/3.pdf", "/d/4.pdf"]
+
+    def test_delete_documents_and_remove_orphans(self, tmp_path: Path):
+        """Deleted documents leave orphans that remove_orphans() compacts."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest(self._document("/a.pdf", entity="Telekom"))
+            kg.ingest(self._document("/b.pdf", entity="Apple"))
+
+            assert kg.delete_documents(["/a.pdf", "/missing.pdf"]) == 1
+            assert kg.remove_orphans() == {"entities": 1, "categories": 0}
+
+            assert kg.list_documents() == [("/b.pdf", "hash-b.pdf")]
+            assert self._count(kg, "MATCH (e:Entity) RETURN count(e)") == 1
+            assert kg.search_documents("Telekom") == []
+
+            kg.delete_documents(["/b.pdf"])
+            assert kg.remove_orphans() == {"entities": 1, "categories": 1}
+
+
+class TestGetSenderCategoryCounts:
+    """Tests for get_sender_category_counts() used to learn sender rules."""
+
+    def test_counts_documents_per_organization_and_category(self, tmp_path: Path):
+        """Organizations are counted per category, other entity types ignored."""
+        documents = [
+            ("/docs/a.pdf", "Finanzen", "Telekom", "ORGANIZATION"),
+            ("/docs/b.pdf", "Finanzen", "Telekom", "Organization"),
+            ("/docs/c.pdf", "Verträge", "Telekom", "ORGANIZATION"),
+            ("/docs/d.pdf", "Privat", "John Doe", "PERSON"),
+        ]
+
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            for index, (path, category, name, entity_type) in enumerate(documents):
+                kg.ingest(
+                    {
+                        "path": path,
+                        "hash": f"hash{index}",
+                        "timestamp": int(time.time()),
+                        "category": category,
+                        "entities": [{"name": name, "type": entity_type}],
+                    }
+                )
+
+            counts = sorted(kg.get_sender_category_counts())
+
+        assert counts == [("Telekom", "Finanzen", 2), ("Telekom", "Verträge", 1)]
+
+    def test_raises_without_connection(self, tmp_path: Path):
+        """A closed graph raises KnowledgeGraphError."""
+        kg = KnowledgeGraph(db_path=tmp_path / "test_graph.db")
+        kg.close()
+
+        with pytest.raises(KnowledgeGraphError):
+            kg.get_sender_category_counts()
+
+
+class TestConcurrentAccess:
+    """Tests for sharing one graph between threads and async tasks."""
+
+    @staticmethod
+    def _document(zone: int, index: int) -> Dict[str, Any]:
+        return {
+            "path": f"/zone{zone}/doc_{index}.pdf",
+            "hash": f"hash{zone}_{index}",
+            "timestamp": 1704067200,
+            "category": "Finanzen",
+            "entities": [{"name": "Telekom", "type": "ORGANIZATION"}],
+        }
+
+    def test_parallel_ingest_from_several_threads(self, tmp_path: Path):
+        """Zones ingesting at the same time lose no documents."""
+        errors: list = []
+
+        def ingest_zone(kg: KnowledgeGraph, zone: int) -> None:
+            try:
+                for index in range(10):
+                    kg.ingest(self._document(zone, index))
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            threads = [
+                threading.Thread(target=ingest_zone, args=(kg, zone))
+                for zone in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+
+            assert errors == []
+            result = kg._conn.execute("MATCH (d:Document) RETURN count(d)")
+            assert result.get_next()[0] == 60
+            assert kg.get_sender_category_counts() == [("Telekom", "Finanzen", 60)]
+
+    def test_queries_do_not_wait_for_writer(self, tmp_path: Path):
+        """Reads use their own connection while a write is in progress."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest(self._document(0, 0))
+
+            with kg._write_lock:
+                kg._conn.execute("BEGIN TRANSACTION")
+                kg._conn.execute("MATCH (d:Document) DETACH DELETE d")
+
+                # The uncommitted delete is not visible to readers
+                assert kg.get_sender_category_counts() == [("Telekom", "Finanzen", 1)]
+
+                kg._conn.execute("ROLLBACK")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_use_separate_connections(self, tmp_path: Path):
+        """Async queries run in parallel on pooled connections."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest_many([self._document(0, index) for index in range(3)])
+            mock_response = {
+                "cypher": "MATCH (d:Document) RETURN DISTINCT d.path",
+                "explanation": "Alle Dokumente",
+            }
+
+            with patch.object(
+                kg, "_call_gemini_for_text", new_callable=AsyncMock
+            ) as mock_call:
+                mock_call.return_value = mock_response
+                results = await asyncio.gather(
+                    *(kg.query_documents("Alle Dokumente") for _ in range(8))
+                )
+
+            assert all(len(paths) == 3 for paths in results)
+            stats = kg.connection_stats()
+            assert stats["in_use"] == 0
+            assert 1 <= stats["open"] <= stats["size"]
+
+    def test_pool_limits_concurrent_readers(self, tmp_path: Path):
+        """Callers beyond the pool size wait for a free connection."""
+        with KnowledgeGraph(
+            db_path=tmp_path / "test_graph.db", read_connections=1
+        ) as kg:
+            finished = threading.Event()
+
+            def count_senders() -> None:
+                kg.get_sender_category_counts()
+                finished.set()
+
+            with kg._readers.connection():
+                waiting = threading.Thread(target=count_senders)
+                waiting.start()
+                assert not finished.wait(0.1)
+
+            assert finished.wait(5)
+            waiting.join(5)
+            assert kg.connection_stats() == {"size": 1, "open": 1, "in_use": 0}
+
+    def test_closed_graph_refuses_queries(self, tmp_path: Path):
+        """Reads after close() raise KnowledgeGraphError."""
+        kg = KnowledgeGraph(db_path=tmp_path / "test_graph.db")
+        kg.get_sender_category_counts()
+        kg.close()
+
+        with pytest.raises(KnowledgeGraphError):
+            kg._read("MATCH (d:Document) RETURN count(d)")
+
+
+class TestQueryShortcuts:
+    """Tests for answering questions without a new AI translation."""
+
+    MOCK_RESPONSE = {
+        "cypher": "MATCH (d:Document) WHERE d.summary CONTAINS 'Rechnung' "
+        "RETURN DISTINCT d.path",
+        "explanation": "Sucht Rechnungen",
+    }
+
+    @staticmethod
+    def _ingest(kg: KnowledgeGraph) -> None:
+        kg.ingest_many(
+            [
+                {
+                    "path": "/docs/telekom_2024.pdf",
+                    "hash": "a",
+                    "timestamp": 1710000000,
+                    "summary": "Rechnung März",
+                    "category": "Finanzen",
+                    "entities": [{"name": "Telekom", "type": "ORGANIZATION"}],
+                },
+                {
+                    "path": "/docs/telekom_2023.pdf",
+                    "hash": "b",
+                    "timestamp": 1680000000,
+                    "summary": "Vertrag",
+                    "category": "Verträge",
+                    "entities": [{"name": "Telekom", "type": "ORGANIZATION"}],
+                },
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_template_question_needs_no_ai(self, tmp_path: Path):
+        """Entity, category and year questions are answered locally."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            self._ingest(kg)
+
+            with patch.object(
+                kg, "_call_gemini_for_text", new_callable=AsyncMock
+            ) as mock_call:
+                by_entity = await kg.query_documents("Dokumente von Telekom")
+                by_year = await kg.query_documents("Telekom 2024")
+                by_category = await kg.query_documents("Verträge")
+
+            mock_call.assert_not_awaited()
+            assert sorted(by_entity) == [
+                "/docs/telekom_2023.pdf",
+                "/docs/telekom_2024.pdf",
+            ]
+            assert by_year == ["/docs/telekom_2024.pdf"]
+            assert by_category == ["/docs/telekom_2023.pdf"]
+
+    @pytest.mark.asyncio
+    async def test_new_names_are_used_after_ingest(self, tmp_path: Path):
+        """Names written after the first query are known to templates."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            self._ingest(kg)
+            await kg.query_documents("Telekom")
+            kg.ingest(
+                {
+                    "path": "/docs/apple.pdf",
+                    "hash": "c",
+                    "timestamp": 1710000000,
+                    "entities": [{"name": "Apple", "type": "ORGANIZATION"}],
+                }
+            )
+
+            with patch.object(
+                kg, "_call_gemini_for_text", new_callable=AsyncMock
+            ) as mock_call:
+                result = await kg.query_documents("Apple")
+
+            mock_call.assert_not_awaited()
+            assert result == ["/docs/apple.pdf"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_question_uses_cached_translation(self, tmp_path: Path):
+        """The AI translates a question once, also across instances."""
+        db_path = tmp_path / "test_graph.db"
+        with KnowledgeGraph(db_path=db_path) as kg:
+            self._ingest(kg)
+            with patch.object(
+                kg, "_call_gemini_for_text", new_callable=AsyncMock
+            ) as mock_call:
+                mock_call.return_value = self.MOCK_RESPONSE
+                first = await kg.query_documents("Rechnungen von Telekom")
+                second = await kg.query_documents("rechnungen von telekom?")
+
+            assert mock_call.await_count == 1
+            assert first == second == ["/docs/telekom_2024.pdf"]
+
+        with KnowledgeGraph(db_path=db_path) as kg:
+            with patch.object(
+                kg, "_call_gemini_for_text", new_callable=AsyncMock
+            ) as mock_call:
+                result = await kg.query_documents("Rechnungen von Telekom")
+
+            mock_call.assert_not_awaited()
+            assert result == ["/docs/telekom_2024.pdf"]
+
+    @pytest.mark.asyncio
+    async def test_failing_translation_is_not_cached(self, tmp_path: Path):
+        """Translations that do not run are requested again."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            with patch.object(
+                kg, "_call_gemini_for_text", new_callable=AsyncMock
+            ) as mock_call:
+                mock_call.return_value = {
+                    "cypher": "MATCH (d:Unknown) RETURN d.path",
+                    "explanation": "",
+                }
+                for _ in range(2):
+                    with pytest.raises(KnowledgeGraphError):
+                        await kg.query_documents("Rechnungen von Telekom")
+
+            assert mock_call.await_count == 2
+            assert kg._get_query_cache().stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_ai_client_is_reused(self, tmp_path: Path):
+        """Translations share one AI client."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            with patch("folder_extractor.core.ai_async.AsyncGeminiClient") as client:
+                client.return_value.generate_response = AsyncMock(
+                    return_value=self.MOCK_RESPONSE
+                )
+                await kg._call_gemini_for_text("prompt 1")
+                await kg._call_gemini_for_text("prompt 2")
+
+            assert client.call_count == 1
+            assert client.return_value.generate_response.await_count == 2
+
+
+class TestPagedQueries:
+    """Tests for cursor pagination and async iteration of query results."""
+
+    @staticmethod
+    def _ingest(kg: KnowledgeGraph, count: int) -> None:
+        # Every document mentions two entities, so a plain MATCH over
+        # MENTIONS returns each path twice
+        kg.ingest_many(
+            [
+                {
+                    "path": f"/docs/{i:02d}.pdf",
+                    "hash": f"h{i}",
+                    "timestamp": 1710000000,
+                    "entities": [
+                        {"name": "Telekom", "type": "ORGANIZATION"},
+                        {"name": "Apple", "type": "ORGANIZATION"},
+                    ],
+                }
+                for i in range(count)
+            ]
+        )
+
+    @staticmethod
+    def _translate(cypher: str) -> AsyncMock:
+        return AsyncMock(return_value={"cypher": cypher, "explanation": ""})
+
+    @pytest.mark.asyncio
+    async def test_pages_follow_cursor_without_duplicates(self, tmp_path: Path):
+        """Following the cursor returns every document exactly once."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            self._ingest(kg, 7)
+            kg._translate_to_cypher = self._translate(
+                "MATCH (d:Document)-[:MENTIONS]->(e:Entity) RETURN d.path"
+            )
+
+            pages = []
+            cursor = None
+            while True:
+                page = await kg.query_documents_page("Alle", 3, cursor)
+                pages.append(page.paths)
+                cursor = page.cursor
+                if cursor is None:
+                    break
+
+            assert pages == [
+                ["/docs/00.pdf", "/docs/01.pdf", "/docs/02.pdf"],
+                ["/docs/03.pdf", "/docs/04.pdf", "/docs/05.pdf"],
+                ["/docs/06.pdf"],
+            ]
+
+    @pytest.mark.asyncio
+    async def test_iter_documents_translates_once(self, tmp_path: Path):
+        """The iterator yields pages of one translation."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            self._ingest(kg, 5)
+            kg._translate_to_cypher = self._translate(
+                "MATCH (d:Document) RETURN DISTINCT d.path"
+            )
+
+            pages = [paths async for paths in kg.iter_documents("Alle", 2)]
+
+            assert [len(paths) for paths in pages] == [2, 2, 1]
+            assert kg._translate_to_cypher.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_other_query_shapes_are_paged_by_offset(self, tmp_path: Path):
+        """Queries that cannot be rewritten are still paged and deduplicated."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            self._ingest(kg, 5)
+            kg._translate_to_cypher = self._translate(
+                "MATCH (d:Document)-[:MENTIONS]->(e:Entity) "
+                "RETURN d.path ORDER BY d.path DESC"
+            )
+
+            first = await kg.query_documents_page("Alle", 3)
+            second = await kg.query_documents_page("Alle", 3, first.cursor)
+
+            assert first.paths == ["/docs/04.pdf", "/docs/03.pdf", "/docs/02.pdf"]
+            assert second.paths == ["/docs/01.pdf", "/docs/00.pdf"]
+            assert second.cursor is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_of_other_question_is_rejected(self, tmp_path: Path):
+        """A cursor only continues the question it was issued for."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            self._ingest(kg, 3)
+            kg._translate_to_cypher = self._translate(
+                "MATCH (d:Document) RETURN DISTINCT d.path"
+            )
+            page = await kg.query_documents_page("Alle", 1)
+
+            with pytest.raises(KnowledgeGraphError, match="cursor"):
+                await kg.query_documents_page("Andere Frage", 1, page.cursor)
+            with pytest.raises(KnowledgeGraphError, match="cursor"):
+                await kg.query_documents_page("Alle", 1, "kein-cursor")
+
+    def test_paged_cypher_keeps_match_and_adds_keyset(self):
+        """The final RETURN becomes a sorted DISTINCT page."""
+        paged = _paged_cypher(
+            "MATCH (d:Document) WHERE d.timestamp > 0 RETURN DISTINCT d.path",
+            limited=True,
+        )
+
+        assert paged == (
+            "MATCH (d:Document) WHERE d.timestamp > 0 WITH DISTINCT d.path AS path "
+            "WHERE path IS NOT NULL AND path > $page_after "
+            "RETURN path ORDER BY path LIMIT $page_limit"
+        )
+        assert _paged_cypher("MATCH (d:Document) RETURN d.path LIMIT 5", True) is None
+
+
+class TestSearchDocuments:
+    """Tests for search_documents() on the local full-text index."""
+
+    DOCUMENT = {
+        "path": "/docs/Finanzen/rechnung_maerz.pdf",
+        "hash": "abc",
+        "timestamp": 1710000000,
+        "summary": "Finanzen",
+        "category": "Finanzen",
+        "sender": "Telekom",
+        "year": "2024",
+        "entities": [{"name": "Telekom Deutschland GmbH", "type": "ORGANIZATION"}],
+    }
+
+    def test_ingested_documents_are_searchable(self, tmp_path: Path):
+        """ingest() keeps the index in sync, including sender and year."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            kg.ingest(self.DOCUMENT)
+
+            assert kg.search_documents("Telekom 2024") == [self.DOCUMENT["path"]]
+            assert kg.search_documents("Rechnungen Deutschland") == [
+                self.DOCUMENT["path"]
+            ]
+            assert kg.search_documents("Telekom 2023") == []
+
+    def test_failed_ingest_is_not_indexed(self, tmp_path: Path):
+        """Only documents written to the graph are indexed."""
+        document = dict(self.DOCUMENT, timestamp="not a number")
+
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            with pytest.raises(KnowledgeGraphError):
+                kg.ingest(document)
+
+            assert kg.search_documents("Telekom") == []
+
+    def test_existing_graph_is_backfilled(self, tmp_path: Path):
+        """Documents ingested before the index existed are indexed on open."""
+        db_path = tmp_path / "test_graph.db"
+        with KnowledgeGraph(db_path=db_path) as kg:
+            kg.ingest(self.DOCUMENT)
+        (tmp_path / "search_index.db").unlink()
+
+        with KnowledgeGraph(db_path=db_path) as kg:
+            assert kg.search_documents("Telekom Deutschland Finanzen") == [
+                self.DOCUMENT["path"]
+            ]
+
+    def test_empty_query_raises(self, tmp_path: Path):
+        """An empty query is rejected."""
+        with KnowledgeGraph(db_path=tmp_path / "test_graph.db") as kg:
+            with pytest.raises(KnowledgeGraphError):
+                kg.search_documents("  ")
+
+
 class TestGetSchemaInfo:
     """Tests for _get_schema_info() method that generates schema description for Cypher prompts."""
 
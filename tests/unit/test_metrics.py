@@ -0,0 +1,106 @@
+"""Unit tests for the in-process metrics registry.
+
+Tests verify that @timed records calls, failures and latency only while
+the registry is enabled and that render() produces the Prometheus text
+format, including gauges.
+"""
+
+import asyncio
+
+import pytest
+
+from folder_extractor.core.metrics import MetricsRegistry, timed
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    registry = MetricsRegistry(buckets=[0.1, 1.0])
+    registry.enable()
+    return registry
+
+
+class TestTimed:
+    """Tests for the @timed decorator."""
+
+    def test_records_calls_and_failures(self, registry: MetricsRegistry) -> None:
+        """Every call is counted; raised exceptions count as failures."""
+
+        @timed("hash", registry)
+        def work(fail: bool) -> str:
+            if fail:
+                raise OSError("Lesefehler")
+            return "ok"
+
+        assert work(False) == "ok"
+        with pytest.raises(OSError):
+            work(True)
+
+        stats = registry.snapshot()["hash"]
+        assert stats["count"] == 2
+        assert stats["errors"] == 1
+        assert stats["sum"] >= 0
+
+    def test_records_coroutine_functions(self, registry: MetricsRegistry) -> None:
+        """Coroutine functions stay coroutine functions and are timed."""
+
+        @timed("analyze", registry)
+        async def analyze() -> int:
+            await asyncio.sleep(0)
+            return 42
+
+        assert asyncio.iscoroutinefunction(analyze)
+        assert asyncio.run(analyze()) == 42
+        assert registry.snapshot()["analyze"]["count"] == 1
+
+    def test_disabled_registry_records_nothing(self, registry: MetricsRegistry) -> None:
+        """While disabled, calls pass straight through."""
+
+        @timed("move", registry)
+        def move() -> None:
+            """Move a file."""
+
+        registry.disable()
+        move()
+
+        assert registry.snapshot() == {}
+        assert move.__doc__ == "Move a file."
+
+
+class TestRender:
+    """Tests for the Prometheus text exposition."""
+
+    def test_histogram_buckets_are_cumulative(self, registry: MetricsRegistry) -> None:
+        """Each bucket counts the observations up to its bound."""
+        for seconds in (0.05, 0.5, 5.0):
+            registry.observe("ingest", seconds)
+        registry.observe("ingest", 0.05, error=True)
+
+        text = registry.render()
+        name = "folder_extractor_operation_duration_seconds"
+        assert f'{name}_bucket{{operation="ingest",le="0.1"}} 2' in text
+        assert f'{name}_bucket{{operation="ingest",le="1.0"}} 3' in text
+        assert f'{name}_bucket{{operation="ingest",le="+Inf"}} 4' in text
+        assert f'{name}_count{{operation="ingest"}} 4' in text
+        assert 'folder_extractor_operation_errors_total{operation="ingest"} 1' in text
+        assert f"# TYPE {name} histogram" in text
+
+    def test_gauges_are_collected_on_render(self, registry: MetricsRegistry) -> None:
+        """Gauge values are read per render; failing collectors are skipped."""
+        depths = {"zone-a": 3}
+        registry.register_gauge("queue_depth", "Waiting files.", "zone", lambda: depths)
+        registry.register_gauge("broken", "Fails.", "zone", lambda: 1 / 0)
+
+        assert 'folder_extractor_queue_depth{zone="zone-a"} 3' in registry.render()
+        depths["zone-a"] = 0
+        text = registry.render()
+        assert 'folder_extractor_queue_depth{zone="zone-a"} 0' in text
+        assert "folder_extractor_broken" not in text
+
+        registry.unregister_gauge("queue_depth")
+        assert "queue_depth" not in registry.render()
+
+    def test_label_values_are_escaped(self, registry: MetricsRegistry) -> None:
+        """Quotes and backslashes in label values are escaped."""
+        registry.register_gauge("depth", "Depth.", "zone", lambda: {'a"b\\c': 1})
+
+        assert 'folder_extractor_depth{zone="a\\"b\\\\c"} 1' in registry.render()
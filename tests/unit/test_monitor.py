@@ -5,10 +5,13 @@ are fully written and ready for processing in watch mode.
 """
 
 import logging
+import sys
 import threading
 import time
 from unittest.mock import patch
 
+import pytest
+
 from folder_extractor.core.state_manager import StateManager
 
 
@@ -146,8 +149,10 @@ class TestStabilityMonitor:
         abort_thread = threading.Thread(target=trigger_abort)
         abort_thread.start()
 
+        # Keep the file "locked" so it never becomes ready on its own
         start = time.time()
-        result = self.monitor.wait_for_file_ready(test_file, timeout=10)
+        with patch.object(self.monitor, "_is_file_locked", return_value=True):
+            result = self.monitor.wait_for_file_ready(test_file, timeout=10)
         elapsed = time.time() - start
 
         abort_thread.join()
@@ -244,3 +249,236 @@ class TestStabilityMonitor:
         assert elapsed < 0.5
         # Result depends on whether file passes immediate stability check
         assert isinstance(result, bool)
+
+
+class TestStabilityMonitorEvents:
+    """Tests for inotify-driven readiness and adaptive polling."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.state_manager = StateManager()
+
+    def test_stable_file_waits_for_quiet_period(self, tmp_path):
+        """Without a close event, the size must stay unchanged for the window."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(self.state_manager, stability_window=0.5)
+        test_file = tmp_path / "fertig.txt"
+        test_file.write_text("done")
+
+        start = time.monotonic()
+        result = monitor.wait_for_file_ready(test_file, timeout=5)
+
+        assert result is True
+        assert 0.5 <= time.monotonic() - start < 3
+
+    def test_writer_pause_does_not_end_wait(self, tmp_path):
+        """A writer pausing shorter than the window is waited for."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(self.state_manager, use_inotify=False)
+        test_file = tmp_path / "netzwerk.bin"
+        test_file.write_bytes(b"x" * 1024)
+
+        def writer():
+            for _ in range(3):
+                time.sleep(0.4)
+                with open(test_file, "ab") as f:
+                    f.write(b"x" * 1024)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        result = monitor.wait_for_file_ready(test_file, timeout=10)
+        size = test_file.stat().st_size
+        thread.join()
+
+        assert result is True
+        assert size == 4 * 1024
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")
+    def test_close_write_wakes_waiter(self, tmp_path):
+        """Closing a file after writing marks it ready via inotify."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(self.state_manager, poll_interval=0.5)
+        if not monitor.use_inotify:
+            pytest.skip("inotify not available")
+        test_file = tmp_path / "download.bin"
+
+        def writer():
+            with open(test_file, "wb") as f:
+                for _ in range(5):
+                    f.write(b"x" * 1024)
+                    f.flush()
+                    time.sleep(0.1)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        result = monitor.wait_for_file_ready(test_file, timeout=5)
+        thread.join()
+
+        assert result is True
+        assert test_file.stat().st_size == 5 * 1024
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")
+    def test_moved_to_marks_file_ready(self, tmp_path):
+        """A file renamed into place is ready immediately."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(self.state_manager, poll_interval=5.0)
+        if not monitor.use_inotify:
+            pytest.skip("inotify not available")
+        partial = tmp_path / "file.part"
+        partial.write_text("content")
+        target = tmp_path / "file.txt"
+
+        def rename_later():
+            time.sleep(0.2)
+            partial.rename(target)
+
+        thread = threading.Thread(target=rename_later)
+        thread.start()
+        start = time.monotonic()
+        result = monitor.wait_for_file_ready(target, timeout=10)
+        thread.join()
+
+        assert result is True
+        assert time.monotonic() - start < 3
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")
+    def test_close_before_wait_is_remembered(self, tmp_path):
+        """A tracked file closed before the wait starts is ready at once."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(self.state_manager, stability_window=5)
+        if not monitor.use_inotify:
+            pytest.skip("inotify not available")
+        test_file = tmp_path / "scan.pdf"
+        test_file.touch()
+        monitor.track(test_file)
+        test_file.write_bytes(b"x" * 1024)
+        time.sleep(0.2)  # Let the reader thread see IN_CLOSE_WRITE
+
+        start = time.monotonic()
+        result = monitor.wait_for_file_ready(test_file, timeout=10)
+
+        assert result is True
+        assert time.monotonic() - start < 0.5
+        assert monitor._tracked == {}
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")
+    def test_write_after_close_waits_for_next_close(self, tmp_path):
+        """A writer reopening the file cancels an earlier close event."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(self.state_manager, stability_window=5)
+        if not monitor.use_inotify:
+            pytest.skip("inotify not available")
+        test_file = tmp_path / "export.csv"
+        test_file.touch()
+        monitor.track(test_file)
+        test_file.write_text("erste Zeile\n")
+        reopened = threading.Event()
+
+        def writer():
+            with open(test_file, "a") as f:
+                f.write("zweite Zeile\n")
+                f.flush()
+                reopened.set()
+                time.sleep(0.7)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        assert reopened.wait(5)
+        time.sleep(0.2)  # Let the reader thread see IN_MODIFY
+
+        start = time.monotonic()
+        result = monitor.wait_for_file_ready(test_file, timeout=10)
+        thread.join()
+
+        assert result is True
+        assert 0.4 <= time.monotonic() - start < 3
+
+    def test_tracked_rename_is_ready_without_inotify(self, tmp_path):
+        """A file reported as renamed into place skips the quiet period."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(
+            self.state_manager, use_inotify=False, stability_window=5
+        )
+        test_file = tmp_path / "download.pdf"
+        test_file.write_text("content")
+        monitor.track(test_file, completed=True)
+
+        start = time.monotonic()
+        assert monitor.wait_for_file_ready(test_file, timeout=10) is True
+        assert time.monotonic() - start < 1
+
+    def test_forget_ends_tracking(self, tmp_path):
+        """Forgotten files are no longer tracked; unknown paths are ignored."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(self.state_manager)
+        test_file = tmp_path / "deleted.pdf"
+        monitor.track(test_file)
+
+        monitor.forget(test_file)
+        monitor.forget(test_file)
+        monitor.mark_completed(test_file)
+
+        assert monitor._tracked == {}
+
+    def test_polling_fallback_without_inotify(self, tmp_path):
+        """Monitor falls back to polling when inotify is unavailable."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        with patch(
+            "folder_extractor.core.monitor._get_inotify_watcher", return_value=None
+        ):
+            monitor = StabilityMonitor(self.state_manager)
+        test_file = tmp_path / "polled.txt"
+        test_file.write_text("content")
+
+        assert monitor.use_inotify is False
+        assert monitor.wait_for_file_ready(test_file, timeout=5) is True
+
+    def test_use_inotify_false_disables_events(self):
+        """Event-driven detection can be switched off explicitly."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(self.state_manager, use_inotify=False)
+
+        assert monitor.use_inotify is False
+
+    def test_interval_backs_off_while_file_changes(self, tmp_path):
+        """The check interval doubles while the file keeps changing."""
+        from folder_extractor.core.monitor import StabilityMonitor
+
+        monitor = StabilityMonitor(
+            self.state_manager,
+            use_inotify=False,
+            poll_interval=0.01,
+            max_poll_interval=0.04,
+            stability_window=0,
+        )
+        test_file = tmp_path / "changing.txt"
+        test_file.write_text("x")
+        sizes = iter([1, 2, 3, 4, 4])
+        real_stat = test_file.stat()
+        sleeps = []
+
+        class FakeStat:
+            def __init__(self, size):
+                self.st_size = size
+                self.st_mtime = real_stat.st_mtime
+                self.st_mode = real_stat.st_mode
+
+        with patch.object(
+            type(test_file), "stat", lambda *a, **k: FakeStat(next(sizes, 4))
+        ), patch.object(type(test_file), "exists", return_value=True), patch(
+            "folder_extractor.core.monitor.time.sleep", side_effect=sleeps.append
+        ):
+            result = monitor.wait_for_file_ready(test_file, timeout=5)
+
+        assert result is True
+        assert sleeps[:4] == [0.01, 0.02, 0.04, 0.04]
@@ -0,0 +1,522 @@
+"""Unit tests for the watch mode processing pipeline.
+
+Tests verify that WatchPipeline decouples event intake from the stability
+and processing stages, limits concurrency, applies backpressure and exposes
+queue depth metrics.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from folder_extractor.core.pipeline import (
+    AsyncLoopThread,
+    EventCoalescer,
+    PipelineStats,
+    WatchPipeline,
+)
+
+
+def _always_ready(filepath: Path, timeout: float) -> bool:
+    return True
+
+
+class TestWatchPipeline:
+    """Tests for WatchPipeline class."""
+
+    def test_submit_returns_immediately_while_stages_block(self) -> None:
+        """Submitting does not wait for the stability stage."""
+        release = threading.Event()
+
+        def slow_ready(filepath: Path, timeout: float) -> bool:
+            release.wait(5)
+            return True
+
+        pipeline = WatchPipeline(slow_ready, lambda path: None, stability_workers=1)
+        try:
+            start = time.monotonic()
+            for i in range(20):
+                assert pipeline.submit(Path(f"/tmp/file{i}.txt"), 60) is True
+            assert time.monotonic() - start < 1.0
+        finally:
+            release.set()
+            assert pipeline.wait_idle(5)
+            pipeline.stop()
+
+    def test_all_submitted_files_are_processed(self) -> None:
+        """Every ready file reaches the processing stage exactly once."""
+        processed = []
+        lock = threading.Lock()
+
+        def process(filepath: Path) -> None:
+            with lock:
+                processed.append(filepath)
+
+        pipeline = WatchPipeline(_always_ready, process, workers=3)
+        files = [Path(f"/tmp/doc{i}.pdf") for i in range(50)]
+        for f in files:
+            pipeline.submit(f, 60)
+
+        assert pipeline.wait_idle(5)
+        pipeline.stop()
+
+        assert sorted(processed) == sorted(files)
+        assert pipeline.stats().processed == 50
+
+    def test_stability_waits_run_concurrently(self) -> None:
+        """Slow stability checks overlap instead of running one after another."""
+
+        def slow_ready(filepath: Path, timeout: float) -> bool:
+            time.sleep(0.3)
+            return True
+
+        pipeline = WatchPipeline(slow_ready, lambda path: None, stability_workers=10)
+        start = time.monotonic()
+        for i in range(10):
+            pipeline.submit(Path(f"/tmp/file{i}.txt"), 60)
+
+        assert pipeline.wait_idle(5)
+        pipeline.stop()
+
+        assert time.monotonic() - start < 2.0
+
+    def test_processing_concurrency_is_limited(self) -> None:
+        """No more than `workers` files are processed at the same time."""
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def process(filepath: Path) -> None:
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+
+        pipeline = WatchPipeline(_always_ready, process, workers=2)
+        for i in range(10):
+            pipeline.submit(Path(f"/tmp/file{i}.txt"), 60)
+
+        assert pipeline.wait_idle(5)
+        pipeline.stop()
+
+        assert peak[0] == 2
+
+    def test_duplicate_submission_is_ignored(self) -> None:
+        """A path already in the pipeline is not queued twice."""
+        release = threading.Event()
+        pipeline = WatchPipeline(
+            lambda path, timeout: release.wait(5), lambda path: None
+        )
+        try:
+            assert pipeline.submit(Path("/tmp/same.txt"), 60) is True
+            assert pipeline.submit(Path("/tmp/same.txt"), 60) is False
+        finally:
+            release.set()
+            pipeline.wait_idle(5)
+            pipeline.stop()
+
+    def test_full_queue_blocks_submit_until_room(self) -> None:
+        """When the intake queue is full, submit waits instead of dropping."""
+        release = threading.Event()
+        processed = []
+        pipeline = WatchPipeline(
+            lambda path, timeout: release.wait(5),
+            processed.append,
+            stability_workers=1,
+            max_queue_size=1,
+        )
+        try:
+            pipeline.submit(Path("/tmp/a.txt"), 60)
+            # Wait until the worker has taken the first file
+            deadline = time.monotonic() + 2
+            while pipeline.stats().waiting == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert pipeline.submit(Path("/tmp/b.txt"), 60) is True
+
+            results = []
+            blocked = threading.Thread(
+                target=lambda: results.append(pipeline.submit(Path("/tmp/c.txt"), 60))
+            )
+            blocked.start()
+            blocked.join(0.3)
+            assert blocked.is_alive()
+
+            release.set()
+            blocked.join(5)
+            assert results == [True]
+            assert pipeline.wait_idle(5)
+            assert sorted(p.name for p in processed) == ["a.txt", "b.txt", "c.txt"]
+        finally:
+            release.set()
+            pipeline.stop()
+
+    def test_stop_releases_blocked_submit(self) -> None:
+        """A submit blocked on a full queue returns False when stopping."""
+        release = threading.Event()
+        done = []
+        pipeline = WatchPipeline(
+            lambda path, timeout: release.wait(5),
+            lambda path: None,
+            on_done=done.append,
+            stability_workers=1,
+            max_queue_size=1,
+        )
+        pipeline.submit(Path("/tmp/a.txt"), 60)
+        deadline = time.monotonic() + 2
+        while pipeline.stats().waiting == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        pipeline.submit(Path("/tmp/b.txt"), 60)
+
+        results = []
+        blocked = threading.Thread(
+            target=lambda: results.append(pipeline.submit(Path("/tmp/c.txt"), 60))
+        )
+        blocked.start()
+        blocked.join(0.3)
+        try:
+            pipeline.stop(timeout=0.5)
+            blocked.join(5)
+        finally:
+            release.set()
+
+        assert results == [False]
+        assert Path("/tmp/c.txt") in done
+        assert pipeline.stats().pending == 0
+
+    def test_not_ready_files_are_not_processed(self) -> None:
+        """Files failing the stability check skip the processing stage."""
+        processed = []
+        done = []
+        pipeline = WatchPipeline(
+            lambda path, timeout: False, processed.append, on_done=done.append
+        )
+        pipeline.submit(Path("/tmp/never.txt"), 1)
+
+        assert pipeline.wait_idle(5)
+        pipeline.stop()
+
+        assert processed == []
+        assert done == [Path("/tmp/never.txt")]
+        assert pipeline.stats().not_ready == 1
+
+    def test_processing_error_is_counted_and_worker_survives(self) -> None:
+        """Exceptions in the processing stage do not kill the worker."""
+        processed = []
+
+        def process(filepath: Path) -> None:
+            if filepath.name == "bad.txt":
+                raise RuntimeError("boom")
+            processed.append(filepath)
+
+        pipeline = WatchPipeline(_always_ready, process, workers=1)
+        pipeline.submit(Path("/tmp/bad.txt"), 60)
+        pipeline.submit(Path("/tmp/good.txt"), 60)
+
+        assert pipeline.wait_idle(5)
+        pipeline.stop()
+
+        assert processed == [Path("/tmp/good.txt")]
+        stats = pipeline.stats()
+        assert stats.failed == 1
+        assert stats.processed == 1
+
+    def test_stats_report_queue_depth(self) -> None:
+        """Queue depth counts pending, waiting and ready files."""
+        release = threading.Event()
+        pipeline = WatchPipeline(
+            lambda path, timeout: release.wait(5),
+            lambda path: None,
+            stability_workers=1,
+        )
+        try:
+            for i in range(5):
+                pipeline.submit(Path(f"/tmp/file{i}.txt"), 60)
+
+            stats = pipeline.stats().to_dict()
+            assert stats["queue_depth"] == 5
+            assert stats["pending"] + stats["waiting"] == 5
+        finally:
+            release.set()
+            pipeline.wait_idle(5)
+            pipeline.stop()
+
+    def test_stop_releases_queued_files(self) -> None:
+        """Stopping discards queued files and reports them as done."""
+        release = threading.Event()
+        done = []
+        pipeline = WatchPipeline(
+            lambda path, timeout: release.wait(0.5),
+            lambda path: None,
+            on_done=done.append,
+            stability_workers=1,
+        )
+        for i in range(5):
+            pipeline.submit(Path(f"/tmp/file{i}.txt"), 60)
+
+        pipeline.stop(timeout=2)
+
+        assert len(done) == 5
+        assert pipeline.submit(Path("/tmp/late.txt"), 60) is False
+        assert not pipeline.is_running
+
+    def test_requires_at_least_one_worker(self) -> None:
+        """Zero workers is rejected."""
+        with pytest.raises(ValueError):
+            WatchPipeline(_always_ready, lambda path: None, workers=0)
+
+
+class TestPipelineStats:
+    """Tests for PipelineStats dataclass."""
+
+    def test_queue_depth_sums_unstarted_stages(self) -> None:
+        """Queue depth excludes files already being processed."""
+        stats = PipelineStats(pending=2, waiting=3, ready=4, processing=1)
+
+        assert stats.queue_depth == 9
+        assert stats.to_dict()["queue_depth"] == 9
+
+
+class TestWatchPipelineBatching:
+    """Tests for batched processing of ready files."""
+
+    def test_ready_files_are_processed_in_batches(self) -> None:
+        """Files queued while a batch runs are handed over together."""
+        batches = []
+        gate = threading.Event()
+
+        def process_batch(filepaths):
+            batches.append(list(filepaths))
+            gate.wait(5)
+
+        pipeline = WatchPipeline(
+            _always_ready,
+            None,
+            process_batch=process_batch,
+            workers=1,
+            batch_size=100,
+        )
+        pipeline.submit(Path("/tmp/first.txt"), 60)
+        deadline = time.monotonic() + 2
+        while not batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for i in range(5):
+            pipeline.submit(Path(f"/tmp/file{i}.txt"), 60)
+        while pipeline.stats().ready < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        gate.set()
+
+        assert pipeline.wait_idle(5)
+        pipeline.stop()
+
+        assert batches[0] == [Path("/tmp/first.txt")]
+        assert len(batches[1]) == 5
+        assert pipeline.stats().processed == 6
+
+    def test_batch_size_limits_batch(self) -> None:
+        """No batch contains more than batch_size files."""
+        batches = []
+        gate = threading.Event()
+
+        def process_batch(filepaths):
+            batches.append(len(filepaths))
+            gate.wait(5)
+
+        pipeline = WatchPipeline(
+            _always_ready, None, process_batch=process_batch, workers=1, batch_size=3
+        )
+        for i in range(7):
+            pipeline.submit(Path(f"/tmp/file{i}.txt"), 60)
+        gate.set()
+
+        assert pipeline.wait_idle(5)
+        pipeline.stop()
+
+        assert max(batches) <= 3
+        assert sum(batches) == 7
+
+    def test_requires_process_or_process_batch(self) -> None:
+        """A pipeline without processing stage is rejected."""
+        with pytest.raises(ValueError):
+            WatchPipeline(_always_ready, None)
+
+
+class TestEventCoalescer:
+    """Tests for EventCoalescer class."""
+
+    def setup_method(self) -> None:
+        """Set up a coalescer that records forwarded paths."""
+        self.forwarded = []
+        self.coalescer = EventCoalescer(
+            lambda path, kind: self.forwarded.append((path, kind)), window=0.05
+        )
+
+    def teardown_method(self) -> None:
+        """Stop the flush thread."""
+        self.coalescer.stop()
+
+    def test_repeated_events_forward_path_once(self) -> None:
+        """Several events for one path within the window are merged."""
+        path = Path("/tmp/doc.pdf")
+        self.coalescer.add(path)
+        self.coalescer.touch(path)
+        self.coalescer.add(path)
+
+        assert self.coalescer.wait_idle(2)
+        assert self.forwarded == [(path, "created")]
+        assert self.coalescer.merged_count == 2
+
+    def test_events_extend_the_window(self) -> None:
+        """A path is not forwarded while events keep arriving."""
+        path = Path("/tmp/growing.bin")
+        self.coalescer.add(path)
+        for _ in range(5):
+            time.sleep(0.03)
+            self.coalescer.touch(path)
+            assert self.forwarded == []
+
+        assert self.coalescer.wait_idle(2)
+        assert self.forwarded == [(path, "created")]
+
+    def test_move_replaces_pending_source(self) -> None:
+        """create + move chains collapse into the final destination path."""
+        partial = Path("/tmp/file.part")
+        final = Path("/tmp/file.pdf")
+        self.coalescer.add(partial)
+        self.coalescer.move(partial, final)
+
+        assert self.coalescer.wait_idle(2)
+        assert self.forwarded == [(final, "moved")]
+
+    def test_touch_ignores_unknown_paths(self) -> None:
+        """Modified events alone do not forward a path."""
+        self.coalescer.touch(Path("/tmp/edited.txt"))
+
+        assert self.coalescer.wait_idle(2)
+        assert self.forwarded == []
+
+    def test_discard_drops_pending_path(self) -> None:
+        """A deleted path is never forwarded."""
+        path = Path("/tmp/deleted.txt")
+        self.coalescer.add(path)
+        self.coalescer.discard(path)
+
+        assert self.coalescer.wait_idle(2)
+        assert self.forwarded == []
+
+    def test_flush_forwards_immediately(self) -> None:
+        """flush() does not wait for the quiet window."""
+        self.coalescer.window = 60
+        self.coalescer.add(Path("/tmp/a.txt"))
+        self.coalescer.flush()
+
+        assert self.forwarded == [(Path("/tmp/a.txt"), "created")]
+        assert self.coalescer.pending_count == 0
+
+
+class TestAsyncLoopThread:
+    """Tests for AsyncLoopThread class."""
+
+    def setup_method(self) -> None:
+        """Set up a loop thread with two concurrency slots."""
+        self.loop_thread = AsyncLoopThread(concurrency=2, name="test-loop")
+
+    def teardown_method(self) -> None:
+        """Stop the loop thread."""
+        self.loop_thread.stop(timeout=1)
+
+    def test_run_returns_coroutine_result(self) -> None:
+        """run() blocks until the coroutine finished and returns its result."""
+
+        async def answer() -> int:
+            await asyncio.sleep(0)
+            return 42
+
+        assert self.loop_thread.run(answer(), timeout=5) == 42
+
+    def test_coroutines_share_one_event_loop(self) -> None:
+        """All submitted coroutines run on the same long-lived loop."""
+
+        async def current_loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        first = self.loop_thread.run(current_loop(), timeout=5)
+        second = self.loop_thread.run(current_loop(), timeout=5)
+
+        assert first is second
+        assert not first.is_closed()
+
+    def test_concurrency_is_limited(self) -> None:
+        """No more than `concurrency` coroutines run at the same time."""
+        active = [0]
+        peak = [0]
+
+        async def work() -> None:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.05)
+            active[0] -= 1
+
+        futures = [self.loop_thread.submit(work()) for _ in range(6)]
+        for future in futures:
+            future.result(5)
+
+        assert peak[0] == 2
+
+    def test_submit_does_not_block(self) -> None:
+        """submit() returns while the coroutine is still running."""
+        release = threading.Event()
+
+        async def wait_for_release() -> None:
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+
+        future = self.loop_thread.submit(wait_for_release())
+        assert not future.done()
+        assert self.loop_thread.pending_count == 1
+
+        release.set()
+        assert self.loop_thread.wait_idle(5)
+        assert future.done()
+
+    def test_exceptions_propagate_to_future(self) -> None:
+        """Errors raised by a coroutine are re-raised by run()."""
+
+        async def fail() -> None:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            self.loop_thread.run(fail(), timeout=5)
+
+    def test_stop_cancels_stuck_coroutines(self) -> None:
+        """Coroutines still running after the stop timeout are cancelled."""
+
+        async def forever() -> None:
+            await asyncio.sleep(60)
+
+        future = self.loop_thread.submit(forever())
+        self.loop_thread.stop(timeout=0.1)
+
+        assert future.cancelled()
+        assert not self.loop_thread.is_running
+        assert self.loop_thread.pending_count == 0
+
+    def test_submit_after_stop_raises(self) -> None:
+        """A stopped loop thread rejects new coroutines."""
+
+        async def noop() -> None:
+            return None
+
+        self.loop_thread.stop()
+
+        with pytest.raises(RuntimeError):
+            self.loop_thread.submit(noop())
+
+    def test_requires_positive_concurrency(self) -> None:
+        """Zero concurrency is rejected."""
+        with pytest.raises(ValueError):
+            AsyncLoopThread(concurrency=0)
@@ -0,0 +1,268 @@
+"""
+Unit tests for the local pre-classifier.
+
+Tests cover:
+- Default rules by extension, file type group and filename pattern
+- Custom rules from the settings and the minimum confidence
+- EXIF and PDF metadata (screenshot markers, years, senders)
+- Sender rules learned from the knowledge graph
+- Hit statistics
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+from pypdf import PdfWriter
+
+from folder_extractor.config.constants import DEFAULT_CATEGORIES
+from folder_extractor.config.settings import Settings
+from folder_extractor.core.preclassifier import PreClassifier
+
+
+@pytest.fixture
+def empty_graph():
+    """Knowledge graph without past decisions."""
+    kg = MagicMock()
+    kg.get_sender_category_counts.return_value = []
+    return kg
+
+
+@pytest.fixture
+def classifier(empty_graph):
+    """PreClassifier with default rules and no learned senders."""
+    return PreClassifier(knowledge_graph=empty_graph)
+
+
+def _write_pdf(path: Path, **metadata: str) -> Path:
+    """Write a one-page PDF with document information."""
+    writer = PdfWriter()
+    writer.add_blank_page(width=100, height=100)
+    writer.add_metadata(metadata)
+    with open(path, "wb") as handle:
+        writer.write(handle)
+    return path
+
+
+class TestDefaultRules:
+    """Tests for the built-in rules."""
+
+    @pytest.mark.parametrize(
+        ("filename", "category"),
+        [
+            ("Installer.dmg", "Technik"),
+            ("setup.EXE", "Technik"),
+            ("backup.zip", "Technik"),
+            ("script.py", "Technik"),
+            ("Urlaub.mp4", "Privat"),
+            ("Screenshot 2024-05-01 at 10.00.00.png", "Privat"),
+            ("Bildschirmfoto 2023-01-02 um 09.15.00.png", "Privat"),
+        ],
+    )
+    def test_obvious_files_are_classified(
+        self, classifier, tmp_path, filename, category
+    ):
+        """Files recognizable by name alone get a category."""
+        filepath = tmp_path / filename
+        filepath.write_bytes(b"data")
+
+        result = classifier.classify(filepath, DEFAULT_CATEGORIES)
+
+        assert result is not None
+        assert result["category"] == category
+        assert result["source"] == "preclassifier"
+        assert result["confidence"] >= classifier.min_confidence
+        assert result["entities"] == []
+
+    def test_unknown_document_is_left_to_ai(self, classifier, tmp_path):
+        """A document without evidence returns None."""
+        filepath = tmp_path / "scan_0042.pdf"
+        _write_pdf(filepath)
+
+        assert classifier.classify(filepath, DEFAULT_CATEGORIES) is None
+
+    def test_year_is_taken_from_filename(self, classifier, tmp_path):
+        """Screenshots named with a date get the year."""
+        filepath = tmp_path / "Screenshot 2024-05-01 at 10.00.00.png"
+        filepath.write_bytes(b"data")
+
+        result = classifier.classify(filepath, DEFAULT_CATEGORIES)
+
+        assert result["year"] == "2024"
+
+    def test_rule_for_inactive_category_is_skipped(self, classifier, tmp_path):
+        """Rules only apply if their category is active."""
+        filepath = tmp_path / "Installer.dmg"
+        filepath.write_bytes(b"data")
+
+        assert classifier.classify(filepath, ["Finanzen", "Privat"]) is None
+
+
+class TestSettings:
+    """Tests for custom rules and the confidence threshold."""
+
+    def test_custom_rules_take_precedence(self, empty_graph, tmp_path):
+        """Custom rules are tried before the defaults."""
+        settings = Settings()
+        settings.set(
+            "preclassifier_rules",
+            [
+                {
+                    "name": "software",
+                    "extensions": [".dmg"],
+                    "category": "Arbeit",
+                    "confidence": 0.99,
+                }
+            ],
+        )
+        filepath = tmp_path / "Installer.dmg"
+        filepath.write_bytes(b"data")
+
+        classifier = PreClassifier(settings=settings, knowledge_graph=empty_graph)
+        result = classifier.classify(filepath, DEFAULT_CATEGORIES)
+
+        assert result["category"] == "Arbeit"
+
+    def test_rules_below_min_confidence_are_ignored(self, empty_graph, tmp_path):
+        """Raising the threshold sends files to the AI again."""
+        settings = Settings()
+        settings.set("preclassifier_min_confidence", 0.99)
+        filepath = tmp_path / "backup.zip"
+        filepath.write_bytes(b"data")
+
+        classifier = PreClassifier(settings=settings, knowledge_graph=empty_graph)
+
+        assert classifier.classify(filepath, DEFAULT_CATEGORIES) is None
+
+
+class TestMetadata:
+    """Tests for EXIF and PDF metadata."""
+
+    def test_exif_screenshot_marker(self, classifier, tmp_path):
+        """Images marked as screenshot in EXIF are classified, with EXIF year."""
+        filepath = tmp_path / "IMG_0001.jpg"
+        exif = Image.Exif()
+        exif[306] = "2022:03:04 10:00:00"
+        exif.get_ifd(0x8769)[37510] = b"ASCII\x00\x00\x00Screenshot"
+        Image.new("RGB", (10, 10)).save(filepath, exif=exif)
+
+        result = classifier.classify(filepath, DEFAULT_CATEGORIES)
+
+        assert result is not None
+        assert result["category"] == "Privat"
+        assert result["year"] == "2022"
+
+    def test_photo_without_marker_is_left_to_ai(self, classifier, tmp_path):
+        """Plain photos are not classified."""
+        filepath = tmp_path / "IMG_0002.jpg"
+        Image.new("RGB", (10, 10)).save(filepath)
+
+        assert classifier.classify(filepath, DEFAULT_CATEGORIES) is None
+
+    def test_unreadable_metadata_is_ignored(self, classifier, tmp_path):
+        """Corrupt files fall through to the AI without raising."""
+        filepath = tmp_path / "broken.pdf"
+        filepath.write_bytes(b"not a pdf")
+
+        assert classifier.classify(filepath, DEFAULT_CATEGORIES) is None
+
+
+class TestSenderRules:
+    """Tests for sender rules learned from the knowledge graph."""
+
+    @pytest.fixture
+    def graph(self):
+        """Knowledge graph with past decisions."""
+        kg = MagicMock()
+        kg.get_sender_category_counts.return_value = [
+            ("Telekom Deutschland GmbH", "Finanzen", 12),
+            ("Stadtwerke", "Finanzen", 2),  # Too few documents
+            ("Allianz", "Verträge", 5),
+            ("Allianz", "Finanzen", 5),  # No clear category
+        ]
+        return kg
+
+    def test_sender_in_pdf_metadata(self, graph, tmp_path):
+        """A learned sender in the PDF author yields its category."""
+        filepath = _write_pdf(
+            tmp_path / "rechnung.pdf",
+            **{"/Author": "Telekom Deutschland", "/CreationDate": "D:20230115"},
+        )
+
+        result = PreClassifier(knowledge_graph=graph).classify(
+            filepath, DEFAULT_CATEGORIES
+        )
+
+        assert result["category"] == "Finanzen"
+        assert result["sender"] == "Telekom Deutschland GmbH"
+        assert result["year"] == "2023"
+        assert result["entities"] == [
+            {"name": "Telekom Deutschland GmbH", "type": "Organization"}
+        ]
+
+    def test_sender_in_filename(self, graph, tmp_path):
+        """A learned sender in the filename yields its category."""
+        filepath = tmp_path / "telekom-deutschland_2024_03.pdf"
+        _write_pdf(filepath)
+
+        result = PreClassifier(knowledge_graph=graph).classify(
+            filepath, DEFAULT_CATEGORIES
+        )
+
+        assert result["category"] == "Finanzen"
+        assert result["year"] == "2024"
+
+    @pytest.mark.parametrize("filename", ["stadtwerke.pdf", "allianz.pdf"])
+    def test_uncertain_senders_are_not_learned(self, graph, tmp_path, filename):
+        """Senders with few or mixed documents are left to the AI."""
+        filepath = _write_pdf(tmp_path / filename)
+
+        result = PreClassifier(knowledge_graph=graph).classify(
+            filepath, DEFAULT_CATEGORIES
+        )
+
+        assert result is None
+
+    def test_senders_are_loaded_once(self, graph, tmp_path):
+        """Learned rules are cached between files."""
+        classifier = PreClassifier(knowledge_graph=graph)
+        for name in ("a.pdf", "b.pdf"):
+            classifier.classify(_write_pdf(tmp_path / name), DEFAULT_CATEGORIES)
+
+        assert graph.get_sender_category_counts.call_count == 1
+
+    def test_unavailable_graph_disables_sender_rules(self, tmp_path):
+        """Errors of the knowledge graph are not propagated."""
+        with patch(
+            "folder_extractor.core.memory.graph.get_knowledge_graph",
+            side_effect=RuntimeError("locked"),
+        ):
+            result = PreClassifier().classify(
+                _write_pdf(tmp_path / "telekom.pdf"), DEFAULT_CATEGORIES
+            )
+
+        assert result is None
+
+
+class TestStats:
+    """Tests for hit statistics."""
+
+    def test_stats_count_hits_and_saved_calls(self, classifier, tmp_path):
+        """Every hit is one AI call saved."""
+        for name in ("a.zip", "b.dmg", "c.pdf", "d.pdf"):
+            (tmp_path / name).write_bytes(b"data")
+            classifier.classify(tmp_path / name, DEFAULT_CATEGORIES)
+
+        assert classifier.stats() == {
+            "checked": 4,
+            "hits": 2,
+            "hit_rate": 0.5,
+            "api_calls_saved": 2,
+        }
+
+    def test_stats_without_files(self, classifier):
+        """The hit rate is zero before any file was checked."""
+        assert classifier.stats()["hit_rate"] == 0.0
@@ -1141,3 +1141,356 @@ class TestPrepareFile:
         assert len(result) == 2
         assert isinstance(result[0], Path)
         assert isinstance(result[1], bool)
+
+
+class TestFastPaths:
+    """Tests for the JPEG draft decoding and PDF page tree fast paths."""
+
+    def test_large_jpeg_is_decoded_in_draft_mode(self, tmp_path):
+        """Large JPEGs are downscaled by the decoder before resizing."""
+        from unittest.mock import patch
+
+        from PIL import Image
+        from PIL.JpegImagePlugin import JpegImageFile
+
+        input_image = tmp_path / "scan.jpg"
+        Image.new("RGB", (5000, 3000), color="white").save(input_image, "JPEG")
+
+        preprocessor = FilePreprocessor()
+        with patch.object(
+            JpegImageFile, "draft", autospec=True, side_effect=JpegImageFile.draft
+        ) as mock_draft:
+            result_path = preprocessor._optimize_image(input_image)
+
+        mock_draft.assert_called_once()
+        with Image.open(result_path) as result_img:
+            assert max(result_img.size) == PREPROCESSOR_MAX_IMAGE_DIMENSION
+
+    def test_small_jpeg_is_not_decoded_in_draft_mode(self, tmp_path):
+        """Images within the size limit are decoded normally."""
+        from unittest.mock import patch
+
+        from PIL import Image
+        from PIL.JpegImagePlugin import JpegImageFile
+
+        input_image = tmp_path / "photo.jpg"
+        Image.new("RGB", (800, 600), color="white").save(input_image, "JPEG")
+
+        with patch.object(JpegImageFile, "draft") as mock_draft:
+            FilePreprocessor()._optimize_image(input_image)
+
+        mock_draft.assert_not_called()
+
+    def test_short_pdf_is_counted_without_flattening_page_tree(self, tmp_path):
+        """The page count comes from the page tree root."""
+        from unittest.mock import patch
+
+        from pypdf import PdfReader, PdfWriter
+
+        input_pdf = tmp_path / "document.pdf"
+        writer = PdfWriter()
+        for _ in range(3):
+            writer.add_blank_page(width=612, height=792)
+        with open(input_pdf, "wb") as f:
+            writer.write(f)
+
+        with patch.object(PdfReader, "_flatten") as mock_flatten:
+            result_path = FilePreprocessor()._optimize_pdf(input_pdf)
+
+        assert result_path == input_pdf
+        mock_flatten.assert_not_called()
+
+    def test_page_count_falls_back_to_page_list(self):
+        """A missing /Count entry falls back to pypdf's page list."""
+        from unittest.mock import MagicMock
+
+        reader = MagicMock()
+        reader.root_object = {"/Pages": {}}
+        reader.pages = [object()] * 7
+
+        assert FilePreprocessor._count_pdf_pages(reader) == 7
+
+
+class TestPreprocessingCache:
+    """Tests for caching optimized outputs by source hash."""
+
+    @pytest.fixture
+    def exotic_image(self, tmp_path):
+        """Fixture providing a BMP image that always needs optimization."""
+        from PIL import Image
+
+        path = tmp_path / "scan.bmp"
+        Image.new("RGB", (100, 100), color="red").save(path, "BMP")
+        return path
+
+    def test_output_is_moved_into_cache(self, tmp_path, exotic_image):
+        """Optimized outputs belong to the cache and need no cleanup."""
+        cache_dir = tmp_path / "cache"
+        preprocessor = FilePreprocessor(cache_dir=cache_dir)
+
+        result_path, needs_cleanup = preprocessor.prepare_file(exotic_image)
+
+        assert needs_cleanup is False
+        assert result_path.parent == cache_dir
+        assert result_path.suffix == ".jpg"
+        assert not list(cache_dir.glob("*.part"))
+
+    def test_concurrent_stores_use_separate_partial_files(self, tmp_path):
+        """Two stores of the same key never write the same partial file."""
+        import os
+        from pathlib import Path
+        from unittest.mock import patch
+
+        cache_dir = tmp_path / "cache"
+        preprocessor = FilePreprocessor(cache_dir=cache_dir)
+        partials = []
+        real_replace = os.replace
+
+        def record(src, dst):
+            partials.append(Path(src).name)
+            real_replace(src, dst)
+
+        with patch("folder_extractor.core.preprocessor.os.replace", record):
+            for content in (b"first", b"second"):
+                work_dir = tmp_path / content.decode()
+                work_dir.mkdir()
+                optimized = work_dir / "out.jpg"
+                optimized.write_bytes(content)
+                preprocessor._store("key", optimized, True)
+
+        assert len(set(partials)) == 2
+        assert (cache_dir / "key.jpg").read_bytes() == b"second"
+
+    def test_identical_source_is_not_optimized_again(self, tmp_path, exotic_image):
+        """A second request for the same content is served from the cache."""
+        from unittest.mock import patch
+
+        preprocessor = FilePreprocessor(cache_dir=tmp_path / "cache")
+        first, _ = preprocessor.prepare_file(exotic_image)
+
+        with patch.object(preprocessor, "_optimize") as mock_optimize:
+            second, needs_cleanup = preprocessor.prepare_file(exotic_image)
+
+        mock_optimize.assert_not_called()
+        assert second == first
+        assert needs_cleanup is False
+
+    def test_known_content_hash_skips_hashing(self, tmp_path, exotic_image):
+        """A hash passed by the caller is used as the cache key."""
+        from unittest.mock import patch
+
+        preprocessor = FilePreprocessor(cache_dir=tmp_path / "cache")
+
+        with patch.object(preprocessor._file_ops, "calculate_file_hash") as mock_hash:
+            result_path, _ = preprocessor.prepare_file(exotic_image, "abc123")
+
+        mock_hash.assert_not_called()
+        assert result_path.name.startswith("abc123_")
+
+    def test_least_recently_used_outputs_are_evicted(self, tmp_path):
+        """The cache stays below its size limit."""
+        from PIL import Image
+
+        cache_dir = tmp_path / "cache"
+        preprocessor = FilePreprocessor(cache_dir=cache_dir, cache_max_bytes=1)
+        paths = []
+        for color in ("red", "green"):
+            path = tmp_path / f"{color}.bmp"
+            Image.new("RGB", (50, 50), color=color).save(path, "BMP")
+            paths.append(preprocessor.prepare_file(path)[0])
+
+        assert not paths[0].exists()
+        assert paths[1].exists()
+
+    def test_no_cache_keeps_temporary_outputs(self, exotic_image):
+        """Without a cache directory callers clean up as before."""
+        result_path, needs_cleanup = FilePreprocessor().prepare_file(exotic_image)
+
+        assert needs_cleanup is True
+        assert result_path.name == "scan_optimized.jpg"
+
+
+class TestPrepareFileAsync:
+    """Tests for FilePreprocessor.prepare_file_async()."""
+
+    def test_small_file_returns_original(self, tmp_path):
+        """Files that need no optimization are returned unchanged."""
+        import asyncio
+
+        test_file = tmp_path / "note.txt"
+        test_file.write_text("hello")
+
+        result = asyncio.run(FilePreprocessor(workers=0).prepare_file_async(test_file))
+
+        assert result == (test_file, False)
+
+    def test_invalid_file_raises_preprocessor_error(self, tmp_path):
+        """Validation errors propagate from the worker thread."""
+        import asyncio
+
+        with pytest.raises(PreprocessorError, match="does not exist"):
+            asyncio.run(
+                FilePreprocessor(workers=0).prepare_file_async(tmp_path / "x.jpg")
+            )
+
+    def test_optimizes_in_thread_without_pool(self, tmp_path):
+        """With workers=0 optimization runs in the default executor."""
+        import asyncio
+
+        from PIL import Image
+
+        source = tmp_path / "scan.bmp"
+        Image.new("RGB", (100, 100), color="red").save(source, "BMP")
+        preprocessor = FilePreprocessor(cache_dir=tmp_path / "cache", workers=0)
+
+        result_path, needs_cleanup = asyncio.run(
+            preprocessor.prepare_file_async(source)
+        )
+
+        assert needs_cleanup is False
+        assert result_path.parent == tmp_path / "cache"
+
+    def test_optimizes_in_process_pool(self, tmp_path):
+        """With workers the optimization runs in a separate process."""
+        import asyncio
+
+        from PIL import Image
+
+        from folder_extractor.core.preprocessor import shutdown_preprocessing_pool
+
+        source = tmp_path / "scan.bmp"
+        Image.new("RGB", (100, 100), color="red").save(source, "BMP")
+        preprocessor = FilePreprocessor(workers=1)
+
+        try:
+            result_path, needs_cleanup = asyncio.run(
+                preprocessor.prepare_file_async(source)
+            )
+        finally:
+            shutdown_preprocessing_pool()
+
+        assert needs_cleanup is True
+        with Image.open(result_path) as result_img:
+            assert result_img.format == "JPEG"
+
+
+def _write_text_pdf(path, pages):
+    """Write a PDF with one line of Helvetica text per page."""
+    from pypdf import PdfWriter
+    from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for text in pages:
+        page = writer.add_blank_page(width=612, height=792)
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1"))
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+class TestExtractTextAsync:
+    """Tests for FilePreprocessor.extract_text_async()."""
+
+    def test_digital_pdf_returns_text(self, tmp_path):
+        """Text of a digital PDF is extracted from its pages."""
+        import asyncio
+
+        pdf = _write_text_pdf(
+            tmp_path / "rechnung.pdf", ["Rechnung Telekom " * 20, "Seite zwei"]
+        )
+
+        text = asyncio.run(FilePreprocessor(workers=0).extract_text_async(pdf))
+
+        assert text.startswith("Rechnung Telekom")
+        assert "Seite zwei" in text
+
+    def test_text_is_cut_to_byte_limit(self, tmp_path):
+        """Only the first PREPROCESSOR_TEXT_MAX_BYTES are returned."""
+        import asyncio
+        from unittest.mock import patch
+
+        pdf = _write_text_pdf(tmp_path / "lang.pdf", ["Rechnung " * 100] * 3)
+
+        with patch(
+            "folder_extractor.core.preprocessor.PREPROCESSOR_TEXT_MAX_BYTES", 500
+        ):
+            text = asyncio.run(FilePreprocessor(workers=0).extract_text_async(pdf))
+
+        assert len(text.encode("utf-8")) == 500
+
+    def test_only_first_pages_are_read(self, tmp_path):
+        """Pages beyond PREPROCESSOR_MAX_PDF_PAGES are ignored."""
+        import asyncio
+
+        pages = [f"Seite {i} " + "Text " * 50 for i in range(8)]
+        pdf = _write_text_pdf(tmp_path / "lang.pdf", pages)
+
+        text = asyncio.run(FilePreprocessor(workers=0).extract_text_async(pdf))
+
+        assert f"Seite {PREPROCESSOR_MAX_PDF_PAGES - 1}" in text
+        assert f"Seite {PREPROCESSOR_MAX_PDF_PAGES} " not in text
+
+    def test_scanned_pdf_returns_none(self, tmp_path):
+        """PDFs without a text layer must be uploaded."""
+        import asyncio
+
+        from pypdf import PdfWriter
+
+        pdf = tmp_path / "scan.pdf"
+        writer = PdfWriter()
+        writer.add_blank_page(width=100, height=100)
+        with open(pdf, "wb") as f:
+            writer.write(f)
+
+        assert asyncio.run(FilePreprocessor(workers=0).extract_text_async(pdf)) is None
+
+    @pytest.mark.parametrize(
+        ("name", "content"),
+        [("foto.jpg", b"fake image data"), ("kaputt.pdf", b"not a pdf")],
+    )
+    def test_other_files_return_none(self, tmp_path, name, content):
+        """Images and unreadable PDFs fall back to the upload."""
+        import asyncio
+
+        path = tmp_path / name
+        path.write_bytes(content)
+
+        assert asyncio.run(FilePreprocessor(workers=0).extract_text_async(path)) is None
+
+    def test_disabled_text_mode_returns_none(self, tmp_path):
+        """With text_first=False every file is uploaded."""
+        import asyncio
+
+        pdf = _write_text_pdf(tmp_path / "rechnung.pdf", ["Rechnung " * 50])
+        preprocessor = FilePreprocessor(workers=0, text_first=False)
+
+        assert asyncio.run(preprocessor.extract_text_async(pdf)) is None
+
+    def test_extracts_in_process_pool(self, tmp_path):
+        """With workers the extraction runs in a separate process."""
+        import asyncio
+
+        from folder_extractor.core.preprocessor import shutdown_preprocessing_pool
+
+        pdf = _write_text_pdf(tmp_path / "rechnung.pdf", ["Rechnung " * 50])
+
+        try:
+            text = asyncio.run(FilePreprocessor(workers=1).extract_text_async(pdf))
+        finally:
+            shutdown_preprocessing_pool()
+
+        assert text.startswith("Rechnung")
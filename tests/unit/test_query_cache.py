@@ -0,0 +1,119 @@
+"""
+Unit tests for the natural language → Cypher translation cache.
+
+Tests cover:
+- Normalization of questions
+- Storing and retrieving translations by question and fingerprint
+- LRU eviction and persistence
+- Fail-safe behavior with an unusable database
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from folder_extractor.core.memory.query_cache import CypherQueryCache, normalize_query
+
+TRANSLATION = {
+    "cypher": "MATCH (d:Document) RETURN DISTINCT d.path",
+    "explanation": "Alle Dokumente",
+}
+
+
+class TestNormalizeQuery:
+    """Tests for normalize_query function."""
+
+    @pytest.mark.parametrize(
+        "variant",
+        [
+            "Rechnungen von Telekom 2024",
+            "  rechnungen   von TELEKOM 2024?",
+            "„Rechnungen von Telekom, 2024!“",
+        ],
+    )
+    def test_trivial_variants_are_equal(self, variant):
+        """Case, punctuation and whitespace are ignored."""
+        assert normalize_query(variant) == "rechnungen von telekom 2024"
+
+    def test_words_are_kept(self):
+        """Different questions stay different."""
+        assert normalize_query("Verträge 2024") != normalize_query("Verträge 2023")
+
+
+class TestCypherQueryCache:
+    """Tests for CypherQueryCache class."""
+
+    def test_put_and_get_roundtrip(self, tmp_path: Path):
+        """A stored translation is returned for a variant of the question."""
+        cache = CypherQueryCache(db_path=tmp_path / "query_cache.db")
+
+        cache.put("Alle Dokumente", "fp", TRANSLATION)
+
+        assert cache.get("alle dokumente?", "fp") == TRANSLATION
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 0}
+
+    def test_different_fingerprint_misses(self, tmp_path: Path):
+        """Translations are not reused after the prompt or model changed."""
+        cache = CypherQueryCache(db_path=tmp_path / "query_cache.db")
+        cache.put("Alle Dokumente", "old-fp", TRANSLATION)
+
+        assert cache.get("Alle Dokumente", "new-fp") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_translations_persist_across_instances(self, tmp_path: Path):
+        """The cache survives a restart."""
+        db_path = tmp_path / "query_cache.db"
+        cache = CypherQueryCache(db_path=db_path)
+        cache.put("Alle Dokumente", "fp", TRANSLATION)
+        cache.close()
+
+        assert CypherQueryCache(db_path=db_path).get("Alle Dokumente", "fp") == (
+            TRANSLATION
+        )
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path: Path):
+        """Beyond max_entries the least recently used translations are dropped."""
+        cache = CypherQueryCache(db_path=tmp_path / "query_cache.db", max_entries=2)
+        cache.put("a", "fp", {"cypher": "a"})
+        time.sleep(0.01)
+        cache.put("b", "fp", {"cypher": "b"})
+        time.sleep(0.01)
+        cache.get("a", "fp")  # "a" is now more recent than "b"
+        time.sleep(0.01)
+        cache.put("c", "fp", {"cypher": "c"})
+
+        assert cache.get("b", "fp") is None
+        assert cache.get("a", "fp") == {"cypher": "a"}
+        assert cache.get("c", "fp") == {"cypher": "c"}
+
+    def test_clear_removes_all_entries(self, tmp_path: Path):
+        """clear() empties the cache."""
+        cache = CypherQueryCache(db_path=tmp_path / "query_cache.db")
+        cache.put("Alle Dokumente", "fp", TRANSLATION)
+
+        cache.clear()
+
+        assert cache.stats()["entries"] == 0
+
+    def test_unusable_database_disables_cache(self, tmp_path: Path):
+        """A corrupt database file does not raise, the cache just misses."""
+        db_path = tmp_path / "query_cache.db"
+        db_path.write_bytes(b"this is not a sqlite database" * 100)
+
+        cache = CypherQueryCache(db_path=db_path)
+        cache.put("Alle Dokumente", "fp", TRANSLATION)
+
+        assert not cache.enabled
+        assert cache.get("Alle Dokumente", "fp") is None
+
+    def test_default_location_is_config_dir(self, tmp_path: Path, monkeypatch):
+        """Without db_path the cache lives in the config root directory."""
+        monkeypatch.setattr(
+            "folder_extractor.core.memory.query_cache.get_config_dir",
+            lambda: tmp_path,
+        )
+
+        assert CypherQueryCache().db_path == tmp_path / "query_cache.db"
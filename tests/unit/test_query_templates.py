@@ -0,0 +1,92 @@
+"""
+Unit tests for the local knowledge graph query templates.
+
+Tests cover:
+- Questions naming an entity, a category and/or a year
+- Longest-name matching
+- Questions left to the AI (extra words, several names, no names)
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from folder_extractor.core.memory.query_templates import match_query_template
+
+CATEGORIES = ["Finanzen", "Verträge", "Medizin"]
+ENTITIES = ["Telekom", "Telekom Deutschland GmbH", "Apple", "Dr. Müller"]
+
+
+class TestMatchingQuestions:
+    """Tests for questions answered by a template."""
+
+    def test_entity(self):
+        """A lone entity filters by MENTIONS."""
+        result = match_query_template("Zeig mir Apple Dokumente", CATEGORIES, ENTITIES)
+
+        assert result["cypher"] == (
+            "MATCH (d:Document), (d)-[:MENTIONS]->(:Entity {name: $entity}) "
+            "RETURN DISTINCT d.path"
+        )
+        assert result["parameters"] == {"entity": "Apple"}
+        assert result["explanation"].startswith("Lokale Vorlage")
+
+    def test_category_and_year(self):
+        """The year becomes a timestamp range in UTC."""
+        result = match_query_template("Verträge aus 2024", CATEGORIES, ENTITIES)
+
+        assert "BELONGS_TO" in result["cypher"]
+        assert "d.timestamp >= $year_start" in result["cypher"]
+        assert result["parameters"] == {
+            "category": "Verträge",
+            "year_start": 1704067200,
+            "year_end": 1735689600,
+        }
+
+    def test_entity_category_and_year(self):
+        """All three criteria are combined."""
+        result = match_query_template("Finanzen von Telekom 2023", CATEGORIES, ENTITIES)
+
+        assert result["parameters"]["category"] == "Finanzen"
+        assert result["parameters"]["entity"] == "Telekom"
+        assert result["parameters"]["year_start"] == 1672531200
+
+    def test_names_are_matched_case_insensitively(self):
+        """The stored spelling is used as parameter."""
+        result = match_query_template("alle dokumente von apple", CATEGORIES, ENTITIES)
+
+        assert result["parameters"] == {"entity": "Apple"}
+
+    def test_longest_name_wins(self):
+        """A longer entity containing a shorter one is preferred."""
+        result = match_query_template(
+            "Telekom Deutschland GmbH 2024", CATEGORIES, ENTITIES
+        )
+
+        assert result["parameters"]["entity"] == "Telekom Deutschland GmbH"
+
+    def test_names_with_punctuation(self):
+        """Entity names are normalized like the question."""
+        result = match_query_template("Dokumente von Dr. Müller", CATEGORIES, ENTITIES)
+
+        assert result["parameters"] == {"entity": "Dr. Müller"}
+
+
+class TestQuestionsLeftToAI:
+    """Tests for questions that need the AI."""
+
+    @pytest.mark.parametrize(
+        "question",
+        [
+            "Rechnungen von Telekom 2024",  # "Rechnungen" is no category here
+            "Apple oder Telekom",  # Two entities
+            "Finanzen und Verträge",  # Two categories
+            "Verträge 2023 2024",  # Two years
+            "Alle Dokumente",  # No criterion
+            "Welche Verträge laufen aus?",  # Extra words
+            "Applepay Dokumente",  # Names only match whole words
+        ],
+    )
+    def test_returns_none(self, question):
+        """No template is applied."""
+        assert match_query_template(question, CATEGORIES, ENTITIES) is None
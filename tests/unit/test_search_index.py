@@ -0,0 +1,205 @@
+"""
+Unit tests for the local full-text document index.
+
+Tests cover:
+- Turning questions into search terms
+- Searching by filename, category, sender, year and entities
+- Updating and keeping existing entries
+- Renaming and removing entries of moved and deleted documents
+- Fail-safe behavior with an unusable database
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from folder_extractor.core.memory.search_index import (
+    DocumentSearchIndex,
+    _search_terms,
+)
+
+
+def _doc(path: str, **fields) -> dict:
+    return {"path": path, "hash": "h", "timestamp": 1704067200, **fields}
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> DocumentSearchIndex:
+    """Index with a few documents."""
+    index = DocumentSearchIndex(db_path=tmp_path / "search_index.db")
+    index.add_many(
+        [
+            _doc(
+                "/docs/Finanzen/Telekom/2024/rechnung_maerz.pdf",
+                summary="Finanzen",
+                category="Finanzen",
+                sender="Telekom",
+                year="2024",
+                entities=[{"name": "Telekom Deutschland GmbH", "type": "ORG"}],
+            ),
+            _doc(
+                "/docs/Verträge/Allianz/2023/police.pdf",
+                category="Verträge",
+                sender="Allianz",
+                year="2023",
+            ),
+            _doc(
+                "/docs/Medizin/arztbrief.pdf",
+                category="Medizin",
+                entities=[{"name": "Dr. Müller", "type": "PERSON"}],
+            ),
+        ]
+    )
+    return index
+
+
+class TestSearchTerms:
+    """Tests for _search_terms function."""
+
+    def test_filler_words_are_dropped(self):
+        """Only meaningful words become terms."""
+        assert _search_terms("Zeig mir alle Dokumente von Telekom") == ['"telekom"*']
+
+    def test_plural_endings_are_stripped(self):
+        """Plural forms match the singular as prefix."""
+        assert _search_terms("Rechnungen 2024") == ['"rechnung"*', '"2024"*']
+
+    def test_only_filler_words(self):
+        """A question without keywords yields no terms."""
+        assert _search_terms("Zeig mir alle Dokumente") == []
+
+
+class TestSearch:
+    """Tests for DocumentSearchIndex.search()."""
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("Telekom", "rechnung_maerz.pdf"),
+            ("Rechnungen von Telekom 2024", "rechnung_maerz.pdf"),
+            ("Deutschland GmbH", "rechnung_maerz.pdf"),
+            ("Verträge 2023", "police.pdf"),
+            ("vertrage allianz", "police.pdf"),
+            ("Arztbriefe Dr. Müller", "arztbrief.pdf"),
+        ],
+    )
+    def test_finds_documents_by_any_field(self, index, query, expected):
+        """Filename, category, sender, year and entities are searchable."""
+        results = index.search(query)
+
+        assert [Path(path).name for path in results] == [expected]
+
+    def test_every_word_must_match(self, index):
+        """Words are combined with AND."""
+        assert index.search("Telekom 2023") == []
+
+    def test_limit(self, index):
+        """No more than limit results are returned."""
+        assert len(index.search("pdf", limit=2)) == 2
+
+    def test_query_without_keywords_finds_nothing(self, index):
+        """Filler words alone do not list the whole index."""
+        assert index.search("alle Dokumente") == []
+
+    def test_search_syntax_is_not_interpreted(self, index):
+        """FTS5 operators in the question cannot break the query."""
+        assert index.search('Telekom" OR "Allianz') == []
+
+
+class TestAddMany:
+    """Tests for DocumentSearchIndex.add_many()."""
+
+    def test_existing_document_is_replaced(self, index):
+        """Re-ingesting a document updates its fields."""
+        path = "/docs/Medizin/arztbrief.pdf"
+
+        index.add_many([_doc(path, category="Privat")])
+
+        assert index.search("Privat") == [path]
+        assert index.search("Müller") == []
+        assert index.count() == 3
+
+    def test_replace_false_keeps_existing_entries(self, index):
+        """Backfilling does not overwrite richer entries."""
+        path = "/docs/Verträge/Allianz/2023/police.pdf"
+
+        index.add_many([_doc(path, category="Privat")], replace=False)
+
+        assert index.search("Allianz") == [path]
+        assert index.search("Privat") == []
+
+    def test_entries_persist_across_instances(self, index, tmp_path):
+        """The index survives a restart."""
+        index.close()
+
+        reopened = DocumentSearchIndex(db_path=tmp_path / "search_index.db")
+
+        assert reopened.count() == 3
+
+    def test_clear_removes_all_documents(self, index):
+        """clear() empties the index."""
+        index.clear()
+
+        assert index.count() == 0
+        assert index.search("Telekom") == []
+
+
+class TestRenameAndRemove:
+    """Tests for DocumentSearchIndex.rename_many() and remove_many()."""
+
+    def test_rename_moves_entry_and_filename(self, index):
+        """A renamed document is found under its new path and name."""
+        old = "/docs/Medizin/arztbrief.pdf"
+        new = "/archiv/befund_2024.pdf"
+
+        index.rename_many([(old, new)])
+
+        assert index.search("Müller") == [new]
+        assert index.search("befund") == [new]
+        assert index.search("arztbrief") == []
+        assert index.count() == 3
+
+    def test_rename_onto_existing_entry_drops_old(self, index):
+        """The entry at the new path wins; the old entry disappears."""
+        old = "/docs/Medizin/arztbrief.pdf"
+        new = "/docs/Verträge/Allianz/2023/police.pdf"
+
+        index.rename_many([(old, new)])
+
+        assert index.search("Allianz") == [new]
+        assert index.search("Müller") == []
+        assert index.count() == 2
+
+    def test_remove_many(self, index):
+        """Removed documents are no longer found; unknown paths are ignored."""
+        index.remove_many(["/docs/Medizin/arztbrief.pdf", "/unknown.pdf"])
+
+        assert index.search("Müller") == []
+        assert index.count() == 2
+
+
+class TestFailSafe:
+    """Tests for an unusable database."""
+
+    def test_unusable_database_disables_index(self, tmp_path: Path):
+        """A corrupt database file does not raise, searches find nothing."""
+        db_path = tmp_path / "search_index.db"
+        db_path.write_bytes(b"this is not a sqlite database" * 100)
+
+        index = DocumentSearchIndex(db_path=db_path)
+        index.add_many([_doc("/docs/a.pdf", category="Finanzen")])
+
+        assert not index.enabled
+        assert index.search("Finanzen") == []
+        assert index.count() == 0
+
+    def test_default_location_is_config_dir(self, tmp_path: Path, monkeypatch):
+        """Without db_path the index lives in the config root directory."""
+        monkeypatch.setattr(
+            "folder_extractor.core.memory.search_index.get_config_dir",
+            lambda: tmp_path,
+        )
+
+        assert DocumentSearchIndex().db_path == tmp_path / "search_index.db"
@@ -331,6 +331,107 @@ class TestConfigureFromArgs:
         assert settings_fixture.get("extract_archives") is True
         assert settings_fixture.get("delete_archives") is False
 
+    def test_archive_depth_from_args(self, settings_fixture):
+        """Test that --archive-depth sets the archive nesting depth."""
+        args = MagicMock()
+        args.dry_run = False
+        args.depth = 0
+        args.include_hidden = False
+        args.sort_by_type = False
+        args.type = None
+        args.domain = None
+        args.deduplicate = False
+        args.global_dedup = False
+        args.extract_archives = True
+        args.delete_archives = False
+        args.archive_depth = 2
+
+        configure_from_args(settings_fixture, args)
+
+        assert settings_fixture.get("archive_nesting_depth") == 2
+
+    def test_watch_workers_from_args(self, settings_fixture):
+        """Test that --watch-workers sets the watch pipeline concurrency."""
+        args = MagicMock()
+        args.dry_run = False
+        args.depth = 0
+        args.include_hidden = False
+        args.sort_by_type = False
+        args.type = None
+        args.domain = None
+        args.deduplicate = False
+        args.global_dedup = False
+        args.extract_archives = False
+        args.delete_archives = False
+        args.archive_depth = None
+        args.watch_workers = 4
+
+        configure_from_args(settings_fixture, args)
+
+        assert settings_fixture.get("watch_workers") == 4
+
+    def test_ai_concurrency_from_args(self, settings_fixture):
+        """Test that --ai-concurrency limits parallel smart watch analyses."""
+        args = MagicMock()
+        args.dry_run = False
+        args.depth = 0
+        args.include_hidden = False
+        args.sort_by_type = False
+        args.type = None
+        args.domain = None
+        args.deduplicate = False
+        args.global_dedup = False
+        args.extract_archives = False
+        args.delete_archives = False
+        args.archive_depth = None
+        args.ai_concurrency = 0
+
+        configure_from_args(settings_fixture, args)
+
+        assert settings_fixture.get("watch_ai_concurrency") == 1
+
+    def test_batch_size_from_args(self, settings_fixture):
+        """Test that --batch sets the files per AI request for smart sort."""
+        args = MagicMock()
+        args.dry_run = False
+        args.depth = 0
+        args.include_hidden = False
+        args.sort_by_type = False
+        args.type = None
+        args.domain = None
+        args.deduplicate = False
+        args.global_dedup = False
+        args.extract_archives = False
+        args.delete_archives = False
+        args.archive_depth = None
+        args.batch = 20
+
+        assert settings_fixture.get("ai_batch_size") == 1
+        configure_from_args(settings_fixture, args)
+
+        assert settings_fixture.get("ai_batch_size") == 20
+
+    def test_offline_disables_ai_fallback(self, settings_fixture):
+        """Test that --offline keeps --ask on the local search index."""
+        args = MagicMock()
+        args.dry_run = False
+        args.depth = 0
+        args.include_hidden = False
+        args.sort_by_type = False
+        args.type = None
+        args.domain = None
+        args.deduplicate = False
+        args.global_dedup = False
+        args.extract_archives = False
+        args.delete_archives = False
+        args.archive_depth = None
+        args.offline = True
+
+        assert settings_fixture.get("ask_ai_fallback") is True
+        configure_from_args(settings_fixture, args)
+
+        assert settings_fixture.get("ask_ai_fallback") is False
+
     def test_delete_archives_ignored_without_extract_archives(self, settings_fixture):
         """Test that delete_archives is ignored when extract_archives is False.
 
@@ -638,3 +638,439 @@ class TestSmartSorterKnowledgeGraphIntegration:
 
                     # Result should still be returned
                     assert result == expected_result
+
+
+class TestSmartSorterResultCache:
+    """Tests for the AI result cache in SmartSorter."""
+
+    @pytest.fixture
+    def cache(self, tmp_path: Path):
+        """Fixture providing a cache in a temporary database."""
+        from folder_extractor.core.ai_cache import AIResultCache
+
+        cache = AIResultCache(db_path=tmp_path / "ai_cache.db")
+        yield cache
+        cache.close()
+
+    @pytest.fixture
+    def mock_client(self):
+        """Fixture providing an AI client returning a fixed result."""
+        client = AsyncMock()
+        client.model_name = "test-model"
+        client.analyze_file.return_value = {"category": "Finanzen", "entities": []}
+        return client
+
+    @pytest.fixture
+    def mock_settings(self):
+        """Fixture providing settings without custom categories."""
+        settings = MagicMock()
+        settings.get.return_value = []
+        return settings
+
+    @pytest.mark.asyncio
+    async def test_identical_content_is_analyzed_once(
+        self, tmp_path: Path, cache, mock_client, mock_settings
+    ):
+        """A byte-identical copy is served from the cache."""
+        original = tmp_path / "rechnung.pdf"
+        copy = tmp_path / "rechnung (1).pdf"
+        original.write_bytes(b"invoice content")
+        copy.write_bytes(b"invoice content")
+        sorter = SmartSorter(mock_client, settings=mock_settings, cache=cache)
+
+        with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            first = await sorter.process_file(original, "application/pdf")
+            second = await sorter.process_file(copy, "application/pdf")
+
+        assert first == second
+        mock_client.analyze_file.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_still_updates_knowledge_graph(
+        self, tmp_path: Path, cache, mock_client, mock_settings
+    ):
+        """Cached results are ingested with the path of the new file."""
+        test_file = tmp_path / "test.pdf"
+        test_file.write_bytes(b"content")
+        sorter = SmartSorter(mock_client, settings=mock_settings, cache=cache)
+
+        with patch(
+            "folder_extractor.core.memory.graph.get_knowledge_graph"
+        ) as mock_get_kg:
+            mock_kg = MagicMock()
+            mock_get_kg.return_value = mock_kg
+            await sorter.process_file(test_file, "application/pdf")
+            await sorter.process_file(test_file, "application/pdf")
+
+        assert mock_kg.ingest.call_count == 2
+        file_info = mock_kg.ingest.call_args[0][0]
+        assert file_info["path"] == str(test_file.resolve())
+        assert file_info["category"] == "Finanzen"
+
+    @pytest.mark.asyncio
+    async def test_changed_categories_invalidate_cache(
+        self, tmp_path: Path, cache, mock_client, mock_settings
+    ):
+        """New categories change the prompt and force a fresh analysis."""
+        test_file = tmp_path / "test.pdf"
+        test_file.write_bytes(b"content")
+        sorter = SmartSorter(mock_client, settings=mock_settings, cache=cache)
+
+        with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            await sorter.process_file(test_file, "application/pdf")
+            mock_settings.get.return_value = ["Steuern"]
+            await sorter.process_file(test_file, "application/pdf")
+
+        assert mock_client.analyze_file.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_is_not_cached(
+        self, tmp_path: Path, cache, mock_client, mock_settings
+    ):
+        """Errors propagate and leave the cache empty."""
+        test_file = tmp_path / "test.pdf"
+        test_file.write_bytes(b"content")
+        mock_client.analyze_file.side_effect = AIClientError("API down")
+        sorter = SmartSorter(mock_client, settings=mock_settings, cache=cache)
+
+        with pytest.raises(AIClientError):
+            await sorter.process_file(test_file, "application/pdf")
+
+        assert cache.stats()["entries"] == 0
+
+
+class TestSmartSorterProcessFiles:
+    """Tests for batch categorization with SmartSorter.process_files()."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Fixture providing an AI client with batch support."""
+        client = AsyncMock()
+        client.model_name = "test-model"
+        client.analyze_file.return_value = {"category": "Einzeln"}
+        client.analyze_files.side_effect = lambda files, prompt, hashes=None: [
+            {"category": f"Batch {path.name}"} for path, _ in files
+        ]
+        return client
+
+    @pytest.fixture
+    def mock_settings(self):
+        """Fixture providing settings without custom categories."""
+        settings = MagicMock()
+        settings.get.return_value = []
+        return settings
+
+    @pytest.fixture
+    def files(self, tmp_path: Path):
+        """Fixture providing five small files with distinct content."""
+        result = []
+        for i in range(5):
+            path = tmp_path / f"beleg_{i}.jpg"
+            path.write_bytes(f"receipt {i}".encode())
+            result.append((path, "image/jpeg"))
+        return result
+
+    @pytest.mark.asyncio
+    async def test_small_files_are_packed_into_batches(
+        self, mock_client, mock_settings, files
+    ):
+        """Five files with batch size 2 need three requests."""
+        sorter = SmartSorter(mock_client, settings=mock_settings)
+
+        with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            results = await sorter.process_files(files, batch_size=2)
+
+        assert mock_client.analyze_files.call_count == 3
+        mock_client.analyze_file.assert_not_called()
+        assert [r["category"] for r in results] == [
+            f"Batch beleg_{i}.jpg" for i in range(5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_one_analyzes_individually(
+        self, mock_client, mock_settings, files
+    ):
+        """Batching is disabled with a batch size of 1."""
+        sorter = SmartSorter(mock_client, settings=mock_settings)
+
+        with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            await sorter.process_files(files, batch_size=1)
+
+        mock_client.analyze_files.assert_not_called()
+        assert mock_client.analyze_file.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_large_files_are_analyzed_individually(
+        self, mock_client, mock_settings, files
+    ):
+        """Files above the batch size limit get their own request."""
+        sorter = SmartSorter(mock_client, settings=mock_settings)
+
+        with patch(
+            "folder_extractor.core.smart_sorter.AI_BATCH_MAX_FILE_SIZE", 12
+        ), patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            files[0][0].write_bytes(b"a much larger receipt")
+            results = await sorter.process_files(files, batch_size=10)
+
+        mock_client.analyze_file.assert_called_once()
+        assert results[0] == {"category": "Einzeln"}
+        assert mock_client.analyze_files.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_batch_results_fall_back_to_single_analysis(
+        self, mock_client, mock_settings, files
+    ):
+        """Files without a batch result are retried on their own."""
+        mock_client.analyze_files.side_effect = lambda batch, prompt, hashes=None: [
+            None if i == 1 else {"category": "Batch"} for i in range(len(batch))
+        ]
+        sorter = SmartSorter(mock_client, settings=mock_settings)
+
+        with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            results = await sorter.process_files(files[:3], batch_size=3)
+
+        mock_client.analyze_file.assert_called_once()
+        assert results[1] == {"category": "Einzeln"}
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_and_reports_errors(
+        self, mock_client, mock_settings, files
+    ):
+        """A failed batch is retried singly; remaining errors are returned."""
+        mock_client.analyze_files.side_effect = AIClientError("Batch kaputt")
+        mock_client.analyze_file.side_effect = [
+            {"category": "Einzeln"},
+            AIClientError("API down"),
+        ]
+        sorter = SmartSorter(mock_client, settings=mock_settings)
+
+        with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            results = await sorter.process_files(files[:2], batch_size=2)
+
+        assert mock_client.analyze_file.call_count == 2
+        assert sum(isinstance(r, AIClientError) for r in results) == 1
+        assert {"category": "Einzeln"} in results
+
+    @pytest.mark.asyncio
+    async def test_cached_files_are_not_sent(
+        self, tmp_path: Path, mock_client, mock_settings, files
+    ):
+        """Results from the cache skip the AI request entirely."""
+        from folder_extractor.core.ai_cache import AIResultCache
+
+        cache = AIResultCache(db_path=tmp_path / "ai_cache.db")
+        sorter = SmartSorter(mock_client, settings=mock_settings, cache=cache)
+        try:
+            with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+                await sorter.process_files(files, batch_size=10)
+                results = await sorter.process_files(files, batch_size=10)
+        finally:
+            cache.close()
+
+        assert mock_client.analyze_files.call_count == 1
+        assert results[4] == {"category": "Batch beleg_4.jpg"}
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_are_not_written_back(
+        self, tmp_path: Path, mock_client, mock_settings, files
+    ):
+        """Reading an entry does not renew it, so it still expires."""
+        from folder_extractor.core.ai_cache import AIResultCache
+
+        cache = AIResultCache(db_path=tmp_path / "ai_cache.db")
+        sorter = SmartSorter(mock_client, settings=mock_settings, cache=cache)
+        try:
+            with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+                await sorter.process_files(files, batch_size=10)
+                with patch.object(cache, "put") as mock_put:
+                    await sorter.process_files(files, batch_size=10)
+        finally:
+            cache.close()
+
+        mock_put.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_results_are_ingested_into_knowledge_graph(
+        self, mock_client, mock_settings, files
+    ):
+        """Every successful result reaches the KnowledgeGraph."""
+        sorter = SmartSorter(mock_client, settings=mock_settings)
+
+        with patch(
+            "folder_extractor.core.memory.graph.get_knowledge_graph"
+        ) as mock_get_kg:
+            mock_kg = MagicMock()
+            mock_get_kg.return_value = mock_kg
+            await sorter.process_files(files, batch_size=10)
+
+        assert mock_kg.ingest.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_each_file_is_hashed_once(self, mock_client, mock_settings, files):
+        """Hashes are calculated once and passed on to the AI client."""
+        from folder_extractor.core.file_operations import FileOperations
+
+        sorter = SmartSorter(mock_client, settings=mock_settings)
+        with patch.object(
+            FileOperations,
+            "calculate_file_hash",
+            autospec=True,
+            side_effect=lambda self, path: f"hash:{path.name}",
+        ) as mock_hash, patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            await sorter.process_files(files[:3], batch_size=2)
+
+        assert mock_hash.call_count == 3
+        assert mock_client.analyze_files.call_args_list[0].kwargs["hashes"] == [
+            "hash:beleg_0.jpg",
+            "hash:beleg_1.jpg",
+        ]
+        single = mock_client.analyze_files.call_args_list[1].kwargs["hashes"]
+        assert single == ["hash:beleg_2.jpg"]
+
+
+class TestSmartSorterPreClassifier:
+    """Tests for the local pre-classification stage."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Fixture providing an AI client with batch support."""
+        client = AsyncMock()
+        client.model_name = "test-model"
+        client.analyze_file.return_value = {"category": "Finanzen", "entities": []}
+        client.analyze_files.side_effect = lambda files, prompt, hashes=None: [
+            {"category": "Finanzen", "entities": []} for _ in files
+        ]
+        return client
+
+    @pytest.fixture
+    def mock_settings(self):
+        """Fixture providing settings without custom categories."""
+        settings = MagicMock()
+        settings.get.return_value = []
+        return settings
+
+    @pytest.fixture
+    def preclassifier(self):
+        """Fixture providing a pre-classifier without learned senders."""
+        from folder_extractor.core.preclassifier import PreClassifier
+
+        kg = MagicMock()
+        kg.get_sender_category_counts.return_value = []
+        return PreClassifier(knowledge_graph=kg)
+
+    @pytest.mark.asyncio
+    async def test_obvious_file_skips_ai(
+        self, mock_client, mock_settings, preclassifier, tmp_path: Path
+    ):
+        """A pre-classified file is not sent to the AI but still ingested."""
+        filepath = tmp_path / "Installer.dmg"
+        filepath.write_bytes(b"installer")
+        sorter = SmartSorter(
+            mock_client, settings=mock_settings, preclassifier=preclassifier
+        )
+
+        with patch(
+            "folder_extractor.core.memory.graph.get_knowledge_graph"
+        ) as mock_get_kg:
+            result = await sorter.process_file(
+                filepath, "application/x-apple-diskimage"
+            )
+
+        assert result["category"] == "Technik"
+        assert result["source"] == "preclassifier"
+        mock_client.analyze_file.assert_not_called()
+        mock_get_kg.return_value.ingest.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_other_files_go_to_ai(
+        self, mock_client, mock_settings, preclassifier, tmp_path: Path
+    ):
+        """Files without evidence are analyzed as before."""
+        filepath = tmp_path / "scan.pdf"
+        filepath.write_bytes(b"not really a pdf")
+        sorter = SmartSorter(
+            mock_client, settings=mock_settings, preclassifier=preclassifier
+        )
+
+        with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            result = await sorter.process_file(filepath, "application/pdf")
+
+        assert result["category"] == "Finanzen"
+        mock_client.analyze_file.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_process_files_sends_only_unknown_files(
+        self, mock_client, mock_settings, preclassifier, tmp_path: Path
+    ):
+        """Batches contain only files the pre-classifier could not sort."""
+        files = []
+        for name in ("backup.zip", "song.mp3", "rechnung.pdf", "vertrag.pdf"):
+            (tmp_path / name).write_bytes(name.encode())
+            files.append((tmp_path / name, "application/octet-stream"))
+        sorter = SmartSorter(
+            mock_client, settings=mock_settings, preclassifier=preclassifier
+        )
+
+        with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            results = await sorter.process_files(files, batch_size=10)
+
+        sent = mock_client.analyze_files.call_args.args[0]
+        assert [path.name for path, _ in sent] == ["rechnung.pdf", "vertrag.pdf"]
+        assert [r["category"] for r in results] == [
+            "Technik",
+            "Privat",
+            "Finanzen",
+            "Finanzen",
+        ]
+        assert preclassifier.stats()["api_calls_saved"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_preclassifier_falls_back_to_ai(
+        self, mock_client, mock_settings, tmp_path: Path
+    ):
+        """Errors of the pre-classifier do not block the analysis."""
+        filepath = tmp_path / "Installer.dmg"
+        filepath.write_bytes(b"installer")
+        preclassifier = MagicMock()
+        preclassifier.classify.side_effect = RuntimeError("boom")
+        sorter = SmartSorter(
+            mock_client, settings=mock_settings, preclassifier=preclassifier
+        )
+
+        with patch("folder_extractor.core.memory.graph.get_knowledge_graph"):
+            result = await sorter.process_file(filepath, "application/octet-stream")
+
+        assert result["category"] == "Finanzen"
+        mock_client.analyze_file.assert_called_once()
+
+
+class TestSmartSorterGraphWriter:
+    """Tests for write-behind ingestion through a KnowledgeGraphWriter."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_queued_instead_of_written(self, tmp_path: Path):
+        """With a graph writer the KnowledgeGraph is not touched directly."""
+        filepath = tmp_path / "invoice.pdf"
+        filepath.write_bytes(b"invoice")
+        mock_client = AsyncMock()
+        mock_client.analyze_file.return_value = {
+            "category": "Finanzen",
+            "entities": [{"name": "Telekom", "type": "Organization"}],
+        }
+        mock_settings = MagicMock()
+        mock_settings.get.return_value = []
+        graph_writer = MagicMock()
+        sorter = SmartSorter(
+            mock_client, settings=mock_settings, graph_writer=graph_writer
+        )
+
+        with patch(
+            "folder_extractor.core.memory.graph.get_knowledge_graph"
+        ) as mock_get_kg:
+            await sorter.process_file(filepath, "application/pdf")
+
+        mock_get_kg.assert_not_called()
+        file_info = graph_writer.submit.call_args[0][0]
+        assert file_info["path"] == str(filepath.resolve())
+        assert file_info["category"] == "Finanzen"
+        assert file_info["entities"] == [{"name": "Telekom", "type": "Organization"}]
@@ -6,11 +6,20 @@ triggers extraction via the orchestrator.
 """
 
 import logging
+import threading
+import time
 from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
-from watchdog.events import DirCreatedEvent, FileCreatedEvent, FileMovedEvent
+from watchdog.events import (
+    DirCreatedEvent,
+    FileClosedEvent,
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+)
 
 from folder_extractor.core.extractor import EnhancedExtractionOrchestrator
 from folder_extractor.core.monitor import StabilityMonitor
@@ -101,6 +110,34 @@ class TestFolderEventHandler:
         assert Path(call_args[0][0]) == dest_file
         self.orchestrator.process_single_file.assert_called_once()
 
+    def test_new_files_are_tracked_before_processing(self, tmp_path: Path) -> None:
+        """Created and moved-in files are registered with the monitor at intake."""
+        created = tmp_path / "scan.pdf"
+        moved = tmp_path / "download.pdf"
+        self.monitor.wait_for_file_ready.return_value = False
+
+        self.handler.on_created(FileCreatedEvent(str(created)))
+        self.handler.on_moved(
+            FileMovedEvent(str(tmp_path / "download.crdownload"), str(moved))
+        )
+        self.handler.on_created(FileCreatedEvent(str(tmp_path / "x.crdownload")))
+
+        assert self.monitor.track.call_args_list == [
+            ((created,), {"completed": False}),
+            ((moved,), {"completed": True}),
+        ]
+        self.monitor.forget.assert_called_once_with(tmp_path / "download.crdownload")
+
+    def test_closed_and_deleted_events_reach_monitor(self, tmp_path: Path) -> None:
+        """Close events complete a tracked file; deletions end tracking."""
+        test_file = tmp_path / "document.pdf"
+
+        self.handler.on_closed(FileClosedEvent(str(test_file)))
+        self.handler.on_deleted(FileDeletedEvent(str(test_file)))
+
+        self.monitor.mark_completed.assert_called_once_with(test_file)
+        self.monitor.forget.assert_called_once_with(test_file)
+
     def test_temp_file_with_tmp_extension_is_ignored(self, tmp_path: Path) -> None:
         """Files with .tmp extension are filtered out."""
         # Arrange
@@ -891,6 +928,230 @@ class TestWebSocketCallback:
         self.websocket_callback.assert_not_called()
 
 
+class TestFolderEventHandlerPipeline:
+    """Tests for FolderEventHandler with a worker pipeline (workers > 0)."""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures before each test method."""
+        self.state_manager = StateManager()
+        self.monitor = Mock(spec=StabilityMonitor)
+        self.orchestrator = Mock(spec=EnhancedExtractionOrchestrator)
+        self.orchestrator.process_single_file.return_value = {"status": "success"}
+        self.orchestrator.process_files.return_value = {"status": "success"}
+        self.handler = FolderEventHandler(
+            self.orchestrator,
+            self.monitor,
+            self.state_manager,
+            workers=2,
+        )
+        self.handler._coalescer.window = 0.05
+
+    def teardown_method(self) -> None:
+        """Stop pipeline workers."""
+        self.handler.stop()
+
+    def _processed_files(self) -> list[Path]:
+        """All files passed to the orchestrator (single or batch calls)."""
+        files = [
+            c.kwargs["filepath"]
+            for c in self.orchestrator.process_single_file.call_args_list
+        ]
+        for c in self.orchestrator.process_files.call_args_list:
+            files.extend(c.kwargs["filepaths"])
+        return files
+
+    def test_inline_processing_without_workers(self) -> None:
+        """Handlers without workers have no pipeline."""
+        handler = FolderEventHandler(
+            self.orchestrator, self.monitor, self.state_manager
+        )
+
+        assert handler.pipeline is None
+        assert handler.get_pipeline_stats() is None
+        assert handler.wait_idle(0) is True
+
+    def test_on_created_does_not_block_on_stability_wait(self, tmp_path: Path) -> None:
+        """Event callback returns while the stability stage is still waiting."""
+        release = threading.Event()
+        self.monitor.wait_for_file_ready.side_effect = lambda path, timeout: (
+            release.wait(5)
+        )
+        test_file = tmp_path / "document.pdf"
+        test_file.write_text("content")
+
+        start = time.monotonic()
+        self.handler.on_created(FileCreatedEvent(str(test_file)))
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 1.0
+        self.orchestrator.process_single_file.assert_not_called()
+
+        release.set()
+        assert self.handler.wait_idle(5)
+        self.orchestrator.process_single_file.assert_called_once()
+
+    def test_processing_set_released_after_pipeline_finishes(
+        self, tmp_path: Path
+    ) -> None:
+        """Files leave the processing set once the pipeline is done with them."""
+        self.monitor.wait_for_file_ready.return_value = True
+        test_file = tmp_path / "document.pdf"
+        test_file.write_text("content")
+
+        self.handler.on_created(FileCreatedEvent(str(test_file)))
+
+        assert self.handler.wait_idle(5)
+        assert str(test_file) not in self.handler._processing_files
+        assert self.handler.get_pipeline_stats()["processed"] == 1
+
+    def test_burst_of_files_is_processed(self, tmp_path: Path) -> None:
+        """Many events are all queued and processed exactly once."""
+        self.monitor.wait_for_file_ready.return_value = True
+        files = [tmp_path / f"doc{i}.pdf" for i in range(30)]
+        for f in files:
+            f.write_text("content")
+            self.handler.on_created(FileCreatedEvent(str(f)))
+
+        assert self.handler.wait_idle(5)
+        assert sorted(self._processed_files()) == sorted(files)
+
+    def test_ready_files_are_batched(self, tmp_path: Path) -> None:
+        """Files that become ready together share one orchestrator call."""
+        release = threading.Event()
+        self.monitor.wait_for_file_ready.side_effect = lambda path, timeout: (
+            release.wait(5)
+        )
+        blocker = tmp_path / "first.pdf"
+        blocker.write_text("content")
+        files = [tmp_path / f"doc{i}.pdf" for i in range(10)]
+        for f in files:
+            f.write_text("content")
+
+        # Occupy the extraction lock so ready files accumulate in the queue
+        with self.handler._extract_lock:
+            for f in [blocker, *files]:
+                self.handler.on_created(FileCreatedEvent(str(f)))
+            assert self.handler._coalescer.wait_idle(5)
+            release.set()
+            deadline = time.monotonic() + 5
+            while (
+                self.handler.get_pipeline_stats()["ready"]
+                + self.handler.get_pipeline_stats()["processing"]
+                < 11
+                and time.monotonic() < deadline
+            ):
+                time.sleep(0.01)
+
+        assert self.handler.wait_idle(5)
+        assert sorted(self._processed_files()) == sorted([blocker, *files])
+        assert self.orchestrator.process_files.call_count >= 1
+
+    def test_failed_batch_reports_every_file(self, tmp_path: Path) -> None:
+        """A batch the orchestrator rejects ends with an error per file."""
+        event_callback = Mock()
+        self.handler.on_event_callback = event_callback
+        self.orchestrator.process_files.return_value = {
+            "status": "security_error",
+            "message": "Unsicherer Pfad",
+        }
+        files = [tmp_path / "a.pdf", tmp_path / "b.pdf"]
+
+        self.handler._process_ready_batch(files)
+
+        errors = [c.args for c in event_callback.call_args_list if c.args[0] == "error"]
+        assert errors == [
+            ("error", "a.pdf", "Unsicherer Pfad"),
+            ("error", "b.pdf", "Unsicherer Pfad"),
+        ]
+
+    def test_batch_reports_files_that_failed_to_move(self, tmp_path: Path) -> None:
+        """Files the extraction counted as errors are not reported as sorted."""
+        event_callback = Mock()
+        self.handler.on_event_callback = event_callback
+        moved, failed = tmp_path / "moved.pdf", tmp_path / "failed.pdf"
+        failed.write_text("still here")
+        self.orchestrator.process_files.return_value = {
+            "status": "success",
+            "errors": 1,
+            "missing": [],
+            "history": [{"original_pfad": str(moved)}],
+        }
+
+        self.handler._process_ready_batch([moved, failed])
+
+        statuses = {
+            c.args[1]: c.args[0]
+            for c in event_callback.call_args_list
+            if c.args[0] in ("sorted", "error")
+        }
+        assert statuses == {"moved.pdf": "sorted", "failed.pdf": "error"}
+
+    def test_create_and_modify_events_are_coalesced(self, tmp_path: Path) -> None:
+        """Repeated events for one path result in a single processing run."""
+        self.monitor.wait_for_file_ready.return_value = True
+        test_file = tmp_path / "document.pdf"
+        test_file.write_text("content")
+
+        self.handler.on_created(FileCreatedEvent(str(test_file)))
+        for _ in range(5):
+            self.handler.on_modified(FileModifiedEvent(str(test_file)))
+        self.handler.on_created(FileCreatedEvent(str(test_file)))
+
+        assert self.handler.wait_idle(5)
+        assert self._processed_files() == [test_file]
+        assert self.handler.get_pipeline_stats()["coalesced_events"] == 6
+
+    def test_create_then_move_processes_only_final_path(self, tmp_path: Path) -> None:
+        """A download renamed into place is processed once under its final name."""
+        self.monitor.wait_for_file_ready.return_value = True
+        partial = tmp_path / "report.pdf.crdownload"
+        final = tmp_path / "report.pdf"
+        final.write_text("content")
+        event_callback = Mock()
+        self.handler.on_event_callback = event_callback
+
+        self.handler.on_created(FileCreatedEvent(str(partial)))
+        self.handler.on_moved(FileMovedEvent(str(partial), str(final)))
+
+        assert self.handler.wait_idle(5)
+        assert self._processed_files() == [final]
+        incoming = [c for c in event_callback.call_args_list if c[0][0] == "incoming"]
+        assert [c[0][1] for c in incoming] == ["report.pdf"]
+
+    def test_deleted_file_is_not_processed(self, tmp_path: Path) -> None:
+        """A file deleted before its events settle is dropped."""
+        test_file = tmp_path / "short-lived.pdf"
+
+        self.handler.on_created(FileCreatedEvent(str(test_file)))
+        self.handler.on_deleted(FileDeletedEvent(str(test_file)))
+
+        assert self.handler.wait_idle(5)
+        self.monitor.wait_for_file_ready.assert_not_called()
+
+    def test_processing_error_reported_from_worker(self, tmp_path: Path) -> None:
+        """Errors in the processing stage reach the event callback."""
+        event_callback = Mock()
+        handler = FolderEventHandler(
+            self.orchestrator,
+            self.monitor,
+            self.state_manager,
+            on_event_callback=event_callback,
+            workers=1,
+        )
+        self.monitor.wait_for_file_ready.return_value = True
+        self.orchestrator.process_single_file.side_effect = RuntimeError("boom")
+        test_file = tmp_path / "document.pdf"
+        test_file.write_text("content")
+
+        try:
+            handler.on_created(FileCreatedEvent(str(test_file)))
+            assert handler.wait_idle(5)
+        finally:
+            handler.stop()
+
+        event_callback.assert_any_call("error", "document.pdf", "boom")
+
+
 class TestSmartWatchSecurity:
     """Security tests for SmartFolderEventHandler path validation.
 
@@ -939,58 +1200,281 @@ class TestSmartWatchSecurity:
             for keyword in ["safe", "allowed", "desktop", "downloads", "documents"]
         )
 
-    def test_smart_watch_validates_resolved_target_path(self, tmp_path: Path) -> None:
+    def test_smart_watch_validates_resolved_target_path(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """SmartFolderEventHandler must validate target_dir escapes safe folders.
 
         SECURITY TEST: Defense-in-depth - even if sanitization is bypassed somehow,
         is_safe_path validation must catch unsafe target directories before file moves.
         """
-        # Arrange - create a safe base_path in Downloads
-        home = Path.home()
+        # Arrange - create a safe base_path in the Downloads of a temporary home
+        home = tmp_path.resolve() / "home"
+        monkeypatch.setattr(Path, "home", lambda: home)
         safe_base = home / "Downloads" / "test_watch_security"
-        safe_base.mkdir(parents=True, exist_ok=True)
+        safe_base.mkdir(parents=True)
+        test_file = safe_base / "document.pdf"
+        test_file.write_text("test content")
+
+        events = []
+        handler = self.SmartFolderEventHandler(
+            smart_sorter=self.smart_sorter,
+            monitor=self.monitor,
+            state_manager=self.state_manager,
+            base_path=safe_base,
+            folder_structure="{category}",
+            on_event_callback=lambda status, name, error=None: events.append(
+                (status, error)
+            ),
+        )
+
+        # Mock AI to return safe-looking data
+        async def mock_process_file(filepath, mime_type):
+            return {"category": "Invoices"}
+
+        self.smart_sorter.process_file = mock_process_file
 
+        # Mock _build_target_path to return an UNSAFE path
+        # This simulates a bypass in sanitization or other vulnerability
+        unsafe_path = tmp_path / "evil"  # Outside safe folders!
+        handler._build_target_path = Mock(return_value=unsafe_path)
+
+        # Act - the sort stage detects the unsafe target_dir
         try:
-            # Create test file in safe location
-            test_file = safe_base / "document.pdf"
-            test_file.write_text("test content")
+            handler._run_smart_sort(test_file)
+        finally:
+            handler.stop()
 
-            # Create handler with SAFE base_path
-            handler = self.SmartFolderEventHandler(
-                smart_sorter=self.smart_sorter,
-                monitor=self.monitor,
-                state_manager=self.state_manager,
-                base_path=safe_base,
-                folder_structure="{category}",
-            )
+        # Assert - reported once as a security violation
+        errors = [error for status, error in events if status == "error"]
+        assert len(errors) == 1
+        assert "security" in errors[0].lower()
+
+        # Verify file was NOT moved to unsafe location
+        assert test_file.exists()
+        assert not (unsafe_path / "document.pdf").exists()
 
-            # Mock AI to return safe-looking data
-            async def mock_process_file(filepath, mime_type):
-                return {"category": "Invoices"}
 
-            self.smart_sorter.process_file = mock_process_file
-            self.monitor.wait_for_file_ready.return_value = True
+class TestSmartFolderEventHandlerLoop:
+    """Tests for the shared event loop of SmartFolderEventHandler."""
 
-            # Mock _build_target_path to return an UNSAFE path
-            # This simulates a bypass in sanitization or other vulnerability
-            unsafe_path = tmp_path / "evil"  # Outside safe folders!
-            original_build = handler._build_target_path
-            handler._build_target_path = Mock(return_value=unsafe_path)
+    @pytest.fixture(autouse=True)
+    def setup_handler(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Set up a smart handler watching Downloads of a temporary home."""
+        pytest.importorskip(
+            "folder_extractor.core.smart_sorter",
+            reason="SmartSorter requires Python 3.9+",
+        )
+        from folder_extractor.core.smart_sorter import SmartSorter
+        from folder_extractor.core.watch import SmartFolderEventHandler
 
-            # Act - process file should detect unsafe target_dir and raise ValueError
-            import asyncio
-            with pytest.raises(ValueError) as exc_info:
-                asyncio.run(handler._process_file_smart(test_file, timeout=30))
+        home = tmp_path.resolve() / "home"
+        monkeypatch.setattr(Path, "home", lambda: home)
+        self.base = home / "Downloads" / "test_smart_watch_loop"
+        self.base.mkdir(parents=True)
+        self.monitor = Mock(spec=StabilityMonitor)
+        self.monitor.wait_for_file_ready.return_value = True
+        self.smart_sorter = Mock(spec=SmartSorter)
+        self.events = []
+        self.handler = SmartFolderEventHandler(
+            smart_sorter=self.smart_sorter,
+            monitor=self.monitor,
+            state_manager=StateManager(),
+            base_path=self.base,
+            folder_structure="{category}",
+            on_event_callback=lambda status, name, error=None: self.events.append(
+                (status, name)
+            ),
+            ai_concurrency=2,
+        )
+        yield
+        self.handler.stop()
+
+    def _create(self, name: str) -> Path:
+        filepath = self.base / name
+        filepath.write_text("content")
+        return filepath
+
+    def test_files_are_analyzed_concurrently_on_one_loop(self) -> None:
+        """Analyses overlap up to ai_concurrency and share one event loop."""
+        import asyncio
+
+        loops = set()
+        active = [0]
+        peak = [0]
+
+        async def process_file(filepath, mime_type):
+            loops.add(asyncio.get_running_loop())
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.1)
+            active[0] -= 1
+            return {"category": "Rechnungen"}
+
+        self.smart_sorter.process_file = process_file
+        for i in range(4):
+            filepath = self._create(f"doc{i}.pdf")
+            self.handler.on_created(FileCreatedEvent(str(filepath)))
+
+        assert self.handler.wait_idle(5)
+
+        assert peak[0] == 2
+        assert len(loops) == 1
+        assert len(list((self.base / "Rechnungen").iterdir())) == 4
+        assert self.handler._processing_files == set()
+
+    def test_pipeline_workers_reach_ai_concurrency(self) -> None:
+        """With few pipeline workers, analyses still overlap up to the limit."""
+        import asyncio
 
-            # Assert - error mentions security violation
-            error_msg = str(exc_info.value).lower()
-            assert "security" in error_msg or "safe" in error_msg
+        from folder_extractor.core.watch import SmartFolderEventHandler
 
-            # Verify file was NOT moved to unsafe location
-            assert not (unsafe_path / "document.pdf").exists()
+        active = [0]
+        peak = [0]
 
+        async def process_file(filepath, mime_type):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.1)
+            active[0] -= 1
+            return {"category": "Rechnungen"}
+
+        self.smart_sorter.process_file = process_file
+        handler = SmartFolderEventHandler(
+            smart_sorter=self.smart_sorter,
+            monitor=self.monitor,
+            state_manager=StateManager(),
+            base_path=self.base,
+            folder_structure="{category}",
+            workers=1,
+            ai_concurrency=3,
+        )
+        try:
+            for i in range(3):
+                handler._schedule_processing(self._create(f"doc{i}.pdf"), 1)
+
+            assert handler.wait_idle(5)
         finally:
-            # Cleanup
-            if safe_base.exists():
-                import shutil
-                shutil.rmtree(safe_base, ignore_errors=True)
+            handler.stop()
+
+        assert handler.pipeline.workers == 3
+        assert peak[0] == 3
+        assert len(list((self.base / "Rechnungen").iterdir())) == 3
+
+    def test_on_created_returns_before_analysis_finishes(self) -> None:
+        """The observer thread is not blocked by the AI analysis."""
+        import asyncio
+
+        release = threading.Event()
+
+        async def process_file(filepath, mime_type):
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+            return {"category": "Rechnungen"}
+
+        self.smart_sorter.process_file = process_file
+        filepath = self._create("slow.pdf")
+
+        self.handler.on_created(FileCreatedEvent(str(filepath)))
+
+        assert filepath.exists()
+        assert str(filepath) in self.handler._processing_files
+        release.set()
+        assert self.handler.wait_idle(5)
+        assert ("sorted", "slow.pdf") in self.events
+
+    def test_unsafe_target_is_reported_and_released(self, tmp_path: Path) -> None:
+        """Errors raised on the loop are reported and free the file again."""
+
+        async def process_file(filepath, mime_type):
+            return {"category": "Rechnungen"}
+
+        self.smart_sorter.process_file = process_file
+        self.handler._build_target_path = Mock(return_value=tmp_path / "evil")
+        filepath = self._create("doc.pdf")
+
+        self.handler.on_created(FileCreatedEvent(str(filepath)))
+
+        assert self.handler.wait_idle(5)
+        assert self.events.count(("error", "doc.pdf")) == 1
+        assert filepath.exists()
+        assert self.handler._processing_files == set()
+
+    def test_move_runs_off_the_event_loop(self) -> None:
+        """A slow move does not block analyses running on the shared loop."""
+        import asyncio
+
+        moving = threading.Event()
+        release = threading.Event()
+        analyzed = []
+        original_move = self.handler._move_to_target
+
+        def slow_move(filepath, target_dir):
+            moving.set()
+            release.wait(5)
+            return original_move(filepath, target_dir)
+
+        async def process_file(filepath, mime_type):
+            if filepath.name == "second.pdf":
+                await asyncio.sleep(0)
+                analyzed.append(filepath.name)
+            return {"category": "Rechnungen"}
+
+        self.smart_sorter.process_file = process_file
+        self.handler._move_to_target = slow_move
+        self.handler.on_created(FileCreatedEvent(str(self._create("first.pdf"))))
+        assert moving.wait(5)
+
+        self.handler.on_created(FileCreatedEvent(str(self._create("second.pdf"))))
+        deadline = time.monotonic() + 5
+        while not analyzed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+
+        assert analyzed == ["second.pdf"]
+        assert self.handler.wait_idle(5)
+
+    def test_sorted_files_are_reported_to_move_callback(self) -> None:
+        """Each move is passed to move_callback as (old path, new path)."""
+
+        async def process_file(filepath, mime_type):
+            return {"category": "Rechnungen"}
+
+        self.smart_sorter.process_file = process_file
+        self.handler.move_callback = Mock(side_effect=RuntimeError("ignored"))
+        filepath = self._create("doc.pdf")
+
+        self.handler.on_created(FileCreatedEvent(str(filepath)))
+
+        assert self.handler.wait_idle(5)
+        self.handler.move_callback.assert_called_once_with(
+            [(str(filepath), str(self.base / "Rechnungen" / "doc.pdf"))]
+        )
+        assert ("sorted", "doc.pdf") in self.events
+
+    def test_stop_closes_event_loop(self) -> None:
+        """Stopping the handler shuts the loop thread down."""
+
+        async def process_file(filepath, mime_type):
+            return {"category": "Rechnungen"}
+
+        self.smart_sorter.process_file = process_file
+        filepath = self._create("doc.pdf")
+        self.handler.on_created(FileCreatedEvent(str(filepath)))
+        assert self.handler.wait_idle(5)
+        assert self.handler.loop_thread.is_running
+
+        self.handler.stop()
+
+        assert not self.handler.loop_thread.is_running
+
+    def test_preclassifier_stats_without_preclassifier(self) -> None:
+        """Stats are None when the sorter has no pre-classifier."""
+        assert self.handler.get_preclassifier_stats() is None
+
+    def test_preclassifier_stats_are_reported(self) -> None:
+        """Stats of the sorter's pre-classifier are passed through."""
+        self.smart_sorter.preclassifier = Mock()
+        self.smart_sorter.preclassifier.stats.return_value = {"hits": 3}
+
+        assert self.handler.get_preclassifier_stats() == {"hits": 3}